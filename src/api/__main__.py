@@ -0,0 +1,30 @@
+import argparse
+import asyncio
+from config import API_HOST, API_PORT
+from database_initialization import initialize_database
+from api.api_server import ApiServer
+
+
+async def serve(host, port):
+    server = ApiServer()
+    port = await server.start(host, port)
+    print(f"Serving the expense tracker API on http://{host}:{port}")
+    await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expense tracker HTTP/JSON API")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args()
+
+    initialize_database()
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
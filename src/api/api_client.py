@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+
+class ApiClient:
+    """This class is a minimal asynchronous client for the expense tracker API,
+    sending requests one after another over a single keep-alive connection
+    """
+
+    def __init__(self, host, port):
+        """Class constructor
+
+        Args:
+            host (str): The address of the API server
+            port (int): The port of the API server
+        """
+        self.host = host
+        self.port = port
+        self.token = None
+        self._reader = None
+        self._writer = None
+
+    async def connect(self):
+        """Opens the connection to the API server
+        """
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        """Closes the connection to the API server
+        """
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def login(self, username, password):
+        """Logs in and uses the received token for the following requests
+
+        Returns:
+            The HTTP status code of the login request
+        """
+        status, response = await self.request(
+            "POST", "/login", {"username": username, "password": password})
+        if status == 200:
+            self.token = response["token"]
+        return status
+
+    async def request(self, method, path, data=None):
+        """Sends a request and waits for its response
+
+        Args:
+            method (str): The HTTP method, e.g. "GET"
+            path (str): The requested path, including the query string
+            data (optional): Sent as the JSON request body
+
+        Returns:
+            Tuple of the HTTP status code and the decoded JSON response
+        """
+        body = json.dumps(data).encode("utf-8") if data is not None else b""
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n"
+        if self.token:
+            head += f"Authorization: Bearer {self.token}\r\n"
+
+        self._writer.write((head + "\r\n").encode("latin-1") + body)
+        await self._writer.drain()
+
+        response_head = (await self._reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        lines = response_head.split("\r\n")
+        status = int(lines[0].split(" ")[1])
+
+        length = 0
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+
+        response_body = await self._reader.readexactly(length)
+        return status, json.loads(response_body) if response_body else None
@@ -0,0 +1,373 @@
+import asyncio
+import json
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+from config import (API_DATABASE_WORKERS, API_MAX_PENDING_REQUESTS,
+                    RECURRING_CHECK_INTERVAL_SECONDS)
+from repositories.expense_repository import ExpenseRepository
+from services.expense_service import ExpenseService, InvalidInputError
+from services.expense_report_service import ExpenseReportService
+from services.expense_exporter import ExpenseExporter
+from services.operation_journal import OperationJournal
+from services.currency_converter import MissingExchangeRateError
+from services.login_service import (login_service as default_login_service,
+                                    InvalidCredentialsError, TooManyAttemptsError)
+from services.recurring_expense_service import (
+    recurring_expense_scheduler as default_recurring_expense_scheduler)
+from entities.category import Category
+from entities.expense import Expense
+
+MAX_PAGE_SIZE = 1000
+MAX_BODY_SIZE = 10 * 1024 * 1024
+
+STATUS_TEXTS = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized",
+                404: "Not Found", 405: "Method Not Allowed", 422: "Unprocessable Entity",
+                429: "Too Many Requests", 500: "Internal Server Error"}
+
+logger = logging.getLogger(__name__)
+
+
+class ApiRequest:
+    """This class represents a parsed request passed to an endpoint handler
+
+    Attributes:
+        query (dict): The query string parameters, the last value of each
+        data (dict or list): The decoded JSON body, empty if there is no body
+        client (str): The address of the client, if known
+        session (Session object): The session of the bearer token, if the
+                                    route requires one
+    """
+
+    def __init__(self, query, data, client=None, session=None):
+        """Class constructor
+
+        Args:
+            query (dict): The query string parameters
+            data (dict or list): The decoded JSON body
+            client (str, optional): The address of the client
+            session (Session object, optional): The session of the request
+        """
+        self.query = query
+        self.data = data
+        self.client = client
+        self.session = session
+
+
+class ApiServer:
+    """This class manages a local HTTP server offering the expense tracking
+    functions of ExpenseService as JSON endpoints to several clients at once.
+    Each request is served for the user of the session its bearer token belongs to.
+    Database operations are run in a bounded thread pool, so that the event
+    loop keeps serving other clients meanwhile. The due expenses of recurring
+    rules are created when the server starts, and then on a timer.
+    """
+
+    def __init__(self, login_service=default_login_service, expense_repository=None,
+                 database_workers=API_DATABASE_WORKERS,
+                 max_pending_requests=API_MAX_PENDING_REQUESTS,
+                 recurring_expense_scheduler=default_recurring_expense_scheduler):
+        """Class constructor
+
+        Args:
+            login_service (LoginService object, optional): Used to log users in
+            expense_repository (ExpenseRepository object, optional): Handles database
+                                                            operations on expenses
+            database_workers (int, optional): Number of threads running database operations
+            max_pending_requests (int, optional): Number of requests that may wait for
+                                            a database worker before new ones are held back
+            recurring_expense_scheduler (RecurringExpenseScheduler object, optional):
+                                            Creates the due expenses of recurring rules
+        """
+        self._login_service = login_service
+        self._expense_repository = expense_repository or ExpenseRepository()
+        self._executor = ThreadPoolExecutor(max_workers=database_workers)
+        self._pending_requests = asyncio.Semaphore(max_pending_requests)
+        self._recurring_expense_scheduler = recurring_expense_scheduler
+        self._scheduler_task = None
+        self._server = None
+
+        # Each route has its handler and whether it requires a logged-in session
+        self._routes = {
+            ("POST", "/login"): (self._login, False),
+            ("POST", "/logout"): (self._logout, True),
+            ("GET", "/expenses"): (self._list_expenses, True),
+            ("POST", "/expenses"): (self._create_expense, True),
+            ("POST", "/expenses/bulk"): (self._create_expenses, True),
+            ("PUT", "/expenses"): (self._edit_expense, True),
+            ("GET", "/expenses/aggregate"): (self._aggregate_expenses, True),
+            ("GET", "/expenses/changes"): (self._list_changes, True),
+            ("POST", "/expenses/undo"): (self._undo, True),
+            ("POST", "/expenses/redo"): (self._redo, True),
+        }
+
+    async def start(self, host, port):
+        """Starts listening for connections
+
+        Args:
+            host (str): The address the server binds to
+            port (int): The port the server listens on, or 0 for any free port
+
+        Returns:
+            The port the server is listening on
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        if self._recurring_expense_scheduler:
+            self._scheduler_task = asyncio.create_task(self._run_recurring_expenses())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Serves clients until the server is stopped
+        """
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """Stops the server and waits for running database operations to finish
+        """
+        if self._scheduler_task:
+            self._scheduler_task.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+        self._executor.shutdown(wait=True)
+
+    async def _run_recurring_expenses(self):
+        while True:
+            await self._run_in_database_worker(self._recurring_expense_scheduler.run_due)
+            await asyncio.sleep(RECURRING_CHECK_INTERVAL_SECONDS)
+
+    async def _run_in_database_worker(self, function, *args):
+        async with self._pending_requests:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, function, *args)
+
+    async def _handle_connection(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        client = peer[0] if peer else None
+
+        try:
+            while await self._serve_request(reader, writer, client):
+                pass
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_request(self, reader, writer, client):
+        request = await self._read_request(reader)
+        if request is None:
+            return False
+
+        method, target, headers, body = request
+        status, response = await self._dispatch(method, target, headers, body, client)
+        keep_alive = headers.get("connection", "").lower() != "close"
+
+        self._write_response(writer, status, response, keep_alive)
+        await writer.drain()
+
+        return keep_alive
+
+    async def _read_request(self, reader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_SIZE:
+            raise ConnectionError("Request body too large")
+        body = await reader.readexactly(length) if length else b""
+
+        return method.upper(), target, headers, body
+
+    def _write_response(self, writer, status, response, keep_alive):
+        body = json.dumps(response).encode("utf-8")
+        retry_after = (f"Retry-After: {math.ceil(response['retry_after'])}\r\n"
+                       if status == 429 else "")
+        head = (f"HTTP/1.1 {status} {STATUS_TEXTS[status]}\r\n"
+                "Content-Type: application/json\r\n"
+                f"{retry_after}"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+    async def _dispatch(self, method, target, headers, body, client=None):
+        url = urlsplit(target)
+        route = self._routes.get((method, url.path))
+
+        if route is None:
+            if any(path == url.path for _, path in self._routes):
+                return 405, {"error": "Method not allowed"}
+            return 404, {"error": "Not found"}
+
+        handler, requires_session = route
+
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            return 400, {"error": "Invalid JSON"}
+
+        request = ApiRequest(
+            {name: values[-1] for name, values in parse_qs(url.query).items()}, data, client)
+
+        if requires_session:
+            request.session = self._login_service.find_session(self._bearer_token(headers))
+            if request.session is None:
+                return 401, {"error": "Not logged in"}
+
+        return await self._handle(handler, request)
+
+    async def _handle(self, handler, request):
+        try:
+            return await handler(request)
+
+        except InvalidInputError:
+            return 422, {"error": "Invalid input. Make sure you have entered a nonnegative "
+                         "numeric amount and a valid date in YYYY-MM-DD format"}
+        except MissingExchangeRateError as error:
+            return 422, {"error": str(error)}
+        except (KeyError, TypeError, ValueError):
+            return 400, {"error": "Invalid request"}
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Request to %s failed", handler.__name__)
+            return 500, {"error": "Internal server error"}
+
+    def _bearer_token(self, headers):
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        return token if scheme.lower() == "bearer" else None
+
+    def _expense_service(self, request):
+        # The journal is kept in the session, so that an edit can be undone by a later
+        # request of the same session
+        session = request.session
+        if session.operation_journal is None:
+            session.operation_journal = OperationJournal(session.user)
+        return ExpenseService(self._expense_repository, session.user,
+                              operation_journal=session.operation_journal)
+
+    async def _login(self, request):
+        try:
+            # Checking the password hash is slow, so it runs in the password hasher's
+            # worker pool instead of holding up a database worker. The user is looked
+            # up and a rehashed password stored in the database worker.
+            login = await self._run_in_database_worker(
+                self._login_service.start_session_async,
+                request.data["username"], request.data["password"], request.client)
+            await asyncio.wrap_future(login.future)
+            session = await self._run_in_database_worker(login.result)
+        except InvalidCredentialsError:
+            return 401, {"error": "Invalid credentials"}
+        except TooManyAttemptsError as error:
+            return 429, {"error": str(error), "retry_after": error.retry_after}
+
+        return 200, {"token": session.session_id}
+
+    async def _logout(self, request):
+        self._login_service.end_session(request.session)
+        return 200, {"logged_out": True}
+
+    async def _list_expenses(self, request):
+        expense_service = self._expense_service(request)
+        offset = int(request.query.get("offset", 0))
+        limit = min(int(request.query.get("limit", 50)), MAX_PAGE_SIZE)
+        category = Category(request.query["category"]) if "category" in request.query else None
+
+        page = await self._run_in_database_worker(
+            expense_service.list_expenses_page, offset, limit, category)
+
+        return 200, {"offset": offset, "limit": limit,
+                     "expenses": [self._expense_to_json(expense) for expense in page]}
+
+    async def _create_expense(self, request):
+        expense_service = self._expense_service(request)
+        await self._run_in_database_worker(
+            expense_service.create_new_expense, request.data["name"], request.data["amount"],
+            request.data.get("date"), request.data.get("category") or "undefined",
+            request.data.get("currency"))
+
+        return 201, {"created": 1}
+
+    async def _create_expenses(self, request):
+        expense_service = self._expense_service(request)
+        expenses = [(expense["name"], expense["amount"], expense.get("date"),
+                     expense.get("category"), expense.get("currency"))
+                    for expense in request.data["expenses"]]
+
+        created = await self._run_in_database_worker(
+            expense_service.create_new_expenses, expenses)
+
+        return 201, {"created": created}
+
+    async def _edit_expense(self, request):
+        expense_service = self._expense_service(request)
+        old = request.data["expense"]
+        expense = Expense(old["name"], old["amount"], old["date"], old["category"])
+
+        edit = {"name": expense_service.edit_expense_name,
+                "amount": expense_service.edit_expense_amount,
+                "date": expense_service.edit_expense_date,
+                "category": expense_service.edit_expense_category}[request.data["field"]]
+
+        edited = await self._run_in_database_worker(edit, request.data["value"], expense)
+
+        if not edited:
+            return 404, {"error": "Expense not found"}
+        return 200, {"edited": 1}
+
+    async def _undo(self, request):
+        expense_service = self._expense_service(request)
+        undone = await self._run_in_database_worker(expense_service.undo)
+
+        if undone is None:
+            return 404, {"error": "Nothing to undo"}
+        return 200, {"undone": undone}
+
+    async def _redo(self, request):
+        expense_service = self._expense_service(request)
+        redone = await self._run_in_database_worker(expense_service.redo)
+
+        if redone is None:
+            return 404, {"error": "Nothing to redo"}
+        return 200, {"redone": redone}
+
+    async def _aggregate_expenses(self, request):
+        report_service = ExpenseReportService(self._expense_repository, request.session.user)
+        period = request.query.get("by", "category")
+        if period == "category":
+            totals = await self._run_in_database_worker(report_service.get_totals_by_category)
+        else:
+            totals = await self._run_in_database_worker(
+                report_service.get_totals_by_period, period, None,
+                request.query.get("start"), request.query.get("end"))
+
+        return 200, {"totals": [{"key": key, "total": total} for key, total in totals]}
+
+    async def _list_changes(self, request):
+        exporter = ExpenseExporter(self._expense_repository, request.session.user)
+        since = int(request.query.get("since", 0))
+        limit = min(int(request.query.get("limit", MAX_PAGE_SIZE)), MAX_PAGE_SIZE)
+
+        changes, last_seq = await self._run_in_database_worker(
+            exporter.get_changes, since, limit)
+
+        return 200, {"since": since, "next": last_seq,
+                     "changes": [self._change_to_json(change) for change in changes]}
+
+    def _expense_to_json(self, expense):
+        return dict(zip(["name", "amount", "date", "category"], expense))
+
+    def _change_to_json(self, change):
+        seq, operation, expense_id, *expense = change
+        return {"seq": seq, "operation": operation, "id": expense_id,
+                "expense": self._expense_to_json(expense) if operation != "delete" else None}
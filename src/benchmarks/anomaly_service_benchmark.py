@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from services.anomaly_service import AnomalyService, category_bounds, ANOMALY_METHODS
+from repositories.expense_repository import ExpenseRepository
+from benchmarks.dataset_generator import CATEGORY_PROFILES
+
+benchmark_repository = ExpenseRepository()
+
+# Number of expenses in the history whose bounds are computed without the database
+HISTORY_SIZE = 1000000
+
+
+@pytest.fixture(name="history", scope="module")
+def fixture_history():
+    generator = np.random.default_rng(0)
+    weights = np.array([profile[1] for profile in CATEGORY_PROFILES], dtype=np.float64)
+    indexes = generator.choice(len(CATEGORY_PROFILES), HISTORY_SIZE, p=weights / weights.sum())
+    typical = np.array([profile[2] for profile in CATEGORY_PROFILES])[indexes]
+    spread = np.array([profile[3] for profile in CATEGORY_PROFILES])[indexes]
+
+    # Category names are Python strings, as read from the database
+    categories = np.array([profile[0] for profile in CATEGORY_PROFILES], dtype=object)[indexes]
+    amounts = np.round(generator.lognormal(np.log(typical), spread), 2)
+    return categories, amounts
+
+
+@pytest.mark.parametrize("method", ANOMALY_METHODS)
+def test_category_bounds_of_million_expenses(benchmark, history, method):
+    benchmark.pedantic(category_bounds, args=(*history, method), rounds=5)
+    benchmark.extra_info["rows"] = HISTORY_SIZE
+
+
+def test_find_anomalies(benchmark, dataset):
+    def find_once():
+        # A new service has an empty cache, so the expenses are read and checked again
+        return AnomalyService(benchmark_repository, dataset[0]).find_anomalies()
+
+    anomalies = benchmark.pedantic(find_once, rounds=3)
+    benchmark.extra_info["anomalies"] = len(anomalies)
+
+
+def test_flag_page_of_expenses(benchmark, dataset):
+    anomaly_service = AnomalyService(benchmark_repository, dataset[0])
+    expenses = [[profile[4][0], profile[2] * 10, "2023-04-15", profile[0]]
+                for profile in CATEGORY_PROFILES] * 5
+    anomaly_service.flag_expenses(expenses)
+
+    benchmark(anomaly_service.flag_expenses, expenses)
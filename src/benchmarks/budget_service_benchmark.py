@@ -0,0 +1,50 @@
+import pytest
+from services.budget_service import BudgetService
+from services.expense_service import ExpenseService
+from repositories.budget_repository import BudgetRepository
+from repositories.expense_repository import ExpenseRepository
+from entities.category import Category
+from benchmarks.dataset_generator import CATEGORY_PROFILES
+
+benchmark_budget_repository = BudgetRepository()
+benchmark_expense_repository = ExpenseRepository()
+
+# Number of expenses in each imported statement
+IMPORT_SIZE = 10000
+
+
+@pytest.fixture(name="services")
+def fixture_services(dataset):
+    budget_service = BudgetService(benchmark_budget_repository, dataset[0])
+    for profile in CATEGORY_PROFILES:
+        budget_service.set_budget(Category(profile[0]), 500)
+
+    return ExpenseService(benchmark_expense_repository, dataset[0]), budget_service
+
+
+def test_check_budget(benchmark, services):
+    _, budget_service = services
+    benchmark(budget_service.check_budget, Category("groceries"), "2023-04-15")
+
+
+def test_create_expense_and_check_budget(benchmark, services):
+    expense_service, budget_service = services
+
+    def create_once():
+        expense_service.create_new_expense("budgeted", 9.99, "2023-04-15", "groceries")
+        return budget_service.check_budget(Category("groceries"), "2023-04-15")
+
+    benchmark(create_once)
+
+
+def test_import_and_check_budgets(benchmark, services):
+    expense_service, budget_service = services
+    statement = [(f"budgeted {number}", 1 + number / 100, f"2023-04-{number % 28 + 1:02}",
+                  CATEGORY_PROFILES[number % len(CATEGORY_PROFILES)][0])
+                 for number in range(IMPORT_SIZE)]
+
+    def import_once():
+        expense_service.create_new_expenses(statement)
+        return budget_service.check_budgets(statement)
+
+    benchmark.pedantic(import_once, rounds=3)
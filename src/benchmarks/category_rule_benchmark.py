@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from services.category_rule_service import CategoryRuleService, CategoryMatcher
+from repositories.category_rule_repository import CategoryRuleRepository
+from repositories.category_repository import CategoryRepository
+from entities.category import Category
+from entities.category_rule import CategoryRule
+from benchmarks.dataset_generator import CATEGORY_PROFILES
+
+benchmark_category_rule_repository = CategoryRuleRepository()
+benchmark_category_repository = CategoryRepository()
+
+# Number of expenses in the imported statement
+IMPORT_SIZE = 100000
+# Number of distinct shops each expense name of the statement is paid at
+SHOPS_PER_NAME = 50
+
+# A rule for every expense name of the generated categories, and a few for the
+# undefined expenses, like a user would write them
+RULES = [CategoryRule(category, name) for category, _, _, _, names in CATEGORY_PROFILES
+         if category != "undefined" for name in names] + [
+    CategoryRule("groceries", r"^card payment\b", "regex", max_amount=15),
+    CategoryRule("bills", "transfer", min_amount=20),
+    CategoryRule("household", r"(?i)misc(ellaneous)?", "regex"),
+]
+
+
+@pytest.fixture(name="statement", scope="module")
+def fixture_statement():
+    generator = np.random.default_rng(0)
+    names = [name for _, _, _, _, names in CATEGORY_PROFILES for name in names]
+    picked = generator.integers(len(names), size=IMPORT_SIZE)
+    shops = generator.integers(SHOPS_PER_NAME, size=IMPORT_SIZE)
+    amounts = np.round(generator.lognormal(np.log(20), 0.8, size=IMPORT_SIZE), 2)
+
+    return [(f"{names[name]} {shop}", amount, "2023-04-15", None)
+            for name, shop, amount in zip(picked.tolist(), shops.tolist(), amounts.tolist())]
+
+
+@pytest.fixture(name="rule_service")
+def fixture_rule_service(dataset):
+    benchmark_category_rule_repository.delete_all_rules()
+    rule_service = CategoryRuleService(
+        benchmark_category_rule_repository, benchmark_category_repository, dataset[0])
+    for rule in RULES:
+        rule_service.create_rule(rule.category, rule.pattern, rule.match_type,
+                                 rule.min_amount, rule.max_amount)
+    return rule_service
+
+
+def test_categorize_import(benchmark, statement):
+    matcher = CategoryMatcher(RULES)
+    names = [expense[0] for expense in statement]
+    amounts = [expense[1] for expense in statement]
+
+    benchmark.pedantic(matcher.categorize, args=(names, amounts), rounds=5)
+    benchmark.extra_info["rows"] = IMPORT_SIZE
+
+
+def test_categorize_expenses_of_import(benchmark, rule_service, statement):
+    benchmark.pedantic(rule_service.categorize_expenses, args=(statement,), rounds=3)
+
+
+def test_apply_to_undefined(benchmark, rule_service):
+    user = rule_service.current_user
+    undefined = benchmark_category_repository.get_expenses_to_categorize(
+        user, Category("undefined"))
+
+    def restore_backlog():
+        benchmark_category_repository.update_categories(
+            user, [(expense["id"], "undefined") for expense in undefined])
+
+    categorized = benchmark.pedantic(
+        rule_service.apply_to_undefined, setup=restore_backlog, rounds=5)
+    benchmark.extra_info["categorized"] = categorized
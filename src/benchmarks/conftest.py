@@ -0,0 +1,27 @@
+import os
+import pytest
+from initialize import reset
+from repositories.user_repository import UserRepository
+from repositories.expense_repository import ExpenseRepository
+from benchmarks.dataset_generator import DatasetGenerator
+
+BENCHMARK_SIZES = [int(size) for size in
+                   os.getenv("BENCHMARK_SIZES", "1000,100000,1000000").split(",")]
+BENCHMARK_USER_COUNT = 10
+
+
+@pytest.fixture(scope="session", params=BENCHMARK_SIZES, ids=lambda size: f"{size}_rows")
+def dataset(request):
+    """Fills the benchmark database with the requested number of expense rows,
+    spread evenly over BENCHMARK_USER_COUNT users
+
+    Returns:
+        List of the generated users as User objects
+    """
+    reset()
+
+    generator = DatasetGenerator(UserRepository(), ExpenseRepository())
+    users = generator.generate(
+        BENCHMARK_USER_COUNT, request.param // BENCHMARK_USER_COUNT)
+
+    return users
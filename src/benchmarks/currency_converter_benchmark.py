@@ -0,0 +1,60 @@
+from datetime import date, timedelta
+import numpy as np
+import pytest
+from services.currency_converter import CurrencyConverter
+from services.expense_service import ExpenseService
+from repositories.expense_repository import ExpenseRepository
+from repositories.exchange_rate_repository import ExchangeRateRepository
+
+benchmark_expense_repository = ExpenseRepository()
+benchmark_exchange_rate_repository = ExchangeRateRepository()
+
+CURRENCIES = ["USD", "GBP", "SEK", "JPY", "CHF"]
+# Number of amounts converted at once, and of expenses in each imported statement
+CONVERSION_SIZE = 1000000
+IMPORT_SIZE = 10000
+
+# The dataset is generated before the rates are imported, as it resets the database
+pytestmark = pytest.mark.usefixtures("dataset")
+
+
+@pytest.fixture(name="converter")
+def fixture_converter():
+    """Imports three years of daily exchange rates for each of CURRENCIES
+    """
+    generator = np.random.default_rng(0)
+    first = date(2020, 5, 1)
+    rates = [(currency, (first + timedelta(days=day)).isoformat(), 0.5 + generator.random())
+             for currency in CURRENCIES for day in range(3 * 365 + 1)]
+
+    converter = CurrencyConverter(benchmark_exchange_rate_repository,
+                                  benchmark_expense_repository)
+    converter.import_rates(rates)
+    yield converter
+    benchmark_exchange_rate_repository.delete_all_rates()
+
+
+def test_convert_million_amounts(benchmark, converter):
+    # The conversion does not read expenses, so it is the same with each dataset size
+    generator = np.random.default_rng(0)
+    amounts = generator.lognormal(3, 0.7, CONVERSION_SIZE)
+    currencies = np.array(CURRENCIES + [None], dtype=object)[
+        generator.integers(0, len(CURRENCIES) + 1, CONVERSION_SIZE)]
+    dates = np.datetime64("2020-05-01") + generator.integers(0, 3 * 365, CONVERSION_SIZE)
+
+    benchmark.pedantic(converter.convert, args=(amounts, currencies, dates), rounds=5)
+    benchmark.extra_info["rows"] = CONVERSION_SIZE
+
+
+def test_get_rate(benchmark, converter):
+    converter.get_rate("USD", "2023-04-15")
+    benchmark(converter.get_rate, "USD", "2023-04-15")
+
+
+def test_create_expenses_in_other_currencies(benchmark, converter, dataset):
+    expense_service = ExpenseService(benchmark_expense_repository, dataset[0], converter)
+    statement = [(f"abroad {number}", 1 + number / 100, f"2023-04-{number % 28 + 1:02}",
+                  "travel", CURRENCIES[number % len(CURRENCIES)])
+                 for number in range(IMPORT_SIZE)]
+
+    benchmark.pedantic(expense_service.create_new_expenses, args=(statement,), rounds=3)
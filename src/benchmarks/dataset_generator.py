@@ -0,0 +1,114 @@
+import random
+from datetime import date, timedelta
+from entities.user import User
+from entities.expense import Expense
+from repositories.user_repository import UserRepository
+from repositories.expense_repository import ExpenseRepository
+from services.password_hasher import PasswordHasher
+
+BENCHMARK_PASSWORD = "benchmark123!"
+
+# (category, relative frequency, typical amount, amount spread, expense names)
+CATEGORY_PROFILES = [
+    ("groceries", 30, 25.0, 0.6, ["supermarket", "bakery", "market", "corner shop"]),
+    ("restaurants", 14, 18.0, 0.5, ["sushi", "pizza", "lunch", "coffee", "kebab"]),
+    ("transport", 14, 4.5, 0.7, ["bus ticket", "train ticket", "taxi", "fuel"]),
+    ("entertainment", 8, 22.0, 0.8, ["cinema", "concert", "games", "streaming"]),
+    ("clothes", 6, 45.0, 0.7, ["shoes", "dress", "jacket", "t-shirt"]),
+    ("health", 5, 30.0, 0.9, ["pharmacy", "dentist", "gym"]),
+    ("household", 8, 20.0, 0.9, ["cleaning supplies", "furniture", "kitchenware"]),
+    ("bills", 4, 60.0, 0.4, ["electricity", "phone", "internet", "insurance"]),
+    ("travel", 2, 180.0, 0.8, ["flight", "hotel", "ferry"]),
+    ("undefined", 9, 15.0, 1.0, ["card payment", "transfer", "misc"]),
+]
+
+# Weekends see more spending than weekdays
+WEEKDAY_WEIGHTS = [0.8, 0.8, 0.9, 0.9, 1.2, 1.6, 1.3]
+
+
+class DatasetGenerator:
+    """This class fills the database with seeded, synthetic users and expenses
+    for performance testing.
+
+    Attributes:
+        user_repository: The UserRepository used for adding users
+        expense_repository: The ExpenseRepository used for adding expenses
+    """
+
+    def __init__(self, user_repository: UserRepository,
+                 expense_repository: ExpenseRepository, seed=0):
+        """Class constructor
+
+        Args:
+            user_repository (UserRepository object): Handles database operations on users
+            expense_repository (ExpenseRepository object): Handles database operations
+                                                            on expenses
+            seed (int, optional): Seed for the random generator. Defaults to 0.
+        """
+        self.user_repository = user_repository
+        self.expense_repository = expense_repository
+        self._random = random.Random(seed)
+
+    def generate(self, user_count, expenses_per_user, end_date=date(2023, 5, 1), years=3,
+                 batch_size=10000):
+        """Adds user_count users with expenses_per_user expenses each into database
+
+        Args:
+            user_count (int): Number of users to be created
+            expenses_per_user (int): Number of expenses to be created for each user
+            end_date (date, optional): Date of the most recent expense. Defaults to 2023-05-01.
+            years (int, optional): How many years back expenses are spread. Defaults to 3.
+            batch_size (int, optional): Number of expenses inserted per transaction.
+
+        Returns:
+            List of the created users as User objects, with their plain text passwords
+        """
+        users = []
+        # All users share a password, so it is only hashed once
+        password_hash = PasswordHasher().hash_password(BENCHMARK_PASSWORD)
+
+        for number in range(user_count):
+            user = User(f"benchmark_user_{number}", BENCHMARK_PASSWORD)
+            self.user_repository.add_user(User(user.username, password_hash))
+            users.append(user)
+
+            remaining = expenses_per_user
+            while remaining > 0:
+                count = min(batch_size, remaining)
+                self.expense_repository.add_expenses(
+                    user, self.generate_expenses(count, end_date, years))
+                remaining -= count
+
+        return users
+
+    def generate_expenses(self, count, end_date=date(2023, 5, 1), years=3):
+        """Generates synthetic expenses without adding them into database
+
+        Args:
+            count (int): Number of expenses to be generated
+            end_date (date, optional): Date of the most recent expense. Defaults to 2023-05-01.
+            years (int, optional): How many years back expenses are spread. Defaults to 3.
+
+        Returns:
+            List of Expense objects
+        """
+        days = 365 * years
+        first_date = end_date - timedelta(days=days - 1)
+
+        day_offsets = range(days)
+        day_weights = [WEEKDAY_WEIGHTS[(first_date + timedelta(days=offset)).weekday()]
+                       for offset in day_offsets]
+        category_weights = [profile[1] for profile in CATEGORY_PROFILES]
+
+        offsets = self._random.choices(day_offsets, weights=day_weights, k=count)
+        profiles = self._random.choices(
+            CATEGORY_PROFILES, weights=category_weights, k=count)
+
+        return [self._generate_expense(profile, first_date + timedelta(days=offset))
+                for offset, profile in zip(offsets, profiles)]
+
+    def _generate_expense(self, profile, expense_date):
+        category, _, typical_amount, spread, names = profile
+        amount = round(typical_amount *
+                       self._random.lognormvariate(0, spread), 2)
+        return Expense(self._random.choice(names), amount, str(expense_date), category)
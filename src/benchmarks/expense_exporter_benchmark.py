@@ -0,0 +1,51 @@
+import importlib.util
+import os
+import tempfile
+import pytest
+from services.expense_exporter import ExpenseExporter, BINARY_FORMATS
+from repositories.expense_repository import ExpenseRepository
+from entities.expense import Expense
+from database_connection import connect_to_database
+
+benchmark_repository = ExpenseRepository()
+
+EXPORT_FORMATS = ["csv", "jsonl", "npz"]
+if importlib.util.find_spec("pyarrow"):
+    EXPORT_FORMATS.append("parquet")
+# Number of new expenses read by the change journal benchmark, independent of dataset size
+CHANGES_SIZE = 100
+
+
+@pytest.mark.parametrize("export_format", EXPORT_FORMATS)
+def test_export_expenses(benchmark, dataset, export_format):
+    exporter = ExpenseExporter(benchmark_repository, dataset[0])
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"expenses.{export_format}")
+
+        def export_once():
+            if export_format in BINARY_FORMATS:
+                with open(path, "wb") as file:
+                    return exporter.export(export_format, file)
+            with open(path, "w", newline="", encoding="utf-8") as file:
+                return exporter.export(export_format, file)
+
+        count = benchmark.pedantic(export_once, rounds=3)
+        size = os.path.getsize(path)
+
+    benchmark.extra_info["rows"] = count
+    benchmark.extra_info["rows_per_second"] = round(count / benchmark.stats.stats.mean)
+    benchmark.extra_info["bytes"] = size
+
+
+def test_get_recent_changes(benchmark, dataset):
+    # A sync after CHANGES_SIZE new expenses should not depend on the size of the table
+    exporter = ExpenseExporter(benchmark_repository, dataset[0])
+    since = connect_to_database().execute(
+        "select coalesce(max(seq), 0) from expense_changes").fetchone()[0]
+    benchmark_repository.add_expenses(
+        dataset[0], [Expense(f"temporary {number}", 1.0, "2023-01-01", "changes")
+                     for number in range(CHANGES_SIZE)])
+
+    changes, _ = benchmark(exporter.get_changes, since)
+    assert len(changes) == CHANGES_SIZE
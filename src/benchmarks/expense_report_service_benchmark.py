@@ -0,0 +1,70 @@
+import pytest
+from services.expense_service import ExpenseService
+from services.expense_report_service import ExpenseReportService
+from repositories.expense_repository import ExpenseRepository
+from entities.expense import Expense
+from entities.category import Category
+
+benchmark_repository = ExpenseRepository()
+
+
+@pytest.fixture(name="report_service")
+def fixture_report_service(dataset):
+    return ExpenseReportService(benchmark_repository, dataset[0])
+
+
+@pytest.fixture(name="expense_service")
+def fixture_expense_service(dataset):
+    return ExpenseService(benchmark_repository, dataset[0])
+
+
+def test_get_total_all_expenses_by_user(benchmark, report_service):
+    benchmark(report_service.get_total_all_expenses_by_user)
+
+
+def test_get_total_by_category_and_user(benchmark, report_service):
+    benchmark(report_service.get_total_by_category_and_user,
+              Category("groceries"))
+
+
+def test_graph_all_expenses(benchmark, report_service):
+    pyplot = pytest.importorskip("matplotlib.pyplot")
+
+    def graph_once():
+        report_service.graph_all_expenses()
+        pyplot.close("all")
+
+    benchmark.pedantic(graph_once, rounds=3)
+
+
+def test_graph_expenses_by_category(benchmark, report_service):
+    pyplot = pytest.importorskip("matplotlib.pyplot")
+
+    def graph_once():
+        report_service.graph_expenses_by_category(Category("groceries"))
+        pyplot.close("all")
+
+    benchmark.pedantic(graph_once, rounds=3)
+
+
+@pytest.mark.parametrize("period", ["day", "month", "year"])
+def test_get_totals_by_period(benchmark, report_service, period):
+    benchmark(report_service.get_totals_by_period, period)
+
+
+def test_get_year_over_year(benchmark, report_service):
+    benchmark(report_service.get_year_over_year)
+
+
+def test_get_totals_by_month_after_late_edit(benchmark, expense_service, report_service):
+    # Each round moves an expense into another year, so four buckets are re-rolled
+    expense = Expense("late edit", 3.5, "2021-01-01", "benchmark")
+    benchmark_repository.add_expense(expense_service.current_user, expense)
+
+    def edit_once():
+        new_date = "2023-01-01" if expense.date == "2021-01-01" else "2021-01-01"
+        expense_service.edit_expense_date(new_date, expense)
+        expense.date = new_date
+        return report_service.get_totals_by_month()
+
+    benchmark(edit_once)
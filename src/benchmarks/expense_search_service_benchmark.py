@@ -0,0 +1,19 @@
+import pytest
+from services.expense_search_service import ExpenseSearchService
+from repositories.expense_search_repository import ExpenseSearchRepository
+
+benchmark_repository = ExpenseSearchRepository()
+
+
+@pytest.fixture(name="search_service")
+def fixture_search_service(dataset):
+    return ExpenseSearchService(benchmark_repository, dataset[0])
+
+
+@pytest.mark.parametrize("query", ["s", "su", "sushi", "train tic", "groc", "nothing"])
+def test_search_expenses(benchmark, search_service, query):
+    benchmark(search_service.search_expenses, query)
+
+
+def test_find_near_duplicates(benchmark, search_service):
+    benchmark.pedantic(search_service.find_near_duplicates, rounds=3)
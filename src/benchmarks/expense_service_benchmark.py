@@ -0,0 +1,187 @@
+import pytest
+from services.expense_service import ExpenseService
+from repositories.expense_repository import ExpenseRepository
+from entities.expense import Expense
+from entities.category import Category
+
+benchmark_repository = ExpenseRepository()
+
+# Number of expenses moved by the category benchmarks, independent of dataset size
+CATEGORY_SIZE = 100
+# Number of expenses in each imported statement
+IMPORT_SIZE = 10000
+# Number of selected expenses edited or deleted at once by the bulk benchmarks
+BULK_SIZE = 1000
+# Number of expenses in the category whose rename is undone
+UNDO_RENAME_SIZE = 50000
+
+
+@pytest.fixture(name="expense_service")
+def fixture_expense_service(dataset):
+    return ExpenseService(benchmark_repository, dataset[0])
+
+
+def _add_temporary_category(expense_service, name):
+    expenses = [Expense(f"temporary {number}", 1.0, "2023-01-01", name)
+                for number in range(CATEGORY_SIZE)]
+    benchmark_repository.add_expenses(expense_service.current_user, expenses)
+
+
+def _add_bulk_selection(expense_service, name):
+    expenses = [Expense(f"selected {number}", 1.0, "2023-01-01", name)
+                for number in range(BULK_SIZE)]
+    benchmark_repository.add_expenses(expense_service.current_user, expenses)
+    return [expense[0] for expense in
+            expense_service.list_expenses_by_category(Category(name), with_ids=True)]
+
+
+def _alternate(*values):
+    state = {"index": 0}
+
+    def next_pair():
+        current = values[state["index"] % len(values)]
+        state["index"] += 1
+        return current, values[state["index"] % len(values)]
+
+    return next_pair
+
+
+def test_create_new_expense(benchmark, expense_service):
+    benchmark(expense_service.create_new_expense,
+              "benchmark expense", 9.99, "2023-02-01", "benchmark")
+
+
+def _benchmark_edit(benchmark, expense_service, edit, expense, attribute, values):
+    next_pair = _alternate(*values)
+    benchmark_repository.add_expense(expense_service.current_user, expense)
+
+    def edit_once():
+        old_value, new_value = next_pair()
+        setattr(expense, attribute, old_value)
+        edit(new_value, expense)
+
+    benchmark(edit_once)
+
+
+def test_edit_expense_name(benchmark, expense_service):
+    expense = Expense("edit name a", 3.5, "2023-02-01", "benchmark")
+    _benchmark_edit(benchmark, expense_service, expense_service.edit_expense_name,
+                    expense, "name", ["edit name a", "edit name b"])
+
+
+def test_edit_expense_amount(benchmark, expense_service):
+    expense = Expense("edit amount", 3.5, "2023-02-01", "benchmark")
+    _benchmark_edit(benchmark, expense_service, expense_service.edit_expense_amount,
+                    expense, "amount", [3.5, 4.5])
+
+
+def test_edit_expense_category(benchmark, expense_service):
+    expense = Expense("edit category", 3.5, "2023-02-01", "benchmark a")
+    _benchmark_edit(benchmark, expense_service, expense_service.edit_expense_category,
+                    expense, "category", ["benchmark a", "benchmark b"])
+
+
+def test_edit_expense_date(benchmark, expense_service):
+    expense = Expense("edit date", 3.5, "2023-02-01", "benchmark")
+    _benchmark_edit(benchmark, expense_service, expense_service.edit_expense_date,
+                    expense, "date", ["2023-02-01", "2023-02-02"])
+
+
+def test_delete_expense(benchmark, expense_service):
+    expense = Expense("to be deleted", 1.0, "2023-02-01", "benchmark")
+
+    def setup():
+        benchmark_repository.add_expense(expense_service.current_user, expense)
+
+    benchmark.pedantic(expense_service.delete_expense, args=(expense,),
+                       setup=setup, rounds=20)
+
+
+def test_edit_expenses_category(benchmark, expense_service):
+    expense_ids = _add_bulk_selection(expense_service, "bulk a")
+    next_pair = _alternate("bulk a", "bulk b")
+
+    def edit_once():
+        _, new_name = next_pair()
+        expense_service.edit_expenses_category(new_name, expense_ids)
+
+    benchmark.pedantic(edit_once, rounds=10)
+
+
+def test_edit_expenses_date(benchmark, expense_service):
+    expense_ids = _add_bulk_selection(expense_service, "bulk date")
+    next_pair = _alternate("2023-01-01", "2023-01-02")
+
+    def edit_once():
+        _, new_date = next_pair()
+        expense_service.edit_expenses_date(new_date, expense_ids)
+
+    benchmark.pedantic(edit_once, rounds=10)
+
+
+def test_delete_expenses(benchmark, expense_service):
+    selection = {}
+
+    def setup():
+        selection["ids"] = _add_bulk_selection(expense_service, "bulk delete")
+
+    benchmark.pedantic(lambda: expense_service.delete_expenses(selection["ids"]),
+                       setup=setup, rounds=5)
+
+
+def test_delete_category(benchmark, expense_service):
+    def setup():
+        _add_temporary_category(expense_service, "temporary")
+
+    benchmark.pedantic(expense_service.delete_category, args=(Category("temporary"),),
+                       setup=setup, rounds=3)
+
+
+def test_rename_category(benchmark, expense_service):
+    _add_temporary_category(expense_service, "rename a")
+    next_pair = _alternate("rename a", "rename b")
+
+    def rename_once():
+        old_name, new_name = next_pair()
+        expense_service.rename_category(new_name, Category(old_name))
+
+    benchmark.pedantic(rename_once, rounds=3)
+
+
+def test_undo_rename_category(benchmark, expense_service):
+    expenses = [Expense(f"undo {number}", 1.0, "2023-01-01", "undo a")
+                for number in range(UNDO_RENAME_SIZE)]
+    benchmark_repository.add_expenses(expense_service.current_user, expenses)
+
+    def setup():
+        expense_service.rename_category("undo b", Category("undo a"))
+
+    # Undoing renames the category back with one update, however many expenses it has
+    benchmark.pedantic(expense_service.undo, setup=setup, rounds=10)
+
+
+def test_undo_delete_expenses(benchmark, expense_service):
+    def setup():
+        expense_service.delete_expenses(_add_bulk_selection(expense_service, "undo delete"))
+
+    benchmark.pedantic(expense_service.undo, setup=setup, rounds=5)
+
+
+def test_list_all_expenses(benchmark, expense_service):
+    benchmark(expense_service.list_all_expenses)
+
+
+def test_list_expenses_by_category(benchmark, expense_service):
+    benchmark(expense_service.list_expenses_by_category, Category("groceries"))
+
+
+def test_list_all_categories(benchmark, expense_service):
+    benchmark(expense_service.list_all_categories)
+
+
+def test_import_overlapping_expenses(benchmark, expense_service):
+    # Every round imports the same statement, so after the first one all are duplicates
+    statement = [(f"import {number}", 10 + number / 100, "2023-03-01", "import")
+                 for number in range(IMPORT_SIZE)]
+
+    benchmark.pedantic(expense_service.import_expenses, args=(statement,), rounds=5)
@@ -0,0 +1,19 @@
+from services.forecast_service import ForecastService
+from repositories.expense_rollup_repository import ExpenseRollupRepository
+
+benchmark_repository = ExpenseRollupRepository()
+
+
+def test_forecast_next_month(benchmark, dataset):
+    def forecast_once():
+        # A new service has an empty cache, so the series are read and forecast again
+        return ForecastService(benchmark_repository, dataset[0]).forecast_next_month("trend")
+
+    benchmark(forecast_once)
+
+
+def test_cached_forecast_next_month(benchmark, dataset):
+    forecast_service = ForecastService(benchmark_repository, dataset[0])
+    forecast_service.forecast_next_month()
+
+    benchmark(forecast_service.forecast_next_month)
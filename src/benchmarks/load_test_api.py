@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import time
+from config import API_HOST, API_PORT
+from api.api_client import ApiClient
+from services.login_service import login_service, UsernameNotUniqueError
+
+# (method, path, body) of the requests each simulated client sends in turn
+REQUEST_MIX = [
+    ("GET", "/expenses?offset=0&limit=50", None),
+    ("POST", "/expenses", {"name": "load test", "amount": 4.2,
+                           "date": "2023-04-01", "category": "load test"}),
+    ("GET", "/expenses/aggregate?by=category", None),
+    ("GET", "/expenses?offset=50&limit=50", None),
+]
+
+
+def percentile(values, fraction):
+    """Returns the value below which the given fraction of the sorted values lie
+    """
+    index = min(len(values) - 1, int(fraction * len(values)))
+    return values[index]
+
+
+async def run_client(host, port, username, password, requests, latencies, errors):
+    client = ApiClient(host, port)
+    await client.connect()
+    await client.login(username, password)
+
+    for number in range(requests):
+        method, path, body = REQUEST_MIX[number % len(REQUEST_MIX)]
+
+        start = time.perf_counter()
+        status, _ = await client.request(method, path, body)
+        latencies.append(time.perf_counter() - start)
+
+        if status >= 400:
+            errors.append(status)
+
+    await client.close()
+
+
+async def load_test(host, port, username, password, clients, requests):
+    latencies = []
+    errors = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, username, password, requests,
+                                      latencies, errors) for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies)} requests from {clients} clients in {elapsed:.2f} s")
+    print(f"throughput: {len(latencies) / elapsed:.1f} requests/s")
+    print(f"latency p50: {1000 * percentile(latencies, 0.50):.2f} ms")
+    print(f"latency p99: {1000 * percentile(latencies, 0.99):.2f} ms")
+    print(f"errors: {len(errors)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test for a running expense tracker API server")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--username", default="load_test_user")
+    parser.add_argument("--password", default="load_test1!")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200,
+                        help="number of requests sent by each client")
+    args = parser.parse_args()
+
+    try:
+        login_service.create_new_user(args.username, args.password)
+    except UsernameNotUniqueError:
+        pass
+
+    asyncio.run(load_test(args.host, args.port, args.username, args.password,
+                          args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main()
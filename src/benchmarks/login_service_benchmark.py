@@ -0,0 +1,71 @@
+import pytest
+from services.login_service import LoginService, TooManyAttemptsError
+from services.rate_limiter import RateLimiter
+from repositories.user_repository import UserRepository
+
+benchmark_repository = UserRepository()
+
+pytestmark = pytest.mark.usefixtures("dataset")
+
+
+@pytest.fixture(name="login_service")
+def fixture_login_service():
+    return LoginService(benchmark_repository)
+
+
+def test_create_new_user(benchmark, login_service):
+    counter = {"value": 0}
+
+    def create_once():
+        counter["value"] += 1
+        login_service.create_new_user(
+            f"new_benchmark_user_{counter['value']}", "benchmark123!")
+
+    benchmark(create_once)
+
+    for number in range(1, counter["value"] + 1):
+        benchmark_repository.delete_user(f"new_benchmark_user_{number}")
+
+
+def test_validate_credentials(benchmark, login_service, dataset):
+    benchmark(login_service.validate_credentials,
+              dataset[0].username, dataset[0].password)
+
+
+def test_authenticate_user(benchmark, login_service, dataset):
+    benchmark(login_service.authenticate_user,
+              dataset[0].username, dataset[0].password)
+
+
+def test_start_session(benchmark, login_service, dataset):
+    benchmark(login_service.start_session,
+              dataset[0].username, dataset[0].password)
+
+
+def test_find_session(benchmark, login_service, dataset):
+    session = login_service.start_session(
+        dataset[0].username, dataset[0].password)
+
+    benchmark(login_service.find_session, session.session_id)
+
+
+def test_end_session(benchmark, login_service, dataset):
+    session = login_service.start_session(
+        dataset[0].username, dataset[0].password)
+
+    benchmark(login_service.end_session, session)
+
+
+def test_rejected_login_attempt(benchmark, dataset):
+    rate_limited_service = LoginService(
+        benchmark_repository, username_rate_limiter=RateLimiter(1, 3600, 100000))
+    username = dataset[0].username
+    rate_limited_service.username_rate_limiter.acquire(username)
+
+    def attempt_once():
+        try:
+            rate_limited_service.validate_credentials(username, "wrong password")
+        except TooManyAttemptsError:
+            pass
+
+    benchmark(attempt_once)
@@ -0,0 +1,19 @@
+import pytest
+from services.password_hasher import PasswordHasher
+
+
+@pytest.fixture(name="password_hasher")
+def fixture_password_hasher():
+    return PasswordHasher()
+
+
+def test_hash_password(benchmark, password_hasher):
+    benchmark.pedantic(password_hasher.hash_password,
+                       args=("benchmark123!",), rounds=5)
+
+
+def test_verify_password(benchmark, password_hasher):
+    password_hash = password_hasher.hash_password("benchmark123!")
+
+    benchmark.pedantic(password_hasher.verify_password,
+                       args=("benchmark123!", password_hash), rounds=5)
@@ -0,0 +1,20 @@
+import random
+import string
+import pytest
+from services.password_policy import PasswordPolicy
+
+IMPORTED_ACCOUNT_COUNT = 100000
+
+
+@pytest.fixture(name="passwords", scope="module")
+def fixture_passwords():
+    generator = random.Random(0)
+    characters = string.ascii_letters + string.digits + string.punctuation
+    return ["".join(generator.choices(characters, k=generator.randint(6, 16)))
+            for _ in range(IMPORTED_ACCOUNT_COUNT)]
+
+
+def test_validate_imported_passwords(benchmark, passwords):
+    policy = PasswordPolicy()
+
+    benchmark(lambda: [policy.is_valid(password) for password in passwords])
@@ -0,0 +1,38 @@
+from datetime import date
+from services.recurring_expense_service import RecurringExpenseService, RecurringExpenseScheduler
+from repositories.recurring_expense_repository import RecurringExpenseRepository
+from entities.expense import Expense
+
+benchmark_repository = RecurringExpenseRepository()
+
+# Number of rules in the catch-up benchmark, each with a month of missed daily occurrences
+RULE_COUNT = 100
+
+
+def test_run_due_without_due_rules(benchmark, dataset):
+    benchmark_repository.delete_all_rules()
+    service = RecurringExpenseService(benchmark_repository, dataset[0])
+    for number in range(RULE_COUNT):
+        service.create_rule(
+            Expense(f"subscription {number}", 9.99, "2023-05-01"), "monthly")
+    scheduler = RecurringExpenseScheduler(benchmark_repository, lambda: date(2023, 4, 15))
+
+    benchmark(scheduler.run_due)
+    benchmark_repository.delete_all_rules()
+
+
+def test_catch_up_missed_occurrences(benchmark, dataset):
+    service = RecurringExpenseService(benchmark_repository, dataset[0])
+    scheduler = RecurringExpenseScheduler(benchmark_repository, lambda: date(2023, 4, 30))
+
+    def create_rules():
+        benchmark_repository.delete_all_rules()
+        for number in range(RULE_COUNT):
+            service.create_rule(
+                Expense(f"coffee {number}", 3.5, "2023-04-01", "dining"), "daily")
+
+    count = benchmark.pedantic(scheduler.run_due, setup=create_rules, rounds=3)
+    benchmark_repository.delete_all_rules()
+
+    benchmark.extra_info["expenses"] = count
+    benchmark.extra_info["expenses_per_second"] = round(count / benchmark.stats.stats.mean)
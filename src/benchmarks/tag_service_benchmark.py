@@ -0,0 +1,56 @@
+import pytest
+from services.tag_service import TagService
+from services.expense_exporter import ExpenseExporter
+from repositories.tag_repository import TagRepository
+from repositories.expense_repository import ExpenseRepository
+
+benchmark_tag_repository = TagRepository()
+benchmark_expense_repository = ExpenseRepository()
+
+# Number of expenses tagged or untagged at once
+BULK_SIZE = 1000
+
+
+@pytest.fixture(name="tagged", scope="module")
+def fixture_tagged(dataset):
+    """Tags every fifth expense of the first user with travel and every tenth with work
+
+    Returns:
+        Tuple of the TagService of the user and the ids of the user's expenses
+    """
+    user = dataset[0]
+    changes, _ = ExpenseExporter(benchmark_expense_repository, user).get_changes(
+        0, 10 ** 9)
+    expense_ids = [expense_id for _, _, expense_id, *_ in changes]
+
+    tag_service = TagService(benchmark_tag_repository, user)
+    tag_service.tag_expenses(expense_ids[::5], ["travel"])
+    tag_service.tag_expenses(expense_ids[::10], ["work"])
+
+    return tag_service, expense_ids
+
+
+def test_list_expenses_with_all_tags(benchmark, tagged):
+    tag_service, _ = tagged
+    benchmark(tag_service.list_expenses_with_tags, ["travel", "work"], "all")
+
+
+def test_list_expenses_with_any_tag(benchmark, tagged):
+    tag_service, _ = tagged
+    benchmark(tag_service.list_expenses_with_tags, ["travel", "work"], "any")
+
+
+def test_totals_by_tag(benchmark, tagged):
+    tag_service, _ = tagged
+    benchmark(tag_service.get_totals_by_tag)
+
+
+def test_tag_and_untag_in_bulk(benchmark, tagged):
+    tag_service, expense_ids = tagged
+    bulk = expense_ids[:BULK_SIZE]
+
+    def tag_and_untag_once():
+        tag_service.tag_expenses(bulk, ["bulk"])
+        return tag_service.untag_expenses(bulk, ["bulk"])
+
+    benchmark(tag_and_untag_once)
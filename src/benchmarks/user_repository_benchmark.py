@@ -0,0 +1,35 @@
+from database_connection import connect_to_database
+from repositories.user_repository import UserRepository
+from entities.user import User
+
+ONBOARDING_USER_COUNT = 10000
+
+benchmark_repository = UserRepository()
+
+
+def test_add_users(benchmark, dataset):
+    # Passwords are not hashed here, so that only the database work is measured
+    password_hash = dataset[0].password
+    rounds = {"value": 0}
+
+    def setup():
+        rounds["value"] += 1
+        users = [User(f"onboarded_{rounds['value']}_{number}", password_hash)
+                 for number in range(ONBOARDING_USER_COUNT)]
+        return (users,), {}
+
+    benchmark.pedantic(benchmark_repository.add_users, setup=setup, rounds=5)
+
+    connection = connect_to_database()
+    connection.execute("delete from users where username like 'onboarded_%'")
+    connection.commit()
+
+
+def test_find_user_uncached(benchmark, dataset):
+    uncached_repository = UserRepository(cache_size=0)
+
+    benchmark(uncached_repository.find_user, dataset[0].username)
+
+
+def test_find_user_cached(benchmark, dataset):
+    benchmark(benchmark_repository.find_user, dataset[0].username)
@@ -0,0 +1,14 @@
+import sys
+from database_initialization import initialize_database
+from services.recurring_expense_service import recurring_expense_scheduler
+from cli.command_line_interface import CommandLineInterface
+
+
+def main():
+    initialize_database()
+    recurring_expense_scheduler.run_due()
+    return CommandLineInterface().run(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,671 @@
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from itertools import islice
+from config import ADMIN_USERNAMES
+from repositories.expense_repository import ExpenseRepository
+from repositories.expense_rollup_repository import ExpenseRollupRepository
+from repositories.expense_search_repository import ExpenseSearchRepository
+from repositories.category_repository import CategoryRepository
+from repositories.recurring_expense_repository import RecurringExpenseRepository
+from repositories.tag_repository import TagRepository
+from repositories.category_rule_repository import CategoryRuleRepository
+from repositories.operation_journal_repository import OperationJournalRepository
+from services.expense_service import ExpenseService, InvalidInputError
+from services.expense_report_service import ExpenseReportService, PERIODS
+from services.expense_search_service import ExpenseSearchService
+from services.recurring_expense_service import (RecurringExpenseService,
+                                                RecurringExpenseScheduler, FREQUENCIES)
+from services.forecast_service import ForecastService, FORECAST_METHODS
+from services.anomaly_service import AnomalyService, ANOMALY_METHODS
+from services.tag_service import TagService, TAG_MATCHES
+from services.category_rule_service import CategoryRuleService
+from services.operation_journal import OperationJournal
+from services.currency_converter import (currency_converter as default_currency_converter,
+                                         InvalidExchangeRateError, MissingExchangeRateError)
+from services.expense_exporter import (ExpenseExporter, BINARY_FORMATS, TEXT_FORMATS,
+                                       ExportFormatUnavailableError)
+from services.login_service import (login_service as default_login_service,
+                                    InvalidCredentialsError, TooManyAttemptsError)
+from entities.category import Category
+from entities.expense import Expense
+
+IMPORT_BATCH_SIZE = 1000
+CHANGES_PAGE_SIZE = 1000
+COLUMN_NAMES = ["name", "amount", "date", "category"]
+# The columns every imported CSV file must have, the others are optional
+IMPORT_COLUMNS = ["name", "amount"]
+RATE_COLUMNS = ["currency", "date", "rate"]
+
+
+class CommandLineInterface:
+    """This class manages the headless command line interface of the application,
+    which offers batch operations on the expenses of a user without a display
+    """
+
+    def __init__(self, login_service=default_login_service, expense_repository=None,
+                 output=None, error_output=None,
+                 currency_converter=default_currency_converter,
+                 admin_usernames=None):
+        """Class constructor
+
+        Args:
+            login_service (LoginService object, optional): Used to log the user in
+            expense_repository (ExpenseRepository object, optional): Handles database
+                                                            operations on expenses
+            output (file object, optional): Where results are written. Defaults to stdout.
+            error_output (file object, optional): Where messages are written.
+                                                    Defaults to stderr.
+            currency_converter (CurrencyConverter object, optional): Converts amounts in
+                                        other currencies into the base currency
+            admin_usernames (list of str, optional): Users who may import exchange
+                                        rates. Defaults to ADMIN_USERNAMES.
+        """
+        self._login_service = login_service
+        self._expense_repository = expense_repository or ExpenseRepository()
+        self._output = output or sys.stdout
+        self._error_output = error_output or sys.stderr
+        self._currency_converter = currency_converter
+        self._admin_usernames = ADMIN_USERNAMES if admin_usernames is None \
+            else admin_usernames
+        self._parser = self._create_parser()
+
+    def run(self, arguments):
+        """Parses the given command line arguments and runs the chosen command
+
+        Args:
+            arguments (list of str): The command line arguments, without the program name
+
+        Returns:
+            The exit code of the command, 0 on success
+        """
+        args = self._parser.parse_args(arguments)
+
+        try:
+            return args.handler(self._create_expense_service(args), args)
+
+        except InvalidCredentialsError:
+            self._display_error_message("Invalid credentials")
+        except TooManyAttemptsError as error:
+            self._display_error_message("Too many failed login attempts, "
+                                        f"try again in {math.ceil(error.retry_after)} seconds")
+        except InvalidInputError:
+            self._display_error_message(
+                "Invalid input. Make sure you have entered a nonnegative numeric amount "
+                "and a valid date in YYYY-MM-DD format")
+        except (ExportFormatUnavailableError, MissingExchangeRateError,
+                InvalidExchangeRateError) as error:
+            self._display_error_message(str(error))
+        except BrokenPipeError:
+            self._discard_output()
+        except OSError as error:
+            # E.g. a file to import does not exist
+            self._display_error_message(f"{error.strerror}: {error.filename}")
+        return 1
+
+    def _discard_output(self):
+        # The reading end of a pipe, e.g. head, was closed before all output was written
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+    def _create_expense_service(self, args):
+        username = args.username or os.getenv("EXPENSE_TRACKER_USERNAME")
+        password = args.password or os.getenv("EXPENSE_TRACKER_PASSWORD")
+
+        user = self._login_service.authenticate_user(username, password)
+        # Each command runs in its own process, so the undo history is kept in database
+        operation_journal = OperationJournal(
+            user, operation_journal_repository=OperationJournalRepository())
+        return ExpenseService(
+            self._expense_repository, user, self._currency_converter, operation_journal)
+
+    def _create_parser(self):
+        parser = argparse.ArgumentParser(
+            prog="expense-tracker", description="Batch operations on expenses")
+        parser.add_argument(
+            "--username", help="defaults to $EXPENSE_TRACKER_USERNAME")
+        parser.add_argument(
+            "--password", help="defaults to $EXPENSE_TRACKER_PASSWORD")
+
+        commands = parser.add_subparsers(dest="command", required=True)
+
+        for add_command in [self._add_add_command, self._add_import_command,
+                            self._add_import_rates_command, self._add_duplicates_command,
+                            self._add_add_recurring_command,
+                            self._add_list_recurring_command,
+                            self._add_delete_recurring_command, self._add_add_rule_command,
+                            self._add_list_rules_command, self._add_delete_rule_command,
+                            self._add_apply_rules_command, self._add_tag_command,
+                            self._add_untag_command, self._add_tag_totals_command,
+                            self._add_list_command, self._add_aggregate_command,
+                            self._add_year_over_year_command, self._add_forecast_command,
+                            self._add_anomalies_command, self._add_rename_category_command,
+                            self._add_undo_command, self._add_redo_command,
+                            self._add_changes_command, self._add_export_command]:
+            add_command(commands)
+
+        return parser
+
+    def _add_add_command(self, commands):
+        add = commands.add_parser("add", help="create a new expense")
+        add.add_argument("name")
+        add.add_argument("amount")
+        add.add_argument("--date", help="YYYY-MM-DD, defaults to today")
+        add.add_argument("--category", default="undefined")
+        add.add_argument("--currency", help="currency code, defaults to the base currency")
+        add.set_defaults(handler=self._add)
+
+    def _add_import_command(self, commands):
+        bulk_import = commands.add_parser(
+            "import", help="create expenses from a CSV file with columns "
+            "name, amount, date, category and optionally currency, "
+            "skipping expenses that exist already")
+        bulk_import.add_argument("file", help="path of the CSV file, or - for stdin")
+        bulk_import.add_argument(
+            "--keep-duplicates", action="store_true",
+            help="also create expenses with the same name, amount and date as existing ones")
+        bulk_import.add_argument(
+            "--no-rules", action="store_true",
+            help="do not categorise expenses without a category with the rules")
+        bulk_import.set_defaults(handler=self._import)
+
+    def _add_import_rates_command(self, commands):
+        import_rates = commands.add_parser(
+            "import-rates", help="import exchange rates from a CSV file with columns "
+            "currency, date and rate, the value of one unit in the base currency. "
+            "The rates are shared by all users, and the expenses of every user in "
+            "the imported currencies are converted again, so only the users listed "
+            "in ADMIN_USERNAMES may import them")
+        import_rates.add_argument("file", help="path of the CSV file, or - for stdin")
+        import_rates.set_defaults(handler=self._import_rates)
+
+    def _add_duplicates_command(self, commands):
+        duplicates = commands.add_parser(
+            "duplicates", help="list pairs of expenses with the same amount "
+            "that are only a few days apart")
+        duplicates.add_argument("--days", type=int, default=3)
+        duplicates.set_defaults(handler=self._duplicates)
+
+    def _add_add_recurring_command(self, commands):
+        add_recurring = commands.add_parser(
+            "add-recurring", help="create a rule for an expense that repeats, e.g. rent, "
+            "and create its expenses that are due")
+        add_recurring.add_argument("name")
+        add_recurring.add_argument("amount")
+        add_recurring.add_argument("--frequency", choices=FREQUENCIES, default="monthly")
+        add_recurring.add_argument(
+            "--every", type=int, default=1, help="number of days, weeks, months or years "
+            "between the expenses, defaults to 1")
+        add_recurring.add_argument("--start", help="date of the first expense, defaults to today")
+        add_recurring.add_argument("--end", help="last possible date of an expense")
+        add_recurring.add_argument("--category", default="undefined")
+        add_recurring.set_defaults(handler=self._add_recurring)
+
+    def _add_list_recurring_command(self, commands):
+        list_recurring = commands.add_parser(
+            "list-recurring", help="list the rules of repeating expenses")
+        list_recurring.set_defaults(handler=self._list_recurring)
+
+    def _add_delete_recurring_command(self, commands):
+        delete_recurring = commands.add_parser(
+            "delete-recurring", help="delete a rule of repeating expenses, "
+            "keeping the expenses it has created")
+        delete_recurring.add_argument("id", type=int)
+        delete_recurring.set_defaults(handler=self._delete_recurring)
+
+    def _add_add_rule_command(self, commands):
+        add_rule = commands.add_parser(
+            "add-rule", help="create a rule that categorises imported and undefined "
+            "expenses by name and amount, tried after the existing rules")
+        add_rule.add_argument("category")
+        name_match = add_rule.add_mutually_exclusive_group()
+        name_match.add_argument("--contains", help="text in the name, in any case")
+        name_match.add_argument("--regex", help="regular expression found in the name")
+        add_rule.add_argument("--min", help="smallest matching amount")
+        add_rule.add_argument("--max", help="largest matching amount")
+        add_rule.set_defaults(handler=self._add_rule)
+
+    def _add_list_rules_command(self, commands):
+        list_rules = commands.add_parser(
+            "list-rules", help="list the categorisation rules in the order they are tried")
+        list_rules.set_defaults(handler=self._list_rules)
+
+    def _add_delete_rule_command(self, commands):
+        delete_rule = commands.add_parser(
+            "delete-rule", help="delete a categorisation rule")
+        delete_rule.add_argument("id", type=int)
+        delete_rule.set_defaults(handler=self._delete_rule)
+
+    def _add_apply_rules_command(self, commands):
+        apply_rules = commands.add_parser(
+            "apply-rules", help="categorise the undefined expenses with the rules")
+        apply_rules.set_defaults(handler=self._apply_rules)
+
+    def _add_tag_command(self, commands):
+        tag = commands.add_parser(
+            "tag", help="attach tags to expenses, by the ids listed by list --ids")
+        tag.add_argument("ids", nargs="+", type=int)
+        tag.add_argument("--tag", action="append", required=True, dest="tags",
+                         help="name of a tag, may be given several times")
+        tag.set_defaults(handler=self._tag)
+
+    def _add_untag_command(self, commands):
+        untag = commands.add_parser("untag", help="detach tags from expenses")
+        untag.add_argument("ids", nargs="+", type=int)
+        untag.add_argument("--tag", action="append", required=True, dest="tags",
+                           help="name of a tag, may be given several times")
+        untag.set_defaults(handler=self._untag)
+
+    def _add_tag_totals_command(self, commands):
+        tag_totals = commands.add_parser(
+            "tag-totals", help="total amount and number of expenses with each tag")
+        tag_totals.set_defaults(handler=self._tag_totals)
+
+    def _add_list_command(self, commands):
+        listing = commands.add_parser("list", help="list expenses")
+        listing.add_argument("--category")
+        listing.add_argument("--tag", action="append", dest="tags",
+                             help="only list expenses with this tag, may be given several times")
+        listing.add_argument("--match", choices=TAG_MATCHES, default="all",
+                             help="whether expenses must have all or any of the tags")
+        listing.add_argument("--ids", action="store_true",
+                             help="start each expense with its id, as taken by tag and untag")
+        listing.add_argument(
+            "--format", choices=["tsv", "csv", "jsonl"], default="tsv")
+        listing.set_defaults(handler=self._list)
+
+    def _add_aggregate_command(self, commands):
+        aggregate = commands.add_parser(
+            "aggregate", help="total amount of expenses by category, day, month or year")
+        aggregate.add_argument(
+            "--by", choices=["category"] + PERIODS, default="category")
+        aggregate.set_defaults(handler=self._aggregate)
+
+    def _add_year_over_year_command(self, commands):
+        year_over_year = commands.add_parser(
+            "year-over-year", help="monthly totals of expenses, one line per year")
+        year_over_year.add_argument("--category")
+        year_over_year.set_defaults(handler=self._year_over_year)
+
+    def _add_forecast_command(self, commands):
+        forecast = commands.add_parser(
+            "forecast", help="projected total of expenses in each category next month")
+        forecast.add_argument("--method", choices=FORECAST_METHODS, default="smoothing")
+        forecast.set_defaults(handler=self._forecast)
+
+    def _add_anomalies_command(self, commands):
+        anomalies = commands.add_parser(
+            "anomalies", help="list expenses with unusual amounts for their category")
+        anomalies.add_argument("--method", choices=ANOMALY_METHODS, default="zscore",
+                               help="robust z-scores or interquartile ranges")
+        anomalies.set_defaults(handler=self._anomalies)
+
+    def _add_rename_category_command(self, commands):
+        rename = commands.add_parser(
+            "rename-category", help="rename a category")
+        rename.add_argument("old_name")
+        rename.add_argument("new_name")
+        rename.set_defaults(handler=self._rename_category)
+
+    def _add_undo_command(self, commands):
+        undo = commands.add_parser(
+            "undo", help="undo the latest edit, e.g. a category rename")
+        undo.set_defaults(handler=self._undo)
+
+    def _add_redo_command(self, commands):
+        redo = commands.add_parser("redo", help="redo the latest undone edit")
+        redo.set_defaults(handler=self._redo)
+
+    def _add_changes_command(self, commands):
+        changes = commands.add_parser(
+            "changes", help="list expenses added, changed or deleted after a sequence "
+            "number of the change journal, as JSON Lines")
+        changes.add_argument(
+            "--since", type=int, default=0,
+            help="the last sequence number already seen, defaults to 0 for all expenses")
+        changes.set_defaults(handler=self._changes)
+
+    def _add_export_command(self, commands):
+        export = commands.add_parser("export", help="export all expenses")
+        export.add_argument(
+            "--format", choices=TEXT_FORMATS + BINARY_FORMATS, default="csv",
+            help="npz and parquet are columnar, parquet requires pyarrow")
+        export.add_argument("--output", help="path of the output file, defaults to stdout")
+        export.set_defaults(handler=self._export)
+
+    def _add(self, expense_service, args):
+        expense_service.create_new_expense(
+            args.name, args.amount, args.date, args.category, args.currency)
+        return 0
+
+    def _add_recurring(self, expense_service, args):
+        recurring_expense_repository = RecurringExpenseRepository()
+        recurring_expense_service = RecurringExpenseService(
+            recurring_expense_repository, expense_service.current_user)
+        rule_id = recurring_expense_service.create_rule(
+            Expense(args.name, args.amount, args.start, args.category),
+            args.frequency, args.every, args.end)
+
+        created = RecurringExpenseScheduler(recurring_expense_repository).run_due(
+            expense_service.current_user)
+        self._error_output.write(
+            f"Created recurring expense {rule_id} and {created} expenses that were due\n")
+        return 0
+
+    def _list_recurring(self, expense_service, _args):
+        recurring_expense_service = RecurringExpenseService(
+            RecurringExpenseRepository(), expense_service.current_user)
+        writer = csv.writer(self._output, delimiter="\t", lineterminator="\n")
+
+        for rule in recurring_expense_service.list_rules():
+            writer.writerow(["" if value is None else value for value in rule])
+        return 0
+
+    def _delete_recurring(self, expense_service, args):
+        recurring_expense_service = RecurringExpenseService(
+            RecurringExpenseRepository(), expense_service.current_user)
+
+        if not recurring_expense_service.delete_rule(args.id):
+            self._display_error_message(f"You do not have a recurring expense {args.id}")
+            return 1
+        return 0
+
+    def _import(self, expense_service, args):
+        if args.file == "-":
+            return self._import_from(expense_service, sys.stdin, args.keep_duplicates,
+                                     not args.no_rules)
+
+        with open(args.file, newline="", encoding="utf-8") as file:
+            return self._import_from(expense_service, file, args.keep_duplicates,
+                                     not args.no_rules)
+
+    def _import_from(self, expense_service, file, keep_duplicates=False, apply_rules=False):
+        rows = csv.DictReader(file)
+        missing = self._missing_columns(rows, IMPORT_COLUMNS)
+        if missing:
+            self._display_error_message(f"The file has no {' or '.join(missing)} column")
+            return 1
+
+        imported = 0
+        skipped = 0
+        # The rules are compiled once and kept for all batches
+        category_rule_service = CategoryRuleService(
+            CategoryRuleRepository(), CategoryRepository(),
+            expense_service.current_user) if apply_rules else None
+
+        while True:
+            try:
+                batch, lines = self._read_import_batch(rows)
+                if not batch:
+                    break
+                if category_rule_service:
+                    batch = category_rule_service.categorize_expenses(batch)
+                created = self._create_imported_expenses(
+                    expense_service, batch, keep_duplicates, lines)
+            except InvalidInputError as error:
+                self._display_error_message(
+                    f"{error}, {imported} expenses were imported before it")
+                return 1
+
+            imported += created
+            skipped += len(batch) - created
+
+        self._error_output.write(
+            f"Imported {imported} expenses, skipped {skipped} duplicates\n")
+        return 0
+
+    def _missing_columns(self, rows, columns):
+        return [column for column in columns if column not in (rows.fieldnames or [])]
+
+    def _read_import_batch(self, rows):
+        first_line = rows.line_num + 1
+        batch = []
+        for row in islice(rows, IMPORT_BATCH_SIZE):
+            # A short row has no value for its last columns
+            if row["amount"] is None:
+                raise InvalidInputError(f"Line {rows.line_num} has too few columns")
+            batch.append((row["name"], row["amount"], row.get("date"), row.get("category"),
+                          row.get("currency")))
+        return batch, (first_line, rows.line_num)
+
+    def _create_imported_expenses(self, expense_service, batch, keep_duplicates, lines):
+        try:
+            if keep_duplicates:
+                return expense_service.create_new_expenses(batch)
+            return expense_service.import_expenses(batch)
+        except InvalidInputError as error:
+            raise InvalidInputError(
+                f"Invalid expense within lines {lines[0]}-{lines[1]}") from error
+
+    def _add_rule(self, expense_service, args):
+        category_rule_service = CategoryRuleService(
+            CategoryRuleRepository(), CategoryRepository(),
+            expense_service.current_user)
+        try:
+            rule_id = category_rule_service.create_rule(
+                args.category, args.regex if args.regex is not None else args.contains,
+                "regex" if args.regex is not None else "contains", args.min, args.max)
+        except InvalidInputError as error:
+            self._display_error_message(str(error))
+            return 1
+
+        self._error_output.write(f"Created categorisation rule {rule_id}\n")
+        return 0
+
+    def _list_rules(self, expense_service, _args):
+        category_rule_service = CategoryRuleService(
+            CategoryRuleRepository(), CategoryRepository(),
+            expense_service.current_user)
+        writer = csv.writer(self._output, delimiter="\t", lineterminator="\n")
+
+        for rule in category_rule_service.list_rules():
+            writer.writerow(["" if value is None else value for value in rule])
+        return 0
+
+    def _delete_rule(self, expense_service, args):
+        category_rule_service = CategoryRuleService(
+            CategoryRuleRepository(), CategoryRepository(),
+            expense_service.current_user)
+
+        if not category_rule_service.delete_rule(args.id):
+            self._display_error_message(f"You do not have a categorisation rule {args.id}")
+            return 1
+        return 0
+
+    def _apply_rules(self, expense_service, _args):
+        category_rule_service = CategoryRuleService(
+            CategoryRuleRepository(), CategoryRepository(),
+            expense_service.current_user)
+        categorized = category_rule_service.apply_to_undefined()
+
+        self._error_output.write(f"Categorised {categorized} undefined expenses\n")
+        return 0
+
+    def _import_rates(self, expense_service, args):
+        if expense_service.current_user.username not in self._admin_usernames:
+            self._display_error_message(
+                "Only the users in ADMIN_USERNAMES may import exchange rates")
+            return 1
+
+        if args.file == "-":
+            rows = csv.DictReader(sys.stdin)
+            missing, rows = self._missing_columns(rows, RATE_COLUMNS), list(rows)
+        else:
+            with open(args.file, newline="", encoding="utf-8") as file:
+                rows = csv.DictReader(file)
+                missing, rows = self._missing_columns(rows, RATE_COLUMNS), list(rows)
+        if missing:
+            self._display_error_message(f"The file has no {' or '.join(missing)} column")
+            return 1
+
+        imported, converted = self._currency_converter.import_rates(
+            (row["currency"], row["date"], row["rate"]) for row in rows)
+        self._error_output.write(
+            f"Imported {imported} exchange rates, converted {converted} expenses again\n")
+        return 0
+
+    def _list(self, expense_service, args):
+        category = Category(args.category) if args.category else None
+
+        if args.tags:
+            tag_service = TagService(TagRepository(), expense_service.current_user)
+            expenses = tag_service.list_expense_ids_with_tags(args.tags, args.match, category)
+            if not args.ids:
+                expenses = (expense[1:] for expense in expenses)
+        else:
+            exporter = ExpenseExporter(self._expense_repository, expense_service.current_user)
+            expenses = exporter.iterate_expenses(category, args.ids)
+
+        columns = ["id"] + COLUMN_NAMES if args.ids else COLUMN_NAMES
+        self._write_rows(expenses, args.format, self._output, columns)
+        return 0
+
+    def _tag(self, expense_service, args):
+        tag_service = TagService(TagRepository(), expense_service.current_user)
+        tagged = tag_service.tag_expenses(args.ids, args.tags)
+        self._error_output.write(f"Attached {tagged} tags to expenses\n")
+        return 0
+
+    def _untag(self, expense_service, args):
+        tag_service = TagService(TagRepository(), expense_service.current_user)
+        untagged = tag_service.untag_expenses(args.ids, args.tags)
+        self._error_output.write(f"Detached {untagged} tags from expenses\n")
+        return 0
+
+    def _tag_totals(self, expense_service, _args):
+        tag_service = TagService(TagRepository(), expense_service.current_user)
+
+        for tag_name, total, count in tag_service.get_totals_by_tag():
+            self._output.write(f"{tag_name}\t{round(total, 2)}\t{count}\n")
+        return 0
+
+    def _aggregate(self, expense_service, args):
+        report_service = ExpenseReportService(
+            self._expense_repository, expense_service.current_user)
+        if args.by in PERIODS:
+            totals = report_service.get_totals_by_period(args.by)
+        else:
+            totals = report_service.get_totals_by_category()
+
+        for key, total in totals:
+            self._output.write(f"{key}\t{round(total, 2)}\n")
+        return 0
+
+    def _year_over_year(self, expense_service, args):
+        category = Category(args.category) if args.category else None
+        report_service = ExpenseReportService(
+            self._expense_repository, expense_service.current_user)
+
+        for year, totals in report_service.get_year_over_year(category):
+            self._output.write("\t".join([year] + [str(round(total, 2)) for total in totals])
+                               + "\n")
+        return 0
+
+    def _forecast(self, expense_service, args):
+        forecast_service = ForecastService(
+            ExpenseRollupRepository(), expense_service.current_user)
+        month, forecasts = forecast_service.forecast_next_month(args.method)
+
+        for category, total in forecasts:
+            self._output.write(f"{month}\t{category}\t{round(total, 2)}\n")
+        return 0
+
+    def _anomalies(self, expense_service, args):
+        anomaly_service = AnomalyService(
+            self._expense_repository, expense_service.current_user, args.method)
+        self._write_rows(anomaly_service.find_anomalies(), "tsv", self._output)
+        return 0
+
+    def _duplicates(self, expense_service, args):
+        search_service = ExpenseSearchService(
+            ExpenseSearchRepository(), expense_service.current_user)
+        writer = csv.writer(self._output, delimiter="\t", lineterminator="\n")
+
+        for first, second in search_service.find_near_duplicates(args.days):
+            writer.writerow(first + second)
+        return 0
+
+    def _rename_category(self, expense_service, args):
+        renamed = expense_service.rename_category(
+            args.new_name, Category(args.old_name))
+
+        if not renamed:
+            self._display_error_message(
+                f"You do not have any expenses in the {args.old_name} category")
+            return 1
+        return 0
+
+    def _undo(self, expense_service, _args):
+        description = expense_service.undo()
+
+        if description is None:
+            self._display_error_message("There is nothing to undo")
+            return 1
+        self._error_output.write(f"Undid {description}\n")
+        return 0
+
+    def _redo(self, expense_service, _args):
+        description = expense_service.redo()
+
+        if description is None:
+            self._display_error_message("There is nothing to redo")
+            return 1
+        self._error_output.write(f"Redid {description}\n")
+        return 0
+
+    def _changes(self, expense_service, args):
+        exporter = ExpenseExporter(self._expense_repository, expense_service.current_user)
+        since = args.since
+
+        while True:
+            changes, since = exporter.get_changes(since, CHANGES_PAGE_SIZE)
+            for seq, operation, expense_id, *expense in changes:
+                change = {"seq": seq, "operation": operation, "id": expense_id}
+                if operation != "delete":
+                    change.update(zip(COLUMN_NAMES, expense))
+                self._output.write(json.dumps(change) + "\n")
+
+            if len(changes) < CHANGES_PAGE_SIZE:
+                break
+
+        self._error_output.write(f"Changes listed up to sequence number {since}\n")
+        return 0
+
+    def _export(self, expense_service, args):
+        exporter = ExpenseExporter(self._expense_repository, expense_service.current_user)
+        binary = args.format in BINARY_FORMATS
+
+        if not args.output:
+            output = self._output.buffer if binary else self._output
+            exporter.export(args.format, output)
+            return 0
+
+        if binary:
+            with open(args.output, "wb") as file:
+                exporter.export(args.format, file)
+        else:
+            with open(args.output, "w", newline="", encoding="utf-8") as file:
+                exporter.export(args.format, file)
+        return 0
+
+    def _write_rows(self, rows, output_format, file, columns=None):
+        columns = columns or COLUMN_NAMES
+        if output_format == "jsonl":
+            for row in rows:
+                file.write(json.dumps(dict(zip(columns, row))) + "\n")
+            return
+
+        if output_format == "csv":
+            writer = csv.writer(file)
+            writer.writerow(columns)
+        else:
+            writer = csv.writer(file, delimiter="\t", lineterminator="\n")
+
+        for row in rows:
+            writer.writerow(row)
+
+    def _display_error_message(self, message):
+        self._error_output.write(f"Error: {message}\n")
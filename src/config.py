@@ -9,3 +9,50 @@ except FileNotFoundError:
 
 DATABASE_FILE = os.getenv("DATABASE_FILE") or "database.sqlite"
 DATABASE_FILE_PATH = os.path.join(dirname, "..", "data", DATABASE_FILE)
+
+PROFILE = (os.getenv("PROFILE") or "").lower() in ("1", "true", "yes")
+PROFILE_DIRECTORY = os.path.join(dirname, "..", "data", "profiles")
+
+API_HOST = os.getenv("API_HOST") or "127.0.0.1"
+API_PORT = int(os.getenv("API_PORT") or 8080)
+API_DATABASE_WORKERS = int(os.getenv("API_DATABASE_WORKERS") or 1)
+API_MAX_PENDING_REQUESTS = int(os.getenv("API_MAX_PENDING_REQUESTS") or 64)
+
+SESSION_TIMEOUT_SECONDS = int(os.getenv("SESSION_TIMEOUT_SECONDS") or 3600)
+
+PASSWORD_HASH_COST = int(os.getenv("PASSWORD_HASH_COST") or 15)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or os.cpu_count() or 2)
+
+LOGIN_ATTEMPTS_PER_USERNAME = int(os.getenv("LOGIN_ATTEMPTS_PER_USERNAME") or 5)
+LOGIN_ATTEMPTS_PER_CLIENT = int(os.getenv("LOGIN_ATTEMPTS_PER_CLIENT") or 20)
+LOGIN_ATTEMPT_WINDOW_SECONDS = int(os.getenv("LOGIN_ATTEMPT_WINDOW_SECONDS") or 60)
+LOGIN_RATE_LIMIT_MAX_KEYS = int(os.getenv("LOGIN_RATE_LIMIT_MAX_KEYS") or 100000)
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE") or 1024)
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS") or 60)
+
+PASSWORD_MIN_LENGTH = int(os.getenv("PASSWORD_MIN_LENGTH") or 8)
+PASSWORD_REQUIRED_CLASSES = (os.getenv("PASSWORD_REQUIRED_CLASSES") or "digit,special").split(",")
+PASSWORD_DENYLIST_FILE_PATH = os.getenv("PASSWORD_DENYLIST_FILE_PATH") or \
+    os.path.join(dirname, "..", "data", "common-passwords.txt")
+
+MIGRATION_CHUNK_SIZE = int(os.getenv("MIGRATION_CHUNK_SIZE") or 50000)
+
+BUDGET_WARNING_RATIO = float(os.getenv("BUDGET_WARNING_RATIO") or 0.8)
+
+RECURRING_CHECK_INTERVAL_SECONDS = int(os.getenv("RECURRING_CHECK_INTERVAL_SECONDS") or 3600)
+
+FORECAST_SMOOTHING_FACTOR = float(os.getenv("FORECAST_SMOOTHING_FACTOR") or 0.5)
+
+ANOMALY_THRESHOLD = float(os.getenv("ANOMALY_THRESHOLD") or 3.5)
+ANOMALY_MIN_EXPENSES = int(os.getenv("ANOMALY_MIN_EXPENSES") or 5)
+
+# Amounts of expenses, totals and budgets are in the base currency. Expenses in other
+# currencies are converted with the imported exchange rates.
+BASE_CURRENCY = (os.getenv("BASE_CURRENCY") or "EUR").upper()
+# Users who may import exchange rates, which are shared by all users
+ADMIN_USERNAMES = [username.strip() for username in
+                   (os.getenv("ADMIN_USERNAMES") or "").split(",") if username.strip()]
+
+# Number of edits that can be undone, and of undone edits that can be redone
+UNDO_HISTORY_SIZE = int(os.getenv("UNDO_HISTORY_SIZE") or 50)
@@ -1,7 +1,9 @@
 import sqlite3
 from config import DATABASE_FILE_PATH
 
-connection = sqlite3.connect(DATABASE_FILE_PATH)
+# The API server runs database operations in worker threads,
+# so the connection may be used outside the thread that created it
+connection = sqlite3.connect(DATABASE_FILE_PATH, check_same_thread=False)
 connection.row_factory = sqlite3.Row
 
 
@@ -1,65 +1,46 @@
 from database_connection import connect_to_database
+from database_migrations import migrate
 
 
-def create_users_table(connection):
+def drop_all_tables(connection):
     cursor = connection.cursor()
 
     cursor.execute("""
-        create table if not exists users ( 
-            username text primary key,
-            password text
-        );
+        select
+            name
+        from
+            sqlite_master
+        where
+            type='table' and name not like 'sqlite_%'
+        order by
+            sql like 'create virtual table%' desc
     """)
+    table_names = [row["name"] for row in cursor.fetchall()]
 
-    connection.commit()
-
+    for table_name in table_names:
+        cursor.execute(f"drop table if exists {table_name};")
 
-def create_expenses_table(connection):
-    cursor = connection.cursor()
-    cursor.execute("""
-        create table if not exists expenses (
-            id integer primary key,
-            username text,
-            name text,
-            amount real,
-            date text,
-            category text
-        );
-    """)
+    cursor.execute("pragma user_version = 0;")
 
     connection.commit()
 
 
-def drop_user_table(connection):
-    cursor = connection.cursor()
-
-    cursor.execute("""
-        drop table if exists users;
-    """)
-
-    cursor = connection.cursor()
-
-
-def drop_expenses_table(connection):
-
-    cursor = connection.cursor()
-
-    cursor.execute("""
-        drop table if exists expenses;
-    """)
-
-    cursor = connection.cursor()
+def initialize_database():
+    """Creates the database tables, or brings an existing database up to date
+    with the current schema without losing its data
+    """
+    connection = connect_to_database()
 
+    migrate(connection)
 
-def initialize_database():
 
+def reset_database():
+    """Deletes all tables and data, and creates the database tables anew
+    """
     connection = connect_to_database()
 
-    drop_user_table(connection)
-    drop_expenses_table(connection)
-
-    create_users_table(connection)
-    create_expenses_table(connection)
+    drop_all_tables(connection)
+    migrate(connection)
 
 
 if __name__ == "__main__":
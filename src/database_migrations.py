@@ -0,0 +1,690 @@
+import hashlib
+from config import MIGRATION_CHUNK_SIZE
+
+
+def get_schema_version(connection):
+    """Returns the schema version of the database, i.e. the number of applied migrations
+
+    Args:
+        connection: SQLite database connection
+
+    Returns:
+        The schema version stored in PRAGMA user_version, 0 for a new database
+    """
+    return connection.execute("pragma user_version").fetchone()[0]
+
+
+def migrate(connection, migrations=None):
+    """Applies the migrations the database does not have yet, in order.
+
+    Each migration runs in its own transaction together with the update of the
+    schema version, so an interrupted upgrade continues from the failed step the next
+    time. Migrations that work through a large table in chunks commit after each
+    chunk, and must therefore be safe to run again from the start.
+
+    Args:
+        connection: SQLite database connection
+        migrations (list, optional): Callable values taking the connection, in the
+                                        order they are applied. Defaults to MIGRATIONS.
+
+    Returns:
+        The schema version after migrating
+    """
+    if migrations is None:
+        migrations = MIGRATIONS
+
+    version = get_schema_version(connection)
+
+    for number, migration in enumerate(migrations[version:], start=version + 1):
+        connection.execute("begin")
+        try:
+            migration(connection)
+            connection.execute(f"pragma user_version = {number}")
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+
+    return get_schema_version(connection)
+
+
+def update_in_chunks(connection, table, assignments, condition="true", parameters=None,
+                     chunk_size=MIGRATION_CHUNK_SIZE):
+    """Updates the rows of a table in chunks of consecutive rowids, committing after
+    each chunk, so that a backfill of a large table neither holds the write lock nor
+    builds up a transaction for long. Other connections can read and write between
+    the chunks.
+
+    The condition should only match rows that still need the update, e.g.
+    "content_hash is null", so that an interrupted backfill can be run again.
+
+    Args:
+        connection: SQLite database connection
+        table (str): Name of the table
+        assignments (str): The set clause of the update, e.g. "category_id = 1"
+        condition (str, optional): Which rows of each chunk are updated
+        parameters (dict, optional): Named parameters used in assignments and condition
+        chunk_size (int, optional): Number of rowids covered by each chunk
+
+    Returns:
+        The number of updated rows
+    """
+    return execute_in_chunks(connection, table, f"""
+        update
+            {table}
+        set
+            {assignments}
+        where
+            rowid > :chunk_start and rowid <= :chunk_end and ({condition})""",
+                             parameters, chunk_size)
+
+
+def execute_in_chunks(connection, table, statement, parameters=None,
+                      chunk_size=MIGRATION_CHUNK_SIZE):
+    """Executes a statement once for each chunk of consecutive rowids of a table,
+    committing after each chunk. The statement limits itself to the chunk with the
+    :chunk_start (exclusive) and :chunk_end (inclusive) parameters.
+
+    Args:
+        connection: SQLite database connection
+        table (str): Name of the table whose rowids are split into chunks
+        statement (str): The SQL statement
+        parameters (dict, optional): Other named parameters used in the statement
+        chunk_size (int, optional): Number of rowids covered by each chunk
+
+    Returns:
+        The number of rows changed by the statement in total
+    """
+    parameters = dict(parameters or {})
+    last_rowid = connection.execute(f"select max(rowid) from {table}").fetchone()[0] or 0
+
+    changed = 0
+    for start in range(0, last_rowid, chunk_size):
+        cursor = connection.execute(statement, {**parameters, "chunk_start": start,
+                                                "chunk_end": start + chunk_size})
+        changed += cursor.rowcount
+        connection.commit()
+
+    return changed
+
+
+def has_column(connection, table, column):
+    """Checks whether a table has a column
+
+    Args:
+        connection: SQLite database connection
+        table (str): Name of the table
+        column (str): Name of the column
+
+    Returns:
+        True, if the column exists
+    """
+    columns = connection.execute(f"pragma table_info({table})").fetchall()
+    return any(row[1] == column for row in columns)
+
+
+def create_users_and_expenses_tables(connection):
+    connection.execute("""
+        create table if not exists users (
+            username text primary key,
+            password text
+        );
+    """)
+    connection.execute("""
+        create table if not exists expenses (
+            id integer primary key,
+            username text,
+            name text,
+            amount real,
+            date text,
+            category text
+        );
+    """)
+
+
+def create_expenses_username_index(connection):
+    # Every expense query filters by user, and most order or group by date.
+    # SQLite builds an index in one sorted pass, in a step of its own.
+    connection.execute("""
+        create index if not exists expenses_username_date_index
+            on expenses (username, date);
+    """)
+
+
+def create_categories_table(connection):
+    connection.execute("""
+        create table if not exists categories (
+            id integer primary key,
+            username text not null,
+            name text not null,
+            unique (username, name)
+        );
+    """)
+    # The backfill commits, so the column may exist already if the step was interrupted
+    if not has_column(connection, "expenses", "category_id"):
+        connection.execute("""
+            alter table expenses add column category_id integer references categories (id);
+        """)
+    execute_in_chunks(connection, "expenses", """
+        insert or ignore into categories (username, name)
+        select distinct username, category from expenses
+        where rowid > :chunk_start and rowid <= :chunk_end and category is not null""")
+
+    update_in_chunks(connection, "expenses", """
+        category_id = (
+            select id from categories
+            where categories.username = expenses.username
+            and categories.name = expenses.category)""",
+                     "category_id is null and category is not null")
+
+    connection.execute("""
+        create index if not exists expenses_category_date_index
+            on expenses (category_id, date);
+    """)
+
+
+def clear_expenses_category_column(connection):
+    # Dropping the column would rewrite the whole table in one transaction, so the
+    # legacy column is kept but no longer read or written, and only emptied in chunks
+    update_in_chunks(connection, "expenses", "category = null", "category is not null")
+
+
+def create_expenses_search_index(connection):
+    # Contentless, so the names are not stored twice. Each row is tagged with a token
+    # derived from its owner's username, so that a search only matches their expenses.
+    # Prefixes of up to 4 characters are indexed, so searching as the user types
+    # does not have to scan the vocabulary.
+    connection.execute("""
+        create virtual table if not exists expenses_search using fts5 (
+            name,
+            owner,
+            content='',
+            prefix='1 2 3 4',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+    """)
+    connection.execute("""
+        insert into expenses_search (expenses_search) values ('delete-all');
+    """)
+    connection.execute("""
+        create trigger if not exists expenses_search_insert after insert on expenses
+        begin
+            insert into expenses_search (rowid, name, owner)
+            values (new.id, new.name, 'u' || hex(new.username));
+        end;
+    """)
+    connection.execute("""
+        create trigger if not exists expenses_search_delete after delete on expenses
+        begin
+            insert into expenses_search (expenses_search, rowid, name, owner)
+            values ('delete', old.id, old.name, 'u' || hex(old.username));
+        end;
+    """)
+    connection.execute("""
+        create trigger if not exists expenses_search_update
+        after update of name, username on expenses
+        begin
+            insert into expenses_search (expenses_search, rowid, name, owner)
+            values ('delete', old.id, old.name, 'u' || hex(old.username));
+            insert into expenses_search (rowid, name, owner)
+            values (new.id, new.name, 'u' || hex(new.username));
+        end;
+    """)
+
+    execute_in_chunks(connection, "expenses", """
+        insert into expenses_search (rowid, name, owner)
+        select id, name, 'u' || hex(username) from expenses
+        where id > :chunk_start and id <= :chunk_end""")
+
+
+def _content_hash(username, name, amount, expense_date):
+    """Computes the hash identifying an expense by its content. Names are compared
+    case-insensitively and ignoring extra whitespace, and amounts to the cent.
+
+    Args:
+        username (str): The user the expense belongs to
+        name (str): The expense name
+        amount (float): The expense amount
+        expense_date (str): The expense date, YYYY-MM-DD
+
+    Returns:
+        The hash as 16 bytes
+    """
+    # Frozen for add_expenses_content_hash, so that later changes to content_hash
+    # of the ExpenseRepository module do not change what the migration does
+    # pylint: disable=duplicate-code
+    normalized_name = " ".join(str(name).lower().split())
+    content = "\x1f".join([str(username), normalized_name, f"{float(amount):.2f}",
+                           str(expense_date)])
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+def add_expenses_content_hash(connection, chunk_size=MIGRATION_CHUNK_SIZE):
+    # The hash identifies expenses by their content, so that imports can skip expenses
+    # that exist already. Expenses entered twice on purpose keep a null hash.
+    if not has_column(connection, "expenses", "content_hash"):
+        connection.execute("alter table expenses add column content_hash blob;")
+    connection.execute("""
+        create unique index if not exists expenses_content_hash_index
+            on expenses (content_hash);
+    """)
+
+    # The hash is computed in Python, so the rows are read and updated chunk by chunk
+    last_id = connection.execute("select max(id) from expenses").fetchone()[0] or 0
+    for start in range(0, last_id, chunk_size):
+        rows = connection.execute("""
+            select id, username, name, amount, date from expenses
+            where id > ? and id <= ? and content_hash is null
+            order by id""", (start, start + chunk_size)).fetchall()
+        connection.executemany("""
+            update or ignore expenses set content_hash = ? where id = ?""",
+                               ((_content_hash(row[1], row[2], row[3], row[4]), row[0])
+                                for row in rows))
+        connection.commit()
+
+
+def create_expense_changes_table(connection):
+    # A journal of the changes to expenses, so that downstream copies can be kept in
+    # sync by reading only what changed after the last sequence number they have seen.
+    # Autoincrement keeps sequence numbers from being reused after deletes.
+    connection.execute("""
+        create table if not exists expense_changes (
+            seq integer primary key autoincrement,
+            username text not null,
+            expense_id integer not null,
+            operation text not null check (operation in ('insert', 'update', 'delete'))
+        );
+    """)
+    connection.execute("""
+        create index if not exists expense_changes_username_seq_index
+            on expense_changes (username, seq);
+    """)
+
+    # Existing expenses are journaled as inserts, so that syncing from 0 copies
+    # everything. The triggers are created afterwards, so the journal only has
+    # backfilled rows, in id order, until the backfill is done, and an interrupted
+    # backfill continues after the last journaled id.
+    execute_in_chunks(connection, "expenses", """
+        insert into expense_changes (username, expense_id, operation)
+        select username, id, 'insert' from expenses
+        where id > :chunk_start and id <= :chunk_end
+        and id > coalesce(
+            (select expense_id from expense_changes order by seq desc limit 1), 0)
+        order by id""")
+
+    connection.execute("""
+        create trigger if not exists expense_changes_insert after insert on expenses
+        begin
+            insert into expense_changes (username, expense_id, operation)
+            values (new.username, new.id, 'insert');
+        end;
+    """)
+    connection.execute("""
+        create trigger if not exists expense_changes_update
+        after update of username, name, amount, date, category_id on expenses
+        begin
+            insert into expense_changes (username, expense_id, operation)
+            values (new.username, new.id, 'update');
+        end;
+    """)
+    connection.execute("""
+        create trigger if not exists expense_changes_delete after delete on expenses
+        begin
+            insert into expense_changes (username, expense_id, operation)
+            values (old.username, old.id, 'delete');
+        end;
+    """)
+    # Renaming a category changes every expense in it without updating them
+    connection.execute("""
+        create trigger if not exists expense_changes_category_update
+        after update of name on categories
+        begin
+            insert into expense_changes (username, expense_id, operation)
+            select username, id, 'update' from expenses where category_id = new.id;
+        end;
+    """)
+
+
+def _roll_up_queued_days(connection):
+    """Sums up the days queued by the triggers on the expenses table from their
+    expenses, and empties the queue. Does not commit.
+
+    Args:
+        connection: SQLite database connection
+    """
+    # Frozen for create_expense_rollups_table, so that later changes to refresh_rollups
+    # of the ExpenseRollupRepository module do not change what the migration does
+    # pylint: disable=duplicate-code
+    connection.execute("""
+        delete from expense_rollups
+        where period='day'
+        and (username, category_id, bucket) in (
+            select username, category_id, day from expense_rollup_queue)""")
+    connection.execute("""
+        insert into expense_rollups (username, period, category_id, bucket, total, count)
+        select
+            queue.username, 'day', queue.category_id, queue.day,
+            sum(expenses.amount), count(*)
+        from
+            expense_rollup_queue as queue
+        join
+            expenses on expenses.category_id=queue.category_id and expenses.date=queue.day
+        group by
+            queue.category_id, queue.day""")
+    connection.execute("delete from expense_rollup_queue")
+
+
+def create_expense_rollups_table(connection, chunk_size=MIGRATION_CHUNK_SIZE):
+    # Daily, monthly and yearly totals per user and category, so that reports over
+    # long histories do not sum up the expenses each time. The triggers only queue the
+    # days an expense was added to or removed from, refresh_rollups re-rolls them.
+    connection.execute("""
+        create table if not exists expense_rollups (
+            username text not null,
+            period text not null check (period in ('day', 'month', 'year')),
+            category_id integer not null,
+            bucket text not null,
+            total real not null,
+            count integer not null,
+            primary key (username, period, category_id, bucket)
+        ) without rowid;
+    """)
+    connection.execute("""
+        create table if not exists expense_rollup_queue (
+            username text not null,
+            category_id integer not null,
+            day text not null,
+            primary key (category_id, day)
+        ) without rowid;
+    """)
+    connection.execute("""
+        create trigger if not exists expense_rollups_insert after insert on expenses
+        begin
+            insert or ignore into expense_rollup_queue (username, category_id, day)
+            select new.username, new.category_id, new.date
+            where new.category_id is not null and new.date is not null;
+        end;
+    """)
+    connection.execute("""
+        create trigger if not exists expense_rollups_update
+        after update of username, amount, date, category_id on expenses
+        begin
+            insert or ignore into expense_rollup_queue (username, category_id, day)
+            select old.username, old.category_id, old.date
+            where old.category_id is not null and old.date is not null;
+            insert or ignore into expense_rollup_queue (username, category_id, day)
+            select new.username, new.category_id, new.date
+            where new.category_id is not null and new.date is not null;
+        end;
+    """)
+    connection.execute("""
+        create trigger if not exists expense_rollups_delete after delete on expenses
+        begin
+            insert or ignore into expense_rollup_queue (username, category_id, day)
+            select old.username, old.category_id, old.date
+            where old.category_id is not null and old.date is not null;
+        end;
+    """)
+
+    # Existing expenses are queued and their days rolled up chunk by chunk. Each
+    # queued day is summed up from all its expenses, so days with expenses in several
+    # chunks stay exact, and an interrupted backfill can run again from the start.
+    last_id = connection.execute("select max(id) from expenses").fetchone()[0] or 0
+    for start in range(0, last_id, chunk_size):
+        connection.execute("""
+            insert or ignore into expense_rollup_queue (username, category_id, day)
+            select distinct username, category_id, date from expenses
+            where id > ? and id <= ? and category_id is not null and date is not null""",
+                           (start, start + chunk_size))
+        _roll_up_queued_days(connection)
+        connection.commit()
+
+    # The months and years are then summed up once from the day rollups
+    connection.execute("delete from expense_rollups where period in ('month', 'year')")
+    for period, length in [("month", 7), ("year", 4)]:
+        connection.execute(f"""
+            insert into expense_rollups (username, period, category_id, bucket, total, count)
+            select
+                username, '{period}', category_id, substr(bucket, 1, {length}),
+                sum(total), sum(count)
+            from
+                expense_rollups
+            where
+                period='day'
+            group by
+                username, category_id, substr(bucket, 1, {length})""")
+
+
+def create_budgets_table(connection):
+    # Monthly budgets per category. Spending in budgeted categories is counted per
+    # month by triggers as expenses are added, edited and deleted, in whole cents so
+    # that the counters do not drift, and checking a budget is a single lookup.
+    connection.execute("""
+        create table if not exists budgets (
+            category_id integer primary key references categories (id),
+            username text not null,
+            amount real not null
+        );
+    """)
+    connection.execute("""
+        create index if not exists budgets_username_index on budgets (username);
+    """)
+    connection.execute("""
+        create table if not exists budget_spending (
+            category_id integer not null,
+            month text not null,
+            spent_cents integer not null,
+            primary key (category_id, month)
+        ) without rowid;
+    """)
+
+    def count_spending(row, sign):
+        return f"""
+            insert into budget_spending (category_id, month, spent_cents)
+            select {row}.category_id, substr({row}.date, 1, 7),
+                {sign}cast(round({row}.amount * 100) as integer)
+            where {row}.date is not null
+            and exists (select 1 from budgets where category_id = {row}.category_id)
+            on conflict (category_id, month)
+            do update set spent_cents = spent_cents + excluded.spent_cents;"""
+
+    connection.execute(f"""
+        create trigger if not exists budget_spending_insert after insert on expenses
+        begin
+            {count_spending("new", "")}
+        end;
+    """)
+    connection.execute(f"""
+        create trigger if not exists budget_spending_update
+        after update of amount, date, category_id on expenses
+        begin
+            {count_spending("old", "-")}
+            {count_spending("new", "")}
+        end;
+    """)
+    connection.execute(f"""
+        create trigger if not exists budget_spending_delete after delete on expenses
+        begin
+            {count_spending("old", "-")}
+        end;
+    """)
+    # Deleting a category removes its budget
+    connection.execute("""
+        create trigger if not exists budgets_category_delete after delete on categories
+        begin
+            delete from budgets where category_id = old.id;
+            delete from budget_spending where category_id = old.id;
+        end;
+    """)
+
+
+def create_recurring_expenses_table(connection):
+    # Rules for expenses that repeat. next_due is the date of the next expense to be
+    # created, or null once the rule has ended, and is indexed so that the scheduler
+    # only reads the rules that are due.
+    connection.execute("""
+        create table if not exists recurring_expenses (
+            id integer primary key,
+            username text not null,
+            name text not null,
+            amount real not null,
+            category text not null,
+            frequency text not null
+                check (frequency in ('daily', 'weekly', 'monthly', 'yearly')),
+            interval integer not null default 1 check (interval > 0),
+            start_date text not null,
+            end_date text,
+            next_due text
+        );
+    """)
+    connection.execute("""
+        create index if not exists recurring_expenses_next_due_index
+            on recurring_expenses (next_due) where next_due is not null;
+    """)
+    connection.execute("""
+        create index if not exists recurring_expenses_username_index
+            on recurring_expenses (username);
+    """)
+
+
+def add_expenses_currency(connection):
+    # amount stays in the base currency, so that totals, rollups and budgets need no
+    # conversion. Expenses in other currencies keep their currency and original amount,
+    # which are null for expenses in the base currency, so existing rows are not rewritten.
+    if not has_column(connection, "expenses", "currency"):
+        connection.execute("alter table expenses add column currency text")
+    if not has_column(connection, "expenses", "original_amount"):
+        connection.execute("alter table expenses add column original_amount real")
+    connection.execute("""
+        create index if not exists expenses_currency_index
+            on expenses (currency, date) where currency is not null;
+    """)
+
+    # Value of one unit of a currency in the base currency, from a date onwards
+    connection.execute("""
+        create table if not exists exchange_rates (
+            currency text not null,
+            date text not null,
+            rate real not null check (rate > 0),
+            primary key (currency, date)
+        ) without rowid;
+    """)
+
+
+def create_tags_tables(connection):
+    # Tags classify expenses along several dimensions at once, e.g. work and travel.
+    # The primary key of expense_tags finds the expenses with a tag, and the index
+    # the tags of an expense, both without reading the table rows.
+    connection.execute("""
+        create table if not exists tags (
+            id integer primary key,
+            username text not null,
+            name text not null,
+            unique (username, name)
+        );
+    """)
+    connection.execute("""
+        create table if not exists expense_tags (
+            tag_id integer not null references tags (id),
+            expense_id integer not null references expenses (id),
+            primary key (tag_id, expense_id)
+        ) without rowid;
+    """)
+    connection.execute("""
+        create index if not exists expense_tags_expense_index
+            on expense_tags (expense_id, tag_id);
+    """)
+    # Expense ids may be reused, so the tags of a deleted expense are deleted with it
+    connection.execute("""
+        create trigger if not exists expense_tags_expense_delete after delete on expenses
+        begin
+            delete from expense_tags where expense_id = old.id;
+        end;
+    """)
+    connection.execute("""
+        create trigger if not exists expense_tags_tag_delete after delete on tags
+        begin
+            delete from expense_tags where tag_id = old.id;
+        end;
+    """)
+
+
+def create_category_rules_table(connection):
+    # Rules that categorise expenses by name and amount, tried in the order of their
+    # ids. An empty pattern matches every name, and a missing bound any amount.
+    connection.execute("""
+        create table if not exists category_rules (
+            id integer primary key,
+            username text not null,
+            category text not null,
+            match_type text not null check (match_type in ('contains', 'regex')),
+            pattern text not null default '',
+            min_amount real,
+            max_amount real
+        );
+    """)
+    connection.execute("""
+        create index if not exists category_rules_username_index
+            on category_rules (username);
+    """)
+
+
+def create_operation_journal_table(connection):
+    # The inverse operations of a user's latest edits, to undo them, and of the
+    # latest undone edits, to redo them. The operations are stored as JSON.
+    connection.execute("""
+        create table if not exists operation_journal (
+            id integer primary key,
+            username text not null,
+            stack text not null check (stack in ('undo', 'redo')),
+            description text not null,
+            operation text not null
+        );
+    """)
+    connection.execute("""
+        create index if not exists operation_journal_username_stack_index
+            on operation_journal (username, stack, id);
+    """)
+
+
+def create_exchange_rates_version_table(connection):
+    # A counter increased by every change of the exchange rates, also by other
+    # processes, so that the rates held in memory are read again only when it changes
+    connection.execute("""
+        create table if not exists exchange_rates_version (
+            version integer not null
+        );
+    """)
+    connection.execute("""
+        insert into exchange_rates_version (version)
+        select 0 where not exists (select 1 from exchange_rates_version);
+    """)
+    for event in ["insert", "update", "delete"]:
+        connection.execute(f"""
+            create trigger if not exists exchange_rates_version_{event}
+                after {event} on exchange_rates
+            begin
+                update exchange_rates_version set version = version + 1;
+            end;
+        """)
+
+
+# Applied in order, the schema version is the number of applied migrations.
+# New migrations are added to the end, and existing ones are never changed.
+MIGRATIONS = [
+    create_users_and_expenses_tables,
+    create_expenses_username_index,
+    create_categories_table,
+    clear_expenses_category_column,
+    create_expenses_search_index,
+    add_expenses_content_hash,
+    create_expense_changes_table,
+    create_expense_rollups_table,
+    create_budgets_table,
+    create_recurring_expenses_table,
+    add_expenses_currency,
+    create_tags_tables,
+    create_category_rules_table,
+    create_operation_journal_table,
+    create_exchange_rates_version_table,
+]
@@ -0,0 +1,32 @@
+class CategoryRule:
+    """
+    Class representing a rule that puts matching expenses into a category,
+    e.g. every expense whose name contains "lidl" into groceries
+
+    Attributes:
+        category (string): The category of the matching expenses
+        pattern (string): The text or regular expression the expense name is matched
+                            against, an empty pattern matching every name
+        match_type (string): contains for a case-insensitive substring of the name,
+                                regex for a regular expression found in the name
+        min_amount (float): The smallest matching amount, or None
+        max_amount (float): The largest matching amount, or None
+    """
+
+    def __init__(self, category, pattern="", match_type="contains", min_amount=None,
+                 max_amount=None):
+        """Class constructor
+
+        Args:
+            category (str): The category of the matching expenses
+            pattern (str, optional): The text or regular expression. Defaults to "",
+                                        which matches every name.
+            match_type (str, optional): contains or regex. Defaults to contains.
+            min_amount (float, optional): The smallest matching amount. Defaults to None.
+            max_amount (float, optional): The largest matching amount. Defaults to None.
+        """
+        self.category = category
+        self.pattern = pattern
+        self.match_type = match_type
+        self.min_amount = min_amount
+        self.max_amount = max_amount
@@ -8,13 +8,16 @@ class Expense:
 
     Attributes:
         name (string): The name given to the expense by the user
-        amount (float): The monetary amount of the expense
+        amount (float): The monetary amount of the expense in the base currency
         date: The date of the expense, default being the current system date
         category: The category of the expense, default being undefined
+        currency: The currency the expense was paid in, None for the base currency
+        original_amount: The amount in that currency, None for the base currency
 
     """
 
-    def __init__(self, name, amount, given_date=date.today(), category="undefined"):
+    def __init__(self, name, amount, given_date=date.today(), category="undefined",
+                 currency=None, original_amount=None):
         """Class constructor
 
         Args:
@@ -22,8 +25,13 @@ class Expense:
             amount (float): The expense amount
             given_date (str, optional): The expense date. Defaults to date.today().
             category (str, optional): The expense category. Defaults to "undefined".
+            currency (str, optional): The currency code of the expense, if it was paid
+                                        in another currency than the base currency
+            original_amount (float, optional): The amount in that currency
         """
         self.name = name
         self.amount = amount
         self.date = given_date
         self.category = category
+        self.currency = currency
+        self.original_amount = original_amount
@@ -0,0 +1,36 @@
+from entities.expense import Expense
+
+
+class RecurringExpense:
+    """
+    Class representing a rule for an expense that repeats, e.g. rent or a subscription
+
+    Attributes:
+        name (string): The name of the created expenses
+        amount (float): The amount of the created expenses
+        frequency (string): daily, weekly, monthly or yearly
+        start_date (string): The date of the first expense, YYYY-MM-DD
+        category (string): The category of the created expenses, default being undefined
+        interval (int): How many days, weeks, months or years there are between the expenses
+        end_date (string): The date after which no more expenses are created, or None
+    """
+
+    def __init__(self, expense: Expense, frequency, interval=1, end_date=None):
+        """Class constructor
+
+        Args:
+            expense (Expense object): The first expense created by the rule. Its name,
+                                        amount and category are those of all the created
+                                        expenses, and its date is the start date.
+            frequency (str): daily, weekly, monthly or yearly
+            interval (int, optional): Number of frequency periods between the expenses.
+                                        Defaults to 1.
+            end_date (str, optional): The last possible date of an expense. Defaults to None.
+        """
+        self.name = expense.name
+        self.amount = expense.amount
+        self.frequency = frequency
+        self.start_date = expense.date
+        self.category = expense.category
+        self.interval = interval
+        self.end_date = end_date
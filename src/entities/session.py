@@ -0,0 +1,27 @@
+from entities.user import User
+
+
+class Session:
+    """
+    Class representing the logged-in session of a user
+
+    Attributes:
+        session_id (string): The session's unique, random identifier
+        user (User): The logged-in user
+        expires_at (float): The time after which the session is no longer valid
+        operation_journal (OperationJournal): The edits of the session that can be
+                                                undone, or None before the first edit
+    """
+
+    def __init__(self, session_id: str, user: User, expires_at: float):
+        """Class constructor
+
+        Args:
+            session_id (str): The session's unique, random identifier
+            user (User): The logged-in user
+            expires_at (float): The time after which the session is no longer valid
+        """
+        self.session_id = session_id
+        self.user = user
+        self.expires_at = expires_at
+        self.operation_journal = None
@@ -1,9 +1,17 @@
-from database_initialization import initialize_database
+import sys
+from database_initialization import initialize_database, reset_database
 
 
 def initialize():
     initialize_database()
 
 
+def reset():
+    reset_database()
+
+
 if __name__ == "__main__":
-    initialize()
+    if "--reset" in sys.argv[1:]:
+        reset()
+    else:
+        initialize()
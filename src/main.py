@@ -1,15 +1,77 @@
 from tkinter import Tk
+from config import PROFILE, PROFILE_DIRECTORY, RECURRING_CHECK_INTERVAL_SECONDS
+from database_initialization import initialize_database
+from services.recurring_expense_service import recurring_expense_scheduler
 from ui.ui import UI
 
 
+def run_recurring_expenses(window):
+    """Creates the due expenses of recurring rules, and then again after
+    RECURRING_CHECK_INTERVAL_SECONDS while the window is open
+    """
+    recurring_expense_scheduler.run_due()
+    window.after(RECURRING_CHECK_INTERVAL_SECONDS * 1000, run_recurring_expenses, window)
+
+
 def main():
+    initialize_database()
+
     window = Tk()
     window.title("Expense Tracker")
+    run_recurring_expenses(window)
 
     user_interface = UI(window)
     user_interface.start()
     window.mainloop()
 
 
+def instrument_services(profiler):
+    """Times the public methods of every service class the UI calls
+
+    Args:
+        profiler (Profiler object): Records the timings
+    """
+    # pylint: disable=import-outside-toplevel
+    from services.expense_service import ExpenseService
+    from services.expense_report_service import ExpenseReportService
+    from services.expense_search_service import ExpenseSearchService
+    from services.budget_service import BudgetService
+    from services.recurring_expense_service import RecurringExpenseService
+    from services.forecast_service import ForecastService
+    from services.anomaly_service import AnomalyService
+
+    for service_class in [ExpenseService, ExpenseReportService, ExpenseSearchService,
+                          BudgetService, RecurringExpenseService, ForecastService,
+                          AnomalyService]:
+        profiler.instrument(service_class, lambda name: not name.startswith("_"))
+
+
+def profile_main():
+    """Runs the application under the profiler, timing each UI action and
+    service call, and writes the session report when the window is closed
+    """
+    # pylint: disable=import-outside-toplevel
+    from profiler import Profiler
+
+    profiler = Profiler(PROFILE_DIRECTORY)
+
+    instrument_services(profiler)
+    # The UI actions are the callbacks of the views wired to buttons and other
+    # widgets, while Tk's own callbacks, e.g. of timers and scrollbars, are not timed
+    profiler.instrument_tk_callbacks(
+        lambda callback: getattr(callback, "__module__", "").startswith("ui."))
+
+    profiler.start()
+    try:
+        main()
+    finally:
+        report_path, collapsed_path = profiler.stop()
+        print(f"Profile report written to {report_path}")
+        print(f"Collapsed stacks for flamegraphs written to {collapsed_path}")
+
+
 if __name__ == "__main__":
-    main()
+    if PROFILE:
+        profile_main()
+    else:
+        main()
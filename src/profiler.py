@@ -0,0 +1,172 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tkinter
+from collections import Counter
+from datetime import datetime
+
+
+class Profiler:
+    """This class profiles a running application session. It records a cProfile
+    profile, the wall clock time of instrumented calls, and periodically samples
+    the call stack of the profiled thread for flamegraphs.
+
+    Attributes:
+        output_directory: The directory where the session reports are written
+        sampling_interval: Seconds between two call stack samples
+    """
+
+    def __init__(self, output_directory, sampling_interval=0.005):
+        """Class constructor
+
+        Args:
+            output_directory (str): The directory where the session reports are written
+            sampling_interval (float, optional): Seconds between two call stack samples.
+                                                    Defaults to 0.005.
+        """
+        self.output_directory = output_directory
+        self.sampling_interval = sampling_interval
+
+        self._profile = cProfile.Profile()
+        self._timings = {}
+        self._stacks = Counter()
+        self._thread_id = None
+        self._sampler = None
+        self._running = threading.Event()
+
+    def instrument(self, cls, predicate):
+        """Wraps the methods of a class selected by predicate, so that
+        the wall clock time of each call is recorded under "Class.method"
+
+        Args:
+            cls (class): The class whose methods are wrapped
+            predicate: Callable value, called with each method name and returning
+                        True if that method should be timed
+        """
+        for name, attribute in list(vars(cls).items()):
+            if callable(attribute) and predicate(name):
+                setattr(cls, name, self._timed(
+                    f"{cls.__name__}.{name}", attribute))
+
+    def instrument_tk_callbacks(self, predicate, widget_class=tkinter.Misc):
+        """Wraps the callbacks selected by predicate as they are registered with Tk,
+        e.g. the command of a button, so that the wall clock time of each UI action
+        is recorded under the qualified name of its callback, e.g. "Class.method"
+
+        Args:
+            predicate: Callable value, called with each registered callback and
+                        returning True if it should be timed
+            widget_class (class, optional): The class registering the callbacks.
+                                            Defaults to tkinter.Misc, the base
+                                            class of all widgets.
+        """
+        # Every callback given to Tk, whether as a command option or a binding,
+        # is registered through this one method
+        register = widget_class._register  # pylint: disable=protected-access
+
+        def register_timed(widget, function, *args, **kwargs):
+            if predicate(function):
+                function = self._timed(function.__qualname__, function)
+            return register(widget, function, *args, **kwargs)
+
+        widget_class._register = register_timed  # pylint: disable=protected-access
+
+    def _timed(self, label, function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._record(label, time.perf_counter() - start)
+
+        return wrapper
+
+    def _record(self, label, elapsed):
+        count, total, longest = self._timings.get(label, (0, 0.0, 0.0))
+        self._timings[label] = (count + 1, total + elapsed, max(longest, elapsed))
+
+    def start(self):
+        """Starts profiling the calling thread
+        """
+        self._thread_id = threading.get_ident()
+        self._running.set()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        self._profile.enable()
+
+    def stop(self):
+        """Stops profiling and writes the session reports
+
+        Returns:
+            Tuple of the paths of the written report and collapsed stack files
+        """
+        self._profile.disable()
+        self._running.clear()
+        self._sampler.join()
+
+        os.makedirs(self.output_directory, exist_ok=True)
+        session = datetime.now().strftime("session-%Y%m%d-%H%M%S")
+        report_path = os.path.join(self.output_directory, f"{session}.txt")
+        collapsed_path = os.path.join(
+            self.output_directory, f"{session}.collapsed")
+
+        with open(report_path, "w", encoding="utf-8") as report:
+            report.write(self.format_timings())
+            report.write("\n")
+            report.write(self.format_profile())
+
+        with open(collapsed_path, "w", encoding="utf-8") as collapsed:
+            for stack, count in self._stacks.most_common():
+                collapsed.write(f"{stack} {count}\n")
+
+        return report_path, collapsed_path
+
+    def format_timings(self):
+        """Returns the timings of instrumented calls as a table,
+        sorted by total time spent in each call
+
+        Returns:
+            The timing table as a string
+        """
+        lines = [f"{'call':<60} {'count':>7} {'total s':>10} {'mean ms':>10} {'max ms':>10}"]
+        ordered = sorted(self._timings.items(),
+                         key=lambda item: item[1][1], reverse=True)
+
+        for label, (count, total, longest) in ordered:
+            lines.append(f"{label:<60} {count:>7} {total:>10.3f} "
+                         f"{1000 * total / count:>10.2f} {1000 * longest:>10.2f}")
+
+        return "\n".join(lines) + "\n"
+
+    def format_profile(self):
+        """Returns the cProfile statistics sorted by cumulative time
+
+        Returns:
+            The profile statistics as a string
+        """
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats()
+        return stream.getvalue()
+
+    def _sample(self):
+        while self._running.is_set():
+            frame = sys._current_frames().get(self._thread_id)  # pylint: disable=protected-access
+            if frame is not None:
+                self._stacks[self._collapse(frame)] += 1
+            time.sleep(self.sampling_interval)
+
+    def _collapse(self, frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            names.append(f"{module}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(names))
@@ -0,0 +1,169 @@
+from database_connection import connect_to_database
+from entities.user import User
+from entities.category import Category
+
+
+class BudgetRepository:
+    """This class is responsible for operations on the budgets database table,
+    and on the month-to-date spending counted for each budget.
+    """
+
+    def __init__(self):
+        """Class constructor
+        """
+        self._connection = connect_to_database()
+
+    def set_budget(self, user: User, category: Category, amount):
+        """Sets the monthly budget of a category of a specified user. When a category
+        gets a budget, its spending is counted once from the existing expenses, after
+        which the database keeps counting it as expenses change.
+
+        Args:
+            user (User object): The user, whose budget is set
+            category (Category object): The budgeted category
+            amount (float): The amount that may be spent in the category each month
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        insert or ignore into categories
+            (username, name)
+        values (?, ?)""", (user.username, category.name))
+        cursor.execute("""
+        select
+            id
+        from
+            categories
+        where
+            username=? and name=?""", (user.username, category.name))
+        category_id = cursor.fetchone()["id"]
+
+        cursor.execute("""
+        select
+            exists (select 1 from budgets where category_id=?) as budgeted""",
+                       (category_id,))
+        budgeted = cursor.fetchone()["budgeted"]
+
+        cursor.execute("""
+        insert into budgets
+            (category_id, username, amount)
+        values (?, ?, ?)
+        on conflict (category_id) do update set amount=excluded.amount""",
+                       (category_id, user.username, amount))
+
+        if not budgeted:
+            cursor.execute("""
+            insert or replace into budget_spending
+                (category_id, month, spent_cents)
+            select
+                category_id,
+                substr(date, 1, 7),
+                sum(cast(round(amount * 100) as integer))
+            from
+                expenses
+            where
+                category_id=? and date is not null
+            group by
+                substr(date, 1, 7)""", (category_id,))
+
+        self._connection.commit()
+
+    def delete_budget(self, user: User, category: Category):
+        """Deletes the budget of a category of a specified user
+
+        Args:
+            user (User object): The user, whose budget is deleted
+            category (Category object): The budgeted category
+
+        Returns:
+            True, if the category had a budget, otherwise False
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        delete from
+            budgets
+        where
+            category_id=(select id from categories where username=? and name=?)
+        returning
+            category_id""", (user.username, category.name))
+        deleted = cursor.fetchall()
+
+        for row in deleted:
+            cursor.execute("""
+            delete from
+                budget_spending
+            where
+                category_id=?""", (row["category_id"],))
+
+        self._connection.commit()
+
+        return len(deleted) > 0
+
+    def find_budget(self, user: User, category: Category, month):
+        """Finds the budget of a category of a specified user, with the amount spent
+        in the category during a month
+
+        Args:
+            user (User object): The user, whose budget is found
+            category (Category object): The budgeted category
+            month (str): The month, YYYY-MM
+
+        Returns:
+            Database row with category, amount and spent, or None if the category
+            has no budget
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        select
+            categories.name as category,
+            budgets.amount,
+            coalesce(budget_spending.spent_cents, 0) / 100.0 as spent
+        from
+            categories
+        join
+            budgets on budgets.category_id=categories.id
+        left join
+            budget_spending on budget_spending.category_id=budgets.category_id
+            and budget_spending.month=:month
+        where
+            categories.username=:username
+        and
+            categories.name=:category""",
+                       {"username": user.username, "category": category.name,
+                        "month": month})
+
+        return cursor.fetchone()
+
+    def get_budgets_by_user(self, user: User, month):
+        """Returns the budgets of a specified user, with the amount spent in each
+        budgeted category during a month
+
+        Args:
+            user (User object): The user, whose budgets are found
+            month (str): The month, YYYY-MM
+
+        Returns:
+            List of database rows with category, amount and spent, sorted by category
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        select
+            categories.name as category,
+            budgets.amount,
+            coalesce(budget_spending.spent_cents, 0) / 100.0 as spent
+        from
+            budgets
+        join
+            categories on categories.id=budgets.category_id
+        left join
+            budget_spending on budget_spending.category_id=budgets.category_id
+            and budget_spending.month=:month
+        where
+            budgets.username=:username
+        order by
+            category""", {"username": user.username, "month": month})
+
+        return cursor.fetchall()
@@ -0,0 +1,182 @@
+import json
+from database_connection import connect_to_database
+from repositories.expense_repository import (CATEGORY_FILTER, select_expenses, add_categories,
+                                            get_category_ids)
+from entities.user import User
+from entities.category import Category
+
+
+class CategoryRepository:
+    """This class is responsible for operations on the categories database table,
+    and on moving expenses between categories.
+    """
+
+    def __init__(self):
+        """Class constructor
+        """
+        self._connection = connect_to_database()
+
+    def get_categories_by_user(self, user: User):
+        """Returns the names of the categories a specified user has expenses in
+
+        Args:
+            user (User object): The user, whose categories should be found
+
+        Returns:
+            List of category names, sorted alphabetically
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        select
+            name
+        from
+            categories
+        where
+            username=?
+        and
+            exists (select 1 from expenses where category_id=categories.id)
+        order by
+            name""", (user.username,))
+
+        return [row["name"] for row in cursor.fetchall()]
+
+    def rename_category(self, user: User, category: Category, new_name):
+        """Renames a category of a specified user. If the user already has a category
+        with the new name, the expenses of the two categories are merged into it.
+        The emptied category is kept, so that its budget is still there if its
+        expenses are moved back, e.g. when the merge is undone.
+
+        Args:
+            user (User object): The user, whose category should be renamed
+            category (Category object): The category to be renamed
+            new_name (str): The new name of the category
+
+        Returns:
+            The number of expenses in the renamed category, 0 if it had no expenses
+        """
+        cursor = self._connection.cursor()
+
+        category_ids = get_category_ids(cursor, user)
+        category_id = category_ids.get(category.name)
+        if category_id is None:
+            return 0
+
+        cursor.execute("""
+        select
+            count(*)
+        from
+            expenses
+        where
+            category_id=?""", (category_id,))
+        count = cursor.fetchone()[0]
+
+        new_category_id = category_ids.get(new_name)
+        if count == 0 or new_category_id == category_id:
+            return count
+
+        if new_category_id is None:
+            cursor.execute("""
+            update
+                categories
+            set
+                name=?
+            where
+                id=?""", (new_name, category_id))
+        else:
+            cursor.execute("""
+            update
+                expenses
+            set
+                category_id=?
+            where
+                category_id=?""", (new_category_id, category_id))
+
+        self._connection.commit()
+
+        return count
+
+    def get_expense_ids_by_category(self, user: User, category: Category):
+        """Returns the ids of the expenses of a specified user within a category
+
+        Args:
+            user (User object): The user, whose expenses should be found
+            category (Category object): The category of the expenses
+
+        Returns:
+            List of expense ids
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute(select_expenses(CATEGORY_FILTER, "expenses.id", "expenses.id"),
+                       {"username": user.username, "category": category.name})
+
+        return [row["id"] for row in cursor.fetchall()]
+
+    def get_expenses_to_categorize(self, user: User, category: Category):
+        """Returns the id, name and amount of the expenses of a specified user
+        within a category, e.g. the undefined ones to be categorised by rules
+
+        Args:
+            user (User object): The user, whose expenses should be found
+            category (Category object): The category of the expenses
+
+        Returns:
+            List of database rows with id, name and amount, ordered by id
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute(select_expenses(CATEGORY_FILTER, "expenses.id",
+                                       "expenses.id, expenses.name, amount"),
+                       {"username": user.username, "category": category.name})
+
+        return cursor.fetchall()
+
+    def update_categories(self, user: User, categories):
+        """Moves expenses of a specified user into other categories with a single
+        update statement, creating the categories the user does not have yet
+
+        Args:
+            user (User object): The user, whose expenses are moved
+            categories (list): Pairs of the id of an expense and the name of
+                                its new category
+
+        Returns:
+            The number of expenses whose category changed
+        """
+        categories = list(categories)
+        cursor = self._connection.cursor()
+
+        add_categories(cursor, user, {category for _, category in categories})
+
+        # The moves are resolved to category ids first, so that each expense
+        # is then found by its id instead of scanning the user's expenses
+        cursor.execute("""
+        with moves as materialized (
+            select
+                moves.value ->> 0 as expense_id,
+                categories.id as category_id
+            from
+                json_each(:categories) as moves
+            cross join
+                categories on categories.username=:username and categories.name=moves.value ->> 1
+        )
+        update
+            expenses
+        set
+            category_id=moves.category_id
+        from
+            moves
+        where
+            expenses.id=moves.expense_id
+        and
+            expenses.username=:username
+        and
+            expenses.category_id != moves.category_id""",
+                       {"username": user.username, "categories": json.dumps(categories)})
+        # The cursor does not count the rows of statements starting with a with clause
+        updated = cursor.execute("select changes()").fetchone()[0]
+
+        self._connection.commit()
+
+        return updated
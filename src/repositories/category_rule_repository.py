@@ -0,0 +1,65 @@
+from database_connection import connect_to_database
+from entities.user import User
+from entities.category_rule import CategoryRule
+from repositories import rule_table
+
+
+class CategoryRuleRepository:
+    """This class is responsible for operations on the category_rules database table.
+    """
+
+    def __init__(self):
+        """Class constructor
+        """
+        self._connection = connect_to_database()
+
+    def add_rule(self, user: User, rule: CategoryRule):
+        """Adds a new categorisation rule for a user into database. It is tried
+        after the user's existing rules.
+
+        Args:
+            user (User object): The user, whose rule will be added
+            rule (CategoryRule object): The rule to be added
+
+        Returns:
+            The id of the added rule
+        """
+        return rule_table.insert_rule(self._connection, "category_rules", user, {
+            "category": rule.category, "match_type": rule.match_type,
+            "pattern": rule.pattern, "min_amount": rule.min_amount,
+            "max_amount": rule.max_amount})
+
+    def delete_rule(self, user: User, rule_id):
+        """Deletes a categorisation rule of a user. Expenses it has categorised
+        keep their category.
+
+        Args:
+            user (User object): The user, whose rule will be deleted
+            rule_id (int): The id of the rule
+
+        Returns:
+            True, if the rule was deleted, False if the user has no such rule
+        """
+        return rule_table.delete_rule(self._connection, "category_rules", user, rule_id)
+
+    def get_rules_by_user(self, user: User):
+        """Returns the categorisation rules of a specified user
+
+        Args:
+            user (User object): The user, whose rules should be found
+
+        Returns:
+            List of database rows of the rules, in the order they are tried
+        """
+        return rule_table.get_rules_by_user(self._connection, "category_rules", user)
+
+    def delete_all_rules(self):
+        """Deletes all categorisation rules in database
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            delete from category_rules;
+        """)
+
+        self._connection.commit()
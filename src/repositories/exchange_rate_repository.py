@@ -0,0 +1,86 @@
+from database_connection import connect_to_database
+
+
+class ExchangeRateRepository:
+    """This class is responsible for operations on the exchange_rates database table,
+    which holds the value of one unit of each currency in the base currency by date
+    """
+
+    def __init__(self):
+        """Class constructor
+        """
+        self._connection = connect_to_database()
+
+    def add_rates(self, rates):
+        """Adds exchange rates into database in a single transaction, replacing
+        the rates of a currency already in database for the same dates
+
+        Args:
+            rates (iterable): Tuples of currency code, date (YYYY-MM-DD) and the value
+                                of one unit of the currency in the base currency
+
+        Returns:
+            The number of added or replaced rates
+        """
+        cursor = self._connection.cursor()
+
+        cursor.executemany("""
+            insert into exchange_rates
+                (currency,
+                date,
+                rate)
+            values (?, ?, ?)
+            on conflict (currency, date) do update set rate=excluded.rate""", rates)
+        added = cursor.rowcount
+
+        self._connection.commit()
+
+        return added
+
+    def get_rates(self):
+        """Returns all exchange rates in database
+
+        Returns:
+            List of database rows with currency, date and rate, sorted by currency and date
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            select
+                currency,
+                date,
+                rate
+            from
+                exchange_rates
+            order by
+                currency, date""")
+
+        return cursor.fetchall()
+
+    def get_version(self):
+        """Returns a number that changes whenever exchange rates are added, changed
+        or deleted, also by another process
+
+        Returns:
+            The version of the exchange rates
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            select
+                version
+            from
+                exchange_rates_version""")
+
+        return cursor.fetchone()["version"]
+
+    def delete_all_rates(self):
+        """Deletes all exchange rates in database
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            delete from exchange_rates;
+        """)
+
+        self._connection.commit()
@@ -0,0 +1,86 @@
+from database_connection import connect_to_database
+from entities.user import User
+
+
+class ExpenseChangeRepository:
+    """This class is responsible for reading the expense_changes journal, in which
+    triggers record every change to an expense.
+    """
+
+    def __init__(self):
+        """Class constructor
+        """
+        self._connection = connect_to_database()
+
+    def get_changes_by_user(self, user: User, after, limit):
+        """Returns the expenses of a specified user that were added, changed or deleted
+        after a given point in the change journal. An expense that changed several
+        times is returned once, with its last change and its current details.
+
+        Args:
+            user (User object): The user, whose changes should be found
+            after (int): Sequence number of the last change already seen, 0 for all
+            limit (int): Maximum number of expenses returned
+
+        Returns:
+            List of database rows with seq, operation, id, name, amount, date and
+            category, ordered by seq. The details are None for deleted expenses.
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        select
+            expense_changes.seq,
+            expense_changes.operation,
+            expense_changes.expense_id as id,
+            expenses.name,
+            expenses.amount,
+            expenses.date,
+            categories.name as category
+        from
+            (select
+                max(seq) as seq
+            from
+                expense_changes
+            where
+                username=:username
+            and
+                seq > :after
+            group by
+                expense_id
+            order by
+                seq
+            limit :limit) as latest
+        join
+            expense_changes on expense_changes.seq=latest.seq
+        left join
+            expenses on expenses.id=expense_changes.expense_id
+        left join
+            categories on categories.id=expenses.category_id
+        order by
+            expense_changes.seq""",
+                       {"username": user.username, "after": after, "limit": limit})
+
+        return cursor.fetchall()
+
+    def get_last_change_seq(self, user: User):
+        """Returns the sequence number of the last change to a specified user's expenses
+        in the change journal, which grows whenever the user's expenses change
+
+        Args:
+            user (User object): The user, whose expenses are watched
+
+        Returns:
+            The sequence number, or 0 if the user's expenses have never changed
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        select
+            coalesce(max(seq), 0)
+        from
+            expense_changes
+        where
+            username=?""", (user.username,))
+
+        return cursor.fetchone()[0]
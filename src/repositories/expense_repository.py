@@ -1,9 +1,307 @@
+import hashlib
+import json
 import pandas as pd
 from database_connection import connect_to_database
 from entities.user import User
 from entities.expense import Expense
 from entities.category import Category
 
+# The columns of an expense listed to the user, selected from EXPENSE_TABLES
+EXPENSE_COLUMNS = """
+            expenses.id,
+            expenses.name,
+            amount,
+            date,
+            categories.name as category"""
+# The expenses joined with the categories they are in
+EXPENSE_TABLES = """
+            expenses
+        join
+            categories on categories.id=expenses.category_id"""
+# Conditions of select_expenses: the expenses of a user, of a user within a category
+# if one is given, and of a user's category
+USER_FILTER = "expenses.username=:username"
+USER_CATEGORY_FILTER = f"""{USER_FILTER}
+        and
+            (:category is null or categories.name=:category)"""
+CATEGORY_FILTER = """categories.username=:username
+        and
+            categories.name=:category"""
+# Inserts of insert_expenses. Only the first expense with the same content gets its
+# content hash when adding, while importing skips the expenses already in database.
+# When the expense with the hash is deleted or edited, a duplicate gets the hash.
+ADD_EXPENSE = """
+    insert into expenses
+        (username,
+        name,
+        amount,
+        date,
+        category_id,
+        content_hash,
+        currency,
+        original_amount)
+    values (:username, :name, :amount, :date, :category_id,
+        (case when exists (select 1 from expenses where content_hash=:hash)
+            then null else :hash end),
+        :currency, :original_amount)"""
+IMPORT_EXPENSE = """
+    insert or ignore into expenses
+        (username,
+        name,
+        amount,
+        date,
+        category_id,
+        content_hash,
+        currency,
+        original_amount)
+    values (:username, :name, :amount, :date, :category_id, :hash,
+        :currency, :original_amount)"""
+
+
+def select_expenses(where, order_by="date desc", columns=EXPENSE_COLUMNS):
+    """Builds a query selecting expenses from EXPENSE_TABLES
+
+    Args:
+        where (str): The condition the selected expenses meet, e.g. USER_FILTER
+        order_by (str, optional): The order of the expenses. Defaults to most recent first.
+        columns (str, optional): The selected columns. Defaults to EXPENSE_COLUMNS.
+
+    Returns:
+        The query
+    """
+    return f"""
+        select
+            {columns}
+        from
+            {EXPENSE_TABLES}
+        where
+            {where}
+        order by
+            {order_by}"""
+
+
+def fetch_in_chunks(cursor, chunk_size):
+    """Yields the rows of an executed query, fetching them chunk_size rows at a time
+
+    Args:
+        cursor: SQLite database cursor, after executing a query
+        chunk_size (int): Number of rows fetched at a time
+
+    Yields:
+        Database rows
+    """
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield from rows
+
+
+def content_hash(username, name, amount, expense_date, currency=None):
+    """Computes the hash identifying an expense by its content, used for
+    recognising expenses that have been imported already. Names are compared
+    case-insensitively and ignoring extra whitespace, and amounts to the cent.
+
+    Args:
+        username (str): The user the expense belongs to
+        name (str): The expense name
+        amount (float): The expense amount
+        expense_date (str): The expense date, YYYY-MM-DD
+        currency (str, optional): The currency of the amount, None for the base currency
+
+    Returns:
+        The hash as 16 bytes
+    """
+    normalized_name = " ".join(str(name).lower().split())
+    normalized_amount = f"{float(amount):.2f}" + (f" {currency}" if currency else "")
+    content = "\x1f".join([str(username), normalized_name, normalized_amount,
+                           str(expense_date)])
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+def expense_content_hash(username, expense: Expense):
+    """Computes the content hash of an expense, from its original amount and currency
+    if it was paid in another currency than the base currency, so that the hash does
+    not change when the expense is converted with new exchange rates
+
+    Args:
+        username (str): The user the expense belongs to
+        expense (Expense object): The expense
+
+    Returns:
+        The hash as 16 bytes
+    """
+    if expense.currency:
+        return content_hash(username, expense.name, expense.original_amount, expense.date,
+                            expense.currency)
+    return content_hash(username, expense.name, expense.amount, expense.date)
+
+
+def add_categories(cursor, user: User, category_names):
+    """Adds the categories a specified user does not have yet. Does not commit.
+
+    Args:
+        cursor: SQLite database cursor
+        user (User object): The user, whose categories are added
+        category_names (iterable of str): The names of the categories
+    """
+    cursor.executemany("""
+        insert into categories
+            (username,
+            name)
+        values (?, ?)
+        on conflict (username, name) do nothing""",
+                       ((user.username, name) for name in category_names))
+
+
+def pass_on_content_hashes(cursor, user: User, freed):
+    """Gives each content hash of deleted or edited expenses that is no longer in use
+    to a remaining expense with the same content, which had no hash as a duplicate,
+    so that importing the content again still skips it. Does not commit.
+
+    Args:
+        cursor: SQLite database cursor
+        user (User object): The user, whose expenses were deleted or edited
+        freed (list): Tuples of the content hash and the date of each deleted
+                        or edited expense, before editing
+
+    Returns:
+        The number of expenses that got a hash
+    """
+    freed = {bytes(expense_hash): expense_date
+             for expense_hash, expense_date in freed if expense_hash is not None}
+    if not freed:
+        return 0
+
+    # Only duplicates have no hash, so they are few and found with the hash index
+    cursor.execute("""
+        select
+            id,
+            name,
+            amount,
+            date,
+            currency,
+            original_amount
+        from
+            expenses
+        where
+            username=:username
+        and
+            content_hash is null
+        and
+            date in (select value from json_each(:dates))
+        order by
+            id""", {"username": user.username, "dates": json.dumps(list(set(freed.values())))})
+
+    heirs = {}
+    for row in cursor.fetchall():
+        expense_hash = expense_content_hash(user.username, Expense(
+            row["name"], row["amount"], row["date"], None, row["currency"],
+            row["original_amount"]))
+        if expense_hash in freed:
+            heirs.setdefault(expense_hash, row["id"])
+
+    cursor.executemany("""
+        update
+            expenses
+        set
+            content_hash=:hash
+        where
+            id=:id
+        and
+            not exists (select 1 from expenses where content_hash=:hash)""",
+                       ({"hash": expense_hash, "id": expense_id}
+                        for expense_hash, expense_id in heirs.items()))
+    return cursor.rowcount if heirs else 0
+
+
+def get_category_ids(cursor, user: User):
+    """Returns the ids of the categories of a specified user
+
+    Args:
+        cursor: SQLite database cursor
+        user (User object): The user, whose categories are found
+
+    Returns:
+        Dictionary of category ids by category name
+    """
+    cursor.execute("""
+        select
+            id,
+            name
+        from
+            categories
+        where
+            username=?""", (user.username,))
+
+    return {row["name"]: row["id"] for row in cursor.fetchall()}
+
+
+def attach_tags(cursor, user: User, expense_ids, tag_ids):
+    """Attaches tags to expenses of a specified user with one statement. Ids of other
+    users' expenses and tags are ignored. Does not commit.
+
+    Args:
+        cursor: SQLite database cursor
+        user (User object): The user, whose expenses are tagged
+        expense_ids (list of int): The ids of the expenses
+        tag_ids (list of int): The ids of the tags
+
+    Returns:
+        The number of tags attached to expenses, not counting the ones
+        the expenses had already
+    """
+    cursor.execute("""
+        insert or ignore into expense_tags
+            (tag_id,
+            expense_id)
+        select
+            tags.id,
+            expenses.id
+        from
+            json_each(:ids) as ids
+        cross join
+            expenses on expenses.id=ids.value
+        cross join
+            tags on tags.id in (select value from json_each(:tag_ids))
+        where
+            expenses.username=:username
+        and
+            tags.username=:username""",
+                   {"username": user.username, "ids": json.dumps(list(expense_ids)),
+                    "tag_ids": json.dumps(list(tag_ids))})
+
+    return cursor.rowcount
+
+
+def insert_expenses(cursor, user: User, expenses, insert=ADD_EXPENSE):
+    """Adds expenses of a specified user, and the categories they are in, with one
+    statement each. Does not commit.
+
+    Args:
+        cursor: SQLite database cursor
+        user (User object): The user, whose expenses are added
+        expenses (iterable of Expense objects): The expenses
+        insert (str, optional): ADD_EXPENSE, or IMPORT_EXPENSE for skipping the
+                                expenses already in database. Defaults to ADD_EXPENSE.
+
+    Returns:
+        The number of added expenses
+    """
+    expenses = list(expenses)
+
+    add_categories(cursor, user, {expense.category for expense in expenses})
+    category_ids = get_category_ids(cursor, user)
+
+    cursor.executemany(insert, (
+        {"username": user.username, "name": expense.name, "amount": expense.amount,
+         "date": expense.date, "category_id": category_ids[expense.category],
+         "hash": expense_content_hash(user.username, expense),
+         "currency": expense.currency, "original_amount": expense.original_amount}
+        for expense in expenses))
+
+    return cursor.rowcount
+
 
 class ExpenseRepository:
     """ This class is responsible for operations on the expenses database table.
@@ -22,20 +320,37 @@ class ExpenseRepository:
             expense (Expense object): The Expense object includes information
             on the expense name, amount, date and category to be added to database
         """
-        cursor = self._connection.cursor()
+        self.add_expenses(user, [expense])
 
-        cursor.execute("""
-            insert into expenses
-                (username,
-                name,
-                amount,
-                date,
-                category)
-            values (?, ?, ?, ?, ?)""",
-                (user.username, expense.name, expense.amount, expense.date, expense.category))
+    def add_expenses(self, user: User, expenses):
+        """Adds several new expenses for a user into database in a single transaction
+
+        Args:
+            user (User object): The user, whose expenses will be added
+            expenses (iterable of Expense objects): The expenses to be added to database
+        """
+        insert_expenses(self._connection.cursor(), user, expenses)
 
         self._connection.commit()
 
+    def import_expenses(self, user: User, expenses):
+        """Adds several new expenses for a user into database in a single transaction,
+        skipping the ones that have the same content as an expense already in database
+        or earlier in the list, e.g. when bank statements overlap
+
+        Args:
+            user (User object): The user, whose expenses will be added
+            expenses (iterable of Expense objects): The expenses to be added to database
+
+        Returns:
+            The number of added expenses
+        """
+        added = insert_expenses(self._connection.cursor(), user, expenses, IMPORT_EXPENSE)
+
+        self._connection.commit()
+
+        return added
+
     def find_expense(self, user: User, expense: Expense):
         """Finds a specified expense in database and returns database row object 
 
@@ -49,25 +364,24 @@ class ExpenseRepository:
         """
         cursor = self._connection.cursor()
 
-        select = """
+        select = f"""
             select
-                username,
-                name,
-                amount,
-                date,
-                category
+                {EXPENSE_COLUMNS},
+                expenses.username,
+                currency,
+                original_amount
             from
-                expenses
+                {EXPENSE_TABLES}
             where
-                username=?
+                expenses.username=?
             and
-                name=?
+                expenses.name=?
             and
                 amount=?
             and 
                 date=?
             and
-                category=?"""
+                categories.name=?"""
 
         cursor.execute(select, (user.username, expense.name,
                        expense.amount, expense.date, expense.category))
@@ -76,35 +390,259 @@ class ExpenseRepository:
 
         return found
 
-    def delete_expense(self, user: User, expense: Expense):
-        """Deletes a specified expense belonging to a specified user
+    def get_expenses_by_ids(self, user: User, expense_ids):
+        """Returns expenses belonging to a specified user by their ids
 
         Args:
-            user (User object): The user, whose expense should be deleted
-            expense (Expense object): The Expense object includes information
-            on the expense name, amount, date and category to be deleted from database
+            user (User object): The user, whose expenses should be found
+            expense_ids (list of int): The ids of the expenses
+
+        Returns:
+            List of database rows with id, name, amount, date, category, currency and
+            original_amount, in the order of the ids. Ids of other users' expenses,
+            or of deleted ones, are left out.
         """
         cursor = self._connection.cursor()
 
-        delete = """
-            delete from
+        cursor.execute(f"""
+        select
+            {EXPENSE_COLUMNS},
+            currency,
+            original_amount
+        from
+            json_each(:ids) as ids
+        cross join
+            expenses on expenses.id=ids.value
+        join
+            categories on categories.id=expenses.category_id
+        where
+            expenses.username=:username
+        order by
+            ids.key""", {"username": user.username, "ids": json.dumps(list(expense_ids))})
+
+        return cursor.fetchall()
+
+    def update_expenses(self, user: User, expenses):
+        """Replaces the details of expenses of a specified user in a single transaction,
+        keeping their ids and so their tags. Their content hashes are computed anew.
+
+        Args:
+            user (User object): The user, whose expenses are updated
+            expenses (iterable): Pairs of the id of an expense and an Expense object
+                                with its new details
+
+        Returns:
+            The number of updated expenses
+        """
+        expenses = list(expenses)
+        cursor = self._connection.cursor()
+
+        add_categories(cursor, user, {expense.category for _, expense in expenses})
+
+        cursor.execute("""
+            select
+                content_hash,
+                date
+            from
                 expenses
             where
-                username=?
+                id in (select value from json_each(:ids))
             and
-                name=?
+                username=:username
             and
-                amount=?
-            and 
-                date=?
+                content_hash is not null""",
+                       {"username": user.username,
+                        "ids": json.dumps([expense_id for expense_id, _ in expenses])})
+        freed = cursor.fetchall()
+
+        cursor.executemany("""
+        update
+            expenses
+        set
+            name=:name,
+            amount=:amount,
+            date=:date,
+            category_id=(select id from categories where username=:username and name=:category),
+            currency=:currency,
+            original_amount=:original_amount,
+            content_hash=(case when exists (
+                select 1 from expenses where content_hash=:hash and id != :id)
+                then null else :hash end)
+        where
+            id=:id
+        and
+            username=:username""",
+                           ({"username": user.username, "id": expense_id, "name": expense.name,
+                             "amount": expense.amount, "date": expense.date,
+                             "category": expense.category, "currency": expense.currency,
+                             "original_amount": expense.original_amount,
+                             "hash": expense_content_hash(user.username, expense)}
+                            for expense_id, expense in expenses))
+        updated = cursor.rowcount
+
+        pass_on_content_hashes(cursor, user, freed)
+
+        self._connection.commit()
+
+        return updated
+
+    def get_expense_snapshots(self, user: User, expense_ids):
+        """Returns everything needed to restore expenses of a specified user after they
+        have been deleted, e.g. to undo the deletion
+
+        Args:
+            user (User object): The user, whose expenses should be found
+            expense_ids (list of int): The ids of the expenses
+
+        Returns:
+            List of lists of the id, name, amount, date, category, currency, original
+            amount and tag ids of each found expense
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute(f"""
+        select
+            {EXPENSE_COLUMNS},
+            currency,
+            original_amount,
+            (select
+                json_group_array(tag_id)
+            from
+                expense_tags
+            where
+                expense_id=expenses.id) as tag_ids
+        from
+            json_each(:ids) as ids
+        cross join
+            expenses on expenses.id=ids.value
+        join
+            categories on categories.id=expenses.category_id
+        where
+            expenses.username=:username""",
+                       {"username": user.username, "ids": json.dumps(list(expense_ids))})
+
+        return [list(row)[:-1] + [json.loads(row["tag_ids"])] for row in cursor.fetchall()]
+
+    def restore_expenses(self, user: User, snapshots):
+        """Adds expenses deleted earlier back into database with their ids and tags,
+        in a single transaction. An expense whose id has been reused since gets a new
+        id, and tags deleted since are not restored.
+
+        Args:
+            user (User object): The user, whose expenses are restored
+            snapshots (list): The expenses, as returned by get_expense_snapshots
+
+        Returns:
+            List of the ids of the restored expenses
+        """
+        cursor = self._connection.cursor()
+
+        add_categories(cursor, user, {snapshot[4] for snapshot in snapshots})
+
+        # Ids reused since get new ones after the largest id in use, like sqlite
+        # would choose, so that all expenses are inserted with one statement
+        snapshot_ids = json.dumps([snapshot[0] for snapshot in snapshots])
+        taken_ids, next_id = cursor.execute("""
+            select
+                json_group_array(id) filter (where id in (select value from json_each(:ids))),
+                coalesce(max(id), 0) + 1
+            from
+                expenses""", {"ids": snapshot_ids}).fetchone()
+        taken_ids = set(json.loads(taken_ids))
+        next_id = max([next_id, *(snapshot[0] + 1 for snapshot in snapshots)])
+
+        expense_ids = []
+        for snapshot in snapshots:
+            if snapshot[0] in taken_ids:
+                expense_ids.append(next_id)
+                next_id += 1
+            else:
+                expense_ids.append(snapshot[0])
+
+        cursor.executemany("""
+            insert into expenses
+                (id,
+                username,
+                name,
+                amount,
+                date,
+                category_id,
+                content_hash,
+                currency,
+                original_amount)
+            values (
+                :id, :username, :name, :amount, :date,
+                (select id from categories where username=:username and name=:category),
+                (case when exists (select 1 from expenses where content_hash=:hash)
+                    then null else :hash end),
+                :currency, :original_amount)""", (
+            {"id": expense_id, "username": user.username, "name": name,
+             "amount": amount, "date": expense_date, "category": category,
+             "hash": expense_content_hash(
+                 user.username, Expense(name, amount, expense_date, category, currency,
+                                        original_amount)),
+             "currency": currency, "original_amount": original_amount}
+            for expense_id, (_, name, amount, expense_date, category, currency,
+                             original_amount, _) in zip(expense_ids, snapshots)))
+
+        cursor.execute("""
+            insert or ignore into expense_tags
+                (tag_id,
+                expense_id)
+            select
+                tags.id,
+                expenses.id
+            from
+                json_each(:tags) as restored
+            cross join
+                expenses on expenses.id=restored.value ->> 0
+            cross join
+                tags on tags.id=restored.value ->> 1
+            where
+                expenses.username=:username
             and
-                category=?"""
+                tags.username=:username""",
+                       {"username": user.username, "tags": json.dumps([
+                           [expense_id, tag_id]
+                           for expense_id, snapshot in zip(expense_ids, snapshots)
+                           for tag_id in snapshot[7]])})
 
-        cursor.execute(delete, (user.username, expense.name,
-                       expense.amount, expense.date, expense.category))
+        self._connection.commit()
+
+        return expense_ids
+
+    def delete_expenses_by_ids(self, user: User, expense_ids):
+        """Deletes expenses belonging to a specified user by their ids with a single
+        delete statement
+
+        Args:
+            user (User object): The user, whose expenses should be deleted
+            expense_ids (list of int): The ids of the expenses
+
+        Returns:
+            The number of deleted expenses
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            delete from
+                expenses
+            where
+                id in (select value from json_each(:ids))
+            and
+                username=:username
+            returning
+                content_hash,
+                date""",
+                       {"username": user.username, "ids": json.dumps(list(expense_ids))})
+        freed = cursor.fetchall()
+
+        pass_on_content_hashes(cursor, user, freed)
 
         self._connection.commit()
 
+        return len(freed)
+
     def delete_all_expenses(self):
         """Deletes all expenses in database table
         """
@@ -113,6 +651,21 @@ class ExpenseRepository:
         cursor.execute("""
         delete from expenses;
         """)
+        cursor.execute("""
+        delete from categories;
+        """)
+        cursor.execute("""
+        delete from expense_changes;
+        """)
+        cursor.execute("""
+        delete from expense_rollups;
+        """)
+        cursor.execute("""
+        delete from expense_rollup_queue;
+        """)
+        cursor.execute("""
+        delete from tags;
+        """)
 
         self._connection.commit()
 
@@ -124,8 +677,15 @@ class ExpenseRepository:
         """
         cursor = self._connection.cursor()
 
-        cursor.execute("""
-        select * from expenses
+        cursor.execute(f"""
+        select
+            {EXPENSE_COLUMNS},
+            expenses.username,
+            content_hash,
+            currency,
+            original_amount
+        from
+            {EXPENSE_TABLES}
         """)
 
         found = cursor.fetchall()
@@ -143,20 +703,7 @@ class ExpenseRepository:
         """
         cursor = self._connection.cursor()
 
-        cursor.execute("""
-        select
-            name,
-            amount,
-            date,
-            category
-        from 
-            expenses
-        where
-           username=:c
-        order by
-            date desc""",
-                       {"c": user.username}
-                       )
+        cursor.execute(select_expenses(USER_FILTER), {"username": user.username})
         found = cursor.fetchall()
 
         return found
@@ -173,27 +720,84 @@ class ExpenseRepository:
         """
         cursor = self._connection.cursor()
 
-        find_all = """
-        select
-            name,
-            amount,
-            date, 
-            category
-        from 
-            expenses
-        where
-           username=?
-        and
-            category=?
-        order by
-            date desc
-        """
-
-        cursor.execute(find_all, (user.username, category.name))
+        cursor.execute(select_expenses(CATEGORY_FILTER),
+                       {"username": user.username, "category": category.name})
         found = cursor.fetchall()
 
         return found
 
+    def get_expenses_by_user_page(self, user: User, offset, limit, category: Category = None):
+        """Returns one page of the expenses belonging to a specified user
+
+        Args:
+            user (User object): The user, whose expenses should be found
+            offset (int): Number of expenses skipped from the start of the list
+            limit (int): Maximum number of expenses returned
+            category (Category object, optional): If given, only expenses
+                                                within this category are found
+
+        Returns:
+            List of database rows of the user's expenses, most recent first
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute(select_expenses(USER_CATEGORY_FILTER, "date desc, expenses.id desc") + """
+        limit :limit
+        offset :offset""",
+                       {"username": user.username,
+                        "category": category.name if category else None,
+                        "limit": limit,
+                        "offset": offset})
+
+        return cursor.fetchall()
+
+    def iterate_expenses_by_user(self, user: User, category: Category = None,
+                                 chunk_size=1000):
+        """Yields the expenses belonging to a specified user, fetching
+        them from database in chunks instead of all at once
+
+        Args:
+            user (User object): The user, whose expenses should be found
+            category (Category object, optional): If given, only expenses
+                                                within this category are found
+            chunk_size (int, optional): Number of rows fetched at a time. Defaults to 1000.
+
+        Yields:
+            Database rows of the user's expenses, most recent first
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute(select_expenses(USER_CATEGORY_FILTER),
+                       {"username": user.username,
+                        "category": category.name if category else None})
+
+        yield from fetch_in_chunks(cursor, chunk_size)
+
+    def get_expense_summary(self, user: User):
+        """Returns the number of a specified user's expenses, and the lengths
+        of their longest expense and category names
+
+        Args:
+            user (User object): The user, whose expenses should be summarised
+
+        Returns:
+            Database row with count, name_length and category_length,
+            the lengths being None if the user has no expenses
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute(f"""
+        select
+            count(*) as count,
+            max(length(expenses.name)) as name_length,
+            max(length(categories.name)) as category_length
+        from
+            {EXPENSE_TABLES}
+        where
+            expenses.username=?""", (user.username,))
+
+        return cursor.fetchone()
+
     def get_all_expenses_as_pandas_dataframe(self):
         """Returns a pandas dataframe with all expenses in the database
 
@@ -201,5 +805,76 @@ class ExpenseRepository:
             Pandas dataframe of all expenses in database expenses table
         """
         dataframe = pd.read_sql_query(
-            "SELECT username, name, amount, date, category from expenses", self._connection)
+            f"""SELECT expenses.username, expenses.name, amount, date, categories.name as category
+            from {EXPENSE_TABLES}""",
+            self._connection)
+        return dataframe
+
+    def get_expenses_as_pandas_dataframe(self, user: User):
+        """Returns a pandas dataframe with the expenses of a specified user
+
+        Args:
+            user (User object): The user, whose expenses should be returned
+
+        Returns:
+            Pandas dataframe with the name, amount, date and category of the user's expenses
+        """
+        dataframe = pd.read_sql_query(
+            f"""SELECT expenses.name, amount, date, categories.name as category
+            from {EXPENSE_TABLES}
+            where expenses.username=?""",
+            self._connection, params=(user.username,))
         return dataframe
+
+    def get_expenses_in_currency(self, currency, start=None):
+        """Returns the expenses of all users paid in a specified currency
+
+        Args:
+            currency (str): The currency code
+            start (str, optional): If given, only expenses on or after this date are returned
+
+        Returns:
+            List of database rows with id, original_amount and date
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        select
+            id,
+            original_amount,
+            date
+        from
+            expenses
+        where
+            currency=:currency
+        and
+            (:start is null or date >= :start)""", {"currency": currency, "start": start})
+
+        return cursor.fetchall()
+
+    def update_amounts(self, amounts):
+        """Changes the amounts of expenses in a single transaction, e.g. after they
+        have been converted into the base currency with new exchange rates
+
+        Args:
+            amounts (iterable): Pairs of the new amount and the id of the expense
+
+        Returns:
+            The number of expenses whose amount changed
+        """
+        cursor = self._connection.cursor()
+
+        cursor.executemany("""
+        update
+            expenses
+        set
+            amount=?1
+        where
+            id=?2
+        and
+            amount != ?1""", amounts)
+        changed = cursor.rowcount
+
+        self._connection.commit()
+
+        return changed
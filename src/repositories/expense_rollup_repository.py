@@ -0,0 +1,213 @@
+from database_connection import connect_to_database
+from entities.user import User
+from entities.category import Category
+
+
+def refresh_rollups(connection):
+    """Brings the expense_rollups table up to date with the expenses, re-rolling only
+    the buckets queued by the triggers on the expenses table. Each queued day is
+    summed up from its expenses, and each affected month and year from the day and
+    month rollups below it, so the totals stay exact however many edits are made.
+    Does not commit.
+
+    Args:
+        connection: SQLite database connection
+
+    Returns:
+        The number of queued days that were re-rolled
+    """
+    queued = connection.execute("select count(*) from expense_rollup_queue").fetchone()[0]
+    if not queued:
+        return 0
+
+    connection.execute("""
+        delete from expense_rollups
+        where period='day'
+        and (username, category_id, bucket) in (
+            select username, category_id, day from expense_rollup_queue)""")
+    connection.execute("""
+        insert into expense_rollups (username, period, category_id, bucket, total, count)
+        select
+            queue.username, 'day', queue.category_id, queue.day,
+            sum(expenses.amount), count(*)
+        from
+            expense_rollup_queue as queue
+        join
+            expenses on expenses.category_id=queue.category_id and expenses.date=queue.day
+        group by
+            queue.category_id, queue.day""")
+
+    # The buckets table is kept for the connection and emptied before each use, so
+    # that a refresh that failed before deleting its rows does not break the next one
+    connection.execute("""
+        create temporary table if not exists rollup_buckets
+            (username text, category_id integer, bucket text)""")
+
+    for period, length, lower_period, first, last in [("month", 7, "day", "-01", "-31"),
+                                                      ("year", 4, "month", "-01", "-12")]:
+        connection.execute("delete from temp.rollup_buckets")
+        connection.execute(f"""
+            insert into temp.rollup_buckets (username, category_id, bucket)
+            select distinct username, category_id, substr(day, 1, {length})
+            from expense_rollup_queue""")
+        connection.execute(f"""
+            delete from expense_rollups
+            where period='{period}'
+            and (username, category_id, bucket) in (
+                select username, category_id, bucket from temp.rollup_buckets)""")
+        connection.execute(f"""
+            insert into expense_rollups (username, period, category_id, bucket, total, count)
+            select
+                buckets.username, '{period}', buckets.category_id, buckets.bucket,
+                sum(rollups.total), sum(rollups.count)
+            from
+                temp.rollup_buckets as buckets
+            join
+                expense_rollups as rollups
+                on rollups.username=buckets.username
+                and rollups.period='{lower_period}'
+                and rollups.category_id=buckets.category_id
+                and rollups.bucket between buckets.bucket || '{first}'
+                    and buckets.bucket || '{last}'
+            group by
+                buckets.category_id, buckets.bucket""")
+
+    connection.execute("delete from expense_rollup_queue")
+    return queued
+
+
+class ExpenseRollupRepository:
+    """This class is responsible for operations on the expense_rollups database table,
+    which holds the daily, monthly and yearly totals of expenses per category.
+    """
+
+    def __init__(self):
+        """Class constructor
+        """
+        self._connection = connect_to_database()
+
+    def refresh_rollups(self):
+        """Re-rolls the daily, monthly and yearly totals affected by the expenses
+        added, edited or deleted since the last refresh. Commits only if there was
+        something to re-roll, and rolls back if re-rolling fails.
+
+        Returns:
+            The number of re-rolled days
+        """
+        try:
+            refreshed = refresh_rollups(self._connection)
+        except BaseException:
+            self._connection.rollback()
+            raise
+
+        if refreshed:
+            self._connection.commit()
+        return refreshed
+
+    def get_rollup_totals(self, user: User, period, category: Category = None,
+                          start=None, end=None):
+        """Returns the total amount of a specified user's expenses in each day, month
+        or year, read from the rollups instead of the expenses
+
+        Args:
+            user (User object): The user, whose expenses should be summed up
+            period (str): day, month or year
+            category (Category object, optional): If given, only expenses
+                                                within this category are summed up
+            start (str, optional): First bucket included, e.g. 2023-01 for months
+            end (str, optional): Last bucket included
+
+        Returns:
+            List of database rows with bucket, total and count, sorted by bucket
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        select
+            bucket,
+            sum(total) as total,
+            sum(count) as count
+        from
+            expense_rollups
+        where
+            username=:username
+        and
+            period=:period
+        and
+            (:category is null or category_id=(
+                select id from categories where username=:username and name=:category))
+        and
+            (:start is null or bucket >= :start)
+        and
+            (:end is null or bucket <= :end)
+        group by
+            bucket
+        order by
+            bucket""",
+                       {"username": user.username, "period": period,
+                        "category": category.name if category else None,
+                        "start": start, "end": end})
+
+        return cursor.fetchall()
+
+    def get_rollup_totals_by_category(self, user: User):
+        """Returns the total amount of a specified user's expenses in each category,
+        summed up from the yearly rollups
+
+        Args:
+            user (User object): The user, whose expenses should be summed up
+
+        Returns:
+            List of database rows with category and total, sorted by category
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        select
+            categories.name as category,
+            sum(total) as total
+        from
+            expense_rollups
+        join
+            categories on categories.id=expense_rollups.category_id
+        where
+            expense_rollups.username=?
+        and
+            period='year'
+        group by
+            categories.id
+        order by
+            category""", (user.username,))
+
+        return cursor.fetchall()
+
+    def get_monthly_totals_by_category(self, user: User):
+        """Returns the total amount of a specified user's expenses in each category
+        and month, read from the monthly rollups
+
+        Args:
+            user (User object): The user, whose expenses should be summed up
+
+        Returns:
+            List of database rows with category, bucket (YYYY-MM) and total,
+            sorted by category and bucket
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        select
+            categories.name as category,
+            bucket,
+            total
+        from
+            expense_rollups
+        join
+            categories on categories.id=expense_rollups.category_id
+        where
+            expense_rollups.username=?
+        and
+            period='month'
+        order by
+            category, bucket""", (user.username,))
+
+        return cursor.fetchall()
@@ -0,0 +1,88 @@
+from database_connection import connect_to_database
+from repositories.expense_repository import (EXPENSE_COLUMNS, USER_FILTER, select_expenses,
+                                            fetch_in_chunks)
+from entities.user import User
+
+
+class ExpenseSearchRepository:
+    """This class is responsible for finding expenses by name, through the
+    expenses_search full-text index, and for reading them in amount order.
+    """
+
+    def __init__(self):
+        """Class constructor
+        """
+        self._connection = connect_to_database()
+
+    def search_expenses(self, user: User, terms, limit):
+        """Finds the most recent expenses of a specified user whose name has a word
+        starting with each of the search terms, or whose category name starts with
+        the search terms joined by spaces
+
+        Args:
+            user (User object): The user, whose expenses should be searched
+            terms (list of str): The search terms
+            limit (int): Maximum number of expenses found by name, and by category
+
+        Returns:
+            List of database rows with the id, name, amount, date and category
+            of the found expenses
+        """
+        if not terms:
+            return []
+
+        cursor = self._connection.cursor()
+
+        owner = "u" + user.username.encode("utf-8").hex()
+        prefixes = " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+        by_category = select_expenses(
+            "categories.username=:username and categories.name like :category escape '\\'")
+
+        cursor.execute(f"""
+        select
+            {EXPENSE_COLUMNS}
+        from
+            (select
+                rowid
+            from
+                expenses_search
+            where
+                expenses_search match :match
+            order by
+                rowid desc
+            limit :limit) as matches
+        join
+            expenses on expenses.id=matches.rowid
+        join
+            categories on categories.id=expenses.category_id
+        union
+        select
+            *
+        from
+            ({by_category}
+            limit :limit)""",
+                       {"match": f'owner : "{owner}" AND name : ({prefixes})',
+                        "username": user.username,
+                        "category": " ".join(terms).replace("\\", "\\\\")
+                        .replace("%", "\\%").replace("_", "\\_") + "%",
+                        "limit": limit})
+
+        return cursor.fetchall()
+
+    def iterate_expenses_by_amount(self, user: User, chunk_size=1000):
+        """Yields the expenses belonging to a specified user ordered by amount and date,
+        fetching them from database in chunks
+
+        Args:
+            user (User object): The user, whose expenses should be found
+            chunk_size (int, optional): Number of rows fetched at a time. Defaults to 1000.
+
+        Yields:
+            Database rows with the id, name, amount, date and category of the expenses
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute(select_expenses(USER_FILTER, "amount, date, expenses.id"),
+                       {"username": user.username})
+
+        yield from fetch_in_chunks(cursor, chunk_size)
@@ -0,0 +1,144 @@
+import json
+from database_connection import connect_to_database
+from entities.user import User
+
+
+class OperationJournalRepository:
+    """This class is responsible for operations on the operation_journal database table,
+    which stores the undo and redo history of users between sessions.
+    """
+
+    def __init__(self):
+        """Class constructor
+        """
+        self._connection = connect_to_database()
+
+    def add_operation(self, user: User, stack, description, operation, limit):
+        """Adds an operation on top of a user's undo or redo stack, and drops the
+        oldest operations of the stack beyond the limit
+
+        Args:
+            user (User object): The user, whose operation will be added
+            stack (str): "undo" or "redo"
+            description (str): What the operation undoes or redoes
+            operation (list): The operation, as a JSON serializable list
+            limit (int): The largest number of operations kept in the stack
+
+        Returns:
+            The id of the added operation
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            insert into operation_journal
+                (username,
+                stack,
+                description,
+                operation)
+            values (?, ?, ?, ?)""",
+                       (user.username, stack, description, json.dumps(operation)))
+        operation_id = cursor.lastrowid
+
+        cursor.execute("""
+            delete from
+                operation_journal
+            where
+                username=:username
+            and
+                stack=:stack
+            and
+                id <= (
+                    select
+                        id
+                    from
+                        operation_journal
+                    where
+                        username=:username
+                    and
+                        stack=:stack
+                    order by
+                        id desc
+                    limit 1 offset :limit)""",
+                       {"username": user.username, "stack": stack, "limit": limit})
+
+        self._connection.commit()
+
+        return operation_id
+
+    def get_operations(self, user: User, stack, limit):
+        """Returns the latest operations of a user's undo or redo stack
+
+        Args:
+            user (User object): The user, whose operations should be found
+            stack (str): "undo" or "redo"
+            limit (int): The largest number of operations returned
+
+        Returns:
+            List of the id, description and operation of each operation,
+            the oldest first
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            select
+                id,
+                description,
+                operation
+            from
+                operation_journal
+            where
+                username=?
+            and
+                stack=?
+            order by
+                id desc
+            limit ?""", (user.username, stack, limit))
+
+        return [(row["id"], row["description"], json.loads(row["operation"]))
+                for row in reversed(cursor.fetchall())]
+
+    def delete_operation(self, operation_id):
+        """Deletes an operation, e.g. after it has been undone or redone
+
+        Args:
+            operation_id (int): The id of the operation
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            delete from
+                operation_journal
+            where
+                id=?""", (operation_id,))
+
+        self._connection.commit()
+
+    def delete_operations(self, user: User, stack):
+        """Deletes all operations of a user's undo or redo stack
+
+        Args:
+            user (User object): The user, whose operations should be deleted
+            stack (str): "undo" or "redo"
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            delete from
+                operation_journal
+            where
+                username=?
+            and
+                stack=?""", (user.username, stack))
+
+        self._connection.commit()
+
+    def delete_all_operations(self):
+        """Deletes all operations in database
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            delete from operation_journal;
+        """)
+
+        self._connection.commit()
@@ -0,0 +1,136 @@
+from database_connection import connect_to_database
+from entities.user import User
+from entities.expense import Expense
+from entities.recurring_expense import RecurringExpense
+from repositories.expense_repository import insert_expenses
+from repositories import rule_table
+
+
+class RecurringExpenseRepository:
+    """This class is responsible for operations on the recurring_expenses database
+    table, and for adding the expenses created by the recurring expense rules.
+    """
+
+    def __init__(self):
+        """Class constructor
+        """
+        self._connection = connect_to_database()
+
+    def add_rule(self, user: User, rule: RecurringExpense):
+        """Adds a new recurring expense rule for a user into database. Its first
+        expense is due on its start date.
+
+        Args:
+            user (User object): The user, whose rule will be added
+            rule (RecurringExpense object): The rule to be added
+
+        Returns:
+            The id of the added rule
+        """
+        return rule_table.insert_rule(self._connection, "recurring_expenses", user, {
+            "name": rule.name, "amount": rule.amount, "category": rule.category,
+            "frequency": rule.frequency, "interval": rule.interval,
+            "start_date": rule.start_date, "end_date": rule.end_date,
+            "next_due": rule.start_date})
+
+    def delete_rule(self, user: User, rule_id):
+        """Deletes a recurring expense rule of a user. The expenses it has
+        created already are kept.
+
+        Args:
+            user (User object): The user, whose rule will be deleted
+            rule_id (int): The id of the rule
+
+        Returns:
+            True, if the rule was deleted, False if the user has no such rule
+        """
+        return rule_table.delete_rule(self._connection, "recurring_expenses", user, rule_id)
+
+    def get_rules_by_user(self, user: User):
+        """Returns the recurring expense rules of a specified user
+
+        Args:
+            user (User object): The user, whose rules should be found
+
+        Returns:
+            List of database rows of the rules, ordered by id
+        """
+        return rule_table.get_rules_by_user(self._connection, "recurring_expenses", user)
+
+    def find_due_rules(self, today, user: User = None):
+        """Finds the rules of all users, or of a specified user, whose next expense
+        is due on or before a date, using the index on next_due
+
+        Args:
+            today (str): The date, YYYY-MM-DD
+            user (User object, optional): If given, only the rules of this user are found
+
+        Returns:
+            List of database rows of the due rules
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            select
+                *
+            from
+                recurring_expenses
+            where
+                next_due <= :today
+            and
+                (:username is null or username=:username)""",
+                       {"today": today, "username": user.username if user else None})
+
+        return cursor.fetchall()
+
+    def add_due_expenses(self, due_rules):
+        """Adds the expenses created by due rules and moves the rules on to their
+        next due dates, all in one transaction. A rule whose next due date has
+        changed since it was read, e.g. because another process got to it first,
+        is skipped, so no expense is created twice.
+
+        Args:
+            due_rules (list): Tuples of a database row of a rule, as returned by
+                                find_due_rules, the dates of the expenses it creates,
+                                and its new next due date, None once it has ended
+
+        Returns:
+            The number of added expenses
+        """
+        cursor = self._connection.cursor()
+
+        try:
+            expenses = {}
+            for rule, dates, next_due in due_rules:
+                cursor.execute("""
+                    update
+                        recurring_expenses
+                    set
+                        next_due=?
+                    where
+                        id=? and next_due=?""", (next_due, rule["id"], rule["next_due"]))
+                if cursor.rowcount:
+                    expenses.setdefault(rule["username"], []).extend(
+                        Expense(rule["name"], rule["amount"], expense_date, rule["category"])
+                        for expense_date in dates)
+
+            for username, user_expenses in expenses.items():
+                insert_expenses(cursor, User(username, None), user_expenses)
+
+            self._connection.commit()
+        except BaseException:
+            self._connection.rollback()
+            raise
+
+        return sum(len(user_expenses) for user_expenses in expenses.values())
+
+    def delete_all_rules(self):
+        """Deletes all recurring expense rules in database
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            delete from recurring_expenses;
+        """)
+
+        self._connection.commit()
@@ -0,0 +1,68 @@
+from entities.user import User
+
+
+def insert_rule(connection, table, user: User, columns):
+    """Adds a rule of a specified user into a rule table, i.e. category_rules or
+    recurring_expenses, and commits
+
+    Args:
+        connection: SQLite database connection
+        table (str): The name of the rule table
+        user (User object): The user, whose rule will be added
+        columns (dict): The values of the rule's columns besides username, by column name
+
+    Returns:
+        The id of the added rule
+    """
+    names = ", ".join(["username", *columns])
+    placeholders = ", ".join("?" * (len(columns) + 1))
+
+    cursor = connection.execute(f"insert into {table} ({names}) values ({placeholders})",
+                                (user.username, *columns.values()))
+    connection.commit()
+
+    return cursor.lastrowid
+
+
+def delete_rule(connection, table, user: User, rule_id):
+    """Deletes a rule of a specified user from a rule table, and commits
+
+    Args:
+        connection: SQLite database connection
+        table (str): The name of the rule table
+        user (User object): The user, whose rule will be deleted
+        rule_id (int): The id of the rule
+
+    Returns:
+        True, if the rule was deleted, False if the user has no such rule
+    """
+    cursor = connection.execute(f"""
+        delete from
+            {table}
+        where
+            id=? and username=?""", (rule_id, user.username))
+    connection.commit()
+
+    return cursor.rowcount > 0
+
+
+def get_rules_by_user(connection, table, user: User):
+    """Returns the rules of a specified user in a rule table
+
+    Args:
+        connection: SQLite database connection
+        table (str): The name of the rule table
+        user (User object): The user, whose rules should be found
+
+    Returns:
+        List of database rows of the rules, ordered by id
+    """
+    return connection.execute(f"""
+        select
+            *
+        from
+            {table}
+        where
+            username=?
+        order by
+            id""", (user.username,)).fetchall()
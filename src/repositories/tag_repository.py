@@ -0,0 +1,250 @@
+import json
+from database_connection import connect_to_database
+from entities.user import User
+from entities.category import Category
+from repositories.expense_repository import USER_CATEGORY_FILTER, select_expenses, attach_tags
+
+# The ids of the tags of a user with the names in a JSON array
+TAG_IDS = """
+                    select
+                        id
+                    from
+                        tags
+                    where
+                        username=:username
+                    and
+                        name in (select value from json_each(:tags))"""
+
+class TagRepository:
+    """This class is responsible for operations on the tags and expense_tags
+    database tables, which attach any number of tags to each expense.
+    """
+
+    def __init__(self):
+        """Class constructor
+        """
+        self._connection = connect_to_database()
+
+    def tag_expenses(self, user: User, expense_ids, tag_names):
+        """Attaches tags to expenses of a specified user in a single transaction.
+        Tags the user does not have yet are created, and ids of other users'
+        expenses are ignored.
+
+        Args:
+            user (User object): The user, whose expenses are tagged
+            expense_ids (list of int): The ids of the expenses
+            tag_names (list of str): The names of the tags
+
+        Returns:
+            The number of tags attached to expenses, not counting the ones
+            the expenses had already
+        """
+        cursor = self._connection.cursor()
+
+        cursor.executemany("""
+            insert into tags
+                (username,
+                name)
+            values (?, ?)
+            on conflict (username, name) do nothing""",
+                           ((user.username, name) for name in tag_names))
+
+        cursor.execute(TAG_IDS, {"username": user.username,
+                                 "tags": json.dumps(list(tag_names))})
+        tag_ids = [row["id"] for row in cursor.fetchall()]
+        tagged = attach_tags(cursor, user, expense_ids, tag_ids)
+
+        self._connection.commit()
+
+        return tagged
+
+    def untag_expenses(self, user: User, expense_ids, tag_names):
+        """Detaches tags from expenses of a specified user in a single transaction
+
+        Args:
+            user (User object): The user, whose expenses are untagged
+            expense_ids (list of int): The ids of the expenses
+            tag_names (list of str): The names of the tags
+
+        Returns:
+            The number of tags detached from expenses
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute(f"""
+            delete from
+                expense_tags
+            where
+                tag_id in ({TAG_IDS})
+            and
+                expense_id in (select value from json_each(:ids))""",
+                       {"username": user.username, "tags": json.dumps(list(tag_names)),
+                        "ids": json.dumps(list(expense_ids))})
+        untagged = cursor.rowcount
+
+        self._connection.commit()
+
+        return untagged
+
+    def find_expenses_by_tags(self, user: User, tag_names, required,
+                              category: Category = None):
+        """Finds the expenses of a specified user that have at least a given number
+        of the given tags. The expenses with each tag are read from the primary key
+        of expense_tags and counted per expense, and only the expenses counted
+        often enough are then looked up by id.
+
+        Args:
+            user (User object): The user, whose expenses should be found
+            tag_names (list of str): The names of the tags, without duplicates
+            required (int): How many of the tags an expense must have, e.g. 1 for
+                            any of them or the number of tags for all of them
+            category (Category object, optional): If given, only expenses
+                                                within this category are found
+
+        Returns:
+            List of database rows with id, name, amount, date and category,
+            most recent first
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute(select_expenses(f"""{USER_CATEGORY_FILTER}
+        and
+            expenses.id in (
+                select
+                    expense_id
+                from
+                    expense_tags
+                where
+                    tag_id in ({TAG_IDS})
+                group by
+                    expense_id
+                having
+                    count(*) >= :required)""", "date desc, expenses.id"),
+                       {"username": user.username, "tags": json.dumps(list(tag_names)),
+                        "required": required,
+                        "category": category.name if category else None})
+
+        return cursor.fetchall()
+
+    def get_tags_by_expenses(self, user: User, expense_ids):
+        """Returns the tags of expenses of a specified user
+
+        Args:
+            user (User object): The user, whose expenses' tags should be found
+            expense_ids (list of int): The ids of the expenses
+
+        Returns:
+            List of database rows with expense_id and tag, sorted by expense and tag
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        select
+            expense_tags.expense_id,
+            tags.name as tag
+        from
+            expense_tags
+        join
+            tags on tags.id=expense_tags.tag_id
+        where
+            expense_tags.expense_id in (select value from json_each(:ids))
+        and
+            tags.username=:username
+        order by
+            expense_tags.expense_id, tags.name""",
+                       {"username": user.username, "ids": json.dumps(list(expense_ids))})
+
+        return cursor.fetchall()
+
+    def get_tags_by_user(self, user: User):
+        """Returns the names of the tags a specified user has attached to expenses
+
+        Args:
+            user (User object): The user, whose tags should be found
+
+        Returns:
+            List of tag names, sorted alphabetically
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        select
+            tags.name
+        from
+            tags
+        where
+            tags.username=?
+        and
+            exists (select 1 from expense_tags where tag_id=tags.id)
+        order by
+            tags.name""", (user.username,))
+
+        return [row["name"] for row in cursor.fetchall()]
+
+    def get_totals_by_tag(self, user: User):
+        """Returns the total amount and number of a specified user's expenses with each tag
+
+        Args:
+            user (User object): The user, whose expenses should be summed up
+
+        Returns:
+            List of database rows with tag, total and count, sorted by tag
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        select
+            tags.name as tag,
+            sum(expenses.amount) as total,
+            count(*) as count
+        from
+            tags
+        join
+            expense_tags on expense_tags.tag_id=tags.id
+        join
+            expenses on expenses.id=expense_tags.expense_id
+        where
+            tags.username=?
+        group by
+            tags.id
+        order by
+            tags.name""", (user.username,))
+
+        return cursor.fetchall()
+
+    def delete_tag(self, user: User, tag_name):
+        """Deletes a tag of a specified user, detaching it from all expenses
+
+        Args:
+            user (User object): The user, whose tag should be deleted
+            tag_name (str): The name of the tag
+
+        Returns:
+            True, if the user had the tag, otherwise False
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+        delete from
+            tags
+        where
+            username=? and name=?""", (user.username, tag_name))
+        deleted = cursor.rowcount
+
+        self._connection.commit()
+
+        return deleted > 0
+
+    def delete_all_tags(self):
+        """Deletes all tags in database
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            delete from expense_tags;
+        """)
+        cursor.execute("""
+            delete from tags;
+        """)
+
+        self._connection.commit()
@@ -1,15 +1,37 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from config import USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS
 from entities.user import User
 from database_connection import connect_to_database
 
 
 class UserRepository:
     """Class managing operations on user table in database
+
+    Found users are cached for a while, so that repeated logins do not query the
+    database. Changes made through the repository update the cache; changes made
+    elsewhere, e.g. by another process, are seen once the cached entry expires.
     """
 
-    def __init__(self):
+    def __init__(self, cache_size=USER_CACHE_SIZE, cache_ttl=USER_CACHE_TTL_SECONDS,
+                 clock=time.monotonic):
         """Class constructor
+
+        Args:
+            cache_size (int, optional): Number of users kept in the cache
+            cache_ttl (float, optional): Seconds a cached user is used before it is
+                                            looked up from the database again
+            clock (optional): Callable value returning the current time in seconds
         """
         self._connection = connect_to_database()
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self._clock = clock
+        # username: (database row, expiry time), from least to most recently used
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def add_user(self, user:User):
         """Adding a new user's information to database
@@ -26,6 +48,49 @@ class UserRepository:
                        )
 
         self._connection.commit()
+        self._invalidate(user.username)
+
+    def add_users(self, users):
+        """Adds several new users to database in a single statement and transaction.
+        Users whose username is already taken, or appears earlier in the list,
+        are not added.
+
+        Args:
+            users (list of User objects): The users to be added
+
+        Returns:
+            List of the usernames that were not added because they were taken
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            insert into users (username, password)
+            select
+                value ->> 0,
+                value ->> 1
+            from
+                json_each(:users)
+            where
+                true
+            on conflict (username) do nothing
+            returning
+                username""",
+                       {"users": json.dumps([[user.username, user.password]
+                                             for user in users])}
+                       )
+
+        added = {row["username"] for row in cursor.fetchall()}
+
+        self._connection.commit()
+
+        taken = []
+        for user in users:
+            if user.username in added:
+                added.remove(user.username)
+            else:
+                taken.append(user.username)
+
+        return taken
 
     def find_user(self, username):
         """Finds an existing user by username and returns their username
@@ -37,6 +102,14 @@ class UserRepository:
         Returns:
             Database row object with the user's username and password, or None
         """
+        now = self._clock()
+
+        with self._cache_lock:
+            cached = self._cache.get(username)
+            if cached is not None and cached[1] > now:
+                self._cache.move_to_end(username)
+                return cached[0]
+
         cursor = self._connection.cursor()
 
         cursor.execute("""
@@ -52,8 +125,33 @@ class UserRepository:
 
         found = cursor.fetchone()
 
+        if found is not None:
+            self._add_to_cache(username, found, now)
+
         return found
 
+    def update_password(self, username, password):
+        """Replaces the stored password (hash) of a user
+
+        Args:
+            username (string): The username of the user
+            password (string): The new password hash
+        """
+        cursor = self._connection.cursor()
+
+        cursor.execute("""
+            update
+                users
+            set
+                password=:p
+            where
+                username=:c""",
+                       {"p": password, "c": username}
+                       )
+
+        self._connection.commit()
+        self._invalidate(username)
+
     def delete_user(self, username):
         """Deletes a user from database
 
@@ -71,6 +169,7 @@ class UserRepository:
                        )
 
         self._connection.commit()
+        self._invalidate(username)
 
     def delete_all_users(self):
         """Deletes all users and thus all entries from database users table
@@ -83,6 +182,9 @@ class UserRepository:
 
         self._connection.commit()
 
+        with self._cache_lock:
+            self._cache.clear()
+
     def find_all_users(self):
         """Finds and returns all users in database users table
 
@@ -98,3 +200,14 @@ class UserRepository:
         found = cursor.fetchall()
 
         return found
+
+    def _add_to_cache(self, username, found, now):
+        with self._cache_lock:
+            self._cache[username] = (found, now + self._cache_ttl)
+            self._cache.move_to_end(username)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def _invalidate(self, username):
+        with self._cache_lock:
+            self._cache.pop(username, None)
@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+from config import ANOMALY_THRESHOLD, ANOMALY_MIN_EXPENSES
+from entities.user import User
+from repositories.expense_repository import ExpenseRepository
+from repositories.expense_change_repository import ExpenseChangeRepository
+from services.expense_service import InvalidInputError
+
+# Ways of telling the usual amounts of a category from the unusual ones
+ANOMALY_METHODS = ["zscore", "iqr"]
+# How many interquartile ranges below the first or above the third quartile are unusual
+IQR_FACTOR = 1.5
+# Scale the median absolute deviation, or the mean absolute deviation when more
+# than half of the amounts are the same, to the standard deviation of a normal distribution
+MAD_SCALE = 0.6745
+MEAN_DEVIATION_SCALE = 0.7979
+
+
+def category_bounds(categories, amounts, method="zscore", threshold=ANOMALY_THRESHOLD,
+                    min_expenses=ANOMALY_MIN_EXPENSES):
+    """Computes the range of usual amounts of each category in one pass over the expenses
+
+    Args:
+        categories (array-like or pandas Categorical): The category of each expense
+        amounts (array-like): The amount of each expense
+        method (str, optional): zscore for amounts within threshold robust z-scores,
+                                i.e. median absolute deviations, of the median, or iqr
+                                for amounts within IQR_FACTOR interquartile ranges of
+                                the quartiles. Defaults to zscore.
+        threshold (float, optional): The largest usual robust z-score
+        min_expenses (int, optional): Categories with fewer expenses have no unusual amounts
+
+    Returns:
+        Pandas dataframe of the lower and upper bound of usual amounts, indexed by category
+    """
+    amounts = pd.Series(amounts, dtype=np.float64)
+    # The category names are factorized once, grouping by their codes is then cheap
+    categories = pd.Categorical(categories)
+    groups = amounts.groupby(categories, observed=True)
+
+    if method == "iqr":
+        first_quartiles = groups.quantile(0.25)
+        third_quartiles = groups.quantile(0.75)
+        spreads = IQR_FACTOR * (third_quartiles - first_quartiles)
+        bounds = pd.DataFrame({"lower": first_quartiles - spreads,
+                               "upper": third_quartiles + spreads})
+    else:
+        deviations = (amounts - groups.transform("median")).abs()
+        deviation_groups = deviations.groupby(categories, observed=True)
+        scales = (deviation_groups.median() / MAD_SCALE).where(
+            lambda scale: scale > 0, deviation_groups.mean() / MEAN_DEVIATION_SCALE)
+        medians = groups.median()
+        bounds = pd.DataFrame({"lower": medians - threshold * scales,
+                               "upper": medians + threshold * scales})
+
+    too_few = groups.size() < min_expenses
+    bounds.loc[too_few, "lower"] = -np.inf
+    bounds.loc[too_few, "upper"] = np.inf
+    return bounds
+
+
+class AnomalyService:
+    """This class finds the expenses of the current user with unusual amounts for
+    their category.
+
+    The range of usual amounts of every category is computed from all of the user's
+    expenses at once, and kept until the user's expenses change, which the change
+    journal tells with a single lookup. Telling whether an expense is unusual then
+    takes a comparison with the bounds of its category.
+    """
+
+    def __init__(self, expense_repository: ExpenseRepository, logged_in_user: User,
+                 method="zscore", threshold=ANOMALY_THRESHOLD,
+                 min_expenses=ANOMALY_MIN_EXPENSES,
+                 change_repository: ExpenseChangeRepository = None):
+        """Class constructor
+
+        Args:
+            expense_repository (ExpenseRepository object): Handles database operations
+                                                            on expenses
+            logged_in_user (User object): The current logged-in user whose expenses
+                                            are checked
+            method (str, optional): zscore or iqr, see category_bounds
+            threshold (float, optional): The largest usual robust z-score
+            min_expenses (int, optional): Categories with fewer expenses have no
+                                            unusual amounts
+            change_repository (ExpenseChangeRepository object, optional): Reads the
+                                                            change journal
+
+        Raises:
+            InvalidInputError: An error that occurs when the method is not one of
+            ANOMALY_METHODS
+        """
+        if method not in ANOMALY_METHODS:
+            raise InvalidInputError(f"Unknown anomaly detection method {method}")
+
+        self.expense_repository = expense_repository
+        self.current_user = logged_in_user
+        self.method = method
+        self.threshold = threshold
+        self.min_expenses = min_expenses
+        self.change_repository = change_repository or ExpenseChangeRepository()
+
+        self._cached_seq = None
+        self._cache = {}
+
+    def get_category_bounds(self):
+        """Returns the range of usual amounts of each of the current user's categories
+
+        Returns:
+            Dictionary of category names and (lower, upper) bound pairs
+        """
+        self._read_expenses()
+        if "bounds" not in self._cache:
+            bounds = self._cache["bounds_frame"]
+            self._cache["bounds"] = dict(
+                zip(bounds.index, zip(bounds["lower"].tolist(), bounds["upper"].tolist())))
+        return self._cache["bounds"]
+
+    def find_anomalies(self):
+        """Returns the current user's expenses with unusual amounts for their category
+
+        Returns:
+            List of expenses, each a list of name, amount, date and category,
+            the most recent first
+        """
+        expenses = self._read_expenses()
+        if "anomalies" not in self._cache:
+            categories = expenses["category"].cat
+            bounds = self._cache["bounds_frame"].reindex(categories.categories)
+            lower = bounds["lower"].to_numpy()[categories.codes]
+            upper = bounds["upper"].to_numpy()[categories.codes]
+            amounts = expenses["amount"].to_numpy()
+
+            anomalies = expenses[(amounts < lower) | (amounts > upper)]
+            self._cache["anomalies"] = anomalies.sort_values(
+                "date", ascending=False, kind="stable").values.tolist()
+        return self._cache["anomalies"]
+
+    def flag_expenses(self, expenses):
+        """Tells which of a list of the current user's expenses have unusual amounts
+
+        Args:
+            expenses (list): Expenses as lists of name, amount, date and category,
+                            as listed by ExpenseService
+
+        Returns:
+            List of booleans, True for each expense with an unusual amount
+        """
+        bounds = self.get_category_bounds()
+        flags = []
+        for _, amount, _, category in expenses:
+            lower, upper = bounds.get(category, (-np.inf, np.inf))
+            flags.append(not lower <= float(amount) <= upper)
+        return flags
+
+    def _read_expenses(self):
+        seq = self.change_repository.get_last_change_seq(self.current_user)
+        if seq != self._cached_seq or "expenses" not in self._cache:
+            expenses = self.expense_repository.get_expenses_as_pandas_dataframe(
+                self.current_user)
+            expenses["category"] = expenses["category"].astype("category")
+            bounds = category_bounds(expenses["category"].array, expenses["amount"],
+                                     self.method, self.threshold, self.min_expenses)
+            self._cached_seq = seq
+            self._cache = {"expenses": expenses, "bounds_frame": bounds}
+        return self._cache["expenses"]
@@ -0,0 +1,140 @@
+from datetime import date
+from config import BUDGET_WARNING_RATIO
+from entities.user import User
+from entities.category import Category
+from repositories.budget_repository import BudgetRepository
+from services.expense_service import InvalidInputError
+
+# Budget statuses, by how much of the budget has been spent during the month
+UNDER_BUDGET = "under"
+NEAR_BUDGET = "near"
+OVER_BUDGET = "over"
+
+
+class BudgetService:
+    """This class manages the monthly category budgets of the current user.
+
+    The month-to-date spending of each budgeted category is counted by the database
+    whenever expenses are created, edited or deleted, so checking a budget, e.g.
+    after each new expense or after importing thousands of them, takes a single
+    lookup instead of summing up the month's expenses.
+    """
+
+    def __init__(self, budget_repository: BudgetRepository, logged_in_user: User,
+                 warning_ratio=BUDGET_WARNING_RATIO):
+        """Class constructor
+
+        Args:
+            budget_repository (BudgetRepository object): Handles database operations
+                                                            on budgets
+            logged_in_user (User object): The current logged-in user whose budgets
+                                            will be managed
+            warning_ratio (float, optional): Share of a budget spent after which
+                                            the budget is reported as near
+        """
+        self.budget_repository = budget_repository
+        self.current_user = logged_in_user
+        self.warning_ratio = warning_ratio
+
+    def set_budget(self, category: Category, amount):
+        """Sets how much the current user may spend in a category each month
+
+        Args:
+            category (Category object): The budgeted category
+            amount (str, int or float): The monthly budget
+
+        Raises:
+            InvalidInputError: An error that occurs when the amount is not
+            a nonnegative number
+        """
+        try:
+            amount = float(amount)
+        except ValueError as exc:
+            raise InvalidInputError(
+                "Invalid input. Make sure you have entered a nonnegative numeric amount") from exc
+
+        if amount < 0:
+            raise InvalidInputError(
+                "Invalid input. Make sure you have entered a nonnegative numeric amount")
+
+        self.budget_repository.set_budget(self.current_user, category, amount)
+
+    def remove_budget(self, category: Category):
+        """Removes the budget of a category of the current user
+
+        Args:
+            category (Category object): The budgeted category
+
+        Returns:
+            True, if the category had a budget, otherwise False
+        """
+        return self.budget_repository.delete_budget(self.current_user, category)
+
+    def check_budget(self, category: Category, expense_date=None):
+        """Checks the budget of a category for the month of a date, e.g. after
+        an expense has been created
+
+        Args:
+            category (Category object): The category of the expense
+            expense_date (str, optional): YYYY-MM-DD or YYYY-MM. Defaults to the
+                                            current date.
+
+        Returns:
+            List of category, budget, spent and status (UNDER_BUDGET, NEAR_BUDGET or
+            OVER_BUDGET), or None if the category has no budget
+        """
+        month = str(expense_date or date.today())[:7]
+        budget = self.budget_repository.find_budget(self.current_user, category, month)
+
+        if budget is None:
+            return None
+        return self._to_status(budget)
+
+    def check_budgets(self, expenses):
+        """Checks the budgets of the categories and months of several expenses,
+        e.g. after importing them, looking each budget up once
+
+        Args:
+            expenses (iterable): Tuples of name, amount, date and category of each expense
+
+        Returns:
+            List of category, budget, spent, status and month of the budgets that
+            are near or over, sorted by month and category
+        """
+        months = {(str(expense[3] or "undefined"), str(expense[2] or date.today())[:7])
+                  for expense in expenses}
+
+        warnings = []
+        for category, month in sorted(months, key=lambda pair: (pair[1], pair[0])):
+            status = self.check_budget(Category(category), month)
+            if status and status[3] != UNDER_BUDGET:
+                warnings.append(status + [month])
+
+        return warnings
+
+    def list_budgets(self, month=None):
+        """Returns the budgets of the current user with their spending during a month
+
+        Args:
+            month (str, optional): YYYY-MM. Defaults to the current month.
+
+        Returns:
+            List of category, budget, spent and status of each budget,
+            sorted by category
+        """
+        month = month or str(date.today())[:7]
+
+        return [self._to_status(budget) for budget in
+                self.budget_repository.get_budgets_by_user(self.current_user, month)]
+
+    def _to_status(self, budget):
+        amount, spent = budget["amount"], budget["spent"]
+
+        if spent > amount:
+            status = OVER_BUDGET
+        elif spent >= amount * self.warning_ratio:
+            status = NEAR_BUDGET
+        else:
+            status = UNDER_BUDGET
+
+        return [budget["category"], amount, spent, status]
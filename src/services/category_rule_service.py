@@ -0,0 +1,268 @@
+import re
+import numpy as np
+import pandas as pd
+from entities.user import User
+from entities.category import Category
+from entities.category_rule import CategoryRule
+from repositories.category_rule_repository import CategoryRuleRepository
+from repositories.category_repository import CategoryRepository
+from services.expense_service import InvalidInputError
+
+# How the name of an expense is matched against the pattern of a rule
+MATCH_TYPES = ["contains", "regex"]
+# Expenses in this category, or without a category, are categorised by the rules
+UNDEFINED_CATEGORY = "undefined"
+# Backreferences and named groups would refer to the wrong groups once the
+# patterns of all rules are combined into one regular expression
+UNCOMBINABLE_PATTERN = re.compile(r"\\[1-9]|\(\?P[<=]|\(\?\(")
+LEADING_FLAGS_PATTERN = re.compile(r"\(\?([aiLmsux]+)\)")
+
+
+def _pattern_source(match_type, pattern):
+    if match_type == "contains":
+        return "(?i:" + re.escape(pattern) + ")"
+
+    # Flags at the start of a regular expression only apply to its own part
+    # of the combined expression
+    flags = LEADING_FLAGS_PATTERN.match(pattern)
+    if flags:
+        return f"(?{flags.group(1)}:{pattern[flags.end():]})"
+    return f"(?:{pattern})"
+
+
+class CategoryMatcher:
+    """This class finds the category of expenses with a list of rules, the first
+    rule whose pattern is found in the name of an expense and whose amount range
+    contains its amount deciding the category.
+
+    The patterns of all rules are compiled into one regular expression, in which
+    each rule is a lookahead setting an empty named group of its own, so a single match
+    of a name tells every rule whose pattern it contains. Each distinct name is
+    matched once, and the amount ranges of all expenses are then checked at once
+    with NumPy.
+    """
+
+    def __init__(self, rules):
+        """Class constructor
+
+        Args:
+            rules (list of CategoryRule objects): The rules, in the order they are tried
+        """
+        self.categories = np.array([rule.category for rule in rules] + [None], dtype=object)
+        self.min_amounts = np.array([-np.inf if rule.min_amount is None else rule.min_amount
+                                     for rule in rules])
+        self.max_amounts = np.array([np.inf if rule.max_amount is None else rule.max_amount
+                                     for rule in rules])
+
+        self._expression = re.compile("".join(
+            f"(?:(?=.*?{_pattern_source(rule.match_type, rule.pattern)})(?P<rule{index}>))?"
+            for index, rule in enumerate(rules)), re.DOTALL)
+        # The groups of the patterns themselves come between the groups of the rules
+        self._rule_groups = [self._expression.groupindex[f"rule{index}"]
+                             for index in range(len(rules))]
+
+    def match_names(self, names):
+        """Tells which rules match each of a list of names, regardless of amounts
+
+        Args:
+            names (list of str): The names
+
+        Returns:
+            NumPy array with a row of booleans for each name, one for each rule
+        """
+        matches = np.zeros((len(names), len(self._rule_groups)), dtype=bool)
+        for row, name in enumerate(names):
+            spans = self._expression.match(name).regs
+            matches[row] = [spans[group][0] >= 0 for group in self._rule_groups]
+        return matches
+
+    def categorize(self, names, amounts):
+        """Finds the category of expenses
+
+        Args:
+            names (array-like): The name of each expense
+            amounts (array-like): The amount of each expense
+
+        Returns:
+            NumPy array of the category of each expense, None for expenses
+            no rule matches
+        """
+        if not self._rule_groups:
+            return np.full(len(names), None, dtype=object)
+
+        codes, unique_names = pd.factorize(pd.Series(names, dtype=object).fillna(""))
+        amounts = pd.to_numeric(pd.Series(amounts, dtype=object), errors="coerce").to_numpy(
+            dtype=np.float64)
+
+        matches = self.match_names([str(name) for name in unique_names])[codes]
+        matches &= (amounts[:, None] >= self.min_amounts) & \
+            (amounts[:, None] <= self.max_amounts)
+
+        # The first matching rule of each expense, or the None after the last rule
+        first_rules = np.where(matches.any(axis=1), matches.argmax(axis=1), len(self.min_amounts))
+        return self.categories[first_rules]
+
+
+class CategoryRuleService:
+    """This class manages the rules that categorise the current user's expenses by
+    their name and amount, e.g. when bank statements are imported.
+
+    The rules are compiled into a CategoryMatcher, which is kept until the rules
+    change, so categorising an import of any size takes one pass over it. The
+    undefined expenses already in database are categorised with one update.
+    """
+
+    def __init__(self, category_rule_repository: CategoryRuleRepository,
+                 category_repository: CategoryRepository, logged_in_user: User):
+        """Class constructor
+
+        Args:
+            category_rule_repository (CategoryRuleRepository object): Handles database
+                                                            operations on the rules
+            category_repository (CategoryRepository object): Moves expenses
+                                                            between categories
+            logged_in_user (User object): The current logged-in user whose rules
+                                            will be managed
+        """
+        self.category_rule_repository = category_rule_repository
+        self.category_repository = category_repository
+        self.current_user = logged_in_user
+
+        self._matcher = None
+
+    def create_rule(self, category, pattern="", match_type="contains", min_amount=None,
+                    max_amount=None):
+        """Creates a new rule, tried after the current user's existing rules
+
+        Args:
+            category (str): The category of the matching expenses
+            pattern (str, optional): Text contained in the names of the matching
+                                    expenses, in any case, or a regular expression
+                                    found in them. Defaults to "", matching every name.
+            match_type (str, optional): One of MATCH_TYPES. Defaults to contains.
+            min_amount (str, int or float, optional): The smallest matching amount
+            max_amount (str, int or float, optional): The largest matching amount
+
+        Raises:
+            InvalidInputError: An error that occurs when the category is empty, the
+            match type is unknown, the regular expression is invalid or uses
+            backreferences or named groups, or the amounts are not numbers
+
+        Returns:
+            The id of the created rule
+        """
+        category = str(category or "").strip()
+        pattern = str(pattern or "")
+
+        if not category or match_type not in MATCH_TYPES:
+            raise InvalidInputError(
+                f"Invalid input. Make sure you have entered a category and one of "
+                f"the match types {', '.join(MATCH_TYPES)}")
+
+        if match_type == "regex":
+            try:
+                re.compile(pattern)
+            except re.error as exc:
+                raise InvalidInputError(f"Invalid regular expression {pattern}") from exc
+            if UNCOMBINABLE_PATTERN.search(pattern):
+                raise InvalidInputError(
+                    "Invalid input. Regular expressions of rules may not use "
+                    "backreferences or named groups")
+
+        try:
+            min_amount = None if min_amount in (None, "") else float(min_amount)
+            max_amount = None if max_amount in (None, "") else float(max_amount)
+        except ValueError as exc:
+            raise InvalidInputError(
+                "Invalid input. Make sure you have entered numeric amounts") from exc
+
+        rule = CategoryRule(category, pattern, match_type, min_amount, max_amount)
+        rule_id = self.category_rule_repository.add_rule(self.current_user, rule)
+        self._matcher = None
+        return rule_id
+
+    def delete_rule(self, rule_id):
+        """Deletes a rule of the current user. Expenses it has categorised keep
+        their category.
+
+        Args:
+            rule_id (int): The id of the rule
+
+        Returns:
+            True, if the rule was deleted, otherwise False
+        """
+        deleted = self.category_rule_repository.delete_rule(self.current_user, int(rule_id))
+        self._matcher = None
+        return deleted
+
+    def list_rules(self):
+        """Returns the rules of the current user
+
+        Returns:
+            List of id, category, match type, pattern, smallest and largest amount of
+            each rule, in the order they are tried, missing amounts being None
+        """
+        return [[rule["id"], rule["category"], rule["match_type"], rule["pattern"],
+                 rule["min_amount"], rule["max_amount"]]
+                for rule in self.category_rule_repository.get_rules_by_user(self.current_user)]
+
+    def get_matcher(self):
+        """Returns the current user's rules compiled into one matcher
+
+        Returns:
+            CategoryMatcher object
+        """
+        if self._matcher is None:
+            rules = [CategoryRule(rule["category"], rule["pattern"], rule["match_type"],
+                                  rule["min_amount"], rule["max_amount"])
+                     for rule in self.category_rule_repository.get_rules_by_user(
+                         self.current_user)]
+            self._matcher = CategoryMatcher(rules)
+        return self._matcher
+
+    def categorize_expenses(self, expenses):
+        """Fills in the category of the expenses without one, or in the undefined
+        category, with the current user's rules, e.g. before they are imported
+
+        Args:
+            expenses (list): Tuples or lists of name, amount, date, category and
+                            optionally currency, as given to ExpenseService
+
+        Returns:
+            List of the expenses as tuples, the ones no rule matches unchanged
+        """
+        expenses = [tuple(expense) for expense in expenses]
+        undefined = [index for index, expense in enumerate(expenses)
+                     if len(expense) < 4 or expense[3] in (None, "", UNDEFINED_CATEGORY)]
+        if not undefined:
+            return expenses
+
+        categories = self.get_matcher().categorize(
+            [expenses[index][0] for index in undefined],
+            [expenses[index][1] for index in undefined])
+
+        for index, category in zip(undefined, categories.tolist()):
+            if category is not None:
+                expense = expenses[index] + (None,) * (4 - len(expenses[index]))
+                expenses[index] = expense[:3] + (category,) + expense[4:]
+        return expenses
+
+    def apply_to_undefined(self):
+        """Categorises the current user's undefined expenses with the rules,
+        moving them into their new categories with a single update
+
+        Returns:
+            The number of categorised expenses
+        """
+        expenses = self.category_repository.get_expenses_to_categorize(
+            self.current_user, Category(UNDEFINED_CATEGORY))
+        if not expenses:
+            return 0
+
+        categories = self.get_matcher().categorize(
+            [expense["name"] for expense in expenses],
+            [expense["amount"] for expense in expenses])
+
+        return self.category_repository.update_categories(self.current_user, [
+            (expense["id"], category) for expense, category in zip(expenses, categories.tolist())
+            if category is not None])
@@ -0,0 +1,230 @@
+import bisect
+import math
+import re
+from datetime import date
+import numpy as np
+import pandas as pd
+from config import BASE_CURRENCY
+from repositories.exchange_rate_repository import ExchangeRateRepository
+from repositories.expense_repository import ExpenseRepository
+
+# ISO 4217 style currency codes, e.g. EUR
+CURRENCY_PATTERN = re.compile(r"[A-Z]{3}")
+CURRENCY_SYMBOLS = {"EUR": "€", "USD": "$", "GBP": "£", "JPY": "¥"}
+
+
+def currency_symbol(currency=BASE_CURRENCY):
+    """Returns the symbol amounts in a currency are shown with
+
+    Args:
+        currency (str, optional): The currency code. Defaults to the base currency.
+
+    Returns:
+        The symbol of the currency, e.g. €, or its code if it has no known symbol
+    """
+    return CURRENCY_SYMBOLS.get(currency, currency)
+
+
+class CurrencyConverter:
+    """This class converts amounts into the base currency with the exchange rates
+    imported into the database.
+
+    The rates of each currency are held in memory sorted by date, and read again
+    when the version of the rates in database changes. The rate of an expense is
+    the latest one on or before its date, found by bisection. Many amounts are
+    converted at once with NumPy, by bisecting all of their dates in one
+    searchsorted call per currency.
+    """
+
+    def __init__(self, exchange_rate_repository: ExchangeRateRepository,
+                 expense_repository: ExpenseRepository, base_currency=BASE_CURRENCY):
+        """Class constructor
+
+        Args:
+            exchange_rate_repository (ExchangeRateRepository object): Handles database
+                                                            operations on exchange rates
+            expense_repository (ExpenseRepository object): Handles database operations
+                                                            on expenses
+            base_currency (str, optional): The currency amounts are converted into
+        """
+        self.exchange_rate_repository = exchange_rate_repository
+        self.expense_repository = expense_repository
+        self.base_currency = base_currency
+
+        self._rate_tables = None
+        self._rates_version = None
+
+    def normalize_currency(self, currency):
+        """Checks a currency code given by the user
+
+        Args:
+            currency (str): The currency code, in any case, or None
+
+        Raises:
+            InvalidCurrencyError: An error that occurs when the code is not three letters
+
+        Returns:
+            The currency code in upper case, or None for the base currency
+        """
+        currency = str(currency or self.base_currency).strip().upper()
+        if not CURRENCY_PATTERN.fullmatch(currency):
+            raise InvalidCurrencyError(f"Invalid currency {currency}")
+        return None if currency == self.base_currency else currency
+
+    def list_currencies(self):
+        """Returns the currencies expenses can be created in
+
+        Returns:
+            List of the base currency followed by the currencies with exchange rates
+        """
+        return [self.base_currency] + sorted(self._get_rate_tables())
+
+    def get_rate(self, currency, on_date):
+        """Returns the value of one unit of a currency in the base currency on a date
+
+        Args:
+            currency (str): The currency code, None for the base currency
+            on_date (str): The date, YYYY-MM-DD
+
+        Raises:
+            MissingExchangeRateError: An error that occurs when the currency has
+            no exchange rate on or before the date
+
+        Returns:
+            The latest exchange rate on or before the date
+        """
+        if not currency:
+            return 1.0
+
+        dates, _, rates = self._get_rate_tables().get(currency, ([], None, []))
+        position = bisect.bisect_right(dates, str(on_date)) - 1
+        if position < 0:
+            raise MissingExchangeRateError(
+                f"No exchange rate for {currency} on or before {on_date}")
+        return float(rates[position])
+
+    def convert(self, amounts, currencies, dates):
+        """Converts amounts into the base currency
+
+        Args:
+            amounts (array-like): The amounts
+            currencies (array-like): The currency of each amount, None for the base currency
+            dates (array-like): The date of each amount, YYYY-MM-DD
+
+        Raises:
+            MissingExchangeRateError: An error that occurs when a currency has
+            no exchange rate on or before the date of an amount
+
+        Returns:
+            NumPy array of the amounts in the base currency, rounded to cents
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        rates = np.ones(len(amounts))
+        # Each currency is compared as a small integer code, None gets the code -1
+        codes, foreign_currencies = pd.factorize(np.asarray(currencies, dtype=object))
+
+        if len(foreign_currencies):
+            dates = np.asarray(dates, dtype="datetime64[D]")
+            tables = self._get_rate_tables()
+
+            for code, currency in enumerate(foreign_currencies):
+                selected = codes == code
+                _, rate_dates, currency_rates = tables.get(
+                    currency, ([], np.array([], dtype="datetime64[D]"), np.array([])))
+                positions = np.searchsorted(rate_dates, dates[selected], side="right") - 1
+
+                if positions.min() < 0:
+                    missing = dates[selected][positions < 0].min()
+                    raise MissingExchangeRateError(
+                        f"No exchange rate for {currency} on or before {missing}")
+                rates[selected] = currency_rates[positions]
+
+        return np.round(amounts * rates, 2)
+
+    def import_rates(self, rates):
+        """Imports exchange rates, e.g. read from a file, and converts the expenses
+        in the imported currencies again from the first imported date onwards.
+        The rates are shared by all users, so the expenses of every user are converted.
+
+        Args:
+            rates (iterable): Tuples of currency code, date (YYYY-MM-DD) and the value
+                                of one unit of the currency in the base currency
+
+        Raises:
+            InvalidExchangeRateError: An error that occurs when a currency code, date
+            or rate is invalid. No rates are imported then.
+
+        Returns:
+            Tuple of the number of imported rates and the number of converted expenses
+        """
+        valid_rates = [self._validate_rate(*rate) for rate in rates]
+        imported = self.exchange_rate_repository.add_rates(valid_rates)
+        self.clear_cache()
+
+        first_dates = {}
+        for currency, rate_date, _ in valid_rates:
+            first_dates[currency] = min(rate_date, first_dates.get(currency, rate_date))
+
+        converted = 0
+        for currency, first_date in first_dates.items():
+            expenses = self.expense_repository.get_expenses_in_currency(currency, first_date)
+            amounts = self.convert([expense["original_amount"] for expense in expenses],
+                                   [currency] * len(expenses),
+                                   [expense["date"] for expense in expenses])
+            converted += self.expense_repository.update_amounts(
+                zip(amounts.tolist(), (expense["id"] for expense in expenses)))
+
+        return imported, converted
+
+    def _validate_rate(self, currency, rate_date, rate):
+        try:
+            currency = self.normalize_currency(currency)
+            rate_date = date.fromisoformat(str(rate_date).strip()).isoformat()
+            rate = float(rate)
+        except (InvalidCurrencyError, TypeError, ValueError) as exc:
+            raise InvalidExchangeRateError(
+                f"Invalid exchange rate {currency} {rate_date} {rate}") from exc
+
+        if not currency or rate <= 0 or math.isnan(rate):
+            raise InvalidExchangeRateError(
+                f"Invalid exchange rate {currency or self.base_currency} {rate_date} {rate}")
+        return currency, rate_date, rate
+
+    def clear_cache(self):
+        """Forgets the exchange rates held in memory, so that they are read again
+        from database when next needed
+        """
+        self._rate_tables = None
+
+    def _get_rate_tables(self):
+        # The rates may have been imported by another process, e.g. the CLI while
+        # the API server is running
+        version = self.exchange_rate_repository.get_version()
+        if self._rate_tables is None or version != self._rates_version:
+            self._rates_version = version
+            rows = self.exchange_rate_repository.get_rates()
+            tables = {}
+            for row in rows:
+                dates, rates = tables.setdefault(row["currency"], ([], []))
+                dates.append(row["date"])
+                rates.append(row["rate"])
+
+            self._rate_tables = {
+                currency: (dates, np.array(dates, dtype="datetime64[D]"), np.array(rates))
+                for currency, (dates, rates) in tables.items()}
+        return self._rate_tables
+
+
+currency_converter = CurrencyConverter(ExchangeRateRepository(), ExpenseRepository())
+
+
+class InvalidCurrencyError(Exception):
+    pass
+
+
+class InvalidExchangeRateError(Exception):
+    pass
+
+
+class MissingExchangeRateError(Exception):
+    pass
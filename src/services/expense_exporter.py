@@ -0,0 +1,294 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from itertools import islice
+import numpy as np
+from repositories.expense_repository import ExpenseRepository
+from repositories.expense_change_repository import ExpenseChangeRepository
+from entities.user import User
+from entities.category import Category
+
+COLUMN_NAMES = ["name", "amount", "date", "category"]
+TEXT_FORMATS = ["csv", "jsonl"]
+BINARY_FORMATS = ["npz", "parquet"]
+EXPORT_CHUNK_SIZE = 10000
+
+
+def column_arrays(expenses, dtypes):
+    """Lays out expenses as one NumPy array per column
+
+    Args:
+        expenses (list): Expenses as lists of name, amount, date and category
+        dtypes (dict): The NumPy dtype of each column
+
+    Returns:
+        Dictionary of the array of each column, by column name
+    """
+    return {column: np.array([expense[index] for expense in expenses], dtype=dtypes[column])
+            for index, column in enumerate(COLUMN_NAMES)}
+
+
+class ExpenseExporter:
+    """This class writes all expenses of a user into a file, reading them from
+    database in chunks, so that memory use stays the same however many expenses
+    there are.
+
+    CSV and JSON Lines are written row by row. The columnar formats are meant for
+    analytics: .npz holds one NumPy array per column, and Parquet, which requires
+    the optional pyarrow package, is written one row group per chunk. The changes
+    made after an export are read from the change journal, to keep a copy up to date.
+    """
+
+    def __init__(self, expense_repository: ExpenseRepository, logged_in_user: User,
+                 chunk_size=EXPORT_CHUNK_SIZE,
+                 change_repository: ExpenseChangeRepository = None):
+        """Class constructor
+
+        Args:
+            expense_repository (ExpenseRepository object): Handles database operations
+                                                            on expenses
+            logged_in_user (User object): The current logged-in user whose expenses
+                                            are exported
+            chunk_size (int, optional): Number of expenses handled at a time
+            change_repository (ExpenseChangeRepository object, optional): Reads the
+                                                            change journal
+        """
+        self.expense_repository = expense_repository
+        self.current_user = logged_in_user
+        self.chunk_size = chunk_size
+        self.change_repository = change_repository or ExpenseChangeRepository()
+
+    def iterate_expenses(self, category: Category = None, with_ids=False):
+        """Yields the expenses of the current user one by one, without
+        loading all of them into memory
+
+        Args:
+            category (Category object, optional): If given, only expenses
+                                                within this category are yielded
+            with_ids (bool, optional): If True, each expense starts with its id
+
+        Yields:
+            Lists of expense name, amount, date and category, after the id if with_ids
+        """
+        for expense in self.expense_repository.iterate_expenses_by_user(
+                self.current_user, category, self.chunk_size):
+            row = [expense["name"], expense["amount"], expense["date"], expense["category"]]
+            yield [expense["id"]] + row if with_ids else row
+
+    def get_export_summary(self):
+        """Returns what is needed for laying out the current user's expenses in
+        fixed-size columns before reading them
+
+        Returns:
+            Tuple of the number of expenses, and the length of the longest
+            expense name and of the longest category name
+        """
+        summary = self.expense_repository.get_expense_summary(self.current_user)
+        return (summary["count"], summary["name_length"] or 0,
+                summary["category_length"] or 0)
+
+    def get_changes(self, since=0, limit=1000):
+        """Returns the changes to the current user's expenses after a sequence number
+        of the change journal, for keeping a copy of them up to date. Each changed
+        expense is listed once, with its last change, so applying the changes in
+        order brings the copy up to date. Edited expenses are updated in place,
+        so they keep their ids.
+
+        Args:
+            since (int, optional): The last sequence number already applied. 0 lists
+                                    all expenses as inserts. Defaults to 0.
+            limit (int, optional): Maximum number of changes returned. Defaults to 1000.
+
+        Returns:
+            Tuple of a list of changes and the sequence number to continue from. Each
+            change is a list of seq, operation (insert, update or delete), expense id,
+            name, amount, date and category, the last four being None for deletes.
+        """
+        since = max(int(since), 0)
+        changes = self.change_repository.get_changes_by_user(
+            self.current_user, since, max(int(limit), 0))
+
+        changes = [[change["seq"], change["operation"], change["id"], change["name"],
+                    change["amount"], change["date"], change["category"]]
+                   for change in changes]
+
+        return changes, changes[-1][0] if changes else since
+
+    def export(self, export_format, file):
+        """Writes the expenses of the user into a file in the given format
+
+        Args:
+            export_format (str): One of TEXT_FORMATS or BINARY_FORMATS
+            file (file object): Opened in text mode for TEXT_FORMATS,
+                                and in binary mode for BINARY_FORMATS
+
+        Raises:
+            ExportFormatUnavailableError: An error that occurs when the format is
+            unknown, or requires a package that is not installed
+
+        Returns:
+            The number of exported expenses
+        """
+        writers = {"csv": self.write_csv, "jsonl": self.write_jsonl,
+                   "npz": self.write_npz, "parquet": self.write_parquet}
+
+        if export_format not in writers:
+            raise ExportFormatUnavailableError(f"Unknown export format {export_format}")
+
+        return writers[export_format](file)
+
+    def write_csv(self, file):
+        """Writes the expenses as CSV, with a header line naming the columns
+
+        Args:
+            file (file object): Opened in text mode, with newline=""
+
+        Returns:
+            The number of exported expenses
+        """
+        writer = csv.writer(file)
+        writer.writerow(COLUMN_NAMES)
+
+        count = 0
+        for chunk in self._iterate_chunks():
+            writer.writerows(chunk)
+            count += len(chunk)
+        return count
+
+    def write_jsonl(self, file):
+        """Writes the expenses as JSON Lines, one object per expense
+
+        Args:
+            file (file object): Opened in text mode
+
+        Returns:
+            The number of exported expenses
+        """
+        count = 0
+        for chunk in self._iterate_chunks():
+            file.writelines(json.dumps(dict(zip(COLUMN_NAMES, expense))) + "\n"
+                            for expense in chunk)
+            count += len(chunk)
+        return count
+
+    def write_npz(self, file):
+        """Writes the expenses as a NumPy .npz archive with one array per column:
+        name and category as fixed-width strings, amount as float64 and
+        date as datetime64[D]. The archive can be read with numpy.load.
+
+        Each column is first streamed into a temporary .npy file, since the
+        members of a zip archive have to be written one after another.
+
+        Args:
+            file (file object): Opened in binary mode
+
+        Returns:
+            The number of exported expenses
+        """
+        count, name_length, category_length = self.get_export_summary()
+        dtypes = {"name": np.dtype(f"<U{max(name_length, 1)}"),
+                  "amount": np.dtype("<f8"),
+                  "date": np.dtype("<M8[D]"),
+                  "category": np.dtype(f"<U{max(category_length, 1)}")}
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = {column: os.path.join(directory, f"{column}.npy")
+                     for column in COLUMN_NAMES}
+            written = self._write_npy_columns(paths, dtypes, count)
+
+            if written < count:
+                raise ExportInterruptedError("Expenses were deleted during the export")
+
+            with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_STORED,
+                                 allowZip64=True) as archive:
+                for column, path in paths.items():
+                    with open(path, "rb") as source, \
+                            archive.open(f"{column}.npy", "w", force_zip64=True) as target:
+                        shutil.copyfileobj(source, target)
+
+        return written
+
+    def _write_npy_columns(self, paths, dtypes, count):
+        """Streams the expenses into one .npy file per column, with a header
+        for count expenses
+
+        Args:
+            paths (dict): The path of the .npy file of each column
+            dtypes (dict): The NumPy dtype of each column
+            count (int): The number of expenses, more are left out
+
+        Returns:
+            The number of written expenses
+        """
+        columns = {column: open(path, "wb")  # pylint: disable=consider-using-with
+                   for column, path in paths.items()}
+        try:
+            for column, column_file in columns.items():
+                np.lib.format.write_array_header_1_0(
+                    column_file, {"descr": np.lib.format.dtype_to_descr(dtypes[column]),
+                                  "fortran_order": False, "shape": (count,)})
+
+            written = 0
+            for chunk in self._iterate_chunks():
+                # Expenses added after counting are left out, so the shape stays right
+                chunk = chunk[:count - written]
+                for column, values in column_arrays(chunk, dtypes).items():
+                    columns[column].write(values.tobytes())
+                written += len(chunk)
+        finally:
+            for column_file in columns.values():
+                column_file.close()
+
+        return written
+
+    def write_parquet(self, file):
+        """Writes the expenses as Parquet, one row group per chunk
+
+        Args:
+            file (file object): Opened in binary mode
+
+        Raises:
+            ExportFormatUnavailableError: An error that occurs when pyarrow is not installed
+
+        Returns:
+            The number of exported expenses
+        """
+        try:
+            # pylint: disable=import-outside-toplevel
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ExportFormatUnavailableError(
+                "Exporting Parquet requires the pyarrow package") from error
+
+        schema = pyarrow.schema([("name", pyarrow.string()), ("amount", pyarrow.float64()),
+                                 ("date", pyarrow.date32()), ("category", pyarrow.string())])
+
+        count = 0
+        with pyarrow.parquet.ParquetWriter(file, schema) as writer:
+            for chunk in self._iterate_chunks():
+                names, amounts, dates, categories = zip(*chunk)
+                writer.write_table(pyarrow.table(
+                    [names, amounts, np.array(dates, dtype="datetime64[D]"), categories],
+                    schema=schema))
+                count += len(chunk)
+        return count
+
+    def _iterate_chunks(self):
+        expenses = self.iterate_expenses()
+        while True:
+            chunk = list(islice(expenses, self.chunk_size))
+            if not chunk:
+                break
+            yield chunk
+
+
+class ExportFormatUnavailableError(Exception):
+    pass
+
+
+class ExportInterruptedError(Exception):
+    pass
@@ -0,0 +1,173 @@
+import pandas as pd
+from repositories.expense_repository import ExpenseRepository
+from repositories.expense_rollup_repository import ExpenseRollupRepository
+from services.expense_service import InvalidInputError
+from entities.user import User
+from entities.category import Category
+
+# Periods the totals of expenses are rolled up by
+PERIODS = ["day", "month", "year"]
+
+
+class ExpenseReportService:
+    """This class sums up and plots the expenses of the current logged-in user.
+
+    Totals are read from the daily, monthly and yearly rollups, which are first
+    brought up to date with the expenses changed since they were last read, so
+    reports over long histories do not sum up the expenses each time.
+    """
+
+    def __init__(self, expense_repository: ExpenseRepository, logged_in_user: User,
+                 rollup_repository: ExpenseRollupRepository = None):
+        """Class constructor
+
+        Args:
+            expense_repository (ExpenseRepository object): Handles database operations
+                                                            on expenses
+            logged_in_user (User object): The current logged-in user whose expenses
+                                            are reported
+            rollup_repository (ExpenseRollupRepository object, optional): Handles database
+                                                            operations on the rollups
+        """
+        self.expense_repository = expense_repository
+        self.current_user = logged_in_user
+        self.rollup_repository = rollup_repository or ExpenseRollupRepository()
+
+    def get_total_all_expenses_by_user(self):
+        """Calculates and returns the total amount of all expenses of the current user,
+        from the yearly rollups.
+
+        Returns:
+            The total amount of all expenses of the current user
+        """
+        return sum(total for _, total in self.get_totals_by_period("year"))
+
+    def get_total_by_category_and_user(self, category: Category):
+        """Calculates and returns the total amount of all expenses wihthin a
+        specified category, belonging to the current user, from the yearly rollups.
+
+        Args:
+            category (Category object): The category whose expense total is to be calculated
+
+        Returns:
+            The total amount of all expenses in that category
+        """
+        return sum(total for _, total in self.get_totals_by_period("year", category))
+
+    def get_totals_by_category(self):
+        """Returns the total amount of the current user's expenses in each category,
+        from the yearly rollups
+
+        Returns:
+            List of category name and total pairs, sorted by category name
+        """
+        self.rollup_repository.refresh_rollups()
+        totals = self.rollup_repository.get_rollup_totals_by_category(
+            self.current_user)
+        return [(total["category"], total["total"]) for total in totals]
+
+    def get_totals_by_month(self):
+        """Returns the total amount of the current user's expenses in each month
+
+        Returns:
+            List of month (YYYY-MM) and total pairs, sorted by month
+        """
+        return self.get_totals_by_period("month")
+
+    def get_totals_by_period(self, period="month", category: Category = None,
+                             start=None, end=None):
+        """Returns the total amount of the current user's expenses in each day, month
+        or year. The totals are read from rollups, which are first brought up to date
+        with the expenses changed since they were last read.
+
+        Args:
+            period (str, optional): day, month or year. Defaults to month.
+            category (Category object, optional): If given, only expenses
+                                                within this category are summed up
+            start (str, optional): First period included, e.g. 2023-01 for months
+            end (str, optional): Last period included
+
+        Raises:
+            InvalidInputError: An error that occurs when the period is not one of
+            PERIODS
+
+        Returns:
+            List of period (YYYY-MM-DD, YYYY-MM or YYYY) and total pairs,
+            sorted by period
+        """
+        if period not in PERIODS:
+            raise InvalidInputError(f"Unknown period {period}")
+
+        self.rollup_repository.refresh_rollups()
+        totals = self.rollup_repository.get_rollup_totals(
+            self.current_user, period, category, start, end)
+        return [(total["bucket"], total["total"]) for total in totals]
+
+    def get_year_over_year(self, category: Category = None):
+        """Returns the total amount of the current user's expenses in each month,
+        laid out by year so that the same months of different years can be compared.
+        Only the monthly rollups are read.
+
+        Args:
+            category (Category object, optional): If given, only expenses
+                                                within this category are summed up
+
+        Returns:
+            List of year (YYYY) and monthly totals pairs, sorted by year. The monthly
+            totals are a list of 12 amounts, January first, 0 for months without expenses.
+        """
+        years = {}
+        for month, total in self.get_totals_by_period("month", category):
+            years.setdefault(month[:4], [0] * 12)[int(month[5:7]) - 1] = total
+
+        return sorted(years.items())
+
+    def graph_all_expenses(self):
+        """Returns a line graph of all expenses of the current user by their amount over time
+
+        Returns:
+            The plot of a pandas dataframe, representing that graph
+        """
+        dataframe = self.expense_repository.get_all_expenses_as_pandas_dataframe()
+        user_dataframe = dataframe[dataframe["username"]
+                                   == self.current_user.username]
+        expense_graph = user_dataframe.plot(x="date", y="amount",
+                            kind="line", xlabel="Expense Date", ylabel="Expense Amount",
+                                    legend=False, figsize=(13, 5), style='-o')
+        return expense_graph
+
+    def graph_expenses_by_category(self, category: Category):
+        """Returns a line graph of the expenses of a specified category
+        of the current user by their amount over time
+
+        Args:
+            category (Category object): The category whose expenses are to be plotted
+
+        Returns:
+            The plot of a pandas dataframe, representing that graph
+        """
+        dataframe = self.expense_repository.get_all_expenses_as_pandas_dataframe()
+        user_dataframe = dataframe[(dataframe["username"] == self.current_user.username) & (
+            dataframe["category"] == category.name)]
+        expense_graph = user_dataframe.plot(
+            x="date", y="amount", kind="line", xlabel="Expense Date",
+            ylabel="Expense Amount", legend=False, figsize=(13, 5), style='-o')
+        return expense_graph
+
+    def graph_year_over_year(self, category: Category = None):
+        """Returns a line graph of the current user's monthly expense totals,
+        with one line per year, drawn from the monthly rollups
+
+        Args:
+            category (Category object, optional): If given, only expenses
+                                                within this category are plotted
+
+        Returns:
+            The plot of a pandas dataframe, representing that graph
+        """
+        years = self.get_year_over_year(category)
+        dataframe = pd.DataFrame(dict(years), index=range(1, 13))
+        expense_graph = dataframe.plot(
+            kind="line", xlabel="Month", ylabel="Total Amount", xticks=range(1, 13),
+            figsize=(13, 5), style='-o')
+        return expense_graph
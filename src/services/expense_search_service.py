@@ -0,0 +1,107 @@
+import re
+from collections import deque
+from datetime import date
+from repositories.expense_search_repository import ExpenseSearchRepository
+from entities.user import User
+
+# How many of the most recent matches of a search are ranked
+SEARCH_CANDIDATES = 500
+# Letters and digits, like the words of the search index
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+class ExpenseSearchService:
+    """This class finds expenses of the current logged-in user, by what they are
+    named or as pairs that may have been entered twice.
+    """
+
+    def __init__(self, search_repository: ExpenseSearchRepository, logged_in_user: User):
+        """Class constructor
+
+        Args:
+            search_repository (ExpenseSearchRepository object): Finds expenses
+                                                                in database
+            logged_in_user (User object): The current logged-in user whose expenses
+                                            are searched
+        """
+        self.search_repository = search_repository
+        self.current_user = logged_in_user
+
+    def search_expenses(self, query, limit=50, with_ids=False):
+        """Finds the current user's expenses by name or category as they type their
+        query. Every word of the query has to start a word of the expense name,
+        or the whole query has to start the category name.
+
+        Expenses whose name words equal the query words come first, then those
+        where they are only prefixes, and then those found by category. Shorter and
+        more recent names come first within each group. Only the most recent
+        SEARCH_CANDIDATES matches are ranked, so that short queries matching a large
+        part of the expenses stay fast.
+
+        Args:
+            query (str): The search query
+            limit (int, optional): Maximum number of expenses returned. Defaults to 50.
+            with_ids (bool, optional): If True, the id of each expense comes
+                                        before its name. Defaults to False.
+
+        Returns:
+            List of at most limit expenses, best matches first
+        """
+        terms = WORD_PATTERN.findall(str(query).lower())
+        candidates = self.search_repository.search_expenses(
+            self.current_user, terms, SEARCH_CANDIDATES)
+
+        def rank(expense):
+            words = WORD_PATTERN.findall(expense["name"].lower())
+            exact = sum(term in words for term in terms)
+            prefix = sum(any(word.startswith(term) for word in words) for term in terms)
+            return (-exact, -prefix, len(expense["name"]))
+
+        # Sorting is stable, so expenses that rank equally stay most recent first
+        candidates = sorted(candidates, key=lambda expense: (expense["date"], expense["id"]),
+                            reverse=True)
+        candidates = sorted(candidates, key=rank)[:max(int(limit), 0)]
+
+        return [([expense["id"]] if with_ids else []) +
+                [expense["name"], expense["amount"], expense["date"], expense["category"]]
+                for expense in candidates]
+
+    def find_near_duplicates(self, days=3):
+        """Finds pairs of the current user's expenses that have the same amount and
+        are at most the given number of days apart, which may have been entered twice.
+
+        The expenses are read ordered by amount and date, so that each expense only
+        needs to be compared with the following ones that are close enough in time,
+        instead of with all other expenses.
+
+        Args:
+            days (int, optional): The largest number of days between the expenses
+                                    of a pair. Defaults to 3.
+
+        Returns:
+            List of pairs of expenses, each expense as a list of name, amount,
+            date and category
+        """
+        days = int(days)
+        pairs = []
+        # Expenses with the current amount that are at most days older than the current one
+        window = deque()
+        window_amount = None
+
+        for expense in self.search_repository.iterate_expenses_by_amount(self.current_user):
+            listed_expense = [expense["name"], expense["amount"],
+                              expense["date"], expense["category"]]
+            day = date.fromisoformat(expense["date"]).toordinal()
+
+            amount = round(expense["amount"], 2)
+            if amount != window_amount:
+                window.clear()
+                window_amount = amount
+
+            while window and window[0][0] < day - days:
+                window.popleft()
+
+            pairs.extend([earlier, listed_expense] for _, earlier in window)
+            window.append((day, listed_expense))
+
+        return pairs
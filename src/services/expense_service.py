@@ -1,5 +1,9 @@
 from datetime import date
 from repositories.expense_repository import ExpenseRepository
+from repositories.category_repository import CategoryRepository
+from services.currency_converter import (CurrencyConverter, InvalidCurrencyError,
+                                         currency_converter as default_currency_converter)
+from services.operation_journal import OperationJournal, UNDO, REDO
 from entities.user import User
 from entities.expense import Expense
 from entities.category import Category
@@ -13,7 +17,10 @@ class ExpenseService:
     user-specific for the current logged in user.
     """
 
-    def __init__(self, expense_repository: ExpenseRepository, logged_in_user: User):
+    def __init__(self, expense_repository: ExpenseRepository, logged_in_user: User,
+                 currency_converter: CurrencyConverter = default_currency_converter,
+                 operation_journal: OperationJournal = None,
+                 category_repository: CategoryRepository = None):
         """Class constructor
 
         Args:
@@ -22,11 +29,21 @@ class ExpenseService:
                                 handling database operations
             logged_in_user (User object): The current logged-in user whose expenses will be managed.
                                             The user object includes their username and password.
+            currency_converter (CurrencyConverter object, optional): Converts the amounts
+                                of expenses in other currencies into the base currency
+            operation_journal (OperationJournal object, optional): Records how to undo
+                                and redo edits. Defaults to a journal kept in memory.
+            category_repository (CategoryRepository object, optional): Handles database
+                                operations on categories
         """
         self.expense_repository = expense_repository
         self.current_user = logged_in_user
+        self.currency_converter = currency_converter
+        self.operation_journal = operation_journal or OperationJournal(logged_in_user)
+        self.category_repository = category_repository or CategoryRepository()
 
-    def create_new_expense(self, name, amount, given_date=str(date.today()), category="undefined"):
+    def create_new_expense(self, name, amount, given_date=str(date.today()), category="undefined",
+                           currency=None):
         """Creates a new expense
 
         Args:
@@ -34,6 +51,90 @@ class ExpenseService:
             amount (str, int or float): Amount of the new expense
             given_date (optional): Date of the new expense. Defaults to date.today().
             category (str, optional): Category of the new expense. Defaults to "undefined".
+            currency (str, optional): Currency of the amount. Defaults to the base currency.
+
+        Raises:
+            MissingExchangeRateError: An error that occurs when the currency has
+            no exchange rate on or before the date of the expense
+        """
+        new_expense = self._build_valid_expense(
+            name, amount, given_date, category, currency)
+        new_expense.amount = round(new_expense.amount * self.currency_converter.get_rate(
+            new_expense.currency, new_expense.date), 2)
+
+        self.expense_repository.add_expense(self.current_user, new_expense)
+
+    def create_new_expenses(self, expenses):
+        """Creates several new expenses in a single transaction. Either all
+        expenses are created, or none of them if any expense is invalid.
+
+        Args:
+            expenses (iterable): Tuples of name, amount, date, category and currency of
+                                each new expense. Date, category and currency can be
+                                left empty or out.
+
+        Raises:
+            InvalidInputError: An error that occurs when the amount
+            and/or date details of any of the expenses are invalid
+            MissingExchangeRateError: An error that occurs when the currency of any
+            of the expenses has no exchange rate on or before its date
+
+        Returns:
+            The number of created expenses
+        """
+        new_expenses = [self._build_valid_expense(*expense) for expense in expenses]
+        self._convert_to_base_currency(new_expenses)
+
+        if new_expenses:
+            self.expense_repository.add_expenses(self.current_user, new_expenses)
+
+        return len(new_expenses)
+
+    def import_expenses(self, expenses):
+        """Creates several new expenses in a single transaction, skipping the ones
+        that have already been created with the same name, amount and date, e.g.
+        when imported bank statements overlap. Either all new expenses are created,
+        or none of them if any expense is invalid.
+
+        Args:
+            expenses (iterable): Tuples of name, amount, date, category and currency of
+                                each new expense. Date, category and currency can be
+                                left empty or out.
+
+        Raises:
+            InvalidInputError: An error that occurs when the amount
+            and/or date details of any of the expenses are invalid
+            MissingExchangeRateError: An error that occurs when the currency of any
+            of the expenses has no exchange rate on or before its date
+
+        Returns:
+            The number of created expenses
+        """
+        new_expenses = [self._build_valid_expense(*expense) for expense in expenses]
+        self._convert_to_base_currency(new_expenses)
+
+        if not new_expenses:
+            return 0
+
+        return self.expense_repository.import_expenses(self.current_user, new_expenses)
+
+    def _build_valid_expense(self, name, amount, given_date=None, category="undefined",
+                             currency=None):
+        """Checks the details of a new expense and builds an Expense object out of them
+
+        Args:
+            name (str): Name of the new expense
+            amount (str, int or float): Amount of the new expense
+            given_date (optional): Date of the new expense. Defaults to the current date.
+            category (str, optional): Category of the new expense. Defaults to "undefined".
+            currency (str, optional): Currency of the amount. Defaults to the base currency.
+
+        Raises:
+            InvalidInputError: An error that occurs when the amount, date
+            or currency is invalid
+
+        Returns:
+            The new expense as an Expense object, with the amount still in its currency
         """
         expense_name = str(name)
 
@@ -43,11 +144,33 @@ class ExpenseService:
         expense_date = self._check_expense_date_and_set_if_not_given(
             given_date)
 
-        expense_category = str(category)
-        new_expense = Expense(expense_name, expense_amount,
-                              expense_date, expense_category)
+        expense_category = str(category or "undefined")
 
-        self.expense_repository.add_expense(self.current_user, new_expense)
+        try:
+            expense_currency = self.currency_converter.normalize_currency(currency)
+        except InvalidCurrencyError as exc:
+            raise InvalidInputError(str(exc)) from exc
+
+        return Expense(expense_name, expense_amount, expense_date, expense_category,
+                       expense_currency, expense_amount if expense_currency else None)
+
+    def _convert_to_base_currency(self, expenses):
+        """Converts the amounts of new expenses in other currencies into the base
+        currency, all at once
+
+        Args:
+            expenses (list of Expense objects): New expenses, as built by _build_valid_expense
+        """
+        foreign = [expense for expense in expenses if expense.currency]
+        if not foreign:
+            return
+
+        amounts = self.currency_converter.convert(
+            [expense.original_amount for expense in foreign],
+            [expense.currency for expense in foreign],
+            [expense.date for expense in foreign])
+        for expense, amount in zip(foreign, amounts.tolist()):
+            expense.amount = amount
 
     def _check_expense_date_and_set_if_not_given(self, given_date):
         """Checks whether a valid date is given and
@@ -78,7 +201,7 @@ class ExpenseService:
         """
         try:
             amount = float(amount)
-        except ValueError as exc:
+        except (TypeError, ValueError) as exc:
             raise InvalidInputError(
                 """Invalid input. Make sure you have entered a nonnegative
                 numeric amount and a valid date in YYYY-MM-DD format""") from exc
@@ -118,19 +241,15 @@ class ExpenseService:
         found = self.expense_repository.find_expense(
             self.current_user, expense)
         if found:
-            old_expense = Expense(
-                found["name"], found["amount"], found["date"], found["category"])
-            self.expense_repository.delete_expense(
-                self.current_user, old_expense)
-
-            new_expense = Expense(
-                str(new_expense_name), found["amount"], found["date"], found["category"])
-            self.expense_repository.add_expense(self.current_user, new_expense)
+            self._run_operation(f"edit the name of {found['name']}", ["update", [[
+                found["id"], str(new_expense_name), found["amount"], found["date"],
+                found["category"], found["currency"], found["original_amount"]]]])
             return True
         return False
 
     def edit_expense_amount(self, new_expense_amount, expense: Expense):
-        """Changes the amount of an existing expense if the new amount is valid
+        """Changes the amount of an existing expense if the new amount is valid.
+        The new amount is in the base currency, like the amounts listed.
 
         Args:
             new_expense_amount (str, int or float): The new expense amount
@@ -144,14 +263,9 @@ class ExpenseService:
         if found:
             self._check_input_validity_expense_amount(new_expense_amount)
 
-            old_expense = Expense(
-                found["name"], found["amount"], found["date"], found["category"])
-            self.expense_repository.delete_expense(
-                self.current_user, old_expense)
-
-            new_expense = Expense(found["name"], float(
-                new_expense_amount), found["date"], found["category"])
-            self.expense_repository.add_expense(self.current_user, new_expense)
+            self._run_operation(f"edit the amount of {found['name']}", ["update", [[
+                found["id"], found["name"], float(new_expense_amount), found["date"],
+                found["category"], None, None]]])
             return True
         return False
 
@@ -168,14 +282,8 @@ class ExpenseService:
         found = self.expense_repository.find_expense(
             self.current_user, expense)
         if found:
-            old_expense = Expense(
-                found["name"], found["amount"], found["date"], found["category"])
-            self.expense_repository.delete_expense(
-                self.current_user, old_expense)
-
-            new_expense = Expense(
-                found["name"], found["amount"], found["date"], str(new_category_name))
-            self.expense_repository.add_expense(self.current_user, new_expense)
+            self._run_operation(f"edit the category of {found['name']}", [
+                "categories", [[found["id"], str(new_category_name)]]])
             return True
         return False
 
@@ -185,6 +293,11 @@ class ExpenseService:
         Args:
             new_expense_date (str): The new expense date
             expense (Expense object): The expense to be edited
+
+        Raises:
+            MissingExchangeRateError: An error that occurs when the expense is in
+            another currency that has no exchange rate on or before the new date
+
         Returns:
             True, if the expense date has been successfully changed
             False, if the expense to be edited does not exist
@@ -193,14 +306,13 @@ class ExpenseService:
             self.current_user, expense)
         if found:
             self._check_input_validity_expense_date(new_expense_date)
-            old_expense = Expense(
-                found["name"], found["amount"], found["date"], found["category"])
-            self.expense_repository.delete_expense(
-                self.current_user, old_expense)
-
-            new_expense = Expense(found["name"], found["amount"], str(
-                new_expense_date), found["category"])
-            self.expense_repository.add_expense(self.current_user, new_expense)
+            # An expense in another currency is converted with the rate of its new date
+            rate = self.currency_converter.get_rate(found["currency"], str(new_expense_date))
+            amount = round(found["original_amount"] * rate, 2) if found["currency"] \
+                else found["amount"]
+            self._run_operation(f"edit the date of {found['name']}", ["update", [[
+                found["id"], found["name"], amount, str(new_expense_date),
+                found["category"], found["currency"], found["original_amount"]]]])
             return True
         return False
 
@@ -219,10 +331,85 @@ class ExpenseService:
             self.current_user, expense)
 
         if found:
-            self.expense_repository.delete_expense(self.current_user, expense)
+            self._run_operation(f"delete {found['name']}", ["delete", [found["id"]]])
             return True
         return False
 
+    def edit_expenses_category(self, new_category_name, expense_ids):
+        """Moves several expenses of the current user into another category at once
+
+        Args:
+            new_category_name (str): The new category name
+            expense_ids (list of int): The ids of the expenses to be edited
+
+        Returns:
+            The number of expenses whose category changed
+        """
+        return self._run_operation(
+            f"move expenses to {new_category_name}", ["categories", [
+                [int(expense_id), str(new_category_name)] for expense_id in expense_ids]])
+
+    def edit_expenses_date(self, new_expense_date, expense_ids):
+        """Moves several expenses of the current user to another date at once, if the
+        new date is valid. They keep their ids, and so their tags.
+
+        Args:
+            new_expense_date (str): The new expense date
+            expense_ids (list of int): The ids of the expenses to be edited
+
+        Raises:
+            MissingExchangeRateError: An error that occurs when one of the expenses is
+            in another currency that has no exchange rate on or before the new date
+
+        Returns:
+            The number of edited expenses
+        """
+        new_expense_date = str(new_expense_date)
+        self._check_input_validity_expense_date(new_expense_date)
+
+        found = self.expense_repository.get_expenses_by_ids(
+            self.current_user, [int(expense_id) for expense_id in expense_ids])
+        expenses = [Expense(expense["name"], expense["amount"], new_expense_date,
+                            expense["category"], expense["currency"], expense["original_amount"])
+                    for expense in found]
+        # Expenses in other currencies are converted with the rates of the new date
+        self._convert_to_base_currency(expenses)
+
+        return self._run_operation(f"move expenses to {new_expense_date}", ["update", [
+            [expense_row["id"], expense.name, expense.amount, expense.date, expense.category,
+             expense.currency, expense.original_amount]
+            for expense_row, expense in zip(found, expenses)]])
+
+    def delete_expenses(self, expense_ids):
+        """Deletes several expenses of the current user at once
+
+        Args:
+            expense_ids (list of int): The ids of the expenses to be deleted
+
+        Returns:
+            The number of deleted expenses
+        """
+        return self._run_operation("delete expenses", [
+            "delete", [int(expense_id) for expense_id in expense_ids]])
+
+    def find_expenses_by_ids(self, expense_ids):
+        """Returns the current user's expenses with the given ids, e.g. to show
+        them again after they have been edited
+
+        Args:
+            expense_ids (list of int): The ids of the expenses
+
+        Returns:
+            Dictionary from the id of each found expense to its name, amount,
+            date and category
+        """
+        found = self.expense_repository.get_expenses_by_ids(
+            self.current_user, [int(expense_id) for expense_id in expense_ids])
+
+        return {expense["id"]: [expense["name"], expense["amount"],
+                                expense["date"], expense["category"]]
+                for expense in found}
+
     def delete_category(self, category: Category):
         """Deletes a specified category and adds all expenses
         within that category to the "undefined" category
@@ -234,22 +421,10 @@ class ExpenseService:
             False, if no expenses within that category exist for the current user
             True, otherwise
         """
-        all_expenses = self.expense_repository.get_all_expenses_by_category_and_user(
-            self.current_user, category)
+        moved = self._rename_category(
+            f"delete category {category.name}", category, "undefined")
 
-        if all_expenses:
-            for expense in all_expenses:
-                old_expense = Expense(
-                    expense["name"], expense["amount"], expense["date"], expense["category"])
-                self.expense_repository.delete_expense(
-                    self.current_user, old_expense)
-
-                new_expense = Expense(
-                    expense["name"], expense["amount"], expense["date"], "undefined")
-                self.expense_repository.add_expense(
-                    self.current_user, new_expense)
-            return True
-        return False
+        return moved > 0
 
     def rename_category(self, new_category_name, category: Category):
         """Renames a specified category
@@ -262,56 +437,130 @@ class ExpenseService:
             False, if no expenses within that category exist for the current user
             True, otherwise
         """
-        all_expenses = self.expense_repository.get_all_expenses_by_category_and_user(
-            self.current_user, category)
+        renamed = self._rename_category(
+            f"rename category {category.name} to {new_category_name}",
+            category, str(new_category_name))
 
-        if all_expenses:
-            for expense in all_expenses:
-                old_expense = Expense(
-                    expense["name"], expense["amount"], expense["date"], expense["category"])
-                self.expense_repository.delete_expense(
-                    self.current_user, old_expense)
-
-                new_expense = Expense(
-                    expense["name"], expense["amount"], expense["date"], str(new_category_name))
-                self.expense_repository.add_expense(
-                    self.current_user, new_expense)
-            return True
-        return False
+        return renamed > 0
+
+    def _rename_category(self, description, category: Category, new_name):
+        if new_name == category.name:
+            return self.category_repository.rename_category(
+                self.current_user, category, new_name)
+
+        return self._run_operation(description, ["rename", [category.name, new_name]])
+
+    def _apply_rename(self, old_name, new_name):
+        if new_name in self.list_all_categories():
+            # Merged expenses cannot be told apart from the ones the other category
+            # had, so the merge is undone by moving them back by their ids
+            expense_ids = self.category_repository.get_expense_ids_by_category(
+                self.current_user, Category(old_name))
+            return self._apply_operation(["categories", [
+                [expense_id, new_name] for expense_id in expense_ids]])
 
-    def get_total_all_expenses_by_user(self):
-        """Calculates and returns the total amount of all expenses of the current user.
+        # Otherwise renaming the category back undoes the rename with a single
+        # update of the category, however many expenses it has
+        count = self.category_repository.rename_category(
+            self.current_user, Category(old_name), new_name)
+        return count, ["rename", [new_name, old_name]]
+
+    def _run_operation(self, description, operation):
+        """Applies an edit and records its inverse operation in the journal
+
+        Args:
+            description (str): What the edit does
+            operation (list): The edit as an operation
 
         Returns:
-            The total amount of all expenses of the current user, as an integer.
+            The number of edited expenses
         """
-        all_expenses = self.expense_repository.get_all_expenses_by_user(
-            self.current_user)
-        total = 0
-        for expense in all_expenses:
-            total += expense["amount"]
-        return total
+        count, inverse = self._apply_operation(operation)
+        if count:
+            self.operation_journal.record(description, inverse)
+        return count
 
-    def get_total_by_category_and_user(self, category: Category):
-        """Calculates and returns the total amount of all expenses wihthin a
-        specified category, belonging to the current user.
+    def _apply_operation(self, operation):
+        """Applies an operation of the journal in a single transaction
 
         Args:
-            category (Category object): The category whose expense total is to be calculated
+            operation (list): The kind of the operation, and the rows or names it
+                            applies to. An update and a move of expenses into
+                            categories give new details of expenses by their ids,
+                            a deletion the ids of the deleted expenses, a restore the
+                            deleted expenses and a rename the old and new category
+                            name.
 
         Returns:
-            The total amount of all expenses in that category, as an integer.
+            The number of edited expenses, and the inverse operation
         """
-        all_expenses = self.expense_repository.get_all_expenses_by_category_and_user(
-            self.current_user, category)
-        total = 0
-        for expense in all_expenses:
-            total += expense["amount"]
-        return total
+        kind, rows = operation
+
+        if kind == "update":
+            inverse = ["update", [list(expense) for expense in
+                                  self.expense_repository.get_expenses_by_ids(
+                                      self.current_user, [row[0] for row in rows])]]
+            count = self.expense_repository.update_expenses(
+                self.current_user, [(row[0], Expense(*row[1:])) for row in rows])
+
+        elif kind == "categories":
+            inverse = ["categories", [[expense["id"], expense["category"]] for expense in
+                                      self.expense_repository.get_expenses_by_ids(
+                                          self.current_user, [row[0] for row in rows])]]
+            count = self.category_repository.update_categories(self.current_user, rows)
+
+        elif kind == "delete":
+            inverse = ["restore", self.expense_repository.get_expense_snapshots(
+                self.current_user, rows)]
+            count = self.expense_repository.delete_expenses_by_ids(self.current_user, rows)
+
+        elif kind == "restore":
+            restored_ids = self.expense_repository.restore_expenses(self.current_user, rows)
+            inverse = ["delete", restored_ids]
+            count = len(restored_ids)
+
+        else:
+            # Renames journaled earlier also list the ids of the renamed expenses
+            count, inverse = self._apply_rename(*rows[:2])
+
+        return count, inverse
+
+    def undo(self):
+        """Undoes the current user's latest edit that has not been undone yet
+
+        Returns:
+            The description of the undone edit, or None if there is nothing to undo
+        """
+        return self._replay(UNDO, REDO)
+
+    def redo(self):
+        """Redoes the current user's latest undone edit
 
-    def list_all_expenses(self):
+        Returns:
+            The description of the redone edit, or None if there is nothing to redo
+        """
+        return self._replay(REDO, UNDO)
+
+    def _replay(self, source, target):
+        entry = self.operation_journal.peek(source)
+        if entry is None:
+            return None
+
+        # The operation is only taken off its stack once it has been applied,
+        # so an undo or redo that fails can be tried again
+        description, operation = entry
+        _, inverse = self._apply_operation(operation)
+        self.operation_journal.pop(source)
+        self.operation_journal.push(target, description, inverse)
+        return description
+
+    def list_all_expenses(self, with_ids=False):
         """Returns a list of all expenses belonging to the current user
 
+        Args:
+            with_ids (bool, optional): If True, the id of each expense comes
+                                        before its name. Defaults to False.
+
         Returns:
             A list of all the current user's expenses
         """
@@ -322,16 +571,20 @@ class ExpenseService:
         for expense in all_expenses:
             listed_expense = [expense["name"], expense["amount"],
                               expense["date"], expense["category"]]
+            if with_ids:
+                listed_expense.insert(0, expense["id"])
             list_of_expenses.append(listed_expense)
 
         return list_of_expenses
 
-    def list_expenses_by_category(self, category: Category):
+    def list_expenses_by_category(self, category: Category, with_ids=False):
         """Returns a list of all expenses belonging to a specified category
         and the current user
 
         Args:
             category (Category object): The category whose expenses are to be listed
+            with_ids (bool, optional): If True, the id of each expense comes
+                                        before its name. Defaults to False.
 
         Returns:
             List of expenses within the specified category
@@ -343,65 +596,38 @@ class ExpenseService:
         for expense in all_expenses:
             listed_expense = [expense["name"], expense["amount"],
                               expense["date"], expense["category"]]
+            if with_ids:
+                listed_expense.insert(0, expense["id"])
             list_of_expenses.append(listed_expense)
 
         return list_of_expenses
 
-    def list_all_categories(self):
-        """Returns a list of categories belonging to the current user
+    def list_expenses_page(self, offset=0, limit=50, category: Category = None):
+        """Returns one page of the expenses belonging to the current user
 
-        Returns:
-            List of categories of the current user, or
-            an empty list if that user has no created expenses
-        """
-        all_expenses = self.expense_repository.get_all_expenses_by_user(
-            self.current_user)
-        if all_expenses:
-            set_of_categories = set()
-            list_of_categories = []
-
-            for expense in all_expenses:
-                set_of_categories.add(expense["category"])
-
-            for category in set_of_categories:
-                list_of_categories.append(category)
-
-            list_of_categories.sort()
-
-            return list_of_categories
-        return []
-
-    def graph_all_expenses(self):
-        """Returns a line graph of all expenses of the current user by their amount over time
+        Args:
+            offset (int, optional): Number of expenses skipped. Defaults to 0.
+            limit (int, optional): Maximum number of expenses returned. Defaults to 50.
+            category (Category object, optional): If given, only expenses
+                                                within this category are listed
 
         Returns:
-            The plot of a pandas dataframe, representing that graph
+            A list of at most limit expenses of the current user, most recent first
         """
-        dataframe = self.expense_repository.get_all_expenses_as_pandas_dataframe()
-        user_dataframe = dataframe[dataframe["username"]
-                                   == self.current_user.username]
-        expense_graph = user_dataframe.plot(x="date", y="amount",
-                            kind="line", xlabel="Expense Date", ylabel="Expense Amount",
-                                    legend=False, figsize=(13, 5), style='-o')
-        return expense_graph
-
-    def graph_expenses_by_category(self, category: Category):
-        """Returns a line graph of the expenses of a specified category
-        of the current user by their amount over time
+        page = self.expense_repository.get_expenses_by_user_page(
+            self.current_user, max(int(offset), 0), max(int(limit), 0), category)
 
-        Args:
-            category (Category object): The category whose expenses are to be plotted
+        return [[expense["name"], expense["amount"], expense["date"], expense["category"]]
+                for expense in page]
+
+    def list_all_categories(self):
+        """Returns a list of categories belonging to the current user
 
         Returns:
-            The plot of a pandas dataframe, representing that graph
+            List of categories of the current user, or
+            an empty list if that user has no created expenses
         """
-        dataframe = self.expense_repository.get_all_expenses_as_pandas_dataframe()
-        user_dataframe = dataframe[(dataframe["username"] == self.current_user.username) & (
-            dataframe["category"] == category.name)]
-        expense_graph = user_dataframe.plot(
-            x="date", y="amount", kind="line", xlabel="Expense Date",
-            ylabel="Expense Amount", legend=False, figsize=(13, 5), style='-o')
-        return expense_graph
+        return self.category_repository.get_categories_by_user(self.current_user)
 
 
 class InvalidInputError(Exception):
@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+from config import FORECAST_SMOOTHING_FACTOR
+from entities.user import User
+from entities.category import Category
+from repositories.expense_rollup_repository import ExpenseRollupRepository
+from repositories.expense_change_repository import ExpenseChangeRepository
+from services.expense_service import InvalidInputError
+
+# Models the next month's spending can be projected with
+FORECAST_METHODS = ["smoothing", "trend"]
+
+
+def forecast_series(series, method="smoothing", smoothing_factor=FORECAST_SMOOTHING_FACTOR):
+    """Projects the next value of several series of monthly totals at once
+
+    Args:
+        series (NumPy array): One row of monthly totals per series, oldest month first
+        method (str, optional): smoothing for simple exponential smoothing, or trend
+                                for a least squares linear trend. Defaults to smoothing.
+        smoothing_factor (float, optional): Weight of the latest month in exponential
+                                            smoothing, between 0 and 1
+
+    Returns:
+        NumPy array of the projected next month's total of each series, never negative
+    """
+    series = np.asarray(series, dtype=np.float64)
+    if series.shape[1] == 0:
+        return np.zeros(series.shape[0])
+
+    if method == "trend":
+        months = np.arange(series.shape[1], dtype=np.float64)
+        offsets = months - months.mean()
+        means = series.mean(axis=1)
+        variance = (offsets ** 2).sum()
+        slopes = (series - means[:, None]) @ offsets / variance if variance else 0
+        forecasts = means + slopes * (series.shape[1] - months.mean())
+    else:
+        forecasts = series[:, 0].copy()
+        for column in series.T[1:]:
+            forecasts += smoothing_factor * (column - forecasts)
+
+    return np.maximum(forecasts, 0)
+
+
+def _month_number(month):
+    return np.asarray(month, dtype="datetime64[M]").astype(np.int64)
+
+
+def _month_name(number):
+    return str(np.datetime64(int(number), "M"))
+
+
+class ForecastService:
+    """This class projects the current user's spending in the next month.
+
+    The monthly totals of all categories are read from the rollups into one
+    matrix, and the forecasts of all categories are computed from it in one pass.
+    Both are kept until the user's expenses change, which the change journal
+    tells with a single lookup.
+    """
+
+    def __init__(self, rollup_repository: ExpenseRollupRepository, logged_in_user: User,
+                 smoothing_factor=FORECAST_SMOOTHING_FACTOR,
+                 change_repository: ExpenseChangeRepository = None):
+        """Class constructor
+
+        Args:
+            rollup_repository (ExpenseRollupRepository object): Handles database
+                                                            operations on the rollups
+            logged_in_user (User object): The current logged-in user whose spending
+                                            is projected
+            smoothing_factor (float, optional): Weight of the latest month in
+                                                exponential smoothing, between 0 and 1
+            change_repository (ExpenseChangeRepository object, optional): Reads the
+                                                            change journal
+        """
+        self.rollup_repository = rollup_repository
+        self.change_repository = change_repository or ExpenseChangeRepository()
+        self.current_user = logged_in_user
+        self.smoothing_factor = smoothing_factor
+
+        self._cached_seq = None
+        self._cache = {}
+
+    def get_monthly_series(self):
+        """Returns the current user's monthly totals in each category, with a total
+        for every month between the first and the last month with expenses
+
+        Returns:
+            Tuple of the months (YYYY-MM), the category names, sorted, and a NumPy
+            array with one row of monthly totals per category
+        """
+        self._clear_cache_if_changed()
+        if "series" not in self._cache:
+            self._cache["series"] = self._read_monthly_series()
+        return self._cache["series"]
+
+    def _read_monthly_series(self):
+        self.rollup_repository.refresh_rollups()
+        rows = self.rollup_repository.get_monthly_totals_by_category(self.current_user)
+        if not rows:
+            return [], [], np.zeros((0, 0))
+
+        categories, category_indexes = np.unique(
+            [row["category"] for row in rows], return_inverse=True)
+        month_numbers = _month_number([row["bucket"] for row in rows])
+        first = month_numbers.min()
+
+        series = np.zeros((len(categories), month_numbers.max() - first + 1))
+        series[category_indexes, month_numbers - first] = [row["total"] for row in rows]
+
+        months = [_month_name(number) for number in range(first, month_numbers.max() + 1)]
+        return months, categories.tolist(), series
+
+    def forecast_next_month(self, method="smoothing"):
+        """Projects the current user's spending in each category in the month
+        after the last month with expenses
+
+        Args:
+            method (str, optional): smoothing or trend, see forecast_series.
+                                    Defaults to smoothing.
+
+        Raises:
+            InvalidInputError: An error that occurs when the method is not one of
+            FORECAST_METHODS
+
+        Returns:
+            Tuple of the projected month (YYYY-MM), None if the user has no expenses,
+            and a list of category name and projected total pairs, sorted by category
+        """
+        if method not in FORECAST_METHODS:
+            raise InvalidInputError(f"Unknown forecast method {method}")
+
+        months, categories, series = self.get_monthly_series()
+        if method not in self._cache:
+            forecasts = forecast_series(series, method, self.smoothing_factor)
+            month = _month_name(_month_number(months[-1]) + 1) if months else None
+            self._cache[method] = (month, list(zip(categories, forecasts.tolist())))
+        return self._cache[method]
+
+    def graph_forecast(self, category: Category = None, method="smoothing"):
+        """Returns a line graph of the current user's monthly expense totals,
+        extended with a dashed line to the next month's projected total
+
+        Args:
+            category (Category object, optional): If given, only expenses
+                                                within this category are plotted
+            method (str, optional): smoothing or trend. Defaults to smoothing.
+
+        Returns:
+            The plot of a pandas dataframe, representing that graph
+        """
+        month, forecasts = self.forecast_next_month(method)
+        months, categories, series = self.get_monthly_series()
+
+        if category:
+            rows = [categories.index(category.name)] if category.name in categories else []
+            totals = series[rows].sum(axis=0)
+            forecast = sum(total for name, total in forecasts if name == category.name)
+        else:
+            totals = series.sum(axis=0)
+            forecast = sum(total for _, total in forecasts)
+
+        dataframe = pd.DataFrame(
+            {"Total": list(totals) + [np.nan], "Forecast": np.nan}, index=months + [month])
+        if months:
+            dataframe.iloc[-2:, 1] = [totals[-1], forecast]
+        expense_graph = dataframe.plot(
+            kind="line", xlabel="Month", ylabel="Total Amount", figsize=(13, 5),
+            style=["-o", "--o"])
+        return expense_graph
+
+    def _clear_cache_if_changed(self):
+        seq = self.change_repository.get_last_change_seq(self.current_user)
+        if seq != self._cached_seq:
+            self._cached_seq = seq
+            self._cache = {}
@@ -1,27 +1,61 @@
-import string
+from config import (LOGIN_ATTEMPTS_PER_USERNAME, LOGIN_ATTEMPTS_PER_CLIENT,
+                    LOGIN_ATTEMPT_WINDOW_SECONDS, LOGIN_RATE_LIMIT_MAX_KEYS)
 from entities.user import User
+from entities.session import Session
 
 from repositories.user_repository import UserRepository
+from services.session_registry import SessionRegistry
+from services.password_hasher import PasswordHasher, PendingResult
+from services.rate_limiter import RateLimiter
+from services.password_policy import PasswordPolicy
 
 
 class LoginService:
     """This class manages the login functionality of the application.
-    This includes creating a new user account, and logging in to and out of an existing account. 
+    This includes creating a new user account, and logging in to and out of an existing account.
+    Each login starts its own session, so several users can be logged in at the same time.
+
+    Passwords are stored as salted hashes. Hashing is slow on purpose, so the methods
+    ending in _async only hash in the worker pool of the password hasher, and return
+    a PendingResult. The database is only used from the thread calling them and
+    the thread requesting the result, as its connection is shared.
+
+    Login attempts are rate limited per username and per client, before the database
+    is queried or a password is hashed. Successful attempts give their tokens back,
+    so only failed attempts count against the limits.
     """
 
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, session_registry: SessionRegistry = None,
+                 password_hasher: PasswordHasher = None, username_rate_limiter: RateLimiter = None,
+                 client_rate_limiter: RateLimiter = None, password_policy: PasswordPolicy = None):
         """Class constructor
 
         Args:
             user_repository (UserRepository object): Object with methods of UserRepository class,
                                                         handling database operations
+            session_registry (SessionRegistry object, optional): Keeps track of the sessions
+                                                        of logged-in users
+            password_hasher (PasswordHasher object, optional): Hashes and verifies passwords
+            username_rate_limiter (RateLimiter object, optional): Limits login attempts
+                                                        per username
+            client_rate_limiter (RateLimiter object, optional): Limits login attempts
+                                                        per client address
+            password_policy (PasswordPolicy object, optional): The rules chosen
+                                                        passwords must meet
         """
         self.user_repository = user_repository
-        self.logged_in_user = None
+        self.session_registry = session_registry or SessionRegistry()
+        self.password_hasher = password_hasher or PasswordHasher()
+        self.username_rate_limiter = username_rate_limiter or RateLimiter(
+            LOGIN_ATTEMPTS_PER_USERNAME, LOGIN_ATTEMPT_WINDOW_SECONDS, LOGIN_RATE_LIMIT_MAX_KEYS)
+        self.client_rate_limiter = client_rate_limiter or RateLimiter(
+            LOGIN_ATTEMPTS_PER_CLIENT, LOGIN_ATTEMPT_WINDOW_SECONDS, LOGIN_RATE_LIMIT_MAX_KEYS)
+        self.password_policy = password_policy or PasswordPolicy()
 
     def _validate_password(self, password):
-        """Checks that a chosen password is valid, i.e. is at least 8 characters long,
-        and includes at least one number and one special character
+        """Checks that a chosen password meets the password policy, by default that it
+        is at least 8 characters long, includes at least one number and one special
+        character, and is not a common password
 
         Args:
             password (str): The chosen password
@@ -35,22 +69,12 @@ class LoginService:
         """
         password = str(password)
 
-        special_characters = list(string.punctuation)
-        include_special_char = False
-
-        numbers = list(string.digits)
-        include_number = False
-
-        for i in password:
-            if i in special_characters:
-                include_special_char = True
-            if i in numbers:
-                include_number = True
-
-        if len(password) >= 8 and include_number is True and include_special_char is True:
+        if self.password_policy.is_valid(password):
             return True
 
-        raise IncorrectPasswordFormatError("Incorrect password format")
+        violations = self.password_policy.find_violations(password)
+        raise IncorrectPasswordFormatError(
+            "Incorrect password format: the password " + ", ".join(violations))
 
     def create_new_user(self, username, password):
         """Creates a new user with username and password
@@ -67,72 +91,252 @@ class LoginService:
         username = str(username)
         password = str(password)
 
+        self._check_new_user(username, password)
+
+        password_hash = self.password_hasher.hash_password(password)
+        self.user_repository.add_user(User(username, password_hash))
+
+    def _check_new_user(self, username, password):
         found = self.user_repository.find_user(username)
 
-        if found is None:
+        if found is not None:
+            raise UsernameNotUniqueError(
+                "User with this username exists already")
 
-            password_test = self._validate_password(password)
+        self._validate_password(password)
 
-            if password_test is True:
+    def create_new_users(self, credentials):
+        """Creates several new users at once, e.g. when onboarding an organisation.
+        All passwords are validated before any user is created, the passwords are
+        hashed in parallel, and the users are added in a single transaction.
 
-                new_user = User(username, password)
-                self.user_repository.add_user(new_user)
+        Args:
+            credentials (list of tuples): Username and password of each new user
 
-        else:
-            raise UsernameNotUniqueError(
-                "User with this username exists already")
+        Raises:
+            IncorrectPasswordFormatError: An error that occurs when any of the
+            passwords does not meet the validity criteria
+
+        Returns:
+            List of the usernames that were not created because they were taken
+        """
+        credentials = [(str(username), str(password)) for username, password in credentials]
+
+        for _, password in credentials:
+            self._validate_password(password)
+
+        password_hashes = self.password_hasher.hash_passwords(
+            [password for _, password in credentials])
+
+        return self.user_repository.add_users(
+            [User(username, password_hash)
+             for (username, _), password_hash in zip(credentials, password_hashes)])
+
+    def create_new_user_async(self, username, password):
+        """Creates a new user, hashing the password in the worker pool of the password
+        hasher. The username is checked in the calling thread, and the user is added
+        in the thread requesting the result.
+
+        Args:
+            username (str): The chosen username
+            password (str): The chosen password
+
+        Returns:
+            A PendingResult, which raises the errors of create_new_user when its
+            result is requested
+        """
+        username = str(username)
+        password = str(password)
+
+        try:
+            self._check_new_user(username, password)
+        except (UsernameNotUniqueError, IncorrectPasswordFormatError) as error:
+            return PendingResult.failed(error)
+
+        return PendingResult(
+            self.password_hasher.submit(self.password_hasher.hash_password, password),
+            lambda password_hash: self.user_repository.add_user(User(username, password_hash)))
 
-    def validate_credentials(self, username, password):
-        """Checks whether the entered username exits and matches the entered password
+    def validate_credentials(self, username, password, client=None):
+        """Checks whether the entered username exits and matches the entered password.
+        If the password is valid, but was hashed with other parameters than the current
+        ones, it is hashed again and the stored hash is replaced.
 
         Args:
             username (str): The entered username
             password (str): The entered password
+            client (str, optional): The address the attempt comes from, if it is remote
 
         Raises:
             InvalidCredentialsError: An error that occurs when the entered username does
             not exist or does not match the password
+            TooManyAttemptsError: An error that occurs when there have been too many
+            failed login attempts for the username or from the client
 
         Returns:
             True, if the username and password match
         """
-        found = self.user_repository.find_user(username)
+        self._check_credentials(username, password, client)
 
-        if found is not None and found["password"] == password:
-            return True
+        return True
 
-        raise InvalidCredentialsError("Invalid credentials")
+    def _check_credentials(self, username, password, client=None):
+        """Checks the entered credentials, rehashing the password if needed
 
-    def login_user(self, username, password):
-        """Logs in an existing user, after checking the validity of their username and password
+        Raises:
+            InvalidCredentialsError: An error that occurs when the entered username does
+            not exist or does not match the password
+            TooManyAttemptsError: An error that occurs when there have been too many
+            failed login attempts for the username or from the client
+
+        Returns:
+            A User object with the current password hash of the user
+        """
+        username = str(username)
+        found = self._find_login_user(username, client)
+
+        return self._finish_login(username, client, found,
+                                  self._verify_password(str(password), found))
+
+    def _find_login_user(self, username, client):
+        self._acquire_login_attempt(username, client)
+
+        return self.user_repository.find_user(username)
+
+    def _verify_password(self, password, found):
+        """Checks a password against the stored hash, and hashes it again if the
+        stored hash has other parameters than the current ones. Does not use the
+        database, so it can run in the worker pool of the password hasher.
+
+        Returns:
+            Tuple of whether the password matched, and the current password hash
+        """
+        # A username that does not exist is checked against a dummy hash, so that
+        # the time the check takes does not tell which usernames exist
+        dummy_hash = self.password_hasher.get_dummy_hash()
+        if found is None:
+            self.password_hasher.verify_password(password, dummy_hash)
+            return False, None
+
+        if not self.password_hasher.verify_password(password, found["password"]):
+            return False, None
+
+        if self.password_hasher.needs_rehash(found["password"]):
+            return True, self.password_hasher.hash_password(password)
+
+        return True, found["password"]
+
+    def _finish_login(self, username, client, found, verification):
+        matches, password_hash = verification
+        if not matches:
+            raise InvalidCredentialsError("Invalid credentials")
+
+        self.username_rate_limiter.release(username)
+        if client is not None:
+            self.client_rate_limiter.release(client)
+
+        if password_hash != found["password"]:
+            self.user_repository.update_password(username, password_hash)
+
+        return User(username, password_hash)
+
+    def _acquire_login_attempt(self, username, client):
+        if client is not None:
+            retry_after = self.client_rate_limiter.acquire(client)
+            if retry_after:
+                raise TooManyAttemptsError(
+                    "Too many login attempts from this client", retry_after)
+
+        retry_after = self.username_rate_limiter.acquire(username)
+        if retry_after:
+            raise TooManyAttemptsError("Too many login attempts for this user", retry_after)
+
+    def authenticate_user(self, username, password, client=None):
+        """Checks the entered credentials and returns the matching user, without
+        logging them in, e.g. for serving several users at once
 
         Args:
             username (str): The entered username
             password (str): The entered password
+            client (str, optional): The address the attempt comes from, if it is remote
+
+        Raises:
+            InvalidCredentialsError: An error that occurs when the entered username does
+            not exist or does not match the password
+            TooManyAttemptsError: An error that occurs when there have been too many
+            failed login attempts for the username or from the client
 
         Returns:
-            A user object of the current logged-in user, or
-            None if the entered credentials are invalid.
+            A User object of the authenticated user
         """
-        valid = self.validate_credentials(username, password)
+        return self._check_credentials(username, password, client)
 
-        if valid:
-            self.logged_in_user = User(username, password)
+    def start_session(self, username, password, client=None):
+        """Logs in an existing user by starting a new session for them,
+        after checking the validity of their username and password
 
-        return self.logged_in_user
+        Args:
+            username (str): The entered username
+            password (str): The entered password
+            client (str, optional): The address the attempt comes from, if it is remote
 
-    def find_logged_in_user(self):
-        """Finds and returns which user is currently logged in
+        Raises:
+            InvalidCredentialsError: An error that occurs when the entered username does
+            not exist or does not match the password
+            TooManyAttemptsError: An error that occurs when there have been too many
+            failed login attempts for the username or from the client
 
         Returns:
-            The currently logged-in user as a User object, or None if no user is logged in.
+            The new session of the logged-in user as a Session object
         """
-        return self.logged_in_user
+        user = self.authenticate_user(username, password, client)
 
-    def logout_user(self):
-        """Logs out the currently logged-in user
+        return self.session_registry.create_session(user)
+
+    def start_session_async(self, username, password, client=None):
+        """Starts a session, checking the password in the worker pool of the password
+        hasher. The user is looked up in the calling thread, and a rehashed password
+        is stored in the thread requesting the result.
+
+        Args:
+            username (str): The entered username
+            password (str): The entered password
+            client (str, optional): The address the attempt comes from, if it is remote
+
+        Returns:
+            A PendingResult of the new Session object, which raises the errors of
+            start_session when its result is requested
+        """
+        username = str(username)
+
+        try:
+            found = self._find_login_user(username, client)
+        except TooManyAttemptsError as error:
+            return PendingResult.failed(error)
+
+        return PendingResult(
+            self.password_hasher.submit(self._verify_password, str(password), found),
+            lambda verification: self.session_registry.create_session(
+                self._finish_login(username, client, found, verification)))
+
+    def find_session(self, session_id):
+        """Finds a session of a logged-in user
+
+        Args:
+            session_id (str): The identifier of the session
+
+        Returns:
+            The Session object, or None if the session does not exist or has expired
         """
-        self.logged_in_user = None
+        return self.session_registry.find_session(session_id)
+
+    def end_session(self, session: Session):
+        """Logs out the user of a session
+
+        Args:
+            session (Session object): The session to be ended
+        """
+        self.session_registry.end_session(session.session_id)
 
 
 class UsernameNotUniqueError(Exception):
@@ -147,4 +351,10 @@ class IncorrectPasswordFormatError(Exception):
     pass
 
 
+class TooManyAttemptsError(Exception):
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 login_service = LoginService(UserRepository())
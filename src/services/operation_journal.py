@@ -0,0 +1,113 @@
+from collections import deque
+from config import UNDO_HISTORY_SIZE
+from entities.user import User
+from repositories.operation_journal_repository import OperationJournalRepository
+
+# The stacks of the journal
+UNDO = "undo"
+REDO = "redo"
+
+
+class OperationJournal:
+    """This class keeps the inverse operations of the current user's latest edits,
+    which undo them, and of the latest undone edits, which redo them.
+
+    An operation is a short JSON serializable list, e.g. the ids of deleted expenses
+    or the new and old name of a renamed category, so it is as
+    large as the edit itself instead of a copy of the tables. Each stack is a ring
+    buffer, in which the oldest operation is dropped when it is full. If an
+    OperationJournalRepository is given, the stacks are also stored in database,
+    so edits can be undone in a later session.
+    """
+
+    def __init__(self, logged_in_user: User, size=UNDO_HISTORY_SIZE,
+                 operation_journal_repository: OperationJournalRepository = None):
+        """Class constructor
+
+        Args:
+            logged_in_user (User object): The current logged-in user whose edits
+                                            are journaled
+            size (int, optional): Largest number of operations kept in each stack
+            operation_journal_repository (OperationJournalRepository object, optional):
+                                            Stores the stacks in database. If not
+                                            given, they are only kept in memory.
+        """
+        self.current_user = logged_in_user
+        self.size = max(int(size), 0)
+        self.operation_journal_repository = operation_journal_repository
+
+        self._stacks = {UNDO: deque(maxlen=self.size), REDO: deque(maxlen=self.size)}
+        if operation_journal_repository:
+            for stack, operations in self._stacks.items():
+                operations.extend(operation_journal_repository.get_operations(
+                    self.current_user, stack, self.size))
+
+    def record(self, description, operation):
+        """Records the inverse operation of a new edit. The undone edits can no
+        longer be redone after it.
+
+        Args:
+            description (str): What the edit did, e.g. "delete 3 expenses"
+            operation (list): The operation undoing the edit
+        """
+        self.clear(REDO)
+        self.push(UNDO, description, operation)
+
+    def push(self, stack, description, operation):
+        """Adds an operation on top of a stack, dropping the oldest operation
+        of a full stack
+
+        Args:
+            stack (str): UNDO or REDO
+            description (str): What the operation undoes or redoes
+            operation (list): The operation
+        """
+        if not self.size:
+            return
+
+        operation_id = None
+        if self.operation_journal_repository:
+            operation_id = self.operation_journal_repository.add_operation(
+                self.current_user, stack, description, operation, self.size)
+        self._stacks[stack].append((operation_id, description, operation))
+
+    def pop(self, stack):
+        """Removes the operation on top of a stack
+
+        Args:
+            stack (str): UNDO or REDO
+
+        Returns:
+            The description and operation, or None if the stack is empty
+        """
+        if not self._stacks[stack]:
+            return None
+
+        operation_id, description, operation = self._stacks[stack].pop()
+        if self.operation_journal_repository:
+            self.operation_journal_repository.delete_operation(operation_id)
+        return description, operation
+
+    def peek(self, stack):
+        """Returns the operation on top of a stack without removing it
+
+        Args:
+            stack (str): UNDO or REDO
+
+        Returns:
+            The description and operation, or None if the stack is empty
+        """
+        if not self._stacks[stack]:
+            return None
+        _, description, operation = self._stacks[stack][-1]
+        return description, operation
+
+    def clear(self, stack):
+        """Removes all operations of a stack
+
+        Args:
+            stack (str): UNDO or REDO
+        """
+        if self._stacks[stack] and self.operation_journal_repository:
+            self.operation_journal_repository.delete_operations(self.current_user, stack)
+        self._stacks[stack].clear()
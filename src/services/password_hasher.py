@@ -0,0 +1,229 @@
+import base64
+import hashlib
+import hmac
+import os
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from config import PASSWORD_HASH_COST, PASSWORD_HASH_WORKERS
+
+ALGORITHM = "scrypt"
+BLOCK_SIZE = 8
+PARALLELISM = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+BASE64 = r"(?:[A-Za-z0-9+/]{4})*(?:[A-Za-z0-9+/]{4}|[A-Za-z0-9+/]{3}=|[A-Za-z0-9+/]{2}==)"
+HASH_PATTERN = re.compile(
+    rf"{ALGORITHM}\$[0-9]{{1,2}}\$[0-9]{{1,3}}\$[0-9]{{1,3}}\${BASE64}\${BASE64}")
+
+
+class PasswordHasher:
+    """This class hashes passwords with the scrypt key derivation function.
+
+    Hashes are stored as "scrypt$cost$block size$parallelism$salt$key", so that
+    passwords hashed with older parameters can still be verified and then rehashed.
+    The cost is the base 2 logarithm of the scrypt N parameter: each step up
+    doubles both the time and the memory a hash takes.
+
+    Hashing takes a deliberately long time, so the worker pool of this class can be
+    used to run it without blocking the UI thread or an event loop.
+    """
+
+    def __init__(self, cost=PASSWORD_HASH_COST, workers=PASSWORD_HASH_WORKERS):
+        """Class constructor
+
+        Args:
+            cost (int, optional): The base 2 logarithm of the scrypt N parameter
+            workers (int, optional): Number of threads in the worker pool
+        """
+        self.cost = cost
+        self._workers = workers
+        self._executor = None
+        self._dummy_hash = None
+
+    def hash_password(self, password):
+        """Hashes a password with a new random salt
+
+        Args:
+            password (str): The password to be hashed
+
+        Returns:
+            The encoded hash, including the parameters and salt
+        """
+        salt = os.urandom(SALT_BYTES)
+        key = self._derive_key(password, salt, self.cost, BLOCK_SIZE, PARALLELISM)
+
+        return "$".join([ALGORITHM, str(self.cost), str(BLOCK_SIZE), str(PARALLELISM),
+                         self._encode(salt), self._encode(key)])
+
+    def verify_password(self, password, encoded_hash):
+        """Checks whether a password matches a stored hash. Passwords stored
+        in plain text before hashing was introduced are also accepted.
+
+        Args:
+            password (str): The entered password
+            encoded_hash (str): The stored hash
+
+        Returns:
+            True, if the password matches, otherwise False
+        """
+        if not self._is_hashed(encoded_hash):
+            return hmac.compare_digest(str(password).encode("utf-8"),
+                                       str(encoded_hash).encode("utf-8"))
+
+        _, cost, block_size, parallelism, salt, key = encoded_hash.split("$")
+        derived = self._derive_key(password, self._decode(salt), int(cost),
+                                   int(block_size), int(parallelism))
+
+        return hmac.compare_digest(derived, self._decode(key))
+
+    def get_dummy_hash(self):
+        """Returns the hash of a random password, created with the current parameters.
+        A password entered for a username that does not exist is verified against it,
+        so that the check takes as long as for an existing user.
+
+        Returns:
+            The encoded hash
+        """
+        if self._dummy_hash is None or self.needs_rehash(self._dummy_hash):
+            self._dummy_hash = self.hash_password(self._encode(os.urandom(KEY_BYTES)))
+        return self._dummy_hash
+
+    def needs_rehash(self, encoded_hash):
+        """Checks whether a stored hash was created with other parameters than the
+        current ones, or whether the password is still stored in plain text
+
+        Args:
+            encoded_hash (str): The stored hash
+
+        Returns:
+            True, if the password should be hashed again
+        """
+        if not self._is_hashed(encoded_hash):
+            return True
+
+        _, cost, block_size, parallelism, _, _ = encoded_hash.split("$")
+        return (int(cost), int(block_size), int(parallelism)) != \
+            (self.cost, BLOCK_SIZE, PARALLELISM)
+
+    def hash_passwords(self, passwords):
+        """Hashes several passwords in parallel in the worker pool
+
+        Args:
+            passwords (list of str): The passwords to be hashed
+
+        Returns:
+            List of the encoded hashes, in the order of the passwords
+        """
+        return list(self._get_executor().map(self.hash_password, passwords))
+
+    def submit(self, function, *args):
+        """Runs a function in the worker pool
+
+        Args:
+            function: Callable value to be run
+            args: Arguments given to the function
+
+        Returns:
+            A concurrent.futures.Future of the function's result
+        """
+        return self._get_executor().submit(function, *args)
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="password-hasher")
+        return self._executor
+
+    def _derive_key(self, password, salt, cost, block_size, parallelism):
+        cost_factor = 2 ** cost
+        return hashlib.scrypt(str(password).encode("utf-8"), salt=salt, n=cost_factor,
+                              r=block_size, p=parallelism,
+                              maxmem=256 * cost_factor * block_size * parallelism,
+                              dklen=KEY_BYTES)
+
+    def _is_hashed(self, encoded_hash):
+        # Plain text passwords from before hashing may start with "scrypt$" too,
+        # so only the complete hash structure counts as a hash
+        return HASH_PATTERN.fullmatch(str(encoded_hash)) is not None
+
+    def _encode(self, value):
+        return base64.b64encode(value).decode("ascii")
+
+    def _decode(self, value):
+        return base64.b64decode(value.encode("ascii"))
+
+
+class PendingResult:
+    """This class represents an operation whose slow hashing runs in the worker pool
+    of a PasswordHasher, while its database operations run in the thread that
+    started it and in the thread that asks for its result. This way database
+    connections are not used from the worker pool.
+    """
+
+    def __init__(self, future, finish):
+        """Class constructor
+
+        Args:
+            future (Future object): The hashing running in the worker pool
+            finish: Callable value, which is given the result of the hashing,
+                    and which returns the result of the operation
+        """
+        self.future = future
+        self._finish = finish
+
+    @classmethod
+    def failed(cls, error):
+        """Creates a result of an operation that failed before any hashing started
+
+        Args:
+            error (Exception): The error raised when the result is requested
+
+        Returns:
+            A PendingResult object that is done
+        """
+        future = Future()
+        future.set_exception(error)
+        return cls(future, None)
+
+    def done(self):
+        """Checks whether the hashing has finished
+
+        Returns:
+            True, if the result can be requested without waiting for the hashing
+        """
+        return self.future.done()
+
+    def result(self):
+        """Waits for the hashing and finishes the operation in the calling thread
+
+        Returns:
+            The result of the operation, or raises its errors
+        """
+        return self._finish(self.future.result())
+
+
+def calibrate_cost(target_seconds=0.1, maximum_cost=20):
+    """Finds the lowest cost whose hashing takes at least the target time on this machine
+
+    Args:
+        target_seconds (float, optional): The targeted hashing time. Defaults to 0.1.
+        maximum_cost (int, optional): The highest cost tried. Defaults to 20.
+
+    Returns:
+        Tuple of the found cost and the time one hash took with it, in seconds
+    """
+    for cost in range(10, maximum_cost + 1):
+        hasher = PasswordHasher(cost)
+        start = time.perf_counter()
+        hasher.hash_password("calibration password 1!")
+        elapsed = time.perf_counter() - start
+        if elapsed >= target_seconds:
+            break
+    return cost, elapsed
+
+
+if __name__ == "__main__":
+    found_cost, hashing_time = calibrate_cost()
+    print(f"PASSWORD_HASH_COST={found_cost} takes {1000 * hashing_time:.0f} ms per hash")
@@ -0,0 +1,128 @@
+import string
+from config import PASSWORD_MIN_LENGTH, PASSWORD_REQUIRED_CLASSES, PASSWORD_DENYLIST_FILE_PATH
+
+CHARACTER_CLASSES = {
+    "digit": ("a number", frozenset(string.digits)),
+    "special": ("a special character", frozenset(string.punctuation)),
+    "lowercase": ("a lowercase letter", frozenset(string.ascii_lowercase)),
+    "uppercase": ("an uppercase letter", frozenset(string.ascii_uppercase)),
+}
+
+
+class PasswordPolicy:
+    """This class checks chosen passwords against the password rules of the application:
+    a minimum length, required character classes and a denylist of common passwords.
+
+    The character class sets and the denylist are built once, so checking a password
+    takes a single pass over it per class and one set lookup, which keeps validating
+    large numbers of imported accounts fast.
+    """
+
+    def __init__(self, min_length=PASSWORD_MIN_LENGTH, required_classes=None,
+                 denylist=None):
+        """Class constructor
+
+        Args:
+            min_length (int, optional): Minimum number of characters in a password
+            required_classes (list of str, optional): Names of the character classes
+                                    of which a password must include at least one
+                                    character, out of the keys of CHARACTER_CLASSES.
+                                    Defaults to PASSWORD_REQUIRED_CLASSES.
+            denylist (iterable of str, optional): Passwords that are not allowed, compared
+                                    case-insensitively. Defaults to the passwords in
+                                    the file at PASSWORD_DENYLIST_FILE_PATH.
+        """
+        if required_classes is None:
+            required_classes = PASSWORD_REQUIRED_CLASSES
+        if denylist is None:
+            denylist = read_denylist(PASSWORD_DENYLIST_FILE_PATH)
+
+        self.min_length = min_length
+        self._required_classes = [CHARACTER_CLASSES[name.strip()]
+                                  for name in required_classes if name.strip()]
+        self._denylist = frozenset(password.lower() for password in denylist)
+
+    def is_valid(self, password):
+        """Checks whether a password meets all rules
+
+        Args:
+            password (str): The chosen password
+
+        Returns:
+            True, if the password is valid, otherwise False
+        """
+        return len(password) >= self.min_length \
+            and all(not characters.isdisjoint(password)
+                    for _, characters in self._required_classes) \
+            and password.lower() not in self._denylist
+
+    def find_violations(self, password):
+        """Lists the rules a password does not meet, e.g. for telling the user
+        what to change
+
+        Args:
+            password (str): The chosen password
+
+        Returns:
+            List of descriptions of the broken rules, empty if the password is valid
+        """
+        violations = []
+
+        if len(password) < self.min_length:
+            violations.append(f"must be at least {self.min_length} characters long")
+
+        for description, characters in self._required_classes:
+            if characters.isdisjoint(password):
+                violations.append(f"must include {description}")
+
+        if password.lower() in self._denylist:
+            violations.append("is too common")
+
+        return violations
+
+    def describe(self):
+        """Describes the rules, e.g. for showing them when the user chooses a password
+
+        Returns:
+            The rules as a sentence
+        """
+        rules = [f"be at least {self.min_length} characters long"]
+        if self._required_classes:
+            rules.append("include " + join_words(
+                [description for description, _ in self._required_classes]))
+        if self._denylist:
+            rules.append("not be a commonly used password")
+
+        return f"Your password must {join_words(rules)}"
+
+
+def read_denylist(path):
+    """Reads denied passwords from a file with one password per line.
+    Empty lines and lines starting with # are skipped.
+
+    Args:
+        path (str): Path of the file
+
+    Returns:
+        List of the denied passwords, or an empty list if the file does not exist
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            return [line.strip() for line in file
+                    if line.strip() and not line.startswith("#")]
+    except FileNotFoundError:
+        return []
+
+
+def join_words(words):
+    """Joins words into a list in a sentence, e.g. "a, b and c"
+
+    Args:
+        words (list of str): The words
+
+    Returns:
+        The joined words
+    """
+    if len(words) == 1:
+        return words[0]
+    return f"{', '.join(words[:-1])} and {words[-1]}"
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class RateLimiter:
+    """This class limits how often an action may be taken for each key, e.g. a username,
+    with a token bucket per key. A bucket holds at most capacity tokens, taking an
+    action uses one token, and tokens are refilled evenly over the refill period.
+
+    Buckets are kept ordered from least to most recently used, and the least recently
+    used ones are dropped when there are more than max_keys of them, so that memory
+    stays bounded however many keys are seen. A dropped bucket would have been full
+    again after the refill period, so dropping idle buckets changes nothing.
+    """
+
+    def __init__(self, capacity, refill_seconds, max_keys, clock=time.monotonic):
+        """Class constructor
+
+        Args:
+            capacity (int): Number of actions allowed in a burst for each key
+            refill_seconds (float): Seconds in which an empty bucket is refilled
+            max_keys (int): Number of buckets kept in memory
+            clock (optional): Callable value returning the current time in seconds
+        """
+        self.capacity = capacity
+        self.refill_rate = capacity / refill_seconds
+        self.max_keys = max_keys
+        self._clock = clock
+        # key: [tokens, time of the last update]
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key):
+        """Takes a token from the bucket of a key, if there is one left
+
+        Args:
+            key: Identifies whose bucket is used, e.g. a username
+
+        Returns:
+            0 if the action is allowed, otherwise the number of seconds
+            until the next token is available
+        """
+        now = self._clock()
+
+        with self._lock:
+            tokens = self._refill(key, now)
+
+            if tokens < 1:
+                return (1 - tokens) / self.refill_rate
+
+            self._buckets[key][0] = tokens - 1
+            return 0
+
+    def release(self, key):
+        """Returns a token to the bucket of a key, e.g. after a successful login
+
+        Args:
+            key: Identifies whose bucket is used
+        """
+        now = self._clock()
+
+        with self._lock:
+            tokens = self._refill(key, now)
+            self._buckets[key][0] = min(self.capacity, tokens + 1)
+
+    def count_keys(self):
+        """Returns the number of buckets kept in memory
+
+        Returns:
+            The number of buckets
+        """
+        return len(self._buckets)
+
+    def _refill(self, key, now):
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            bucket = [self.capacity, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+
+        bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_rate)
+        bucket[1] = now
+        return bucket[0]
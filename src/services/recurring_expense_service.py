@@ -0,0 +1,180 @@
+import calendar
+from datetime import date, timedelta
+from entities.user import User
+from entities.expense import Expense
+from entities.recurring_expense import RecurringExpense
+from repositories.recurring_expense_repository import RecurringExpenseRepository
+from services.expense_service import InvalidInputError
+
+FREQUENCIES = ["daily", "weekly", "monthly", "yearly"]
+
+
+def next_occurrence(occurrence, frequency, interval=1, day_of_month=None):
+    """Returns the date of the expense following an expense of a recurring rule
+
+    Args:
+        occurrence (date): The date of an expense
+        frequency (str): daily, weekly, monthly or yearly
+        interval (int, optional): Number of frequency periods between the expenses
+        day_of_month (int, optional): For monthly and yearly rules, the day of month
+                                        of the start date. In shorter months the
+                                        expense falls on the last day of the month.
+
+    Returns:
+        The date of the next expense
+    """
+    if frequency == "daily":
+        return occurrence + timedelta(days=interval)
+    if frequency == "weekly":
+        return occurrence + timedelta(weeks=interval)
+
+    months = interval * (12 if frequency == "yearly" else 1)
+    year, month = divmod(occurrence.month - 1 + months, 12)
+    year += occurrence.year
+    day = min(day_of_month or occurrence.day, calendar.monthrange(year, month + 1)[1])
+    return date(year, month + 1, day)
+
+
+class RecurringExpenseService:
+    """This class manages the recurring expense rules of the current user,
+    e.g. for rent and subscriptions
+    """
+
+    def __init__(self, recurring_expense_repository: RecurringExpenseRepository,
+                 logged_in_user: User):
+        """Class constructor
+
+        Args:
+            recurring_expense_repository (RecurringExpenseRepository object):
+                                    Handles database operations on the rules
+            logged_in_user (User object): The current logged-in user whose rules
+                                            will be managed
+        """
+        self.recurring_expense_repository = recurring_expense_repository
+        self.current_user = logged_in_user
+
+    def create_rule(self, expense: Expense, frequency, interval=1, end_date=None):
+        """Creates a new recurring expense rule. Its expenses are created by the
+        RecurringExpenseScheduler once they are due.
+
+        Args:
+            expense (Expense object): The first expense of the rule, as entered: its
+                                        name, amount (str, int or float), date, which
+                                        is the start date, today if not given, and
+                                        category, undefined if not given
+            frequency (str): One of FREQUENCIES
+            interval (str or int, optional): Number of frequency periods between
+                                        the expenses. Defaults to 1.
+            end_date (str, optional): The last possible date of an expense
+
+        Raises:
+            InvalidInputError: An error that occurs when the amount, frequency,
+            interval or dates are invalid
+
+        Returns:
+            The id of the created rule
+        """
+        try:
+            amount = float(expense.amount)
+            interval = int(interval)
+            start_date = date.fromisoformat(str(expense.date)) if expense.date else date.today()
+            end_date = date.fromisoformat(str(end_date)) if end_date else None
+        except ValueError as exc:
+            raise InvalidInputError(
+                "Invalid input. Make sure you have entered a nonnegative numeric amount, "
+                "a positive interval and valid dates in YYYY-MM-DD format") from exc
+
+        if amount < 0 or interval < 1 or frequency not in FREQUENCIES \
+                or (end_date and end_date < start_date):
+            raise InvalidInputError(
+                "Invalid input. Make sure you have entered a nonnegative numeric amount, "
+                "a positive interval and valid dates in YYYY-MM-DD format")
+
+        rule = RecurringExpense(
+            Expense(str(expense.name), amount, str(start_date),
+                    str(expense.category or "undefined")),
+            frequency, interval, str(end_date) if end_date else None)
+
+        return self.recurring_expense_repository.add_rule(self.current_user, rule)
+
+    def delete_rule(self, rule_id):
+        """Deletes a recurring expense rule of the current user. The expenses
+        it has created already are kept.
+
+        Args:
+            rule_id (int): The id of the rule
+
+        Returns:
+            True, if the rule was deleted, otherwise False
+        """
+        return self.recurring_expense_repository.delete_rule(self.current_user, int(rule_id))
+
+    def list_rules(self):
+        """Returns the recurring expense rules of the current user
+
+        Returns:
+            List of id, name, amount, category, frequency, interval, start date,
+            end date and next due date of each rule, the next due date being None
+            once the rule has ended
+        """
+        return [[rule["id"], rule["name"], rule["amount"], rule["category"],
+                 rule["frequency"], rule["interval"], rule["start_date"],
+                 rule["end_date"], rule["next_due"]]
+                for rule in self.recurring_expense_repository.get_rules_by_user(
+                    self.current_user)]
+
+
+class RecurringExpenseScheduler:
+    """This class creates the expenses of recurring rules once they are due. It is
+    run when the application starts and then on a timer.
+
+    Only the rules that are due are read, through the index on their next due date.
+    After a long downtime, all the missed expenses of all due rules are created
+    in a single transaction.
+    """
+
+    def __init__(self, recurring_expense_repository: RecurringExpenseRepository,
+                 clock=date.today):
+        """Class constructor
+
+        Args:
+            recurring_expense_repository (RecurringExpenseRepository object):
+                                    Handles database operations on the rules
+            clock (optional): Callable value returning the current date
+        """
+        self.recurring_expense_repository = recurring_expense_repository
+        self._clock = clock
+
+    def run_due(self, user: User = None):
+        """Creates the expenses of all rules that are due today or earlier
+
+        Args:
+            user (User object, optional): If given, only the rules of this user are run
+
+        Returns:
+            The number of created expenses
+        """
+        today = self._clock()
+        due_rules = []
+
+        for rule in self.recurring_expense_repository.find_due_rules(str(today), user):
+            end_date = date.fromisoformat(rule["end_date"]) if rule["end_date"] else None
+            last_date = min(today, end_date) if end_date else today
+            day_of_month = date.fromisoformat(rule["start_date"]).day
+
+            dates = []
+            due = date.fromisoformat(rule["next_due"])
+            while due <= last_date:
+                dates.append(str(due))
+                due = next_occurrence(due, rule["frequency"], rule["interval"], day_of_month)
+
+            next_due = str(due) if end_date is None or due <= end_date else None
+            due_rules.append((rule, dates, next_due))
+
+        if not due_rules:
+            return 0
+
+        return self.recurring_expense_repository.add_due_expenses(due_rules)
+
+
+recurring_expense_scheduler = RecurringExpenseScheduler(RecurringExpenseRepository())
@@ -0,0 +1,96 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from config import SESSION_TIMEOUT_SECONDS
+from entities.session import Session
+from entities.user import User
+
+
+class SessionRegistry:
+    """This class keeps track of the logged-in sessions of all users of the process.
+    A session expires when it has not been used for the timeout period.
+
+    Sessions are kept ordered from least to most recently used, so that
+    expired sessions are always found at the front and can be removed
+    without going through all sessions.
+    """
+
+    def __init__(self, timeout=SESSION_TIMEOUT_SECONDS, clock=time.monotonic):
+        """Class constructor
+
+        Args:
+            timeout (float, optional): Seconds of inactivity after which a session expires
+            clock (optional): Callable value returning the current time in seconds
+        """
+        self.timeout = timeout
+        self._clock = clock
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create_session(self, user: User):
+        """Creates and registers a new session for a user
+
+        Args:
+            user (User object): The logged-in user
+
+        Returns:
+            The new session as a Session object
+        """
+        now = self._clock()
+        session = Session(secrets.token_urlsafe(32), user, now + self.timeout)
+
+        with self._lock:
+            self._remove_expired_sessions(now)
+            self._sessions[session.session_id] = session
+
+        return session
+
+    def find_session(self, session_id):
+        """Finds a valid session by its identifier and extends its expiry time
+
+        Args:
+            session_id (str): The identifier of the session
+
+        Returns:
+            The Session object, or None if no such session exists or it has expired
+        """
+        now = self._clock()
+
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+
+            if session.expires_at <= now:
+                del self._sessions[session_id]
+                return None
+
+            session.expires_at = now + self.timeout
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def end_session(self, session_id):
+        """Ends a session, e.g. when the user logs out
+
+        Args:
+            session_id (str): The identifier of the session
+        """
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def count_sessions(self):
+        """Returns the number of registered sessions, including expired ones
+        that have not been removed yet
+
+        Returns:
+            The number of sessions
+        """
+        return len(self._sessions)
+
+    def _remove_expired_sessions(self, now):
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.expires_at > now:
+                break
+            self._sessions.popitem(last=False)
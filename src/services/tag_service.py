@@ -0,0 +1,184 @@
+from entities.user import User
+from entities.category import Category
+from repositories.tag_repository import TagRepository
+from services.expense_service import InvalidInputError
+
+# Whether listed expenses must have all of the given tags, or any of them
+TAG_MATCHES = ["all", "any"]
+
+
+class TagService:
+    """This class manages the tags the current user attaches to expenses.
+
+    An expense may have any number of tags next to its single category, e.g. both
+    work and travel. Tagging, untagging and finding tagged expenses each take one
+    statement however many expenses and tags are involved, and the totals of
+    all tags are summed up by the database.
+    """
+
+    def __init__(self, tag_repository: TagRepository, logged_in_user: User):
+        """Class constructor
+
+        Args:
+            tag_repository (TagRepository object): Handles database operations on tags
+            logged_in_user (User object): The current logged-in user whose tags
+                                            will be managed
+        """
+        self.tag_repository = tag_repository
+        self.current_user = logged_in_user
+
+    def tag_expenses(self, expense_ids, tags):
+        """Attaches tags to expenses of the current user
+
+        Args:
+            expense_ids (iterable of int): The ids of the expenses
+            tags (iterable of str): The names of the tags
+
+        Raises:
+            InvalidInputError: An error that occurs when a tag name is empty
+            or an id is not an integer
+
+        Returns:
+            The number of tags attached to expenses, not counting the ones
+            the expenses had already
+        """
+        expense_ids = self._check_expense_ids(expense_ids)
+        tags = self._check_tags(tags)
+        if not expense_ids or not tags:
+            return 0
+        return self.tag_repository.tag_expenses(self.current_user, expense_ids, tags)
+
+    def untag_expenses(self, expense_ids, tags):
+        """Detaches tags from expenses of the current user
+
+        Args:
+            expense_ids (iterable of int): The ids of the expenses
+            tags (iterable of str): The names of the tags
+
+        Raises:
+            InvalidInputError: An error that occurs when a tag name is empty
+            or an id is not an integer
+
+        Returns:
+            The number of tags detached from expenses
+        """
+        expense_ids = self._check_expense_ids(expense_ids)
+        tags = self._check_tags(tags)
+        if not expense_ids or not tags:
+            return 0
+        return self.tag_repository.untag_expenses(self.current_user, expense_ids, tags)
+
+    def list_expenses_with_tags(self, tags, match="all", category: Category = None):
+        """Lists the expenses of the current user with all or any of the given tags
+
+        Args:
+            tags (iterable of str): The names of the tags
+            match (str, optional): all or any. Defaults to all.
+            category (Category object, optional): If given, only expenses
+                                                within this category are listed
+
+        Raises:
+            InvalidInputError: An error that occurs when a tag name is empty or
+            the match is not one of TAG_MATCHES
+
+        Returns:
+            List of expenses, each a list of name, amount, date and category,
+            the most recent first
+        """
+        return [expense[1:] for expense in
+                self.list_expense_ids_with_tags(tags, match, category)]
+
+    def list_expense_ids_with_tags(self, tags, match="all", category: Category = None):
+        """Lists the expenses of the current user with all or any of the given tags,
+        with their ids
+
+        Args:
+            tags (iterable of str): The names of the tags
+            match (str, optional): all or any. Defaults to all.
+            category (Category object, optional): If given, only expenses
+                                                within this category are listed
+
+        Raises:
+            InvalidInputError: An error that occurs when a tag name is empty or
+            the match is not one of TAG_MATCHES
+
+        Returns:
+            List of expenses, each a list of id, name, amount, date and category,
+            the most recent first
+        """
+        if match not in TAG_MATCHES:
+            raise InvalidInputError(f"Unknown tag match {match}")
+
+        tags = self._check_tags(tags)
+        if not tags:
+            return []
+
+        required = len(tags) if match == "all" else 1
+        expenses = self.tag_repository.find_expenses_by_tags(
+            self.current_user, tags, required, category)
+        return [[expense["id"], expense["name"], expense["amount"], expense["date"],
+                 expense["category"]] for expense in expenses]
+
+    def get_expense_tags(self, expense_ids):
+        """Returns the tags of expenses of the current user
+
+        Args:
+            expense_ids (iterable of int): The ids of the expenses
+
+        Returns:
+            Dictionary of expense ids and lists of their tag names, sorted alphabetically.
+            Expenses without tags are left out.
+        """
+        expense_tags = {}
+        for row in self.tag_repository.get_tags_by_expenses(
+                self.current_user, self._check_expense_ids(expense_ids)):
+            expense_tags.setdefault(row["expense_id"], []).append(row["tag"])
+        return expense_tags
+
+    def list_all_tags(self):
+        """Lists the tags the current user has attached to expenses
+
+        Returns:
+            List of tag names, sorted alphabetically
+        """
+        return self.tag_repository.get_tags_by_user(self.current_user)
+
+    def get_totals_by_tag(self):
+        """Sums up the current user's expenses with each tag. An expense with several
+        tags counts towards the total of each of them.
+
+        Returns:
+            List of tag name, total amount and number of expenses tuples, sorted by tag
+        """
+        return [(row["tag"], row["total"], row["count"])
+                for row in self.tag_repository.get_totals_by_tag(self.current_user)]
+
+    def delete_tag(self, tag):
+        """Deletes a tag of the current user, detaching it from all expenses
+
+        Args:
+            tag (str): The name of the tag
+
+        Returns:
+            True, if the user had the tag, otherwise False
+        """
+        return self.tag_repository.delete_tag(self.current_user, str(tag).strip())
+
+    def _check_tags(self, tags):
+        if isinstance(tags, str):
+            tags = [tags]
+
+        checked = []
+        for tag in tags:
+            tag = str(tag).strip()
+            if not tag:
+                raise InvalidInputError("Invalid input. Tag names may not be empty")
+            if tag not in checked:
+                checked.append(tag)
+        return checked
+
+    def _check_expense_ids(self, expense_ids):
+        try:
+            return sorted({int(expense_id) for expense_id in expense_ids})
+        except (TypeError, ValueError) as exc:
+            raise InvalidInputError(f"Invalid expense ids {expense_ids}") from exc
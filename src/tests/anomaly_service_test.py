@@ -0,0 +1,83 @@
+import math
+import unittest
+from services.anomaly_service import AnomalyService, category_bounds
+from services.expense_service import ExpenseService, InvalidInputError
+from entities.user import User
+from repositories.expense_repository import ExpenseRepository
+
+test_repository = ExpenseRepository()
+test_user = User("alice", "1234abcd!")
+
+
+class TestAnomalyService(unittest.TestCase):
+    def setUp(self):
+        test_repository.delete_all_expenses()
+        self.test_expense_service = ExpenseService(test_repository, test_user)
+        self.test_expense_service.create_new_expenses(
+            [("lunch", amount, f"2023-04-{day:02}", "food")
+             for day, amount in enumerate([10, 11, 12, 10, 11, 95, 0.5], 1)]
+            + [("rent", 800, "2023-04-01", "housing"), ("deposit", 2400, "2023-04-02", "housing")])
+        self.test_anomaly_service = AnomalyService(test_repository, test_user)
+
+    def test_category_bounds_with_robust_zscores(self):
+        bounds = category_bounds(["a"] * 5, [10, 11, 12, 10, 11], threshold=3.5)
+
+        self.assertAlmostEqual(bounds.loc["a", "lower"], 11 - 3.5 / 0.6745)
+        self.assertAlmostEqual(bounds.loc["a", "upper"], 11 + 3.5 / 0.6745)
+
+    def test_category_bounds_with_iqr(self):
+        bounds = category_bounds(["a"] * 5, [10, 11, 12, 10, 11], "iqr")
+
+        self.assertEqual(bounds.loc["a"].tolist(), [8.5, 12.5])
+
+    def test_category_bounds_when_most_amounts_are_the_same(self):
+        bounds = category_bounds(["a"] * 6, [5, 5, 5, 5, 5, 6])
+
+        self.assertTrue(bounds.loc["a", "lower"] < 5 < bounds.loc["a", "upper"] < 6)
+
+    def test_category_bounds_of_small_category(self):
+        bounds = category_bounds(["a"] * 2, [1, 100], min_expenses=5)
+
+        self.assertEqual(bounds.loc["a"].tolist(), [-math.inf, math.inf])
+
+    def test_find_anomalies(self):
+        self.assertEqual(self.test_anomaly_service.find_anomalies(), [
+            ["lunch", 0.5, "2023-04-07", "food"],
+            ["lunch", 95.0, "2023-04-06", "food"],
+        ])
+
+    def test_find_anomalies_with_iqr(self):
+        test_anomaly_service = AnomalyService(test_repository, test_user, "iqr")
+
+        self.assertEqual(len(test_anomaly_service.find_anomalies()), 2)
+
+    def test_flag_expenses(self):
+        flags = self.test_anomaly_service.flag_expenses([
+            ["lunch", 95.0, "2023-04-06", "food"],
+            ["lunch", 11.0, "2023-04-05", "food"],
+            ["deposit", 2400.0, "2023-04-02", "housing"],
+            ["ticket", 3.0, "2023-04-03", "transport"],
+        ])
+
+        self.assertEqual(flags, [True, False, False, False])
+
+    def test_anomalies_are_found_again_after_expenses_change(self):
+        self.test_anomaly_service.find_anomalies()
+        self.test_expense_service.create_new_expense("lunch", "60", "2023-04-08", "food")
+
+        self.assertEqual(len(self.test_anomaly_service.find_anomalies()), 3)
+
+    def test_anomalies_are_cached_until_expenses_change(self):
+        first = self.test_anomaly_service.find_anomalies()
+
+        self.assertIs(self.test_anomaly_service.find_anomalies(), first)
+
+    def test_find_anomalies_without_expenses(self):
+        test_repository.delete_all_expenses()
+
+        self.assertEqual(self.test_anomaly_service.find_anomalies(), [])
+        self.assertEqual(self.test_anomaly_service.get_category_bounds(), {})
+
+    def test_unknown_method(self):
+        with self.assertRaises(InvalidInputError):
+            AnomalyService(test_repository, test_user, "isolation-forest")
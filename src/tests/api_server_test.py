@@ -0,0 +1,191 @@
+import unittest
+from api.api_server import ApiServer
+from api.api_client import ApiClient
+from services.login_service import LoginService
+from repositories.user_repository import UserRepository
+from repositories.expense_repository import ExpenseRepository
+
+test_user_repository = UserRepository()
+test_expense_repository = ExpenseRepository()
+
+
+class TestApiServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        test_user_repository.delete_all_users()
+        test_expense_repository.delete_all_expenses()
+
+        test_login_service = LoginService(test_user_repository)
+        test_login_service.create_new_user("alice", "1234abc!")
+        test_login_service.create_new_user("bob", "5678efg!")
+
+        self.test_server = ApiServer(test_login_service, test_expense_repository)
+        port = await self.test_server.start("127.0.0.1", 0)
+
+        self.client = ApiClient("127.0.0.1", port)
+        await self.client.connect()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.test_server.stop()
+
+    async def test_login_with_invalid_credentials(self):
+        status = await self.client.login("alice", "wrong")
+
+        self.assertEqual(status, 401)
+
+    async def test_requests_require_login(self):
+        status, _ = await self.client.request("GET", "/expenses")
+
+        self.assertEqual(status, 401)
+
+    async def test_unknown_path(self):
+        status, _ = await self.client.request("GET", "/unknown")
+
+        self.assertEqual(status, 404)
+
+    async def test_create_and_list_expenses(self):
+        await self.client.login("alice", "1234abc!")
+        await self.client.request("POST", "/expenses", {
+            "name": "sushi", "amount": 12.5, "date": "2023-04-15", "category": "food"})
+
+        status, response = await self.client.request("GET", "/expenses?limit=10")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(response["expenses"], [
+            {"name": "sushi", "amount": 12.5, "date": "2023-04-15", "category": "food"}])
+
+    async def test_create_invalid_expense(self):
+        await self.client.login("alice", "1234abc!")
+
+        status, _ = await self.client.request(
+            "POST", "/expenses", {"name": "sushi", "amount": -1})
+
+        self.assertEqual(status, 422)
+
+    async def test_bulk_create_and_paginate(self):
+        await self.client.login("alice", "1234abc!")
+        expenses = [{"name": f"expense {number}", "amount": number,
+                     "date": f"2023-04-{number:02}"} for number in range(1, 21)]
+
+        status, response = await self.client.request(
+            "POST", "/expenses/bulk", {"expenses": expenses})
+        _, page = await self.client.request("GET", "/expenses?offset=5&limit=5")
+
+        self.assertEqual(status, 201)
+        self.assertEqual(response["created"], 20)
+        self.assertEqual([expense["name"] for expense in page["expenses"]],
+                         [f"expense {number}" for number in range(15, 10, -1)])
+
+    async def test_edit_expense(self):
+        await self.client.login("alice", "1234abc!")
+        expense = {"name": "sushi", "amount": 12.5,
+                   "date": "2023-04-15", "category": "food"}
+        await self.client.request("POST", "/expenses", expense)
+
+        status, _ = await self.client.request(
+            "PUT", "/expenses", {"expense": expense, "field": "amount", "value": 20})
+        _, page = await self.client.request("GET", "/expenses")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(page["expenses"][0]["amount"], 20)
+
+    async def test_undo_and_redo_edit_in_later_requests(self):
+        await self.client.login("alice", "1234abc!")
+        expense = {"name": "sushi", "amount": 12.5,
+                   "date": "2023-04-15", "category": "food"}
+        await self.client.request("POST", "/expenses", expense)
+        await self.client.request(
+            "PUT", "/expenses", {"expense": expense, "field": "amount", "value": 20})
+
+        status, response = await self.client.request("POST", "/expenses/undo")
+        _, undone = await self.client.request("GET", "/expenses")
+        await self.client.request("POST", "/expenses/redo")
+        _, redone = await self.client.request("GET", "/expenses")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(response["undone"], "edit the amount of sushi")
+        self.assertEqual(undone["expenses"][0]["amount"], 12.5)
+        self.assertEqual(redone["expenses"][0]["amount"], 20)
+
+    async def test_undo_without_edits(self):
+        await self.client.login("alice", "1234abc!")
+
+        status, _ = await self.client.request("POST", "/expenses/undo")
+
+        self.assertEqual(status, 404)
+
+    async def test_unexpected_error_is_logged(self):
+        async def failing_handler(request):
+            raise RuntimeError("database is gone")
+
+        self.test_server._routes[("GET", "/expenses")] = (failing_handler, True)
+        await self.client.login("alice", "1234abc!")
+
+        with self.assertLogs("api.api_server", "ERROR") as logs:
+            status, _ = await self.client.request("GET", "/expenses")
+
+        self.assertEqual(status, 500)
+        self.assertIn("database is gone", logs.output[0])
+
+    async def test_aggregate_expenses(self):
+        await self.client.login("alice", "1234abc!")
+        await self.client.request("POST", "/expenses/bulk", {"expenses": [
+            {"name": "sushi", "amount": 12.5, "category": "food"},
+            {"name": "pizza", "amount": 10, "category": "food"}]})
+
+        _, response = await self.client.request("GET", "/expenses/aggregate")
+
+        self.assertEqual(response["totals"], [{"key": "food", "total": 22.5}])
+
+    async def test_aggregate_expenses_by_year(self):
+        await self.client.login("alice", "1234abc!")
+        await self.client.request("POST", "/expenses/bulk", {"expenses": [
+            {"name": "sushi", "amount": 12.5, "date": "2022-04-15"},
+            {"name": "pizza", "amount": 10, "date": "2023-04-15"}]})
+
+        _, response = await self.client.request(
+            "GET", "/expenses/aggregate?by=year&start=2023")
+
+        self.assertEqual(response["totals"], [{"key": "2023", "total": 10}])
+
+    async def test_list_changes(self):
+        await self.client.login("alice", "1234abc!")
+        await self.client.request("POST", "/expenses", {"name": "sushi", "amount": 12.5,
+                                                        "date": "2023-04-15"})
+
+        _, response = await self.client.request("GET", "/expenses/changes?since=0")
+        _, later = await self.client.request(
+            "GET", f"/expenses/changes?since={response['next']}")
+
+        self.assertEqual(len(response["changes"]), 1)
+        self.assertEqual(response["changes"][0]["operation"], "insert")
+        self.assertEqual(response["changes"][0]["expense"],
+                         {"name": "sushi", "amount": 12.5,
+                          "date": "2023-04-15", "category": "undefined"})
+        self.assertEqual(later["changes"], [])
+
+    async def test_users_only_see_their_own_expenses(self):
+        await self.client.login("alice", "1234abc!")
+        await self.client.request("POST", "/expenses", {"name": "sushi", "amount": 12.5})
+
+        other_client = ApiClient(self.client.host, self.client.port)
+        await other_client.connect()
+        await other_client.login("bob", "5678efg!")
+        _, response = await other_client.request("GET", "/expenses")
+        await other_client.close()
+
+        self.assertEqual(response["expenses"], [])
+
+    async def test_logout_ends_session(self):
+        await self.client.login("alice", "1234abc!")
+
+        await self.client.request("POST", "/logout")
+        status, _ = await self.client.request("GET", "/expenses")
+
+        self.assertEqual(status, 401)
+
+    async def test_repeated_failed_logins_are_rejected(self):
+        statuses = [await self.client.login("alice", "wrong") for _ in range(6)]
+
+        self.assertEqual(statuses[:5], [401] * 5)
+        self.assertEqual(statuses[5], 429)
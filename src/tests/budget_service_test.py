@@ -0,0 +1,110 @@
+import unittest
+from datetime import date
+from services.budget_service import BudgetService, UNDER_BUDGET, NEAR_BUDGET, OVER_BUDGET
+from services.expense_service import ExpenseService, InvalidInputError
+from entities.user import User
+from entities.expense import Expense
+from entities.category import Category
+from repositories.budget_repository import BudgetRepository
+from repositories.expense_repository import ExpenseRepository
+
+test_budget_repository = BudgetRepository()
+test_expense_repository = ExpenseRepository()
+test_user = User("alice", "1234abcd!")
+
+
+class TestBudgetService(unittest.TestCase):
+    def setUp(self):
+        test_expense_repository.delete_all_expenses()
+        self.test_budget_service = BudgetService(
+            test_budget_repository, test_user, warning_ratio=0.8)
+        self.test_expense_service = ExpenseService(test_expense_repository, test_user)
+
+    def test_set_budget_counts_existing_expenses(self):
+        self.test_expense_service.create_new_expenses([
+            ("sushi", 12.5, "2023-04-15", "food"),
+            ("pizza", 10, "2023-04-20", "food"),
+            ("bread", 3, "2023-05-01", "food"),
+        ])
+
+        self.test_budget_service.set_budget(Category("food"), 100)
+
+        self.assertEqual(self.test_budget_service.list_budgets("2023-04"),
+                         [["food", 100, 22.5, UNDER_BUDGET]])
+
+    def test_spending_follows_new_edited_and_deleted_expenses(self):
+        self.test_budget_service.set_budget(Category("food"), 30)
+        self.test_expense_service.create_new_expense("sushi", 12.5, "2023-04-15", "food")
+        self.test_expense_service.create_new_expense("pizza", 10, "2023-04-20", "food")
+
+        self.test_expense_service.edit_expense_amount(
+            "20.1", Expense("sushi", 12.5, "2023-04-15", "food"))
+        self.assertEqual(self.test_budget_service.check_budget(Category("food"), "2023-04-01"),
+                         ["food", 30, 30.1, OVER_BUDGET])
+
+        self.test_expense_service.edit_expense_date(
+            "2023-05-01", Expense("pizza", 10, "2023-04-20", "food"))
+        self.test_expense_service.delete_expense(Expense("sushi", 20.1, "2023-04-15", "food"))
+
+        self.assertEqual(self.test_budget_service.check_budget(Category("food"), "2023-04-01"),
+                         ["food", 30, 0, UNDER_BUDGET])
+        self.assertEqual(self.test_budget_service.check_budget(Category("food"), "2023-05-31"),
+                         ["food", 30, 10, UNDER_BUDGET])
+
+    def test_spending_moves_with_recategorised_expenses(self):
+        self.test_budget_service.set_budget(Category("food"), 30)
+        self.test_budget_service.set_budget(Category("takeaway"), 10)
+        self.test_expense_service.create_new_expense("pizza", 9, "2023-04-20", "takeaway")
+
+        self.test_expense_service.rename_category("food", Category("takeaway"))
+
+        self.assertEqual(self.test_budget_service.list_budgets("2023-04"),
+                         [["food", 30, 9, UNDER_BUDGET], ["takeaway", 10, 0, UNDER_BUDGET]])
+
+    def test_undo_merge_keeps_budget_of_merged_category(self):
+        self.test_budget_service.set_budget(Category("transport"), 100)
+        self.test_expense_service.create_new_expenses([
+            ("bus", 3, "2023-04-17", "transport"),
+            ("flight", 80, "2023-04-18", "travel"),
+        ])
+
+        self.test_expense_service.rename_category("travel", Category("transport"))
+        self.test_expense_service.undo()
+
+        self.assertEqual(self.test_budget_service.check_budget(Category("transport"),
+                                                               "2023-04-01"),
+                         ["transport", 100, 3, UNDER_BUDGET])
+
+    def test_check_budget_without_budget(self):
+        self.test_expense_service.create_new_expense("sushi", 12.5, "2023-04-15", "food")
+
+        self.assertIsNone(self.test_budget_service.check_budget(Category("food")))
+
+    def test_check_budget_defaults_to_current_month(self):
+        self.test_budget_service.set_budget(Category("food"), 10)
+        self.test_expense_service.create_new_expense("sushi", 8.5, str(date.today()), "food")
+
+        self.assertEqual(self.test_budget_service.check_budget(Category("food"))[3],
+                         NEAR_BUDGET)
+
+    def test_check_budgets_after_import(self):
+        self.test_budget_service.set_budget(Category("food"), 20)
+        self.test_budget_service.set_budget(Category("transport"), 20)
+        expenses = [(f"expense {number}", 1, f"2023-04-{number:02}", "food")
+                    for number in range(1, 26)] + [("bus", 3, "2023-04-01", "transport")]
+
+        self.test_expense_service.import_expenses(expenses)
+
+        self.assertEqual(self.test_budget_service.check_budgets(expenses),
+                         [["food", 20, 25, OVER_BUDGET, "2023-04"]])
+
+    def test_remove_budget(self):
+        self.test_budget_service.set_budget(Category("food"), 20)
+
+        self.assertTrue(self.test_budget_service.remove_budget(Category("food")))
+        self.assertFalse(self.test_budget_service.remove_budget(Category("food")))
+        self.assertEqual(self.test_budget_service.list_budgets(), [])
+
+    def test_set_invalid_budget(self):
+        with self.assertRaises(InvalidInputError):
+            self.test_budget_service.set_budget(Category("food"), "-5")
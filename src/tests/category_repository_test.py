@@ -0,0 +1,72 @@
+import unittest
+from repositories.category_repository import CategoryRepository
+from repositories.expense_repository import ExpenseRepository
+from entities.expense import Expense
+from entities.user import User
+from entities.category import Category
+
+test_category_repository = CategoryRepository()
+test_expense_repository = ExpenseRepository()
+
+
+class TestCategoryRepository(unittest.TestCase):
+    def setUp(self):
+        test_expense_repository.delete_all_expenses()
+        self.test_user = User("alice", "1234abc!")
+        self.test_expense = Expense("sushi", 12.5, "2023-04-15", "food")
+
+    def test_get_categories_by_user(self):
+        test_expense_repository.add_expense(self.test_user, self.test_expense)
+        test_expense_repository.add_expense(
+            self.test_user, Expense("dress", 55.6, "2023-03-28", "clothes"))
+        test_expense_repository.add_expense(
+            User("bob", "5678efg!"), Expense("bus", 2.5, "2023-03-28", "transport"))
+
+        found = test_category_repository.get_categories_by_user(self.test_user)
+
+        self.assertEqual(found, ["clothes", "food"])
+
+    def test_get_categories_by_user_skips_categories_without_expenses(self):
+        test_expense_repository.add_expense(self.test_user, self.test_expense)
+        expense_id = test_expense_repository.find_expense(self.test_user, self.test_expense)["id"]
+
+        test_expense_repository.delete_expenses_by_ids(self.test_user, [expense_id])
+
+        self.assertEqual(test_category_repository.get_categories_by_user(self.test_user), [])
+
+    def test_rename_category_updates_only_category_row(self):
+        test_expense_repository.add_expenses(self.test_user, [self.test_expense] * 3)
+
+        renamed = test_category_repository.rename_category(
+            self.test_user, Category("food"), "groceries")
+
+        self.assertEqual(renamed, 3)
+        self.assertEqual(test_category_repository.get_categories_by_user(self.test_user), ["groceries"])
+        self.assertEqual(len(test_expense_repository.get_all_expenses_by_category_and_user(
+            self.test_user, Category("groceries"))), 3)
+
+    def test_rename_category_merges_into_existing_category(self):
+        test_expense_repository.add_expense(self.test_user, self.test_expense)
+        test_expense_repository.add_expense(
+            self.test_user, Expense("bread", 3.2, "2023-03-28", "groceries"))
+
+        test_category_repository.rename_category(self.test_user, Category("food"), "groceries")
+
+        self.assertEqual(test_category_repository.get_categories_by_user(self.test_user), ["groceries"])
+        self.assertEqual(len(test_expense_repository.get_all_expenses_by_category_and_user(
+            self.test_user, Category("groceries"))), 2)
+
+    def test_rename_category_returns_0_if_not_exists(self):
+        renamed = test_category_repository.rename_category(
+            self.test_user, Category("food"), "groceries")
+
+        self.assertEqual(renamed, 0)
+
+    def test_rename_category_of_other_user_is_not_affected(self):
+        other_user = User("bob", "5678efg!")
+        test_expense_repository.add_expense(self.test_user, self.test_expense)
+        test_expense_repository.add_expense(other_user, self.test_expense)
+
+        test_category_repository.rename_category(self.test_user, Category("food"), "groceries")
+
+        self.assertEqual(test_category_repository.get_categories_by_user(other_user), ["food"])
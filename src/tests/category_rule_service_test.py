@@ -0,0 +1,131 @@
+import unittest
+from services.category_rule_service import CategoryRuleService, CategoryMatcher
+from services.expense_service import ExpenseService, InvalidInputError
+from entities.user import User
+from entities.category import Category
+from entities.category_rule import CategoryRule
+from repositories.category_rule_repository import CategoryRuleRepository
+from repositories.expense_repository import ExpenseRepository
+from repositories.category_repository import CategoryRepository
+
+test_category_rule_repository = CategoryRuleRepository()
+test_expense_repository = ExpenseRepository()
+test_category_repository = CategoryRepository()
+test_user = User("alice", "1234abcd!")
+other_user = User("bob", "1234abcd!")
+
+
+class TestCategoryMatcher(unittest.TestCase):
+    def test_first_matching_rule_decides_the_category(self):
+        matcher = CategoryMatcher([
+            CategoryRule("groceries", "lidl"),
+            CategoryRule("transport", r"^(hsl|uber)\b", "regex"),
+            CategoryRule("furniture", "", min_amount=100),
+            CategoryRule("restaurants", "", max_amount=20),
+        ])
+
+        categories = matcher.categorize(
+            ["LIDL Helsinki", "uber ride", "my uber", "sofa", "lunch", "lidl"],
+            [150, 12, 7, 500, 50, "not a number"])
+
+        self.assertEqual(categories.tolist(),
+                         ["groceries", "transport", "restaurants", "furniture", None, None])
+
+    def test_flags_of_a_regex_apply_only_to_its_rule(self):
+        matcher = CategoryMatcher([
+            CategoryRule("transport", "(?i)taxi", "regex"),
+            CategoryRule("hobbies", "Golf", "regex"),
+        ])
+
+        self.assertEqual(matcher.categorize(["TAXI", "golf", "Golf"], [1, 1, 1]).tolist(),
+                         ["transport", None, "hobbies"])
+
+    def test_without_rules_nothing_matches(self):
+        self.assertEqual(CategoryMatcher([]).categorize(["lidl"], [1]).tolist(), [None])
+
+
+class TestCategoryRuleService(unittest.TestCase):
+    def setUp(self):
+        test_expense_repository.delete_all_expenses()
+        test_category_rule_repository.delete_all_rules()
+        self.test_category_rule_service = CategoryRuleService(
+            test_category_rule_repository, test_category_repository, test_user)
+        self.test_expense_service = ExpenseService(test_expense_repository, test_user)
+
+    def test_create_and_list_rules(self):
+        first = self.test_category_rule_service.create_rule("groceries", "lidl")
+        second = self.test_category_rule_service.create_rule(
+            "transport", "^hsl", "regex", "1", 10)
+
+        self.assertEqual(self.test_category_rule_service.list_rules(), [
+            [first, "groceries", "contains", "lidl", None, None],
+            [second, "transport", "regex", "^hsl", 1.0, 10.0]])
+
+    def test_create_rule_with_invalid_input(self):
+        with self.assertRaises(InvalidInputError):
+            self.test_category_rule_service.create_rule(" ", "lidl")
+        with self.assertRaises(InvalidInputError):
+            self.test_category_rule_service.create_rule("groceries", "lidl", "glob")
+        with self.assertRaises(InvalidInputError):
+            self.test_category_rule_service.create_rule("groceries", "(lidl", "regex")
+        with self.assertRaises(InvalidInputError):
+            self.test_category_rule_service.create_rule("groceries", r"(a)\1", "regex")
+        with self.assertRaises(InvalidInputError):
+            self.test_category_rule_service.create_rule("groceries", "lidl", min_amount="x")
+
+    def test_delete_rule(self):
+        rule_id = self.test_category_rule_service.create_rule("groceries", "lidl")
+
+        self.assertFalse(CategoryRuleService(
+            test_category_rule_repository, test_category_repository, other_user
+        ).delete_rule(rule_id))
+        self.assertTrue(self.test_category_rule_service.delete_rule(rule_id))
+        self.assertEqual(self.test_category_rule_service.list_rules(), [])
+
+    def test_categorize_expenses_fills_in_only_missing_categories(self):
+        self.test_category_rule_service.create_rule("groceries", "lidl")
+
+        expenses = self.test_category_rule_service.categorize_expenses([
+            ("Lidl", "12.5", "2023-04-15", None, "SEK"),
+            ("Lidl", "3", "2023-04-15", "household"),
+            ("lidl", "4", "2023-04-16", "undefined"),
+            ("bus", "3", "2023-04-16", ""),
+        ])
+
+        self.assertEqual(expenses, [
+            ("Lidl", "12.5", "2023-04-15", "groceries", "SEK"),
+            ("Lidl", "3", "2023-04-15", "household"),
+            ("lidl", "4", "2023-04-16", "groceries"),
+            ("bus", "3", "2023-04-16", "")])
+
+    def test_new_rule_is_used_after_categorizing(self):
+        self.test_category_rule_service.categorize_expenses([("lidl", 1, None, None)])
+        self.test_category_rule_service.create_rule("groceries", "lidl")
+
+        self.assertEqual(
+            self.test_category_rule_service.categorize_expenses([("lidl", 1, None, None)]),
+            [("lidl", 1, None, "groceries")])
+
+    def test_apply_to_undefined(self):
+        self.test_expense_service.create_new_expenses([
+            ("Lidl Helsinki", 12.5, "2023-04-15", "undefined"),
+            ("HSL ticket", 3, "2023-04-16", "undefined"),
+            ("lidl", 4, "2023-04-16", "household"),
+            ("gift", 30, "2023-04-17", "undefined"),
+        ])
+        ExpenseService(test_expense_repository, other_user).create_new_expense(
+            "lidl", 5, "2023-04-15", "undefined")
+        self.test_category_rule_service.create_rule("groceries", "lidl")
+        self.test_category_rule_service.create_rule("transport", "(?i)^hsl", "regex")
+
+        categorized = self.test_category_rule_service.apply_to_undefined()
+
+        self.assertEqual(categorized, 2)
+        self.assertEqual(self.test_expense_service.list_expenses_by_category(
+            Category("groceries")), [["Lidl Helsinki", 12.5, "2023-04-15", "groceries"]])
+        self.assertEqual(self.test_expense_service.list_expenses_by_category(
+            Category("transport")), [["HSL ticket", 3, "2023-04-16", "transport"]])
+        self.assertEqual(self.test_expense_service.list_expenses_by_category(
+            Category("undefined")), [["gift", 30, "2023-04-17", "undefined"]])
+        self.assertEqual(ExpenseService(test_expense_repository, other_user).list_all_expenses(),
+                         [["lidl", 5, "2023-04-15", "undefined"]])
@@ -0,0 +1,348 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from cli.command_line_interface import CommandLineInterface
+from services.login_service import LoginService
+from repositories.user_repository import UserRepository
+from repositories.expense_repository import ExpenseRepository
+from repositories.exchange_rate_repository import ExchangeRateRepository
+from repositories.category_rule_repository import CategoryRuleRepository
+from repositories.operation_journal_repository import OperationJournalRepository
+from services.currency_converter import currency_converter
+
+test_user_repository = UserRepository()
+test_expense_repository = ExpenseRepository()
+test_exchange_rate_repository = ExchangeRateRepository()
+test_category_rule_repository = CategoryRuleRepository()
+test_operation_journal_repository = OperationJournalRepository()
+
+
+class TestCommandLineInterface(unittest.TestCase):
+    def setUp(self):
+        test_user_repository.delete_all_users()
+        test_expense_repository.delete_all_expenses()
+        test_category_rule_repository.delete_all_rules()
+        test_operation_journal_repository.delete_all_operations()
+
+        self.test_login_service = LoginService(test_user_repository)
+        self.test_login_service.create_new_user("alice", "1234abc!")
+
+        self.output = io.StringIO()
+        self.error_output = io.StringIO()
+        self.test_cli = CommandLineInterface(
+            self.test_login_service, test_expense_repository, self.output, self.error_output,
+            admin_usernames=["alice"])
+
+    def run_command(self, *arguments):
+        return self.test_cli.run(["--username", "alice", "--password", "1234abc!", *arguments])
+
+    def test_add_and_list(self):
+        self.run_command("add", "sushi", "12.5",
+                         "--date", "2023-04-15", "--category", "food")
+        self.run_command("list")
+
+        self.assertEqual(self.output.getvalue(), "sushi\t12.5\t2023-04-15\tfood\n")
+
+    def test_invalid_credentials(self):
+        exit_code = self.test_cli.run(
+            ["--username", "alice", "--password", "wrong", "list"])
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Invalid credentials", self.error_output.getvalue())
+
+    def test_add_invalid_amount(self):
+        exit_code = self.run_command("add", "sushi", "-1")
+
+        self.assertEqual(exit_code, 1)
+
+    def test_import_and_export_jsonl(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write("name,amount,date,category\n")
+            file.write("sushi,12.5,2023-04-15,food\n")
+            file.write("bus,3,2023-04-16,transport\n")
+
+        self.run_command("import", file.name)
+        os.remove(file.name)
+        self.run_command("export", "--format", "jsonl")
+
+        lines = [json.loads(line)
+                 for line in self.output.getvalue().splitlines()]
+
+        self.assertEqual(lines[0], {"name": "bus", "amount": 3.0,
+                                    "date": "2023-04-16", "category": "transport"})
+        self.assertEqual(len(lines), 2)
+
+    def test_export_npz_to_file(self):
+        self.run_command("add", "sushi", "12.5",
+                         "--date", "2023-04-15", "--category", "food")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "expenses.npz")
+            exit_code = self.run_command("export", "--format", "npz", "--output", path)
+
+            with np.load(path) as columns:
+                self.assertEqual(columns["name"].tolist(), ["sushi"])
+
+        self.assertEqual(exit_code, 0)
+
+    def test_changes_since(self):
+        self.run_command("add", "sushi", "12.5",
+                         "--date", "2023-04-15", "--category", "food")
+        self.run_command("changes")
+        since = json.loads(self.output.getvalue())["seq"]
+        self.run_command("rename-category", "food", "restaurants")
+
+        self.output.truncate(0)
+        self.output.seek(0)
+        self.run_command("changes", "--since", str(since))
+        change = json.loads(self.output.getvalue())
+
+        self.assertEqual(change["operation"], "update")
+        self.assertEqual(change["category"], "restaurants")
+
+    def test_year_over_year(self):
+        self.run_command("add", "sushi", "12.5", "--date", "2022-01-15")
+        self.run_command("add", "pizza", "10", "--date", "2023-02-15")
+        self.run_command("year-over-year")
+
+        self.assertEqual(self.output.getvalue().splitlines(), [
+            "2022\t12.5" + "\t0" * 11,
+            "2023\t0\t10.0" + "\t0" * 10,
+        ])
+
+    def test_forecast(self):
+        self.run_command("add", "rent", "800", "--date", "2023-01-31", "--category", "housing")
+        self.run_command("add", "rent", "900", "--date", "2023-02-28", "--category", "housing")
+        self.run_command("forecast", "--method", "trend")
+
+        self.assertEqual(self.output.getvalue(), "2023-03\thousing\t1000.0\n")
+
+    def test_anomalies(self):
+        for amount in ["10", "11", "12", "10", "11", "95"]:
+            self.run_command("add", "lunch", amount, "--date", "2023-04-15", "--category", "food")
+        self.run_command("anomalies")
+
+        self.assertEqual(self.output.getvalue(), "lunch\t95.0\t2023-04-15\tfood\n")
+
+    def test_import_rates_and_add_in_other_currency(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rates.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("currency,date,rate\nUSD,2023-01-01,0.9\n")
+
+            exit_code = self.run_command("import-rates", path)
+        self.run_command("add", "burger", "20", "--date", "2023-04-15", "--currency", "USD")
+        self.run_command("list")
+        test_exchange_rate_repository.delete_all_rates()
+        currency_converter.clear_cache()
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(self.output.getvalue(), "burger\t18.0\t2023-04-15\tundefined\n")
+        self.assertIn("Imported 1 exchange rates", self.error_output.getvalue())
+
+    def test_import_rates_requires_admin(self):
+        self.test_login_service.create_new_user("bob", "1234abc!")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rates.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("currency,date,rate\nUSD,2023-01-01,0.9\n")
+
+            exit_code = self.test_cli.run(
+                ["--username", "bob", "--password", "1234abc!", "import-rates", path])
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Only the users in ADMIN_USERNAMES", self.error_output.getvalue())
+        self.assertEqual(test_exchange_rate_repository.get_rates(), [])
+
+    def test_import_rates_without_rate_column(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rates.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("currency,date\nUSD,2023-01-01\n")
+
+            exit_code = self.run_command("import-rates", path)
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("The file has no rate column", self.error_output.getvalue())
+
+    def test_import_missing_file(self):
+        exit_code = self.run_command("import-rates", "no-such-rates.csv")
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("No such file or directory: no-such-rates.csv",
+                      self.error_output.getvalue())
+
+    def test_add_in_currency_without_rate(self):
+        exit_code = self.run_command("add", "burger", "20", "--currency", "SEK")
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("No exchange rate for SEK", self.error_output.getvalue())
+
+    def test_add_and_list_recurring(self):
+        exit_code = self.run_command("add-recurring", "rent", "800", "--frequency", "monthly",
+                                     "--start", "2023-01-31", "--end", "2023-03-31")
+        self.run_command("list-recurring")
+        self.run_command("list")
+
+        lines = self.output.getvalue().splitlines()
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(lines[0].split("\t")[1:], ["rent", "800.0", "undefined", "monthly",
+                                                    "1", "2023-01-31", "2023-03-31", ""])
+        self.assertEqual(lines[1:], ["rent\t800.0\t2023-03-31\tundefined",
+                                     "rent\t800.0\t2023-02-28\tundefined",
+                                     "rent\t800.0\t2023-01-31\tundefined"])
+
+    def test_import_invalid_file_imports_nothing(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write("name,amount,date,category\n")
+            file.write("sushi,12.5,2023-04-15,food\n")
+            file.write("bus,3,not a date,transport\n")
+
+        exit_code = self.run_command("import", file.name)
+        os.remove(file.name)
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(test_expense_repository.get_all_expenses_in_table(), [])
+
+    def test_import_short_row_reports_its_line(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write("name,amount,date,category\n")
+            file.write("sushi,12.5,2023-04-15,food\n")
+            file.write("bus\n")
+
+        exit_code = self.run_command("import", file.name)
+        os.remove(file.name)
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Line 3 has too few columns", self.error_output.getvalue())
+        self.assertEqual(test_expense_repository.get_all_expenses_in_table(), [])
+
+    def test_import_without_amount_column(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write("name,date\n")
+            file.write("sushi,2023-04-15\n")
+
+        exit_code = self.run_command("import", file.name)
+        os.remove(file.name)
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("The file has no amount column", self.error_output.getvalue())
+
+    def test_aggregate_by_category(self):
+        self.run_command("add", "sushi", "12.5", "--category", "food")
+        self.run_command("add", "pizza", "10", "--category", "food")
+        self.run_command("add", "bus", "3", "--category", "transport")
+        self.run_command("aggregate")
+
+        self.assertEqual(self.output.getvalue(), "food\t22.5\ntransport\t3.0\n")
+
+    def test_rename_category(self):
+        self.run_command("add", "sushi", "12.5", "--category", "food")
+        self.run_command("rename-category", "food", "restaurants")
+        self.run_command("aggregate")
+
+        self.assertEqual(self.output.getvalue(), "restaurants\t12.5\n")
+
+    def test_tag_and_list_by_tags(self):
+        self.run_command("add", "hotel", "120", "--date", "2023-04-15")
+        self.run_command("add", "train", "40", "--date", "2023-04-16")
+        self.run_command("list", "--ids")
+        ids = [line.split("\t")[0] for line in self.output.getvalue().splitlines()]
+
+        self.run_command("tag", *ids, "--tag", "travel")
+        self.run_command("tag", ids[0], "--tag", "work")
+        self.output.truncate(0)
+        self.output.seek(0)
+        self.run_command("list", "--tag", "travel", "--tag", "work")
+        self.run_command("tag-totals")
+
+        self.assertEqual(self.output.getvalue(),
+                         "train\t40.0\t2023-04-16\tundefined\n"
+                         "travel\t160.0\t2\nwork\t40.0\t1\n")
+
+    def test_list_ids_as_jsonl(self):
+        self.run_command("add", "hotel", "120", "--date", "2023-04-15")
+        self.run_command("list", "--ids", "--format", "jsonl")
+
+        expense = json.loads(self.output.getvalue())
+        self.assertEqual(list(expense), ["id", "name", "amount", "date", "category"])
+        self.assertEqual(expense["name"], "hotel")
+
+    def test_undo_and_redo_rename_category(self):
+        self.run_command("add", "sushi", "12.5", "--category", "food")
+        self.run_command("rename-category", "food", "restaurants")
+        self.run_command("undo")
+        self.run_command("aggregate")
+        self.run_command("redo")
+        self.run_command("aggregate")
+        exit_code = self.run_command("redo")
+
+        self.assertEqual(self.output.getvalue(), "food\t12.5\nrestaurants\t12.5\n")
+        self.assertIn("Undid rename category food to restaurants", self.error_output.getvalue())
+        self.assertEqual(exit_code, 1)
+
+    def test_rename_category_that_does_not_exist(self):
+        exit_code = self.run_command("rename-category", "food", "restaurants")
+
+        self.assertEqual(exit_code, 1)
+
+    def test_import_skips_expenses_imported_before(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write("name,amount,date,category\n")
+            file.write("sushi,12.5,2023-04-15,food\n")
+            file.write("bus,3,2023-04-16,transport\n")
+
+        self.run_command("import", file.name)
+        self.run_command("import", file.name)
+        os.remove(file.name)
+
+        self.assertIn("Imported 0 expenses, skipped 2 duplicates",
+                      self.error_output.getvalue())
+        self.assertEqual(len(test_expense_repository.get_all_expenses_in_table()), 2)
+
+    def test_import_categorises_with_rules(self):
+        self.run_command("add-rule", "groceries", "--contains", "lidl")
+        self.run_command("add-rule", "transport", "--regex", "(?i)^(hsl|vr)\\b", "--max", "50")
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write("name,amount,date,category\n")
+            file.write("LIDL Kamppi,12.5,2023-04-15,\n")
+            file.write("VR ticket,30,2023-04-16,\n")
+            file.write("lidl,3,2023-04-16,household\n")
+
+        self.run_command("import", file.name)
+        os.remove(file.name)
+        self.run_command("aggregate")
+
+        self.assertEqual(self.output.getvalue(),
+                         "groceries\t12.5\nhousehold\t3.0\ntransport\t30.0\n")
+
+    def test_apply_rules_to_undefined_expenses(self):
+        self.run_command("add", "HSL ticket", "3")
+        self.run_command("add", "gift", "30")
+        self.run_command("add-rule", "transport", "--regex", "(?i)^hsl")
+        self.run_command("list-rules")
+        self.run_command("apply-rules")
+        self.run_command("aggregate")
+
+        self.assertIn("Categorised 1 undefined expenses", self.error_output.getvalue())
+        self.assertTrue(self.output.getvalue().endswith("transport\t3.0\nundefined\t30.0\n"))
+        self.assertIn("\ttransport\tregex\t(?i)^hsl\t\t\n", self.output.getvalue())
+
+    def test_add_rule_with_invalid_regex(self):
+        exit_code = self.run_command("add-rule", "transport", "--regex", "(hsl")
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Invalid regular expression", self.error_output.getvalue())
+
+    def test_duplicates(self):
+        self.run_command("add", "sushi", "12.5", "--date", "2023-04-15")
+        self.run_command("add", "Sushi bar", "12.5", "--date", "2023-04-17")
+
+        self.run_command("duplicates", "--days", "2")
+
+        self.assertEqual(self.output.getvalue(),
+                         "sushi\t12.5\t2023-04-15\tundefined\t"
+                         "Sushi bar\t12.5\t2023-04-17\tundefined\n")
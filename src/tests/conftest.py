@@ -1,5 +1,5 @@
-from initialize import initialize
+from initialize import reset
 
 
 def pytest_configure():
-    initialize()
+    reset()
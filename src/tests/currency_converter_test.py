@@ -0,0 +1,165 @@
+import unittest
+from services.currency_converter import (CurrencyConverter, InvalidExchangeRateError,
+                                         MissingExchangeRateError, currency_symbol)
+from services.expense_service import ExpenseService, InvalidInputError
+from services.expense_report_service import ExpenseReportService
+from entities.user import User
+from entities.expense import Expense
+from repositories.expense_repository import ExpenseRepository
+from repositories.exchange_rate_repository import ExchangeRateRepository
+
+test_expense_repository = ExpenseRepository()
+test_exchange_rate_repository = ExchangeRateRepository()
+test_user = User("alice", "1234abcd!")
+
+
+class TestCurrencyConverter(unittest.TestCase):
+    def setUp(self):
+        test_expense_repository.delete_all_expenses()
+        test_exchange_rate_repository.delete_all_rates()
+        self.test_converter = CurrencyConverter(
+            test_exchange_rate_repository, test_expense_repository, "EUR")
+        self.test_converter.import_rates([
+            ("usd", "2023-01-01", "0.9"),
+            ("USD", "2023-04-01", "0.95"),
+            ("GBP", "2023-01-01", "1.15"),
+        ])
+        self.test_expense_service = ExpenseService(
+            test_expense_repository, test_user, self.test_converter)
+        self.test_report_service = ExpenseReportService(test_expense_repository, test_user)
+
+    def tearDown(self):
+        test_exchange_rate_repository.delete_all_rates()
+
+    def test_get_rate_uses_latest_rate_on_or_before_date(self):
+        self.assertEqual(self.test_converter.get_rate("USD", "2023-03-31"), 0.9)
+        self.assertEqual(self.test_converter.get_rate("USD", "2023-04-01"), 0.95)
+        self.assertEqual(self.test_converter.get_rate("USD", "2024-01-01"), 0.95)
+        self.assertEqual(self.test_converter.get_rate(None, "2023-04-01"), 1.0)
+
+    def test_get_rate_before_first_rate(self):
+        with self.assertRaises(MissingExchangeRateError):
+            self.test_converter.get_rate("USD", "2022-12-31")
+        with self.assertRaises(MissingExchangeRateError):
+            self.test_converter.get_rate("SEK", "2023-04-01")
+
+    def test_convert(self):
+        amounts = self.test_converter.convert(
+            [10, 10, 10, 10], ["USD", None, "GBP", "USD"],
+            ["2023-02-01", "2023-02-01", "2023-02-01", "2023-05-01"])
+
+        self.assertEqual(amounts.tolist(), [9.0, 10.0, 11.5, 9.5])
+
+    def test_convert_without_rate(self):
+        with self.assertRaises(MissingExchangeRateError):
+            self.test_converter.convert([10, 10], ["USD", "USD"], ["2023-02-01", "2022-02-01"])
+
+    def test_rates_changed_elsewhere_are_read_again(self):
+        self.assertEqual(self.test_converter.get_rate("USD", "2023-04-01"), 0.95)
+
+        test_exchange_rate_repository.add_rates([("USD", "2023-04-01", 0.97)])
+
+        self.assertEqual(self.test_converter.get_rate("USD", "2023-04-01"), 0.97)
+        test_exchange_rate_repository.delete_all_rates()
+        self.assertEqual(self.test_converter.list_currencies(), ["EUR"])
+
+    def test_list_currencies(self):
+        self.assertEqual(self.test_converter.list_currencies(), ["EUR", "GBP", "USD"])
+
+    def test_currency_symbol(self):
+        self.assertEqual(currency_symbol("EUR"), "€")
+        self.assertEqual(currency_symbol("SEK"), "SEK")
+
+    def test_create_expense_in_other_currency(self):
+        self.test_expense_service.create_new_expense(
+            "burger", "20", "2023-04-15", "food", "usd")
+
+        found = test_expense_repository.find_expense(
+            test_user, Expense("burger", 19.0, "2023-04-15", "food"))
+        self.assertEqual((found["currency"], found["original_amount"]), ("USD", 20))
+        self.assertEqual(self.test_report_service.get_total_all_expenses_by_user(), 19.0)
+
+    def test_create_expense_in_base_currency(self):
+        self.test_expense_service.create_new_expense("sushi", "12.5", "2023-04-15", "food", "EUR")
+
+        found = test_expense_repository.find_expense(
+            test_user, Expense("sushi", 12.5, "2023-04-15", "food"))
+        self.assertIsNone(found["currency"])
+
+    def test_create_expenses_converts_all_at_once(self):
+        self.test_expense_service.create_new_expenses([
+            ("burger", "20", "2023-03-15", "food", "USD"),
+            ("tea", "4", "2023-03-15", "food", "GBP"),
+            ("sushi", "12.5", "2023-03-15", "food"),
+        ])
+
+        self.assertEqual(self.test_report_service.get_totals_by_category(), [("food", 35.1)])
+
+    def test_create_expense_without_rate(self):
+        with self.assertRaises(MissingExchangeRateError):
+            self.test_expense_service.create_new_expense("smorgas", "50", "2023-04-15",
+                                                         "food", "SEK")
+
+    def test_create_expense_with_invalid_currency(self):
+        with self.assertRaises(InvalidInputError):
+            self.test_expense_service.create_new_expense("burger", "20", "2023-04-15",
+                                                         "food", "dollars")
+
+    def test_import_rates_converts_existing_expenses_again(self):
+        self.test_expense_service.create_new_expenses([
+            ("burger", "20", "2023-03-15", "food", "USD"),
+            ("fries", "10", "2023-04-15", "food", "USD"),
+        ])
+
+        imported, converted = self.test_converter.import_rates([("USD", "2023-04-10", "1.1")])
+
+        self.assertEqual((imported, converted), (1, 1))
+        self.assertEqual(self.test_report_service.get_totals_by_period("month"),
+                         [("2023-03", 18.0), ("2023-04", 11.0)])
+
+    def test_import_invalid_rates_imports_nothing(self):
+        for rates in [[("USD", "2023-05-01", "1.1"), ("USD", "2023-05-02", "-1")],
+                      [("USD", "2023-05-32", "1.1")], [("EUR", "2023-05-01", "1")],
+                      [("dollars", "2023-05-01", "1")], [("USD", "2023-05-01", "nan")]]:
+            with self.assertRaises(InvalidExchangeRateError):
+                self.test_converter.import_rates(rates)
+
+        self.assertEqual(self.test_converter.get_rate("USD", "2023-05-01"), 0.95)
+
+    def test_import_skips_same_expense_in_same_currency(self):
+        statement = [("burger", "20", "2023-03-15", "food", "USD"),
+                     ("burger", "20", "2023-03-15", "food", "GBP")]
+
+        self.assertEqual(self.test_expense_service.import_expenses(statement), 2)
+        self.assertEqual(self.test_expense_service.import_expenses(statement), 0)
+
+    def test_edit_expense_date_converts_with_rate_of_new_date(self):
+        self.test_expense_service.create_new_expense("burger", "20", "2023-03-15", "food", "USD")
+
+        self.test_expense_service.edit_expense_date(
+            "2023-04-15", Expense("burger", 18.0, "2023-03-15", "food"))
+
+        self.assertEqual(self.test_expense_service.list_all_expenses(),
+                         [["burger", 19.0, "2023-04-15", "food"]])
+
+    def test_edit_expenses_date_converts_only_other_currencies(self):
+        self.test_expense_service.create_new_expenses([
+            ("burger", "20", "2023-03-15", "food", "USD"),
+            ("sushi", "12.5", "2023-03-15", "food")])
+        ids = [expense[0] for expense in self.test_expense_service.list_all_expenses(True)]
+
+        self.test_expense_service.edit_expenses_date("2023-04-15", ids)
+
+        self.assertEqual(sorted(self.test_expense_service.list_all_expenses()),
+                         [["burger", 19.0, "2023-04-15", "food"],
+                          ["sushi", 12.5, "2023-04-15", "food"]])
+
+    def test_edit_expense_name_keeps_currency(self):
+        self.test_expense_service.create_new_expense("burger", "20", "2023-03-15", "food", "USD")
+
+        self.test_expense_service.edit_expense_name(
+            "cheeseburger", Expense("burger", 18.0, "2023-03-15", "food"))
+        found = test_expense_repository.find_expense(
+            test_user, Expense("cheeseburger", 18.0, "2023-03-15", "food"))
+
+        self.assertEqual((found["currency"], found["original_amount"]), ("USD", 20))
@@ -0,0 +1,183 @@
+import sqlite3
+import unittest
+from functools import partial
+from database_migrations import (MIGRATIONS, get_schema_version, migrate, update_in_chunks,
+                                 create_expense_rollups_table)
+
+
+class TestDatabaseMigrations(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.row_factory = sqlite3.Row
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_migrate_new_database(self):
+        version = migrate(self.connection)
+
+        self.assertEqual(version, len(MIGRATIONS))
+        self.assertEqual(get_schema_version(self.connection), len(MIGRATIONS))
+
+    def test_migrate_keeps_existing_data(self):
+        # A database created before migrations existed has the tables, but version 0
+        self.connection.execute(
+            "create table users (username text primary key, password text)")
+        self.connection.execute(
+            "insert into users (username, password) values ('mark', '1234abc!')")
+        self.connection.commit()
+
+        migrate(self.connection)
+        migrate(self.connection)
+
+        found = self.connection.execute("select * from users").fetchall()
+        self.assertEqual(len(found), 1)
+
+    def test_migrate_moves_category_names_into_categories_table(self):
+        migrate(self.connection, MIGRATIONS[:2])
+        self.connection.executemany(
+            "insert into expenses (username, name, amount, date, category) "
+            "values (?, ?, 1, '2023-04-15', ?)",
+            [("mark", "sushi", "food"), ("mark", "bread", "food"), ("anna", "bus", "transport")])
+        self.connection.commit()
+
+        migrate(self.connection)
+
+        categories = self.connection.execute(
+            "select username, name from categories order by username").fetchall()
+        self.assertEqual([tuple(row) for row in categories],
+                         [("anna", "transport"), ("mark", "food")])
+        found = self.connection.execute("""
+            select expenses.name, categories.name from expenses
+            join categories on categories.id = expenses.category_id
+            order by expenses.id""").fetchall()
+        self.assertEqual([tuple(row) for row in found],
+                         [("sushi", "food"), ("bread", "food"), ("bus", "transport")])
+        legacy = self.connection.execute(
+            "select count(*) from expenses where category is not null").fetchone()[0]
+        self.assertEqual(legacy, 0)
+
+    def test_migrate_indexes_existing_expenses_for_search(self):
+        migrate(self.connection, MIGRATIONS[:4])
+        self.connection.execute(
+            "insert into expenses (username, name, amount, date) "
+            "values ('mark', 'sushi', 1, '2023-04-15')")
+        self.connection.commit()
+
+        migrate(self.connection)
+
+        found = self.connection.execute(
+            "select rowid from expenses_search where expenses_search match 'sush*'").fetchall()
+        self.assertEqual(len(found), 1)
+
+    def test_migrate_hashes_existing_expenses_once(self):
+        migrate(self.connection, MIGRATIONS[:5])
+        self.connection.executemany(
+            "insert into expenses (username, name, amount, date) values ('mark', ?, 1, ?)",
+            [("sushi", "2023-04-15"), ("Sushi", "2023-04-15"), ("bus", "2023-04-16")])
+        self.connection.commit()
+
+        migrate(self.connection)
+
+        hashes = [row[0] for row in self.connection.execute(
+            "select content_hash from expenses order by id")]
+        self.assertIsNotNone(hashes[0])
+        self.assertIsNone(hashes[1])
+        self.assertIsNotNone(hashes[2])
+
+    def test_migrate_journals_existing_expenses_as_inserts(self):
+        migrate(self.connection, MIGRATIONS[:6])
+        self.connection.executemany(
+            "insert into expenses (username, name, amount, date) values ('mark', ?, 1, ?)",
+            [("sushi", "2023-04-15"), ("bus", "2023-04-16")])
+        self.connection.commit()
+
+        migrate(self.connection)
+        self.connection.execute("delete from expenses where name = 'bus'")
+
+        changes = self.connection.execute(
+            "select expense_id, operation from expense_changes order by seq").fetchall()
+        self.assertEqual([tuple(row) for row in changes],
+                         [(1, "insert"), (2, "insert"), (2, "delete")])
+
+    def test_migrate_rolls_up_existing_expenses(self):
+        migrate(self.connection, MIGRATIONS[:7])
+        self.connection.execute("insert into categories (username, name) values ('mark', 'food')")
+        self.connection.executemany(
+            "insert into expenses (username, name, amount, date, category_id) "
+            "values ('mark', ?, ?, ?, 1)",
+            [("sushi", 12.5, "2023-04-15"), ("pizza", 10, "2023-04-15"),
+             ("bread", 2, "2023-05-01")])
+        self.connection.commit()
+
+        migrate(self.connection)
+
+        rollups = self.connection.execute("""
+            select period, bucket, total, count from expense_rollups
+            order by period, bucket""").fetchall()
+        self.assertEqual([tuple(row) for row in rollups], [
+            ("day", "2023-04-15", 22.5, 2), ("day", "2023-05-01", 2, 1),
+            ("month", "2023-04", 22.5, 2), ("month", "2023-05", 2, 1),
+            ("year", "2023", 24.5, 3)])
+
+    def test_migrate_rolls_up_days_with_expenses_in_several_chunks(self):
+        migrate(self.connection, MIGRATIONS[:7])
+        self.connection.execute("insert into categories (username, name) values ('mark', 'food')")
+        self.connection.executemany(
+            "insert into expenses (username, name, amount, date, category_id) "
+            "values ('mark', ?, ?, ?, 1)",
+            [("sushi", 12.5, "2023-04-15"), ("bread", 2, "2023-05-01"),
+             ("pizza", 10, "2023-04-15")])
+        self.connection.commit()
+
+        migrate(self.connection, MIGRATIONS[:7] + [
+            partial(create_expense_rollups_table, chunk_size=1)])
+
+        rollups = self.connection.execute("""
+            select period, bucket, total, count from expense_rollups
+            order by period, bucket""").fetchall()
+        self.assertEqual([tuple(row) for row in rollups], [
+            ("day", "2023-04-15", 22.5, 2), ("day", "2023-05-01", 2, 1),
+            ("month", "2023-04", 22.5, 2), ("month", "2023-05", 2, 1),
+            ("year", "2023", 24.5, 3)])
+        queued = self.connection.execute(
+            "select count(*) from expense_rollup_queue").fetchone()[0]
+        self.assertEqual(queued, 0)
+
+    def test_migrate_applies_only_new_migrations(self):
+        applied = []
+        migrations = [lambda connection: applied.append(1),
+                      lambda connection: applied.append(2)]
+
+        migrate(self.connection, migrations[:1])
+        migrate(self.connection, migrations)
+
+        self.assertEqual(applied, [1, 2])
+
+    def test_failed_migration_is_rolled_back(self):
+        def failing_migration(connection):
+            connection.execute("create table half_done (id integer)")
+            raise RuntimeError("failed")
+
+        with self.assertRaises(RuntimeError):
+            migrate(self.connection, [MIGRATIONS[0], failing_migration])
+
+        self.assertEqual(get_schema_version(self.connection), 1)
+        tables = self.connection.execute(
+            "select name from sqlite_master where name='half_done'").fetchall()
+        self.assertEqual(tables, [])
+
+    def test_update_in_chunks(self):
+        migrate(self.connection)
+        self.connection.executemany(
+            "insert into expenses (username, name, amount) values ('mark', ?, ?)",
+            [(f"expense {number}", number) for number in range(25)])
+        self.connection.commit()
+
+        updated = update_in_chunks(self.connection, "expenses", "name = :name",
+                                   "amount >= 10", {"name": "big"}, chunk_size=4)
+
+        self.assertEqual(updated, 15)
+        found = self.connection.execute(
+            "select count(*) from expenses where name = 'big'").fetchone()[0]
+        self.assertEqual(found, 15)
@@ -0,0 +1,129 @@
+import csv
+import importlib.util
+import io
+import json
+import unittest
+import numpy as np
+from services.expense_service import ExpenseService
+from services.expense_exporter import ExpenseExporter, ExportFormatUnavailableError
+from entities.user import User
+from entities.expense import Expense
+from entities.category import Category
+from repositories.expense_repository import ExpenseRepository
+
+test_repository = ExpenseRepository()
+test_user = User("alice", "1234abcd!")
+
+
+class TestExpenseExporter(unittest.TestCase):
+    def setUp(self):
+        test_repository.delete_all_expenses()
+        self.test_expense_service = ExpenseService(test_repository, test_user)
+        self.test_expense_service.create_new_expenses([
+            ("sushi", "12.5", "2023-04-15", "food"),
+            ("bus ticket", "3", "2023-04-16", "transport"),
+            ("café", "4.2", "2023-04-14", "food"),
+        ])
+        # A chunk size smaller than the number of expenses makes the exporter use several chunks
+        self.test_exporter = ExpenseExporter(test_repository, test_user, chunk_size=2)
+
+    def test_export_csv(self):
+        file = io.StringIO(newline="")
+
+        count = self.test_exporter.export("csv", file)
+        file.seek(0)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(list(csv.reader(file)), [
+            ["name", "amount", "date", "category"],
+            ["bus ticket", "3.0", "2023-04-16", "transport"],
+            ["sushi", "12.5", "2023-04-15", "food"],
+            ["café", "4.2", "2023-04-14", "food"],
+        ])
+
+    def test_export_jsonl(self):
+        file = io.StringIO()
+
+        self.test_exporter.export("jsonl", file)
+        lines = [json.loads(line) for line in file.getvalue().splitlines()]
+
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[2], {"name": "café", "amount": 4.2,
+                                    "date": "2023-04-14", "category": "food"})
+
+    def test_export_npz(self):
+        file = io.BytesIO()
+
+        count = self.test_exporter.export("npz", file)
+        file.seek(0)
+        columns = np.load(file)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(columns["name"].tolist(), ["bus ticket", "sushi", "café"])
+        self.assertEqual(columns["amount"].dtype, np.float64)
+        self.assertAlmostEqual(columns["amount"].sum(), 19.7)
+        self.assertEqual(columns["date"][0], np.datetime64("2023-04-16"))
+        self.assertEqual(columns["category"].tolist(), ["transport", "food", "food"])
+
+    def test_export_npz_without_expenses(self):
+        test_repository.delete_all_expenses()
+        file = io.BytesIO()
+
+        count = self.test_exporter.export("npz", file)
+        file.seek(0)
+
+        self.assertEqual(count, 0)
+        self.assertEqual(len(np.load(file)["amount"]), 0)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_export_parquet(self):
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+        file = io.BytesIO()
+
+        self.test_exporter.export("parquet", file)
+        file.seek(0)
+        table = pyarrow.parquet.read_table(file)
+
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(table.column("name").to_pylist(), ["bus ticket", "sushi", "café"])
+
+    @unittest.skipIf(importlib.util.find_spec("pyarrow"), "pyarrow is installed")
+    def test_export_parquet_without_pyarrow(self):
+        with self.assertRaises(ExportFormatUnavailableError):
+            self.test_exporter.export("parquet", io.BytesIO())
+
+    def test_export_unknown_format(self):
+        with self.assertRaises(ExportFormatUnavailableError):
+            self.test_exporter.export("xlsx", io.StringIO())
+
+    def test_iterate_expenses_by_category(self):
+        expenses = list(self.test_exporter.iterate_expenses(Category("transport")))
+
+        self.assertEqual(expenses, [["bus ticket", 3.0, "2023-04-16", "transport"]])
+
+    def test_get_changes_lists_each_changed_expense_once(self):
+        _, since = self.test_exporter.get_changes()
+
+        self.test_expense_service.edit_expense_amount(
+            "13", Expense("sushi", 12.5, "2023-04-15", "food"))
+        self.test_expense_service.rename_category("travel", Category("transport"))
+        changes, last_seq = self.test_exporter.get_changes(since)
+
+        self.assertEqual([change[1:2] + change[3:] for change in changes], [
+            ["update", "sushi", 13.0, "2023-04-15", "food"],
+            ["update", "bus ticket", 3.0, "2023-04-16", "travel"],
+        ])
+        self.assertEqual(last_seq, changes[-1][0])
+        self.assertEqual(self.test_exporter.get_changes(last_seq), ([], last_seq))
+
+    def test_get_changes_in_pages(self):
+        first, since = self.test_exporter.get_changes(0, 2)
+        second, _ = self.test_exporter.get_changes(since, 2)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual([change[3] for change in second], ["café"])
+
+    def test_get_changes_only_lists_own_expenses(self):
+        other_exporter = ExpenseExporter(test_repository, User("bob", "5678efgh!"))
+
+        self.assertEqual(other_exporter.get_changes(), ([], 0))
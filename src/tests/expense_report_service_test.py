@@ -0,0 +1,107 @@
+import unittest
+from services.expense_service import ExpenseService, InvalidInputError
+from services.expense_report_service import ExpenseReportService
+from entities.expense import Expense
+from entities.user import User
+from entities.category import Category
+from repositories.expense_repository import ExpenseRepository
+
+test_repository = ExpenseRepository()
+test_user = User("alice", "1234abcd!")
+
+
+class TestExpenseReportService(unittest.TestCase):
+    def setUp(self):
+        self.test_expense_service = ExpenseService(test_repository, test_user)
+        self.test_report_service = ExpenseReportService(test_repository, test_user)
+        test_repository.delete_all_expenses()
+        self.test_expense = Expense("sushi", 12.5, "2023-04-15", "food")
+
+    def test_get_total_all_expenses_by_user(self):
+        self.test_expense_service.create_new_expense(
+            self.test_expense.name, self.test_expense.amount, self.test_expense.date, self.test_expense.category)
+        self.test_expense_service.create_new_expense(
+            "pizza", 15.6, self.test_expense.date, self.test_expense.category)
+
+        expected_total = self.test_expense.amount + 15.6
+        returned_total = self.test_report_service.get_total_all_expenses_by_user()
+
+        self.assertEqual(expected_total, returned_total)
+
+    def test_get_total_by_category_and_user(self):
+        self.test_expense_service.create_new_expense(
+            self.test_expense.name, self.test_expense.amount, self.test_expense.date, self.test_expense.category)
+        self.test_expense_service.create_new_expense(
+            "pizza", 15.6, self.test_expense.date, self.test_expense.category)
+
+        expected_total = self.test_expense.amount + 15.6
+        returned_total = self.test_report_service.get_total_by_category_and_user(
+            Category(self.test_expense.category))
+
+        self.assertEqual(expected_total, returned_total)
+
+    def test_get_totals_by_category(self):
+        self.test_expense_service.create_new_expense(
+            self.test_expense.name, self.test_expense.amount, self.test_expense.date, self.test_expense.category)
+        self.test_expense_service.create_new_expense(
+            "pizza", 15.6, self.test_expense.date, "takeaway")
+
+        totals = self.test_report_service.get_totals_by_category()
+
+        self.assertEqual(totals, [("food", 12.5), ("takeaway", 15.6)])
+
+    def test_get_totals_by_month(self):
+        self.test_expense_service.create_new_expense(
+            self.test_expense.name, self.test_expense.amount, "2023-04-15", self.test_expense.category)
+        self.test_expense_service.create_new_expense(
+            "pizza", 15.6, "2023-04-20", "takeaway")
+        self.test_expense_service.create_new_expense(
+            "bus", 3, "2023-05-02", "transport")
+
+        totals = self.test_report_service.get_totals_by_month()
+
+        self.assertEqual(totals, [("2023-04", 28.1), ("2023-05", 3)])
+
+    def test_get_totals_by_period(self):
+        self.test_expense_service.create_new_expenses([
+            ("sushi", 12.5, "2022-04-15", "food"),
+            ("pizza", 15.6, "2023-04-15", "food"),
+            ("bus", 3, "2023-04-15", "transport"),
+            ("train", 7, "2023-05-02", "transport"),
+        ])
+
+        self.assertEqual(self.test_report_service.get_totals_by_period("day"),
+                         [("2022-04-15", 12.5), ("2023-04-15", 18.6), ("2023-05-02", 7)])
+        self.assertEqual(self.test_report_service.get_totals_by_period("year"),
+                         [("2022", 12.5), ("2023", 25.6)])
+        self.assertEqual(self.test_report_service.get_totals_by_period(
+            "month", Category("transport"), start="2023-05"), [("2023-05", 7)])
+
+    def test_get_totals_by_period_after_late_edits(self):
+        self.test_expense_service.create_new_expense("sushi", 12.5, "2023-04-15", "food")
+        self.test_expense_service.create_new_expense("bus", 3, "2023-04-16", "transport")
+        self.test_report_service.get_totals_by_period("month")
+
+        self.test_expense_service.edit_expense_date(
+            "2022-12-31", Expense("sushi", 12.5, "2023-04-15", "food"))
+        self.test_expense_service.delete_expense(Expense("bus", 3, "2023-04-16", "transport"))
+
+        self.assertEqual(self.test_report_service.get_totals_by_period("month"),
+                         [("2022-12", 12.5)])
+        self.assertEqual(self.test_report_service.get_totals_by_category(), [("food", 12.5)])
+
+    def test_get_totals_by_invalid_period(self):
+        with self.assertRaises(InvalidInputError):
+            self.test_report_service.get_totals_by_period("week")
+
+    def test_get_year_over_year(self):
+        self.test_expense_service.create_new_expenses([
+            ("sushi", 12.5, "2022-04-15", "food"),
+            ("pizza", 15.6, "2023-04-15", "food"),
+            ("bus", 3, "2023-12-15", "transport"),
+        ])
+
+        years = self.test_report_service.get_year_over_year()
+
+        self.assertEqual(years, [("2022", [0, 0, 0, 12.5] + [0] * 8),
+                                 ("2023", [0, 0, 0, 15.6] + [0] * 7 + [3])])
@@ -25,10 +25,11 @@ class TestExpenseRepository(unittest.TestCase):
         test_expense_list = ["alice", "sushi", 12.5, "2023-04-15", "food"]
         self.assertEqual(found_expense, test_expense_list)
 
-    def test_delete_expense(self):
+    def test_delete_expenses_by_ids(self):
         test_repository.add_expense(self.test_user, self.test_expense)
+        expense_id = test_repository.find_expense(self.test_user, self.test_expense)["id"]
 
-        test_repository.delete_expense(self.test_user, self.test_expense)
+        test_repository.delete_expenses_by_ids(self.test_user, [expense_id])
 
         found = test_repository.find_expense(self.test_user, self.test_expense)
 
@@ -103,3 +104,37 @@ class TestExpenseRepository(unittest.TestCase):
             self.test_user, test_category)
 
         self.assertEqual(found, [])
+
+    def test_add_expenses_adds_all_expenses(self):
+        expenses = [self.test_expense,
+                    Expense("dress", 55.6, "2023-03-28", "clothes")]
+        test_repository.add_expenses(self.test_user, expenses)
+
+        found = test_repository.get_all_expenses_by_user(self.test_user)
+
+        self.assertEqual(len(found), 2)
+
+    def test_iterate_expenses_by_user_yields_all_expenses(self):
+        test_repository.add_expenses(
+            self.test_user, [self.test_expense] * 5)
+
+        found = list(test_repository.iterate_expenses_by_user(
+            self.test_user, chunk_size=2))
+
+        self.assertEqual(len(found), 5)
+
+    def test_restore_expenses_gives_reused_ids_new_ones(self):
+        test_repository.add_expenses(
+            self.test_user, [self.test_expense, Expense("dress", 55.6, "2023-03-28", "clothes")])
+        expense_ids = [expense["id"] for expense in
+                       test_repository.get_all_expenses_by_user(self.test_user)]
+        snapshots = test_repository.get_expense_snapshots(self.test_user, expense_ids)
+        test_repository.delete_expenses_by_ids(self.test_user, expense_ids)
+        test_repository.add_expense(self.test_user, Expense("taxi", 20, "2023-04-01", "travel"))
+        reused_id = test_repository.get_all_expenses_by_user(self.test_user)[0]["id"]
+
+        restored_ids = test_repository.restore_expenses(self.test_user, snapshots)
+
+        found = test_repository.get_expenses_by_ids(self.test_user, restored_ids)
+        self.assertEqual(sorted(expense["name"] for expense in found), ["dress", "sushi"])
+        self.assertEqual(len(set(restored_ids + [reused_id])), 3)
@@ -0,0 +1,56 @@
+import unittest
+from database_connection import connect_to_database
+from repositories.expense_rollup_repository import ExpenseRollupRepository
+from repositories.expense_repository import ExpenseRepository
+from entities.expense import Expense
+from entities.user import User
+
+test_rollup_repository = ExpenseRollupRepository()
+test_expense_repository = ExpenseRepository()
+
+
+class TestExpenseRollupRepository(unittest.TestCase):
+    def setUp(self):
+        test_expense_repository.delete_all_expenses()
+        self.test_user = User("alice", "1234abc!")
+        self.test_expense = Expense("sushi", 12.5, "2023-04-15", "food")
+
+    def test_get_rollup_totals_by_category(self):
+        test_expense_repository.add_expense(self.test_user, self.test_expense)
+        test_expense_repository.add_expense(
+            self.test_user, Expense("dress", 55.6, "2023-03-28", "clothes"))
+
+        test_rollup_repository.refresh_rollups()
+        totals = [(row["category"], row["total"]) for row in
+                  test_rollup_repository.get_rollup_totals_by_category(self.test_user)]
+
+        self.assertEqual(totals, [("clothes", 55.6), ("food", 12.5)])
+
+    def test_refresh_rollups_after_failed_refresh(self):
+        test_expense_repository.add_expense(self.test_user, self.test_expense)
+        # Rows left behind by a refresh that failed halfway
+        connection = connect_to_database()
+        connection.execute("""
+            create temporary table if not exists rollup_buckets
+                (username text, category_id integer, bucket text)""")
+        connection.execute("insert into temp.rollup_buckets values ('alice', 1, '2023-04')")
+
+        refreshed = test_rollup_repository.refresh_rollups()
+        totals = [(row["bucket"], row["total"]) for row in
+                  test_rollup_repository.get_rollup_totals(self.test_user, "month")]
+
+        self.assertEqual(refreshed, 1)
+        self.assertEqual(totals, [("2023-04", 12.5)])
+
+    def test_refresh_rollups_without_queued_days_does_not_commit(self):
+        test_rollup_repository.refresh_rollups()
+        connection = connect_to_database()
+        connection.execute("""
+            insert into expense_rollups (username, period, category_id, bucket, total, count)
+            values ('alice', 'year', 1, '2023', 12.5, 1)""")
+
+        refreshed = test_rollup_repository.refresh_rollups()
+        connection.rollback()
+
+        self.assertEqual(refreshed, 0)
+        self.assertEqual(test_rollup_repository.get_rollup_totals(self.test_user, "year"), [])
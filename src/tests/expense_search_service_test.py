@@ -0,0 +1,102 @@
+import unittest
+from services.expense_service import ExpenseService
+from services.expense_search_service import ExpenseSearchService
+from entities.expense import Expense
+from entities.user import User
+from repositories.expense_repository import ExpenseRepository
+from repositories.expense_search_repository import ExpenseSearchRepository
+
+test_repository = ExpenseRepository()
+test_user = User("alice", "1234abcd!")
+
+
+class TestExpenseSearchService(unittest.TestCase):
+    def setUp(self):
+        self.test_expense_service = ExpenseService(test_repository, test_user)
+        self.test_search_service = ExpenseSearchService(ExpenseSearchRepository(), test_user)
+        test_repository.delete_all_expenses()
+        self.test_expense = Expense("sushi", 12.5, "2023-04-15", "food")
+
+    def test_search_expenses_by_name_prefix(self):
+        self.test_expense_service.create_new_expenses(
+            [("sushi", 12.5, "2023-04-15", "food"),
+             ("supermarket", 30, "2023-04-16", "groceries"),
+             ("bus ticket", 3, "2023-04-17", "transport")])
+
+        found = self.test_search_service.search_expenses("su")
+
+        self.assertEqual([expense[0] for expense in found], ["sushi", "supermarket"])
+
+    def test_search_expenses_ranks_exact_words_first(self):
+        self.test_expense_service.create_new_expenses(
+            [("bus ticket", 3, "2023-04-17", "transport"),
+             ("business lunch", 25, "2023-04-18", "food")])
+
+        found = self.test_search_service.search_expenses("bus")
+
+        self.assertEqual([expense[0] for expense in found], ["bus ticket", "business lunch"])
+
+    def test_search_expenses_with_several_words(self):
+        self.test_expense_service.create_new_expenses(
+            [("bus ticket", 3, "2023-04-17", "transport"),
+             ("train ticket", 25, "2023-04-18", "transport")])
+
+        found = self.test_search_service.search_expenses("TRAIN tic")
+
+        self.assertEqual([expense[0] for expense in found], ["train ticket"])
+
+    def test_search_expenses_by_category(self):
+        self.test_expense_service.create_new_expenses(
+            [("bread", 3, "2023-04-17", "groceries"),
+             ("bus ticket", 3, "2023-04-17", "transport")])
+
+        found = self.test_search_service.search_expenses("groc")
+
+        self.assertEqual(found, [["bread", 3, "2023-04-17", "groceries"]])
+
+    def test_search_expenses_follows_edits_and_deletions(self):
+        self.test_expense_service.create_new_expense(
+            "sushi", 12.5, "2023-04-15", "food")
+
+        self.test_expense_service.edit_expense_name("ramen", self.test_expense)
+        renamed = self.test_search_service.search_expenses("ram")
+        self.test_expense_service.delete_expense(
+            Expense("ramen", 12.5, "2023-04-15", "food"))
+        deleted = self.test_search_service.search_expenses("ram")
+
+        self.assertEqual(len(renamed), 1)
+        self.assertEqual(self.test_search_service.search_expenses("sushi"), [])
+        self.assertEqual(deleted, [])
+
+    def test_search_expenses_of_other_users_are_not_found(self):
+        ExpenseService(test_repository, User("bob", "5678efg!")).create_new_expense(
+            "sushi", 12.5, "2023-04-15", "food")
+
+        self.assertEqual(self.test_search_service.search_expenses("sushi"), [])
+
+    def test_search_expenses_with_empty_query(self):
+        self.test_expense_service.create_new_expense("sushi", 12.5)
+
+        self.assertEqual(self.test_search_service.search_expenses("  \"*"), [])
+
+    def test_find_near_duplicates(self):
+        self.test_expense_service.create_new_expenses(
+            [("sushi", 12.5, "2023-04-15", "food"),
+             ("sushi bar", 12.5, "2023-04-17", "food"),
+             ("sushi", 12.5, "2023-04-25", "food"),
+             ("bus", 3, "2023-04-15", "transport")])
+
+        pairs = self.test_search_service.find_near_duplicates(days=3)
+
+        self.assertEqual(pairs, [[["sushi", 12.5, "2023-04-15", "food"],
+                                  ["sushi bar", 12.5, "2023-04-17", "food"]]])
+
+    def test_find_near_duplicates_within_window(self):
+        self.test_expense_service.create_new_expenses(
+            [("bus", 3, f"2023-04-{day:02}", "transport") for day in range(1, 6)])
+
+        pairs = self.test_search_service.find_near_duplicates(days=1)
+
+        self.assertEqual([(first[2], second[2]) for first, second in pairs],
+                         [("2023-04-01", "2023-04-02"), ("2023-04-02", "2023-04-03"),
+                          ("2023-04-03", "2023-04-04"), ("2023-04-04", "2023-04-05")])
@@ -1,5 +1,6 @@
 import unittest
-from services.expense_service import ExpenseService
+from services.expense_service import ExpenseService, InvalidInputError
+from services.expense_report_service import ExpenseReportService
 from entities.expense import Expense
 from entities.user import User
 from entities.category import Category
@@ -13,6 +14,7 @@ test_user = User("alice", "1234abcd!")
 class TestExpenseService(unittest.TestCase):
     def setUp(self):
         self.test_expense_service = ExpenseService(test_repository, test_user)
+        self.test_report_service = ExpenseReportService(test_repository, test_user)
         test_repository.delete_all_expenses()
         self.test_expense = Expense("sushi", 12.5, "2023-04-15", "food")
 
@@ -251,29 +253,6 @@ class TestExpenseService(unittest.TestCase):
             new_category.name, test_category)
         self.assertEqual(renamed, False)
 
-    def test_get_total_all_expenses_by_user(self):
-        self.test_expense_service.create_new_expense(
-            self.test_expense.name, self.test_expense.amount, self.test_expense.date, self.test_expense.category)
-        self.test_expense_service.create_new_expense(
-            "pizza", 15.6, self.test_expense.date, self.test_expense.category)
-
-        expected_total = self.test_expense.amount + 15.6
-        returned_total = self.test_expense_service.get_total_all_expenses_by_user()
-
-        self.assertEqual(expected_total, returned_total)
-
-    def test_get_total_by_category_and_user(self):
-        self.test_expense_service.create_new_expense(
-            self.test_expense.name, self.test_expense.amount, self.test_expense.date, self.test_expense.category)
-        self.test_expense_service.create_new_expense(
-            "pizza", 15.6, self.test_expense.date, self.test_expense.category)
-
-        expected_total = self.test_expense.amount + 15.6
-        returned_total = self.test_expense_service.get_total_by_category_and_user(
-            Category(self.test_expense.category))
-
-        self.assertEqual(expected_total, returned_total)
-
     def test_list_all_expenses(self):
         self.test_expense_service.create_new_expense(
             self.test_expense.name, self.test_expense.amount, self.test_expense.date, self.test_expense.category)
@@ -302,3 +281,261 @@ class TestExpenseService(unittest.TestCase):
         expected_list = [self.test_expense.category, "takeaway"]
 
         self.assertEqual(list_of_categories, expected_list)
+
+    def test_create_new_expenses_creates_all_expenses(self):
+        created = self.test_expense_service.create_new_expenses(
+            [("sushi", "12.5", "2023-04-15", "food"), ("bus", 3, "", "")])
+
+        self.assertEqual(created, 2)
+        self.assertEqual(
+            len(self.test_expense_service.list_all_expenses()), 2)
+
+    def test_create_new_expenses_creates_nothing_if_one_is_invalid(self):
+        with self.assertRaises(InvalidInputError):
+            self.test_expense_service.create_new_expenses(
+                [("sushi", "12.5", "2023-04-15", "food"), ("bus", -3, "", "")])
+
+        self.assertEqual(self.test_expense_service.list_all_expenses(), [])
+
+    def test_create_new_expenses_without_amount(self):
+        with self.assertRaises(InvalidInputError):
+            self.test_expense_service.create_new_expenses([("sushi", None, "2023-04-15", "food")])
+
+    def test_list_expenses_page(self):
+        self.test_expense_service.create_new_expenses(
+            [(f"expense {number}", number, f"2023-04-{number:02}", "food")
+             for number in range(1, 11)])
+
+        page = self.test_expense_service.list_expenses_page(offset=2, limit=3)
+
+        self.assertEqual([expense[0] for expense in page],
+                         ["expense 8", "expense 7", "expense 6"])
+
+    def test_import_expenses_skips_existing_expenses(self):
+        self.test_expense_service.create_new_expense(
+            "sushi", 12.5, "2023-04-15", "food")
+
+        imported = self.test_expense_service.import_expenses(
+            [(" SUSHI ", "12.50", "2023-04-15", "restaurants"),
+             ("bus", 3, "2023-04-16", "transport"),
+             ("bus", 3, "2023-04-16", "transport")])
+
+        self.assertEqual(imported, 1)
+        self.assertEqual(len(self.test_expense_service.list_all_expenses()), 2)
+
+    def test_same_expense_can_be_created_twice(self):
+        self.test_expense_service.create_new_expense(
+            "coffee", 3.5, "2023-04-15", "food")
+        self.test_expense_service.create_new_expenses(
+            [("coffee", 3.5, "2023-04-15", "food")])
+        self.test_expense_service.create_new_expense(
+            "coffee", 3.5, "2023-04-15", "food")
+
+        self.assertEqual(len(self.test_expense_service.list_all_expenses()), 3)
+
+    def test_import_skips_duplicate_after_deleting_first_copy(self):
+        self.test_expense_service.create_new_expense("coffee", 3.5, "2023-04-15", "food")
+        self.test_expense_service.create_new_expense("coffee", 3.5, "2023-04-15", "food")
+        first_id = min(expense[0] for expense in
+                       self.test_expense_service.list_all_expenses(with_ids=True))
+        self.test_expense_service.delete_expenses([first_id])
+
+        imported = self.test_expense_service.import_expenses(
+            [("coffee", 3.5, "2023-04-15", "food")])
+
+        self.assertEqual(imported, 0)
+        self.assertEqual(len(self.test_expense_service.list_all_expenses()), 1)
+
+    def test_import_skips_duplicate_after_editing_first_copy(self):
+        self.test_expense_service.create_new_expense("coffee", 3.5, "2023-04-15", "food")
+        self.test_expense_service.create_new_expense("coffee", 3.5, "2023-04-15", "food")
+        first_id = min(expense[0] for expense in
+                       self.test_expense_service.list_all_expenses(with_ids=True))
+        self.test_expense_service.edit_expenses_date("2023-04-16", [first_id])
+
+        imported = self.test_expense_service.import_expenses(
+            [("coffee", 3.5, "2023-04-15", "food"), ("coffee", 3.5, "2023-04-16", "food")])
+
+        self.assertEqual(imported, 0)
+
+    def test_list_all_expenses_with_ids(self):
+        self.test_expense_service.create_new_expense("sushi", 12.5, "2023-04-15", "food")
+
+        expense_id, *expense = self.test_expense_service.list_all_expenses(with_ids=True)[0]
+
+        self.assertEqual(self.test_expense_service.find_expenses_by_ids([expense_id]),
+                         {expense_id: expense})
+
+    def test_edit_expenses_category_moves_only_selected_expenses(self):
+        self.test_expense_service.create_new_expenses([
+            ("sushi", 12.5, "2023-04-15", "food"),
+            ("pizza", 15.6, "2023-04-16", "food"),
+            ("bus", 3, "2023-04-17", "transport"),
+        ])
+        ids = [expense[0] for expense in self.test_expense_service.list_all_expenses(True)[:2]]
+
+        moved = self.test_expense_service.edit_expenses_category("travel", ids)
+
+        self.assertEqual(moved, 2)
+        self.assertEqual(self.test_report_service.get_totals_by_category(),
+                         [("food", 12.5), ("travel", 18.6)])
+
+    def test_edit_expenses_date_keeps_ids_and_updates_totals(self):
+        self.test_expense_service.create_new_expenses([
+            ("sushi", 12.5, "2023-04-15", "food"),
+            ("pizza", 15.6, "2023-04-16", "food"),
+        ])
+        ids = [expense[0] for expense in self.test_expense_service.list_all_expenses(True)]
+
+        edited = self.test_expense_service.edit_expenses_date("2023-05-01", ids)
+
+        self.assertEqual(edited, 2)
+        self.assertEqual(self.test_expense_service.find_expenses_by_ids(ids), {
+            ids[0]: ["pizza", 15.6, "2023-05-01", "food"],
+            ids[1]: ["sushi", 12.5, "2023-05-01", "food"]})
+        self.assertEqual(self.test_report_service.get_totals_by_period("month"),
+                         [("2023-05", 28.1)])
+        # The content hashes follow the new date, so importing the moved
+        # expenses again skips them
+        self.assertEqual(self.test_expense_service.import_expenses(
+            [("sushi", 12.5, "2023-05-01", "food")]), 0)
+
+    def test_edit_expenses_date_with_invalid_date(self):
+        self.test_expense_service.create_new_expense("sushi", 12.5, "2023-04-15", "food")
+        ids = [expense[0] for expense in self.test_expense_service.list_all_expenses(True)]
+
+        with self.assertRaises(InvalidInputError):
+            self.test_expense_service.edit_expenses_date("2023-13-01", ids)
+
+    def test_delete_expenses(self):
+        self.test_expense_service.create_new_expenses([
+            ("sushi", 12.5, "2023-04-15", "food"),
+            ("pizza", 15.6, "2023-04-16", "food"),
+            ("bus", 3, "2023-04-17", "transport"),
+        ])
+        ids = [expense[0] for expense in self.test_expense_service.list_all_expenses(True)]
+
+        deleted = self.test_expense_service.delete_expenses(ids[:2])
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(self.test_expense_service.list_all_expenses(),
+                         [["sushi", 12.5, "2023-04-15", "food"]])
+
+    def test_bulk_edits_do_not_touch_other_users_expenses(self):
+        other_service = ExpenseService(test_repository, User("bob", "1234abcd!"))
+        other_service.create_new_expense("sushi", 12.5, "2023-04-15", "food")
+        ids = [expense[0] for expense in other_service.list_all_expenses(True)]
+
+        self.assertEqual(self.test_expense_service.edit_expenses_category("travel", ids), 0)
+        self.assertEqual(self.test_expense_service.edit_expenses_date("2023-05-01", ids), 0)
+        self.assertEqual(self.test_expense_service.delete_expenses(ids), 0)
+        self.assertEqual(other_service.list_all_expenses(),
+                         [["sushi", 12.5, "2023-04-15", "food"]])
+
+    def test_undo_and_redo_edit_keeps_the_expense_id(self):
+        self.test_expense_service.create_new_expense("sushi", 12.5, "2023-04-15", "food")
+        expense_id = self.test_expense_service.list_all_expenses(True)[0][0]
+        self.test_expense_service.edit_expense_name(
+            "sushi bar", Expense("sushi", 12.5, "2023-04-15", "food"))
+
+        self.assertEqual(self.test_expense_service.undo(), "edit the name of sushi")
+        self.assertEqual(self.test_expense_service.list_all_expenses(True),
+                         [[expense_id, "sushi", 12.5, "2023-04-15", "food"]])
+        self.assertEqual(self.test_expense_service.redo(), "edit the name of sushi")
+        self.assertEqual(self.test_expense_service.list_all_expenses(True),
+                         [[expense_id, "sushi bar", 12.5, "2023-04-15", "food"]])
+
+    def test_undo_bulk_edits_in_reverse_order(self):
+        self.test_expense_service.create_new_expenses([
+            ("sushi", 12.5, "2023-04-15", "food"),
+            ("pizza", 15.6, "2023-04-16", "food"),
+            ("bus", 3, "2023-04-17", "transport"),
+        ])
+        before = self.test_expense_service.list_all_expenses(True)
+        ids = [expense[0] for expense in before]
+        self.test_expense_service.edit_expenses_category("travel", ids[:2])
+        self.test_expense_service.edit_expenses_date("2023-05-01", ids[1:])
+
+        self.test_expense_service.undo()
+        self.test_expense_service.undo()
+
+        self.assertEqual(self.test_expense_service.list_all_expenses(True), before)
+        self.assertEqual(self.test_report_service.get_totals_by_category(),
+                         [("food", 28.1), ("transport", 3)])
+
+    def test_undo_delete_restores_expenses_with_their_ids(self):
+        self.test_expense_service.create_new_expenses([
+            ("sushi", 12.5, "2023-04-15", "food"),
+            ("bus", 3, "2023-04-17", "transport"),
+        ])
+        before = self.test_expense_service.list_all_expenses(True)
+        self.test_expense_service.delete_expenses([expense[0] for expense in before])
+
+        self.assertEqual(self.test_expense_service.undo(), "delete expenses")
+        self.assertEqual(self.test_expense_service.list_all_expenses(True), before)
+        self.test_expense_service.redo()
+        self.assertEqual(self.test_expense_service.list_all_expenses(), [])
+
+    def test_undo_category_rename_and_merge(self):
+        self.test_expense_service.create_new_expenses([
+            ("sushi", 12.5, "2023-04-15", "food"),
+            ("pizza", 15.6, "2023-04-16", "restaurants"),
+            ("bus", 3, "2023-04-17", "transport"),
+        ])
+        self.test_expense_service.rename_category("travel", Category("transport"))
+        self.test_expense_service.rename_category("restaurants", Category("food"))
+
+        self.test_expense_service.undo()
+        self.assertEqual(self.test_report_service.get_totals_by_category(),
+                         [("food", 12.5), ("restaurants", 15.6), ("travel", 3)])
+        self.test_expense_service.undo()
+        self.assertEqual(self.test_expense_service.list_all_categories(),
+                         ["food", "restaurants", "transport"])
+
+    def test_undo_and_redo_rename_rename_the_category_back_and_forth(self):
+        self.test_expense_service.create_new_expense("sushi", 12.5, "2023-04-15", "food")
+        self.test_expense_service.rename_category("groceries", Category("food"))
+        self.test_expense_service.create_new_expense("bread", 3.2, "2023-04-17", "groceries")
+
+        self.test_expense_service.undo()
+        self.assertEqual(self.test_report_service.get_totals_by_category(),
+                         [("food", 15.7)])
+        self.test_expense_service.redo()
+        self.assertEqual(self.test_report_service.get_totals_by_category(),
+                         [("groceries", 15.7)])
+
+    def test_undo_rename_into_a_category_with_expenses_moves_them_back(self):
+        self.test_expense_service.create_new_expense("sushi", 12.5, "2023-04-15", "food")
+        self.test_expense_service.rename_category("groceries", Category("food"))
+        self.test_expense_service.create_new_expense("pizza", 15.6, "2023-04-16", "food")
+
+        self.test_expense_service.undo()
+        self.assertEqual(self.test_report_service.get_totals_by_category(),
+                         [("food", 28.1)])
+        self.test_expense_service.redo()
+        self.assertEqual(self.test_report_service.get_totals_by_category(),
+                         [("food", 15.6), ("groceries", 12.5)])
+
+    def test_failed_undo_can_be_tried_again(self):
+        self.test_expense_service.create_new_expense("sushi", 12.5, "2023-04-15", "food")
+        before = self.test_expense_service.list_all_expenses(True)
+        self.test_expense_service.delete_expenses([before[0][0]])
+
+        self.test_expense_service.expense_repository = None
+        with self.assertRaises(AttributeError):
+            self.test_expense_service.undo()
+        self.test_expense_service.expense_repository = test_repository
+
+        self.assertEqual(self.test_expense_service.undo(), "delete expenses")
+        self.assertEqual(self.test_expense_service.list_all_expenses(True), before)
+
+    def test_new_edit_cannot_be_undone_past_and_clears_redo(self):
+        self.test_expense_service.create_new_expense("sushi", 12.5, "2023-04-15", "food")
+        self.test_expense_service.delete_category(Category("food"))
+        self.test_expense_service.undo()
+        self.test_expense_service.rename_category("restaurants", Category("food"))
+
+        self.assertIsNone(self.test_expense_service.redo())
+        self.test_expense_service.undo()
+        self.assertIsNone(self.test_expense_service.undo())
+        self.assertEqual(self.test_expense_service.list_all_categories(), ["food"])
@@ -0,0 +1,84 @@
+import unittest
+import numpy as np
+from services.forecast_service import ForecastService, forecast_series
+from services.expense_service import ExpenseService, InvalidInputError
+from entities.user import User
+from entities.category import Category
+from repositories.expense_repository import ExpenseRepository
+from repositories.expense_rollup_repository import ExpenseRollupRepository
+
+test_repository = ExpenseRepository()
+test_user = User("alice", "1234abcd!")
+
+
+class TestForecastService(unittest.TestCase):
+    def setUp(self):
+        test_repository.delete_all_expenses()
+        self.test_expense_service = ExpenseService(test_repository, test_user)
+        self.test_expense_service.create_new_expenses([
+            ("rent", "800", "2023-01-31", "housing"),
+            ("rent", "900", "2023-03-31", "housing"),
+            ("pizza", "10", "2023-01-15", "food"),
+            ("sushi", "30", "2023-02-15", "food"),
+            ("pizza", "20", "2023-03-15", "food"),
+        ])
+        self.test_forecast_service = ForecastService(
+            ExpenseRollupRepository(), test_user, smoothing_factor=0.5)
+
+    def test_forecast_series_with_trend(self):
+        forecasts = forecast_series([[1, 2, 3, 4], [4, 4, 4, 4], [0, 10, 0, 0]], "trend")
+
+        self.assertEqual(forecasts.tolist(), [5, 4, 0])
+
+    def test_forecast_series_with_smoothing(self):
+        forecasts = forecast_series([[1, 2, 3, 4], [4, 4, 4, 4]], "smoothing", 0.5)
+
+        self.assertEqual(forecasts.tolist(), [3.125, 4])
+
+    def test_forecast_series_of_one_month(self):
+        self.assertEqual(forecast_series([[5]], "trend").tolist(), [5])
+        self.assertEqual(forecast_series(np.zeros((2, 0))).tolist(), [0, 0])
+
+    def test_get_monthly_series_fills_months_without_expenses(self):
+        months, categories, series = self.test_forecast_service.get_monthly_series()
+
+        self.assertEqual(months, ["2023-01", "2023-02", "2023-03"])
+        self.assertEqual(categories, ["food", "housing"])
+        self.assertEqual(series.tolist(), [[10, 30, 20], [800, 0, 900]])
+
+    def test_forecast_next_month(self):
+        month, forecasts = self.test_forecast_service.forecast_next_month()
+
+        self.assertEqual(month, "2023-04")
+        self.assertEqual(forecasts, [("food", 20.0), ("housing", 650.0)])
+
+    def test_forecast_is_recomputed_after_expenses_change(self):
+        self.test_forecast_service.forecast_next_month("trend")
+        self.test_expense_service.create_new_expense("rent", "1000", "2023-04-30", "housing")
+
+        month, forecasts = self.test_forecast_service.forecast_next_month("trend")
+
+        self.assertEqual(month, "2023-05")
+        self.assertEqual(dict(forecasts)["food"], 5.0)
+
+    def test_forecast_is_cached_until_expenses_change(self):
+        first = self.test_forecast_service.forecast_next_month()
+
+        self.assertIs(self.test_forecast_service.forecast_next_month(), first)
+
+    def test_forecast_is_recomputed_after_category_is_renamed(self):
+        self.test_forecast_service.forecast_next_month()
+        self.test_expense_service.rename_category("groceries", Category("food"))
+
+        _, forecasts = self.test_forecast_service.forecast_next_month()
+
+        self.assertEqual([category for category, _ in forecasts], ["groceries", "housing"])
+
+    def test_forecast_without_expenses(self):
+        test_repository.delete_all_expenses()
+
+        self.assertEqual(self.test_forecast_service.forecast_next_month(), (None, []))
+
+    def test_forecast_with_unknown_method(self):
+        with self.assertRaises(InvalidInputError):
+            self.test_forecast_service.forecast_next_month("arima")
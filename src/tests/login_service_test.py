@@ -1,12 +1,44 @@
+import threading
 import unittest
-from services.login_service import LoginService
+from services.login_service import (LoginService, InvalidCredentialsError, TooManyAttemptsError,
+                                    IncorrectPasswordFormatError, UsernameNotUniqueError)
 from entities.user import User
 from repositories.user_repository import UserRepository
+from services.rate_limiter import RateLimiter
+from services.password_hasher import PasswordHasher
 
 
 test_repository = UserRepository()
 
 
+class ThreadRecordingUserRepository(UserRepository):
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def find_user(self, username):
+        self.threads.add(threading.get_ident())
+        return super().find_user(username)
+
+    def add_user(self, user: User):
+        self.threads.add(threading.get_ident())
+        super().add_user(user)
+
+    def update_password(self, username, password):
+        self.threads.add(threading.get_ident())
+        super().update_password(username, password)
+
+
+class RecordingPasswordHasher(PasswordHasher):
+    def __init__(self):
+        super().__init__(cost=4)
+        self.verified = []
+
+    def verify_password(self, password, encoded_hash):
+        self.verified.append(encoded_hash)
+        return super().verify_password(password, encoded_hash)
+
+
 class TestLoginService(unittest.TestCase):
 
     def setUp(self):
@@ -79,3 +111,176 @@ class TestLoginService(unittest.TestCase):
             self.test_login_service.validate_credentials("mark", "1234abc?")
 
         self.assertTrue("Invalid credentials" in str(context.exception))
+
+    def test_authenticate_user_does_not_log_in(self):
+        self.test_login_service.create_new_user("mark", "1234abc!")
+
+        user = self.test_login_service.authenticate_user("mark", "1234abc!")
+
+        self.assertEqual(user.username, "mark")
+        self.assertEqual(self.test_login_service.session_registry.count_sessions(), 0)
+
+    def test_start_session(self):
+        self.test_login_service.create_new_user("mark", "1234abc!")
+
+        session = self.test_login_service.start_session("mark", "1234abc!")
+
+        found = self.test_login_service.find_session(session.session_id)
+        self.assertEqual(found.user.username, "mark")
+
+    def test_start_session_invalid_credentials(self):
+        self.test_login_service.create_new_user("mark", "1234abc!")
+
+        with self.assertRaises(InvalidCredentialsError):
+            self.test_login_service.start_session("mark", "1234abc?")
+
+    def test_sessions_of_several_users(self):
+        self.test_login_service.create_new_user("mark", "1234abc!")
+        self.test_login_service.create_new_user("anna", "5678efg!")
+
+        first = self.test_login_service.start_session("mark", "1234abc!")
+        second = self.test_login_service.start_session("anna", "5678efg!")
+
+        self.assertEqual(self.test_login_service.find_session(
+            first.session_id).user.username, "mark")
+        self.assertEqual(self.test_login_service.find_session(
+            second.session_id).user.username, "anna")
+
+    def test_end_session(self):
+        self.test_login_service.create_new_user("mark", "1234abc!")
+        session = self.test_login_service.start_session("mark", "1234abc!")
+
+        self.test_login_service.end_session(session)
+
+        self.assertEqual(
+            self.test_login_service.find_session(session.session_id), None)
+
+    def test_create_user_does_not_store_plain_text_password(self):
+        self.test_login_service.create_new_user("mark", "1234abc!")
+
+        found = test_repository.find_user("mark")
+
+        self.assertNotEqual(found["password"], "1234abc!")
+
+    def test_plain_text_password_is_rehashed_on_login(self):
+        test_repository.add_user(User("mark", "1234abc!"))
+
+        self.test_login_service.validate_credentials("mark", "1234abc!")
+
+        found = test_repository.find_user("mark")
+        self.assertTrue(found["password"].startswith("scrypt$"))
+
+    def test_plain_text_password_with_hash_prefix_is_rehashed_on_login(self):
+        test_repository.add_user(User("mark", "scrypt$12345"))
+
+        self.test_login_service.validate_credentials("mark", "scrypt$12345")
+
+        found = test_repository.find_user("mark")
+        self.assertNotEqual(found["password"], "scrypt$12345")
+        self.assertFalse(
+            self.test_login_service.password_hasher.needs_rehash(found["password"]))
+
+    def test_password_is_rehashed_when_cost_changes(self):
+        self.test_login_service.create_new_user("mark", "1234abc!")
+        old_hash = test_repository.find_user("mark")["password"]
+
+        self.test_login_service.password_hasher.cost += 1
+        self.test_login_service.validate_credentials("mark", "1234abc!")
+
+        new_hash = test_repository.find_user("mark")["password"]
+        self.assertNotEqual(old_hash, new_hash)
+        self.assertFalse(
+            self.test_login_service.password_hasher.needs_rehash(new_hash))
+
+    def test_start_session_async(self):
+        self.test_login_service.create_new_user("mark", "1234abc!")
+
+        login = self.test_login_service.start_session_async("mark", "1234abc!")
+
+        self.assertEqual(login.result().user.username, "mark")
+
+    def test_start_session_async_invalid_credentials(self):
+        self.test_login_service.create_new_user("mark", "1234abc!")
+
+        login = self.test_login_service.start_session_async("mark", "wrong")
+
+        with self.assertRaises(InvalidCredentialsError):
+            login.result()
+
+    def test_async_methods_use_database_only_in_calling_thread(self):
+        repository = ThreadRecordingUserRepository()
+        login_service = LoginService(repository)
+
+        login_service.create_new_user_async("mark", "1234abc!").result()
+        login_service.password_hasher.cost += 1
+        session = login_service.start_session_async("mark", "1234abc!").result()
+
+        self.assertEqual(session.user.username, "mark")
+        self.assertFalse(login_service.password_hasher.needs_rehash(
+            repository.find_user("mark")["password"]))
+        self.assertEqual(repository.threads, {threading.get_ident()})
+
+    def test_create_new_user_async_existing_user(self):
+        self.test_login_service.create_new_user("mark", "1234abc!")
+
+        creation = self.test_login_service.create_new_user_async("mark", "1234abc!")
+
+        self.assertTrue(creation.done())
+        with self.assertRaises(UsernameNotUniqueError):
+            creation.result()
+
+    def test_failed_attempts_are_rate_limited_per_username(self):
+        self.test_login_service.username_rate_limiter = RateLimiter(3, 60, 100)
+        self.test_login_service.create_new_user("mark", "1234abc!")
+
+        for _ in range(3):
+            with self.assertRaises(InvalidCredentialsError):
+                self.test_login_service.validate_credentials("mark", "wrong")
+
+        with self.assertRaises(TooManyAttemptsError):
+            self.test_login_service.validate_credentials("mark", "1234abc!")
+
+    def test_successful_attempts_are_not_rate_limited(self):
+        self.test_login_service.username_rate_limiter = RateLimiter(3, 60, 100)
+        self.test_login_service.create_new_user("mark", "1234abc!")
+
+        for _ in range(5):
+            self.test_login_service.validate_credentials("mark", "1234abc!")
+
+    def test_failed_attempts_are_rate_limited_per_client(self):
+        self.test_login_service.client_rate_limiter = RateLimiter(3, 60, 100)
+
+        for username in ["mark", "anna", "john"]:
+            with self.assertRaises(InvalidCredentialsError):
+                self.test_login_service.validate_credentials(username, "wrong", "10.0.0.1")
+
+        with self.assertRaises(TooManyAttemptsError):
+            self.test_login_service.validate_credentials("paul", "wrong", "10.0.0.1")
+        with self.assertRaises(InvalidCredentialsError):
+            self.test_login_service.validate_credentials("paul", "wrong", "10.0.0.2")
+
+    def test_create_new_users(self):
+        self.test_login_service.create_new_user("mark", "1234abc!")
+
+        taken = self.test_login_service.create_new_users(
+            [("mark", "5678efg!"), ("anna", "5678efg!"), ("john", "9012hij!")])
+
+        self.assertEqual(taken, ["mark"])
+        self.assertTrue(self.test_login_service.validate_credentials("anna", "5678efg!"))
+        self.assertTrue(self.test_login_service.validate_credentials("mark", "1234abc!"))
+
+    def test_create_new_users_with_invalid_password_creates_none(self):
+        with self.assertRaises(IncorrectPasswordFormatError):
+            self.test_login_service.create_new_users(
+                [("anna", "5678efg!"), ("john", "short")])
+
+        self.assertEqual(test_repository.find_all_users(), [])
+
+    def test_unknown_username_is_verified_against_dummy_hash(self):
+        password_hasher = RecordingPasswordHasher()
+        login_service = LoginService(test_repository, password_hasher=password_hasher)
+
+        with self.assertRaises(InvalidCredentialsError):
+            login_service.authenticate_user("nobody", "1234abc!")
+
+        self.assertEqual(password_hasher.verified, [password_hasher.get_dummy_hash()])
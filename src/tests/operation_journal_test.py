@@ -0,0 +1,56 @@
+import unittest
+from services.operation_journal import OperationJournal, UNDO, REDO
+from repositories.operation_journal_repository import OperationJournalRepository
+from entities.user import User
+
+test_operation_journal_repository = OperationJournalRepository()
+test_user = User("alice", "1234abcd!")
+other_user = User("bob", "1234abcd!")
+
+
+class TestOperationJournal(unittest.TestCase):
+    def setUp(self):
+        test_operation_journal_repository.delete_all_operations()
+
+    def test_pop_returns_the_latest_operation_first(self):
+        journal = OperationJournal(test_user)
+        journal.record("first", ["delete", [1]])
+        journal.record("second", ["delete", [2]])
+
+        self.assertEqual(journal.pop(UNDO), ("second", ["delete", [2]]))
+        self.assertEqual(journal.peek(UNDO), ("first", ["delete", [1]]))
+        self.assertEqual(journal.pop(UNDO), ("first", ["delete", [1]]))
+        self.assertIsNone(journal.pop(UNDO))
+
+    def test_full_journal_drops_the_oldest_operation(self):
+        journal = OperationJournal(test_user, size=2)
+        for number in range(3):
+            journal.record(f"edit {number}", ["delete", [number]])
+
+        self.assertEqual(journal.pop(UNDO)[0], "edit 2")
+        self.assertEqual(journal.pop(UNDO)[0], "edit 1")
+        self.assertIsNone(journal.pop(UNDO))
+
+    def test_recording_an_edit_clears_the_redo_stack(self):
+        journal = OperationJournal(test_user)
+        journal.push(REDO, "undone", ["delete", [1]])
+        journal.record("new edit", ["delete", [2]])
+
+        self.assertIsNone(journal.peek(REDO))
+
+    def test_persistent_journal_is_read_in_a_later_session(self):
+        journal = OperationJournal(
+            test_user, size=2, operation_journal_repository=test_operation_journal_repository)
+        for number in range(3):
+            journal.record(f"edit {number}", ["rename", ["food", f"food {number}"]])
+        journal.push(REDO, "undone", ["delete", [1]])
+        journal.pop(UNDO)
+        OperationJournal(other_user, operation_journal_repository=test_operation_journal_repository
+                         ).record("other user's edit", ["delete", [5]])
+
+        later = OperationJournal(
+            test_user, size=2, operation_journal_repository=test_operation_journal_repository)
+
+        self.assertEqual(later.pop(UNDO), ("edit 1", ["rename", ["food", "food 1"]]))
+        self.assertIsNone(later.pop(UNDO))
+        self.assertEqual(later.pop(REDO), ("undone", ["delete", [1]]))
@@ -0,0 +1,63 @@
+import unittest
+from services.password_hasher import PasswordHasher
+
+
+class TestPasswordHasher(unittest.TestCase):
+    def setUp(self):
+        self.test_hasher = PasswordHasher(cost=4)
+
+    def test_hash_does_not_contain_password(self):
+        password_hash = self.test_hasher.hash_password("1234abc!")
+
+        self.assertNotIn("1234abc!", password_hash)
+
+    def test_hashes_are_salted(self):
+        first = self.test_hasher.hash_password("1234abc!")
+        second = self.test_hasher.hash_password("1234abc!")
+
+        self.assertNotEqual(first, second)
+
+    def test_verify_correct_password(self):
+        password_hash = self.test_hasher.hash_password("1234abc!")
+
+        self.assertTrue(self.test_hasher.verify_password("1234abc!", password_hash))
+
+    def test_verify_wrong_password(self):
+        password_hash = self.test_hasher.hash_password("1234abc!")
+
+        self.assertFalse(self.test_hasher.verify_password("1234abc?", password_hash))
+
+    def test_verify_plain_text_password(self):
+        self.assertTrue(self.test_hasher.verify_password("1234abc!", "1234abc!"))
+
+    def test_needs_rehash_plain_text_password(self):
+        self.assertTrue(self.test_hasher.needs_rehash("1234abc!"))
+
+    def test_plain_text_password_with_hash_prefix(self):
+        self.assertTrue(self.test_hasher.verify_password("scrypt$12345", "scrypt$12345"))
+        self.assertFalse(self.test_hasher.verify_password("12345", "scrypt$12345"))
+        self.assertTrue(self.test_hasher.needs_rehash("scrypt$12345"))
+
+    def test_dummy_hash_has_current_parameters(self):
+        dummy_hash = self.test_hasher.get_dummy_hash()
+
+        self.assertFalse(self.test_hasher.needs_rehash(dummy_hash))
+        self.assertEqual(self.test_hasher.get_dummy_hash(), dummy_hash)
+        self.test_hasher.cost = 5
+        self.assertFalse(self.test_hasher.needs_rehash(self.test_hasher.get_dummy_hash()))
+
+    def test_needs_rehash_when_cost_changes(self):
+        password_hash = PasswordHasher(cost=5).hash_password("1234abc!")
+
+        self.assertTrue(self.test_hasher.needs_rehash(password_hash))
+        self.assertTrue(self.test_hasher.verify_password("1234abc!", password_hash))
+
+    def test_no_rehash_with_current_parameters(self):
+        password_hash = self.test_hasher.hash_password("1234abc!")
+
+        self.assertFalse(self.test_hasher.needs_rehash(password_hash))
+
+    def test_submit_runs_in_worker_pool(self):
+        future = self.test_hasher.submit(self.test_hasher.hash_password, "1234abc!")
+
+        self.assertTrue(self.test_hasher.verify_password("1234abc!", future.result()))
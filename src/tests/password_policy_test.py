@@ -0,0 +1,49 @@
+import unittest
+from services.password_policy import PasswordPolicy, read_denylist
+
+
+class TestPasswordPolicy(unittest.TestCase):
+    def setUp(self):
+        self.test_policy = PasswordPolicy(
+            min_length=8, required_classes=["digit", "special"], denylist=["Password1!"])
+
+    def test_valid_password(self):
+        self.assertTrue(self.test_policy.is_valid("1234abc!"))
+        self.assertEqual(self.test_policy.find_violations("1234abc!"), [])
+
+    def test_too_short_password(self):
+        self.assertFalse(self.test_policy.is_valid("1a!"))
+        self.assertEqual(self.test_policy.find_violations("1a!"),
+                         ["must be at least 8 characters long"])
+
+    def test_password_without_required_classes(self):
+        self.assertFalse(self.test_policy.is_valid("abcdefgh"))
+        self.assertEqual(self.test_policy.find_violations("abcdefgh"),
+                         ["must include a number", "must include a special character"])
+
+    def test_denied_password_is_compared_case_insensitively(self):
+        self.assertFalse(self.test_policy.is_valid("PASSWORD1!"))
+        self.assertEqual(self.test_policy.find_violations("password1!"), ["is too common"])
+
+    def test_configurable_classes(self):
+        policy = PasswordPolicy(min_length=4, required_classes=["uppercase"], denylist=[])
+
+        self.assertTrue(policy.is_valid("Abcd"))
+        self.assertFalse(policy.is_valid("abcd"))
+
+    def test_describe_lists_active_rules(self):
+        self.assertEqual(self.test_policy.describe(),
+                         "Your password must be at least 8 characters long, include "
+                         "a number and a special character and not be a commonly "
+                         "used password")
+        self.assertEqual(PasswordPolicy(min_length=12, required_classes=[],
+                                        denylist=[]).describe(),
+                         "Your password must be at least 12 characters long")
+
+    def test_default_denylist_is_read_from_file(self):
+        policy = PasswordPolicy()
+
+        self.assertFalse(policy.is_valid("P@ssw0rd"))
+
+    def test_read_denylist_of_missing_file(self):
+        self.assertEqual(read_denylist("no-such-file.txt"), [])
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from profiler import Profiler
+from main import instrument_services
+from services.expense_report_service import ExpenseReportService
+from repositories.expense_repository import ExpenseRepository
+from entities.user import User
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def increment(self):
+        self.value += 1
+        return self.value
+
+    def _reset(self):
+        self.value = 0
+
+
+class Widget:
+    def _register(self, function, subst=None, needcleanup=1):
+        return function
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.output_directory = tempfile.mkdtemp()
+        self.test_profiler = Profiler(self.output_directory)
+
+    def test_instrument_records_selected_methods(self):
+        self.test_profiler.instrument(
+            Counter, lambda name: not name.startswith("_"))
+        counter = Counter()
+
+        counter.increment()
+        counter.increment()
+        counter._reset()
+
+        timings = self.test_profiler.format_timings()
+
+        self.assertIn("Counter.increment", timings)
+        self.assertNotIn("Counter._reset", timings)
+
+    def test_instrumented_method_returns_value(self):
+        self.test_profiler.instrument(Counter, lambda name: name == "increment")
+
+        self.assertEqual(Counter().increment(), 1)
+
+    def test_instrument_tk_callbacks_records_selected_callbacks(self):
+        self.test_profiler.instrument_tk_callbacks(
+            lambda callback: callback.__name__ == "increment", Widget)
+        counter = Counter()
+
+        self.assertEqual(Widget()._register(counter.increment)(), 1)
+        Widget()._register(counter._reset)()
+
+        timings = self.test_profiler.format_timings()
+
+        self.assertIn("Counter.increment", timings)
+        self.assertNotIn("Counter._reset", timings)
+
+    def test_stop_writes_report_and_collapsed_stacks(self):
+        self.test_profiler.start()
+        sum(range(100000))
+        report_path, collapsed_path = self.test_profiler.stop()
+
+        self.assertTrue(os.path.exists(report_path))
+        self.assertTrue(os.path.exists(collapsed_path))
+
+    def test_report_is_sorted_by_cumulative_time(self):
+        self.test_profiler.start()
+        sum(range(1000))
+        self.test_profiler.stop()
+
+        self.assertIn("cumulative", self.test_profiler.format_profile())
+
+
+class TestInstrumentServices(unittest.TestCase):
+    def setUp(self):
+        self.test_profiler = Profiler(tempfile.mkdtemp())
+        self.methods = dict(vars(ExpenseReportService))
+
+    def tearDown(self):
+        for name, method in self.methods.items():
+            if callable(method):
+                setattr(ExpenseReportService, name, method)
+
+    def test_instrument_services_times_reports(self):
+        instrument_services(self.test_profiler)
+        report_service = ExpenseReportService(ExpenseRepository(), User("mark", "1234abc!"))
+
+        report_service.get_totals_by_period("month")
+
+        timings = self.test_profiler.format_timings()
+
+        self.assertIn("ExpenseReportService.get_totals_by_period", timings)
@@ -0,0 +1,68 @@
+import unittest
+from services.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.test_limiter = RateLimiter(
+            capacity=3, refill_seconds=30, max_keys=2, clock=self.clock)
+
+    def test_acquire_allows_burst_up_to_capacity(self):
+        results = [self.test_limiter.acquire("alice") for _ in range(3)]
+
+        self.assertEqual(results, [0, 0, 0])
+
+    def test_acquire_returns_wait_time_when_bucket_is_empty(self):
+        for _ in range(3):
+            self.test_limiter.acquire("alice")
+
+        self.assertAlmostEqual(self.test_limiter.acquire("alice"), 10)
+
+    def test_tokens_are_refilled_over_time(self):
+        for _ in range(3):
+            self.test_limiter.acquire("alice")
+
+        self.clock.now = 10
+
+        self.assertEqual(self.test_limiter.acquire("alice"), 0)
+        self.assertGreater(self.test_limiter.acquire("alice"), 0)
+
+    def test_keys_have_separate_buckets(self):
+        for _ in range(3):
+            self.test_limiter.acquire("alice")
+
+        self.assertEqual(self.test_limiter.acquire("bob"), 0)
+
+    def test_release_returns_token(self):
+        for _ in range(3):
+            self.test_limiter.acquire("alice")
+
+        self.test_limiter.release("alice")
+
+        self.assertEqual(self.test_limiter.acquire("alice"), 0)
+
+    def test_release_does_not_exceed_capacity(self):
+        self.test_limiter.release("alice")
+
+        results = [self.test_limiter.acquire("alice") for _ in range(4)]
+
+        self.assertGreater(results[3], 0)
+
+    def test_least_recently_used_bucket_is_dropped(self):
+        self.test_limiter.acquire("alice")
+        self.test_limiter.acquire("bob")
+        self.test_limiter.acquire("alice")
+        self.test_limiter.acquire("carol")
+
+        self.assertEqual(self.test_limiter.count_keys(), 2)
+        self.assertIn("alice", self.test_limiter._buckets)
+        self.assertNotIn("bob", self.test_limiter._buckets)
@@ -0,0 +1,116 @@
+import unittest
+from datetime import date
+from services.recurring_expense_service import (RecurringExpenseService,
+                                                RecurringExpenseScheduler, next_occurrence)
+from services.expense_service import ExpenseService, InvalidInputError
+from entities.user import User
+from entities.expense import Expense
+from repositories.expense_repository import ExpenseRepository
+from repositories.recurring_expense_repository import RecurringExpenseRepository
+
+test_expense_repository = ExpenseRepository()
+test_recurring_expense_repository = RecurringExpenseRepository()
+test_user = User("alice", "1234abcd!")
+
+
+class TestRecurringExpenseService(unittest.TestCase):
+    def setUp(self):
+        test_expense_repository.delete_all_expenses()
+        test_recurring_expense_repository.delete_all_rules()
+        self.today = date(2023, 4, 15)
+        self.test_recurring_expense_service = RecurringExpenseService(
+            test_recurring_expense_repository, test_user)
+        self.test_scheduler = RecurringExpenseScheduler(
+            test_recurring_expense_repository, lambda: self.today)
+        self.test_expense_service = ExpenseService(test_expense_repository, test_user)
+
+    def tearDown(self):
+        test_recurring_expense_repository.delete_all_rules()
+
+    def test_next_occurrence(self):
+        self.assertEqual(next_occurrence(date(2023, 4, 15), "daily"), date(2023, 4, 16))
+        self.assertEqual(next_occurrence(date(2023, 4, 15), "weekly", 2), date(2023, 4, 29))
+        self.assertEqual(next_occurrence(date(2023, 11, 30), "monthly", 3), date(2024, 2, 29))
+        self.assertEqual(next_occurrence(date(2023, 2, 28), "monthly", 1, 31), date(2023, 3, 31))
+        self.assertEqual(next_occurrence(date(2024, 2, 29), "yearly"), date(2025, 2, 28))
+
+    def test_catch_up_creates_all_missed_expenses(self):
+        self.test_recurring_expense_service.create_rule(
+            Expense("rent", 800, "2023-01-31", "housing"), "monthly")
+
+        created = self.test_scheduler.run_due()
+
+        self.assertEqual(created, 3)
+        self.assertEqual(self.test_expense_service.list_all_expenses(), [
+            ["rent", 800.0, "2023-03-31", "housing"],
+            ["rent", 800.0, "2023-02-28", "housing"],
+            ["rent", 800.0, "2023-01-31", "housing"],
+        ])
+        self.assertEqual(self.test_recurring_expense_service.list_rules()[0][8], "2023-04-30")
+
+    def test_run_due_creates_expenses_once(self):
+        self.test_recurring_expense_service.create_rule(
+            Expense("coffee", 3, "2023-04-14"), "daily")
+
+        self.test_scheduler.run_due()
+        created_again = self.test_scheduler.run_due()
+        self.today = date(2023, 4, 16)
+        created_next_day = self.test_scheduler.run_due()
+
+        self.assertEqual(created_again, 0)
+        self.assertEqual(created_next_day, 1)
+        self.assertEqual(len(self.test_expense_service.list_all_expenses()), 3)
+
+    def test_rule_ends_on_end_date(self):
+        self.test_recurring_expense_service.create_rule(
+            Expense("gym", 30, "2023-03-01"), "weekly", end_date="2023-03-20")
+
+        created = self.test_scheduler.run_due()
+
+        self.assertEqual(created, 3)
+        self.assertIsNone(self.test_recurring_expense_service.list_rules()[0][8])
+
+    def test_future_rule_is_not_due(self):
+        self.test_recurring_expense_service.create_rule(
+            Expense("insurance", 120, "2023-06-01"), "yearly")
+
+        self.assertEqual(self.test_scheduler.run_due(), 0)
+
+    def test_run_due_for_one_user(self):
+        self.test_recurring_expense_service.create_rule(
+            Expense("rent", 800, "2023-04-01"), "monthly")
+        RecurringExpenseService(test_recurring_expense_repository, User("bob", "5678efgh!")) \
+            .create_rule(Expense("rent", 700, "2023-04-01"), "monthly")
+
+        self.assertEqual(self.test_scheduler.run_due(test_user), 1)
+        self.assertEqual(self.test_scheduler.run_due(), 1)
+
+    def test_rule_changed_by_another_run_is_skipped(self):
+        self.test_recurring_expense_service.create_rule(
+            Expense("rent", 800, "2023-04-01"), "monthly")
+        due_rules = test_recurring_expense_repository.find_due_rules("2023-04-15")
+        self.test_scheduler.run_due()
+
+        added = test_recurring_expense_repository.add_due_expenses(
+            [(due_rules[0], ["2023-04-01"], "2023-05-01")])
+
+        self.assertEqual(added, 0)
+        self.assertEqual(len(self.test_expense_service.list_all_expenses()), 1)
+
+    def test_delete_rule(self):
+        rule_id = self.test_recurring_expense_service.create_rule(
+            Expense("rent", 800, "2023-04-01"), "monthly")
+
+        self.assertTrue(self.test_recurring_expense_service.delete_rule(rule_id))
+        self.assertFalse(self.test_recurring_expense_service.delete_rule(rule_id))
+        self.assertEqual(self.test_scheduler.run_due(), 0)
+
+    def test_create_invalid_rule(self):
+        for arguments in [(Expense("rent", "-1", None), "monthly"),
+                          (Expense("rent", 800, None), "hourly"),
+                          (Expense("rent", 800, "2023-02-30"), "monthly"),
+                          (Expense("rent", 800, "2023-04-01", "housing"), "monthly", 0),
+                          (Expense("rent", 800, "2023-04-01", "housing"), "monthly", 1,
+                           "2023-03-01")]:
+            with self.assertRaises(InvalidInputError):
+                self.test_recurring_expense_service.create_rule(*arguments)
@@ -0,0 +1,66 @@
+import unittest
+from services.session_registry import SessionRegistry
+from entities.user import User
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSessionRegistry(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.test_registry = SessionRegistry(timeout=10, clock=self.clock)
+        self.test_user = User("alice", "1234abc!")
+
+    def test_create_session_can_be_found(self):
+        session = self.test_registry.create_session(self.test_user)
+
+        found = self.test_registry.find_session(session.session_id)
+
+        self.assertEqual(found.user.username, "alice")
+
+    def test_sessions_have_unique_ids(self):
+        first = self.test_registry.create_session(self.test_user)
+        second = self.test_registry.create_session(self.test_user)
+
+        self.assertNotEqual(first.session_id, second.session_id)
+
+    def test_find_session_returns_None_if_not_exists(self):
+        self.assertEqual(self.test_registry.find_session("unknown"), None)
+
+    def test_session_expires_after_timeout(self):
+        session = self.test_registry.create_session(self.test_user)
+
+        self.clock.now = 10
+
+        self.assertEqual(self.test_registry.find_session(session.session_id), None)
+
+    def test_using_session_extends_expiry(self):
+        session = self.test_registry.create_session(self.test_user)
+
+        self.clock.now = 8
+        self.test_registry.find_session(session.session_id)
+        self.clock.now = 16
+
+        self.assertNotEqual(self.test_registry.find_session(session.session_id), None)
+
+    def test_end_session(self):
+        session = self.test_registry.create_session(self.test_user)
+
+        self.test_registry.end_session(session.session_id)
+
+        self.assertEqual(self.test_registry.find_session(session.session_id), None)
+
+    def test_expired_sessions_are_removed_when_creating_sessions(self):
+        self.test_registry.create_session(self.test_user)
+        self.test_registry.create_session(self.test_user)
+
+        self.clock.now = 20
+        self.test_registry.create_session(self.test_user)
+
+        self.assertEqual(self.test_registry.count_sessions(), 1)
@@ -0,0 +1,146 @@
+import unittest
+from services.tag_service import TagService
+from services.expense_service import ExpenseService, InvalidInputError
+from services.expense_exporter import ExpenseExporter
+from entities.user import User
+from entities.expense import Expense
+from entities.category import Category
+from repositories.tag_repository import TagRepository
+from repositories.expense_repository import ExpenseRepository
+
+test_tag_repository = TagRepository()
+test_expense_repository = ExpenseRepository()
+test_user = User("alice", "1234abcd!")
+other_user = User("bob", "1234abcd!")
+
+
+class TestTagService(unittest.TestCase):
+    def setUp(self):
+        test_expense_repository.delete_all_expenses()
+        self.test_tag_service = TagService(test_tag_repository, test_user)
+        self.test_expense_service = ExpenseService(test_expense_repository, test_user)
+
+        self.test_expense_service.create_new_expenses([
+            ("hotel", 120, "2023-04-15", "accommodation"),
+            ("train", 40, "2023-04-16", "transport"),
+            ("lunch", 12.5, "2023-04-16", "food"),
+            ("groceries", 30, "2023-04-17", "food"),
+        ])
+        self.ids = self.expense_ids(self.test_expense_service)
+
+    def expense_ids(self, expense_service):
+        exporter = ExpenseExporter(test_expense_repository, expense_service.current_user)
+        changes, _ = exporter.get_changes()
+        return {name: expense_id for _, _, expense_id, name, *_ in changes}
+
+    def test_tag_expenses_in_bulk(self):
+        tagged = self.test_tag_service.tag_expenses(
+            [self.ids["hotel"], self.ids["train"]], ["work", "travel"])
+
+        self.assertEqual(tagged, 4)
+        self.assertEqual(self.test_tag_service.list_all_tags(), ["travel", "work"])
+        self.assertEqual(self.test_tag_service.get_expense_tags(self.ids.values()),
+                         {self.ids["hotel"]: ["travel", "work"],
+                          self.ids["train"]: ["travel", "work"]})
+
+    def test_tagging_again_attaches_only_new_tags(self):
+        self.test_tag_service.tag_expenses([self.ids["hotel"]], ["work"])
+
+        tagged = self.test_tag_service.tag_expenses(
+            [self.ids["hotel"], self.ids["train"]], ["work", " work "])
+
+        self.assertEqual(tagged, 1)
+
+    def test_untag_expenses(self):
+        self.test_tag_service.tag_expenses(
+            [self.ids["hotel"], self.ids["train"]], ["work", "travel"])
+
+        untagged = self.test_tag_service.untag_expenses([self.ids["train"]], ["work"])
+
+        self.assertEqual(untagged, 1)
+        self.assertEqual(self.test_tag_service.get_expense_tags([self.ids["train"]]),
+                         {self.ids["train"]: ["travel"]})
+
+    def test_list_expenses_with_all_or_any_tags(self):
+        self.test_tag_service.tag_expenses(
+            [self.ids["hotel"], self.ids["train"]], ["travel"])
+        self.test_tag_service.tag_expenses(
+            [self.ids["train"], self.ids["lunch"]], ["work"])
+
+        self.assertEqual(
+            self.test_tag_service.list_expenses_with_tags(["travel", "work"]),
+            [["train", 40, "2023-04-16", "transport"]])
+        self.assertEqual(
+            self.test_tag_service.list_expenses_with_tags(["travel", "work"], "any"),
+            [["train", 40, "2023-04-16", "transport"], ["lunch", 12.5, "2023-04-16", "food"],
+             ["hotel", 120, "2023-04-15", "accommodation"]])
+        self.assertEqual(
+            self.test_tag_service.list_expenses_with_tags(["work"], "any", Category("food")),
+            [["lunch", 12.5, "2023-04-16", "food"]])
+
+    def test_list_expenses_with_all_tags_requires_unknown_tags_too(self):
+        self.test_tag_service.tag_expenses([self.ids["hotel"]], ["travel"])
+
+        self.assertEqual(
+            self.test_tag_service.list_expenses_with_tags(["travel", "holiday"]), [])
+
+    def test_list_expenses_with_unknown_match(self):
+        with self.assertRaises(InvalidInputError):
+            self.test_tag_service.list_expenses_with_tags(["travel"], "some")
+
+    def test_empty_tag_name(self):
+        with self.assertRaises(InvalidInputError):
+            self.test_tag_service.tag_expenses([self.ids["hotel"]], [" "])
+
+    def test_totals_by_tag(self):
+        self.test_tag_service.tag_expenses(
+            [self.ids["hotel"], self.ids["train"]], ["travel"])
+        self.test_tag_service.tag_expenses(
+            [self.ids["train"], self.ids["lunch"]], ["work"])
+
+        self.assertEqual(self.test_tag_service.get_totals_by_tag(),
+                         [("travel", 160, 2), ("work", 52.5, 2)])
+
+    def test_other_users_expenses_are_not_tagged(self):
+        other_expense_service = ExpenseService(test_expense_repository, other_user)
+        other_expense_service.create_new_expense("taxi", 25, "2023-04-16", "transport")
+        other_ids = self.expense_ids(other_expense_service)
+
+        tagged = self.test_tag_service.tag_expenses([other_ids["taxi"]], ["travel"])
+
+        self.assertEqual(tagged, 0)
+        self.assertEqual(TagService(test_tag_repository, other_user).list_all_tags(), [])
+
+    def test_edited_expense_keeps_its_tags(self):
+        self.test_tag_service.tag_expenses([self.ids["hotel"]], ["work", "travel"])
+
+        self.test_expense_service.edit_expense_amount(
+            "150", Expense("hotel", 120, "2023-04-15", "accommodation"))
+
+        self.assertEqual(
+            self.test_tag_service.list_expenses_with_tags(["work", "travel"]),
+            [["hotel", 150, "2023-04-15", "accommodation"]])
+
+    def test_deleted_expense_loses_its_tags(self):
+        self.test_tag_service.tag_expenses([self.ids["hotel"]], ["travel"])
+
+        self.test_expense_service.delete_expense(
+            Expense("hotel", 120, "2023-04-15", "accommodation"))
+
+        self.assertEqual(self.test_tag_service.get_totals_by_tag(), [])
+        self.assertEqual(self.test_tag_service.list_all_tags(), [])
+
+    def test_undone_deletion_restores_tags(self):
+        self.test_tag_service.tag_expenses([self.ids["hotel"], self.ids["train"]], ["travel"])
+        self.test_expense_service.delete_expenses([self.ids["hotel"], self.ids["train"]])
+
+        self.test_expense_service.undo()
+
+        self.assertEqual(self.test_tag_service.get_totals_by_tag(), [("travel", 160, 2)])
+
+    def test_delete_tag(self):
+        self.test_tag_service.tag_expenses([self.ids["hotel"]], ["travel"])
+
+        self.assertTrue(self.test_tag_service.delete_tag("travel"))
+        self.assertFalse(self.test_tag_service.delete_tag("travel"))
+        self.assertEqual(self.test_tag_service.get_expense_tags([self.ids["hotel"]]), {})
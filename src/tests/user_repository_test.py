@@ -5,6 +5,14 @@ from entities.user import User
 test_repository = UserRepository()
 
 
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
 class TestUserRepository(unittest.TestCase):
     def setUp(self):
         test_repository.delete_all_users()
@@ -60,3 +68,66 @@ class TestUserRepository(unittest.TestCase):
         found = test_repository.find_user("mark")
 
         self.assertEqual(found, None)
+
+    def test_add_users(self):
+        taken = test_repository.add_users(
+            [self.test_user, User("another", "test1234!")])
+
+        self.assertEqual(taken, [])
+        self.assertEqual(len(test_repository.find_all_users()), 2)
+
+    def test_add_users_returns_taken_usernames(self):
+        test_repository.add_user(self.test_user)
+
+        taken = test_repository.add_users(
+            [User("mark", "other123!"), User("anna", "test1234!"), User("anna", "dupl123!")])
+
+        self.assertEqual(taken, ["mark", "anna"])
+        self.assertEqual(test_repository.find_user("mark")["password"], "1234abc!")
+        self.assertEqual(test_repository.find_user("anna")["password"], "test1234!")
+
+    def test_find_user_is_cached(self):
+        test_repository.add_user(self.test_user)
+        test_repository.find_user("mark")
+
+        # Changed behind the repository's back, so only the cache still has the old password
+        test_repository._connection.execute(
+            "update users set password='changed' where username='mark'")
+
+        self.assertEqual(test_repository.find_user("mark")["password"], "1234abc!")
+
+    def test_cached_user_expires(self):
+        clock = FakeClock()
+        cached_repository = UserRepository(cache_ttl=10, clock=clock)
+        cached_repository.add_user(self.test_user)
+        cached_repository.find_user("mark")
+        cached_repository._connection.execute(
+            "update users set password='changed' where username='mark'")
+
+        clock.now = 10
+
+        self.assertEqual(cached_repository.find_user("mark")["password"], "changed")
+
+    def test_cache_is_bounded(self):
+        cached_repository = UserRepository(cache_size=2)
+        for username in ["mark", "anna", "john"]:
+            cached_repository.add_user(User(username, "1234abc!"))
+            cached_repository.find_user(username)
+
+        self.assertEqual(list(cached_repository._cache), ["anna", "john"])
+
+    def test_delete_user_invalidates_cache(self):
+        test_repository.add_user(self.test_user)
+        test_repository.find_user("mark")
+
+        test_repository.delete_user("mark")
+
+        self.assertEqual(test_repository.find_user("mark"), None)
+
+    def test_update_password_invalidates_cache(self):
+        test_repository.add_user(self.test_user)
+        test_repository.find_user("mark")
+
+        test_repository.update_password("mark", "new1234!")
+
+        self.assertEqual(test_repository.find_user("mark")["password"], "new1234!")
@@ -17,9 +17,11 @@ class CreateAccountView:
         self._handle_login = handle_login
         self._frame = None
         self._style = None
+        self._pending_wait = None
 
         self._username_entry = None
         self._password_entry = None
+        self._create_account_button = None
 
         self._initialize()
 
@@ -40,9 +42,9 @@ class CreateAccountView:
             master=self._frame, text="Choose a password", background="#AFE4DE")
         self._password_entry = ttk.Entry(master=self._frame)
         password_info_label = ttk.Label(
-            master=self._frame, text="""Your password must be at least 8 characters long and contain at least 1 number and 1 special character""", background="#AFE4DE")
+            master=self._frame, text=login_service.password_policy.describe(), background="#AFE4DE")
 
-        create_account_and_continue_button = ttk.Button(
+        self._create_account_button = ttk.Button(
             master=self._frame, text="Create account and continue to login", command=self._handle_create_account_and_continue_to_login_button_click)
         return_to_login_button = ttk.Button(
             master=self._frame, text="Return to Login", command=self._handle_login)
@@ -60,7 +62,7 @@ class CreateAccountView:
         password_info_label.grid(
             column=1, columnspan=2, sticky=(constants.N), padx=5, pady=5)
 
-        create_account_and_continue_button.grid(
+        self._create_account_button.grid(
             columnspan=2, sticky=(constants.E, constants.W), padx=5, pady=5)
         return_to_login_button.grid(columnspan=2, sticky=(
             constants.E, constants.W), padx=5, pady=5)
@@ -76,6 +78,8 @@ class CreateAccountView:
     def destroy(self):
         """Destroys the create account view
         """
+        if self._pending_wait:
+            self._root.after_cancel(self._pending_wait)
         self._frame.destroy()
 
     def _handle_create_account_and_continue_to_login_button_click(self):
@@ -83,15 +87,30 @@ class CreateAccountView:
         password_value = self._password_entry.get()
 
         if username_value and password_value:
-            try:
-                login_service.create_new_user(username_value, password_value)
-                self._handle_login()
-            except IncorrectPasswordFormatError:
-                self._display_error_message("Incorrect password format")
-
-            except UsernameNotUniqueError:
-                self._display_error_message(
-                    "User with this username exists already")
+            self._create_account_button.state(["disabled"])
+            creation = login_service.create_new_user_async(
+                username_value, password_value)
+            self._wait_for_account_creation(creation)
+
+    def _wait_for_account_creation(self, creation):
+        # Hashing the password runs in a worker thread, so the window stays responsive.
+        # The result is requested here, so the database is only used from the UI thread.
+        # The view may be left meanwhile, in which case destroy cancels the next check
+        self._pending_wait = None
+        if not creation.done():
+            self._pending_wait = self._root.after(20, self._wait_for_account_creation, creation)
+            return
+
+        self._create_account_button.state(["!disabled"])
+        try:
+            creation.result()
+            self._handle_login()
+        except IncorrectPasswordFormatError as error:
+            self._display_error_message(str(error))
+
+        except UsernameNotUniqueError:
+            self._display_error_message(
+                "User with this username exists already")
 
     def _display_error_message(self, message):
         messagebox.showerror("Error", message)
@@ -1,19 +1,29 @@
 from tkinter import ttk, constants, OptionMenu, StringVar, messagebox
-from services.login_service import login_service
-from repositories.expense_repository import ExpenseRepository
-from services.expense_service import ExpenseService, InvalidInputError
+from services.expense_service import InvalidInputError
+from services.budget_service import UNDER_BUDGET
+from services.recurring_expense_service import FREQUENCIES
+from services.currency_converter import MissingExchangeRateError, currency_symbol
+from entities.category import Category
+from entities.expense import Expense
+
+NO_REPEAT = "does not repeat"
 
 
 class ExpenseCreationView:
     """This class manages the UI view, where a user can create new expenses
     """
 
-    def __init__(self, root, handle_expense_tracker, handle_expense_overview):
+    def __init__(self, root, expense_service, handle_expense_tracker, handle_expense_overview,
+                 budget_service=None, recurring_expense_service=None, recurring_expense_scheduler=None):
         """Class constructor, creates the expense creation view
 
         Args:
             root (Tkinter frame): The Tkinter frame within which the login view resides
+            expense_service (ExpenseService object): Manages the expenses of the logged-in user
             handle_expense_tracker: Callable value, called when the user chooses to return to the home screen
+            budget_service (BudgetService object, optional): Checks the budget of the category of each new expense
+            recurring_expense_service (RecurringExpenseService object, optional): Creates rules for repeating expenses
+            recurring_expense_scheduler (RecurringExpenseScheduler object, optional): Creates the due expenses of new rules
         """
         self._root = root
         self._handle_return_to_homescreen = handle_expense_tracker
@@ -22,14 +32,18 @@ class ExpenseCreationView:
         self._frame = None
         self._style = None
 
-        self.user = login_service.find_logged_in_user()
-        self.expense_service = ExpenseService(ExpenseRepository(), self.user)
+        self.expense_service = expense_service
+        self.budget_service = budget_service
+        self.recurring_expense_service = recurring_expense_service
+        self.recurring_expense_scheduler = recurring_expense_scheduler
 
         self._expense_name = None
         self._expense_amount = None
         self._expense_date = None
         self._expense_category = None
         self._selected_category = None
+        self._selected_frequency = None
+        self._selected_currency = None
 
         self._initialize()
 
@@ -108,6 +122,7 @@ class ExpenseCreationView:
         expense_amount_label.grid(row=5, padx=5, pady=5)
         self._expense_amount.grid(row=5, column=1, sticky=(
             constants.E, constants.W), padx=5, pady=5)
+        self._initialize_currency_dropdown()
 
         expense_date_label.grid(padx=5, pady=5)
         self._expense_date.grid(row=6, column=1, sticky=(
@@ -116,7 +131,34 @@ class ExpenseCreationView:
         expense_category_label.grid(padx=5, pady=5)
         self._add_expense_category()
 
-        create_expense_button.grid(column=1, sticky=(
+        if self.recurring_expense_service:
+            self._initialize_repeat_dropdown()
+
+        create_expense_button.grid(row=10, column=1, sticky=(
+            constants.E, constants.W), padx=5, pady=5)
+
+    def _initialize_currency_dropdown(self):
+        currencies = self.expense_service.currency_converter.list_currencies()
+        self._selected_currency = StringVar()
+        self._selected_currency.set(currencies[0])
+
+        if len(currencies) > 1:
+            currency_dropdown = OptionMenu(
+                self._frame, self._selected_currency, *currencies)
+            currency_dropdown.grid(row=5, column=2, sticky=(
+                constants.E, constants.W), padx=5, pady=5)
+
+    def _initialize_repeat_dropdown(self):
+        repeat_label = ttk.Label(
+            master=self._frame, text="Repeats (from the date onwards)", background="#AFE4DE")
+
+        self._selected_frequency = StringVar()
+        self._selected_frequency.set(NO_REPEAT)
+        repeat_dropdown = OptionMenu(
+            self._frame, self._selected_frequency, NO_REPEAT, *FREQUENCIES)
+
+        repeat_label.grid(row=9, padx=5, pady=5)
+        repeat_dropdown.grid(row=9, column=1, sticky=(
             constants.E, constants.W), padx=5, pady=5)
 
     def _add_expense_category(self):
@@ -149,19 +191,51 @@ class ExpenseCreationView:
 
         if expense_name and expense_amount:
             try:
-                self.expense_service.create_new_expense(
-                    expense_name, expense_amount, expense_date, expense_category)
+                frequency = self._selected_frequency.get() if self._selected_frequency else NO_REPEAT
+                currency = self.expense_service.currency_converter.normalize_currency(
+                    self._selected_currency.get())
+                if frequency == NO_REPEAT:
+                    self.expense_service.create_new_expense(
+                        expense_name, expense_amount, expense_date, expense_category, currency)
+                elif currency:
+                    self._display_error_message(
+                        "Recurring expenses are in the base currency, choose it to create one")
+                    return
+                else:
+                    self.recurring_expense_service.create_rule(
+                        Expense(expense_name, expense_amount, expense_date, expense_category),
+                        frequency)
+                    self.recurring_expense_scheduler.run_due(
+                        self.recurring_expense_service.current_user)
+                self._check_budget(expense_category, expense_date)
 
                 self._expense_name.delete(0, constants.END)
                 self._expense_amount.delete(0, constants.END)
                 self._expense_date.delete(0, constants.END)
                 self._expense_category.delete(0, constants.END)
                 self._selected_category.set("undefined")
+                self._selected_currency.set(
+                    self.expense_service.currency_converter.base_currency)
+                if self._selected_frequency:
+                    self._selected_frequency.set(NO_REPEAT)
                 self._add_expense_category()
 
             except InvalidInputError:
                 self._display_error_message(
                     "Invalid input. Make sure you have entered a nonnegative numeric amount and a valid date in YYYY-MM-DD format")
+            except MissingExchangeRateError as error:
+                self._display_error_message(str(error))
+
+    def _check_budget(self, category_name, expense_date):
+        if not self.budget_service:
+            return
+
+        budget = self.budget_service.check_budget(
+            Category(category_name or "undefined"), expense_date)
+        if budget and budget[3] != UNDER_BUDGET:
+            category, amount, spent, _ = budget
+            messagebox.showwarning(
+                "Budget", f"You have spent {spent} {currency_symbol()} of your {amount} {currency_symbol()} budget for the {category} category this month")
 
     def _display_error_message(self, message):
         messagebox.showerror("Error", message)
@@ -1,9 +1,7 @@
 from tkinter import ttk, constants, StringVar, OptionMenu
 from matplotlib import pyplot
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from services.login_service import login_service
-from repositories.expense_repository import ExpenseRepository
-from services.expense_service import ExpenseService
+from services.expense_report_service import ExpenseReportService
 from entities.category import Category
 
 
@@ -11,22 +9,30 @@ class ExpenseGraph:
     """This class manages the UI view where users can view graphs of their entered expenses
     """
 
-    def __init__(self, root, expense_tracker_homescreen, expense_overview):
+    def __init__(self, root, expense_service, expense_tracker_homescreen, expense_overview,
+                 forecast_service=None, report_service=None):
         """Class constructor, creates the 'expense graph' view
 
         Args:
             root (Tkinter frame): The Tkinter frame within which the login view resides
+            expense_service (ExpenseService object): Manages the expenses of the logged-in user
             expense_tracker_homescreen: Callable value, called when the user chooses to return to the home screen of the expense tracker
+            forecast_service (ForecastService object, optional): Projects the logged-in user's
+                                                                spending in the next month
+            report_service (ExpenseReportService object, optional): Plots the expenses of the
+                                                                logged-in user
         """
         self._root = root
         self._return_to_homescreen = expense_tracker_homescreen
         self._view_edit_expenses = expense_overview
+        self._forecast_service = forecast_service
 
         self._frame = None
         self._style = None
 
-        self.user = login_service.find_logged_in_user()
-        self.expense_service = ExpenseService(ExpenseRepository(), self.user)
+        self.expense_service = expense_service
+        self.report_service = report_service or ExpenseReportService(
+            expense_service.expense_repository, expense_service.current_user)
 
         self._selected_category = None
 
@@ -93,6 +99,16 @@ class ExpenseGraph:
             master=self._frame, text="View graph for all expenses", command=self._display_expense_graph)
         show_all_expenses.grid(row=1, padx=5, pady=5)
 
+        show_year_over_year = ttk.Button(
+            master=self._frame, text="Compare years by month", command=self._display_year_over_year_graph)
+        show_year_over_year.grid(row=1, column=1, padx=5, pady=5)
+
+        if self._forecast_service:
+            show_forecast = ttk.Button(
+                master=self._frame, text="Forecast next month (for the chosen category)",
+                command=self._display_forecast_graph)
+            show_forecast.grid(row=1, column=2, padx=5, pady=5)
+
         choose_category_label = ttk.Label(
             master=self._frame, text="Choose category to view as graph", background="#AFE4DE")
         choose_category_label.grid(row=2, padx=5, pady=5)
@@ -113,7 +129,30 @@ class ExpenseGraph:
         if self._graph_canvas:
             self._graph_canvas.get_tk_widget().destroy()
 
-        expense_plot = self.expense_service.graph_all_expenses().get_figure()
+        expense_plot = self.report_service.graph_all_expenses().get_figure()
+
+        self._graph_canvas = FigureCanvasTkAgg(expense_plot, self._frame)
+
+        self._graph_canvas.get_tk_widget().grid(row=3, column=1)
+
+    def _display_year_over_year_graph(self):
+        if self._graph_canvas:
+            self._graph_canvas.get_tk_widget().destroy()
+
+        expense_plot = self.report_service.graph_year_over_year().get_figure()
+
+        self._graph_canvas = FigureCanvasTkAgg(expense_plot, self._frame)
+
+        self._graph_canvas.get_tk_widget().grid(row=3, column=1)
+
+    def _display_forecast_graph(self):
+        if self._graph_canvas:
+            self._graph_canvas.get_tk_widget().destroy()
+
+        selected_category = self._selected_category.get()
+        category = Category(selected_category) if selected_category else None
+
+        expense_plot = self._forecast_service.graph_forecast(category).get_figure()
 
         self._graph_canvas = FigureCanvasTkAgg(expense_plot, self._frame)
 
@@ -130,7 +169,7 @@ class ExpenseGraph:
             expense_list = self.expense_service.list_expenses_by_category(
                 category)
             if expense_list:
-                expense_plot = self.expense_service.graph_expenses_by_category(
+                expense_plot = self.report_service.graph_expenses_by_category(
                     category).get_figure()
 
                 self._graph_canvas = FigureCanvasTkAgg(
@@ -1,23 +1,39 @@
 from tkinter import ttk, constants, OptionMenu, StringVar, messagebox, END, VERTICAL
-from services.login_service import login_service
-from repositories.expense_repository import ExpenseRepository
-from services.expense_service import ExpenseService, InvalidInputError
+from services.expense_service import InvalidInputError
+from services.expense_report_service import ExpenseReportService
+from services.expense_search_service import ExpenseSearchService
+from repositories.expense_search_repository import ExpenseSearchRepository
+from services.budget_service import NEAR_BUDGET, OVER_BUDGET
+from services.currency_converter import MissingExchangeRateError, currency_symbol
 from entities.category import Category
 from entities.expense import Expense
 
+# Milliseconds to wait after the last keystroke before searching
+SEARCH_DELAY = 200
+SEARCH_RESULT_LIMIT = 100
+# Tag of the expense table rows with unusual amounts for their category
+ANOMALY_TAG = "anomaly"
+
 
 class ExpenseOverview:
     """This class manages the UI view of the expense tracker, where the user can view tables of their
     entered expenses, and edit their expenses and categories
     """
 
-    def __init__(self, root, expense_tracker, expense_graph, expense_creation, expense_overview):
+    def __init__(self, root, expense_service, expense_tracker, expense_graph, expense_creation, expense_overview,
+                 budget_service=None, anomaly_service=None, report_service=None):
         """Class constructor, creates the 'expense overview' view
 
         Args:
             root (Tkinter frame): The Tkinter frame within which the login view resides
+            expense_service (ExpenseService object): Manages the expenses of the logged-in user
             expense_tracker: Callable value, called when the user chooses to return to the expense tracker home screen
             expense_graph: Callable value, called when the user clicks the "View Expenses as Graph" button
+            budget_service (BudgetService object, optional): Manages the budgets of the logged-in user
+            anomaly_service (AnomalyService object, optional): Finds the logged-in user's expenses
+                                                                with unusual amounts, which are highlighted
+            report_service (ExpenseReportService object, optional): Sums up the expenses of the
+                                                                logged-in user for the totals shown
         """
         self._root = root
         self._handle_return_to_homescreen = expense_tracker
@@ -28,8 +44,11 @@ class ExpenseOverview:
         self._frame = None
         self._style = None
 
-        self.user = login_service.find_logged_in_user()
-        self.expense_service = ExpenseService(ExpenseRepository(), self.user)
+        self.expense_service = expense_service
+        self.report_service = report_service or ExpenseReportService(
+            expense_service.expense_repository, expense_service.current_user)
+        self.search_service = ExpenseSearchService(
+            ExpenseSearchRepository(), expense_service.current_user)
 
         self._expense_name = None
         self._expense_amount = None
@@ -39,6 +58,7 @@ class ExpenseOverview:
         self._selected_category = None
         self._selected_table_category = None
         self._expense_table = None
+        self._shown_category = None
 
         self._display_total = None
         self._display_category_total = None
@@ -50,6 +70,16 @@ class ExpenseOverview:
         self._category_user_change = None
         self._edit_categories_dropdown = None
 
+        self._search_query = None
+        self._pending_search = None
+
+        self.budget_service = budget_service
+        self._budget_table = None
+        self._selected_budget_category = None
+        self._budget_amount_input = None
+
+        self.anomaly_service = anomaly_service
+
         self._initialize()
 
     def configure(self):
@@ -61,6 +91,8 @@ class ExpenseOverview:
     def destroy(self):
         """Destroys the expense overview view
         """
+        if self._pending_search:
+            self._root.after_cancel(self._pending_search)
         self._frame.destroy()
 
     def _initialize(self):
@@ -117,9 +149,9 @@ class ExpenseOverview:
         self._initialize_view_expense_tables()
 
     def _initialize_view_expense_total(self):
-        total = self.expense_service.get_total_all_expenses_by_user()
+        total = self.report_service.get_total_all_expenses_by_user()
         self._display_total = ttk.Label(
-            master=self._frame, text=f"Total amount spent: {total} €", background="#AFE4DE")
+            master=self._frame, text=f"Total amount spent: {total} {currency_symbol()}", background="#AFE4DE")
 
         self._display_total.grid(row=1, sticky=(
             constants.W), padx=5, pady=5)
@@ -127,9 +159,9 @@ class ExpenseOverview:
     def _initialize_view_category_total(self, category):
         if self._display_total:
             self._display_total.destroy()
-        total = self.expense_service.get_total_by_category_and_user(category)
+        total = self.report_service.get_total_by_category_and_user(category)
         self._display_category_total = ttk.Label(
-            master=self._frame, text=f"Total spending in the {category.name} category: {total} €", background="#AFE4DE")
+            master=self._frame, text=f"Total spending in the {category.name} category: {total} {currency_symbol()}", background="#AFE4DE")
 
         self._display_category_total.grid(row=1,
                                           sticky=(constants.W), padx=5, pady=5)
@@ -144,6 +176,8 @@ class ExpenseOverview:
             constants.W))
         table_view_by_category_button.grid(row=2, column=1, padx=5, pady=5)
 
+        self._initialize_search_box()
+
         self._get_expense_table()
         self._get_category_dropdown()
 
@@ -153,6 +187,7 @@ class ExpenseOverview:
             self._root.geometry("+105+105")
             self._initialize_edit_expenses()
             self._initialize_edit_categories()
+            self._initialize_budgets()
         else:
             self._initialize_window_size()
 
@@ -164,18 +199,19 @@ class ExpenseOverview:
             self._display_category_total.destroy()
 
         self._initialize_view_expense_total()
+        self._display_budgets()
 
-        expense_list = self.expense_service.list_all_expenses()
+        self._shown_category = None
+        expense_list = self.expense_service.list_all_expenses(with_ids=True)
 
         if expense_list:
             column_names = ["Expense Name", "Amount", "Date", "Category"]
             self._expense_table = ttk.Treeview(
-                master=self._frame, columns=column_names, show="headings", selectmode="browse")
+                master=self._frame, columns=column_names, show="headings", selectmode="extended")
             self._style.configure("Treeview.Heading", background="#AFE4DE")
             for column in column_names:
                 self._expense_table.heading(column, text=column)
-            for expense in expense_list:
-                self._expense_table.insert("", END, values=expense)
+            self._insert_expense_rows(expense_list)
             self._expense_table.grid(
                 row=4, columnspan=2, sticky=(constants.NSEW), padx=5, pady=5)
             self._insert_table_scrollbar(self._expense_table)
@@ -185,6 +221,39 @@ class ExpenseOverview:
                 master=self._frame, text="You do not currently have any recorded expenses", background="#AFE4DE")
             note.grid(row=4, padx=5, pady=5, sticky=(constants.NSEW))
 
+    def _initialize_search_box(self):
+        search_label = ttk.Label(
+            master=self._frame, text="Search expenses", background="#AFE4DE")
+        self._search_query = StringVar()
+        self._search_query.trace_add("write", self._handle_search_change)
+        search_entry = ttk.Entry(
+            master=self._frame, textvariable=self._search_query)
+
+        search_label.grid(row=2, column=2, padx=5, pady=5, sticky=(constants.E))
+        search_entry.grid(row=2, column=3, padx=5, pady=5, sticky=(
+            constants.E, constants.W))
+
+    def _handle_search_change(self, *args):
+        # Searching waits for a pause in typing, so that only the last query is run
+        if self._pending_search:
+            self._root.after_cancel(self._pending_search)
+        self._pending_search = self._root.after(
+            SEARCH_DELAY, self._display_search_results)
+
+    def _display_search_results(self):
+        self._pending_search = None
+        query = self._search_query.get().strip()
+
+        if not query:
+            self._get_expense_table()
+            return
+
+        if self._expense_table:
+            self._delete_table()
+            self._shown_category = None
+            self._insert_expense_rows(
+                self.search_service.search_expenses(query, SEARCH_RESULT_LIMIT, with_ids=True))
+
     def _get_expense_category_table(self):
         if self._expense_table:
             self._delete_table()
@@ -195,8 +264,9 @@ class ExpenseOverview:
         category = self._selected_table_category.get()
 
         if category:
+            self._shown_category = category
             expense_list = self.expense_service.list_expenses_by_category(
-                Category(category))
+                Category(category), with_ids=True)
 
             self._initialize_view_category_total(Category(category))
 
@@ -204,13 +274,12 @@ class ExpenseOverview:
 
                 column_names = ["Expense Name", "Amount", "Date", "Category"]
                 self._expense_table = ttk.Treeview(
-                    master=self._frame, columns=column_names, show="headings", selectmode="browse")
+                    master=self._frame, columns=column_names, show="headings", selectmode="extended")
                 self._style.configure("Treeview.Heading", background="#AFE4DE")
 
                 for column in column_names:
                     self._expense_table.heading(column, text=column)
-                for expense in expense_list:
-                    self._expense_table.insert("", END, values=expense)
+                self._insert_expense_rows(expense_list)
                 self._expense_table.grid(
                     row=4, columnspan=2, sticky=constants.NSEW, padx=5, pady=5)
 
@@ -221,6 +290,52 @@ class ExpenseOverview:
                     master=self._frame, text="You do not currently have any recorded expenses", background="#AFE4DE")
                 note.grid(row=4, padx=5, pady=5)
 
+    def _insert_expense_rows(self, expense_list):
+        # The id of each expense is the id of its row, so that selected rows
+        # can be edited and patched by their ids
+        self._expense_table.tag_configure(ANOMALY_TAG, background="#F4A6A6")
+        flags = self._flag_expenses([expense[1:] for expense in expense_list])
+
+        for expense, flagged in zip(expense_list, flags):
+            self._expense_table.insert(
+                "", END, iid=expense[0], values=expense[1:],
+                tags=(ANOMALY_TAG,) if flagged else ())
+
+    def _flag_expenses(self, expense_list):
+        if self.anomaly_service:
+            return self.anomaly_service.flag_expenses(expense_list)
+        return [False] * len(expense_list)
+
+    def _patch_expense_rows(self, row_ids):
+        # Only the edited rows are read again and updated in the table, and the
+        # ones that no longer belong to the shown category are removed from it
+        found = self.expense_service.find_expenses_by_ids(row_ids)
+        kept = []
+        for row_id in row_ids:
+            expense = found.get(int(row_id))
+            if expense is None or self._shown_category not in (None, expense[3]):
+                self._expense_table.delete(row_id)
+            else:
+                kept.append((row_id, expense))
+
+        flags = self._flag_expenses([expense for _, expense in kept])
+        for (row_id, expense), flagged in zip(kept, flags):
+            self._expense_table.item(
+                row_id, values=expense, tags=(ANOMALY_TAG,) if flagged else ())
+
+        self._refresh_totals()
+
+    def _refresh_totals(self):
+        if self._shown_category:
+            if self._display_category_total:
+                self._display_category_total.destroy()
+            self._initialize_view_category_total(Category(self._shown_category))
+        else:
+            if self._display_total:
+                self._display_total.destroy()
+            self._initialize_view_expense_total()
+        self._display_budgets()
+
     def _delete_table(self):
         for element in self._expense_table.get_children():
             self._expense_table.delete(element)
@@ -244,7 +359,7 @@ class ExpenseOverview:
         edit_expenses_header = ttk.Label(
             master=self._frame, text="Edit and Delete Expenses", background="pink")
         edit_expense_label = ttk.Label(
-            master=self._frame, text="Choose expense to edit by selecting it via click, choose expense aspect to edit in the dropdown and then fill in changed value in the text field.", background="#AFE4DE")
+            master=self._frame, text="Choose expenses to edit by selecting them via click, holding Ctrl or Shift to select several, choose expense aspect to edit in the dropdown and then fill in changed value in the text field. Names and amounts are edited one expense at a time.", background="#AFE4DE")
 
         self._selected_expense_editable = StringVar()
         edit_options = ["Name", "Amount", "Date", "Category", "Delete"]
@@ -267,59 +382,107 @@ class ExpenseOverview:
         edit_expense_button.grid(row=19, padx=5, pady=5, sticky=(
             constants.E, constants.W))
 
+        undo_button = ttk.Button(
+            master=self._frame, text="Undo", command=self._undo)
+        redo_button = ttk.Button(
+            master=self._frame, text="Redo", command=self._redo)
+        undo_button.grid(row=19, column=1, padx=5, pady=5, sticky=(constants.W))
+        redo_button.grid(row=19, column=2, padx=5, pady=5, sticky=(constants.W))
+
     def _edit_expenses(self):
         editable = self._selected_expense_editable.get()
-        chosen_expense = self._expense_table.focus()
-
-        if editable and chosen_expense:
-            chosen_expense_details = self._expense_table.item(chosen_expense)
-
-            old_expense = Expense(chosen_expense_details.get("values")[0], chosen_expense_details.get("values")[1],
-                                  chosen_expense_details.get("values")[2], chosen_expense_details.get("values")[3])
-
-            if editable == "Delete":
-                self.expense_service.delete_expense(old_expense)
-
-                remaining_expenses = self.expense_service.list_all_expenses()
-                if not remaining_expenses:
-                    self._expense_overview()
-                    return
-
-                else:
-                    self._get_category_dropdown()
-                    self._initialize_edit_categories()
-
-            user_change = self._expense_user_change_input.get()
-
-            if user_change:
-                if editable == "Name":
-                    self.expense_service.edit_expense_name(
-                        user_change, old_expense)
-
-                elif editable == "Amount":
-                    try:
-                        self.expense_service.edit_expense_amount(
-                            user_change, old_expense)
-                    except InvalidInputError:
-                        self._display_error_message(
-                            "Invalid input. Make sure you have entered a nonnegative numeric amount")
-
-                elif editable == "Date":
-                    try:
-                        self.expense_service.edit_expense_date(
-                            user_change, old_expense)
-                    except InvalidInputError:
-                        self._display_error_message(
-                            "Invalid input. Make sure you have entered a valid date in YYYY-MM-DD format")
-
-                elif editable == "Category":
-                    self.expense_service.edit_expense_category(
-                        user_change, old_expense)
-                    self._get_category_dropdown()
-                    self._initialize_edit_categories()
+        selected_expenses = self._expense_table.selection()
 
-            self._expense_user_change_input.delete(0, constants.END)
-            self._get_expense_table()
+        if not (editable and selected_expenses):
+            return
+
+        if editable == "Delete":
+            self._delete_expenses(selected_expenses)
+            return
+
+        user_change = self._expense_user_change_input.get()
+
+        if user_change:
+            if editable in ("Name", "Amount"):
+                self._edit_single_expense(editable, user_change, selected_expenses)
+                return
+
+            if editable == "Date":
+                try:
+                    self.expense_service.edit_expenses_date(
+                        user_change, selected_expenses)
+                except InvalidInputError:
+                    self._display_error_message(
+                        "Invalid input. Make sure you have entered a valid date in YYYY-MM-DD format")
+                except MissingExchangeRateError as error:
+                    self._display_error_message(str(error))
+
+            elif editable == "Category":
+                self.expense_service.edit_expenses_category(
+                    user_change, selected_expenses)
+                self._get_category_dropdown()
+                self._initialize_edit_categories()
+
+            self._patch_expense_rows(selected_expenses)
+
+        self._expense_user_change_input.delete(0, constants.END)
+
+    def _delete_expenses(self, selected_expenses):
+        self.expense_service.delete_expenses(selected_expenses)
+
+        if not self.expense_service.list_expenses_page(0, 1):
+            self._expense_overview()
+            return
+
+        self._expense_table.delete(*selected_expenses)
+        self._refresh_totals()
+        self._get_category_dropdown()
+        self._initialize_edit_categories()
+
+    def _edit_single_expense(self, editable, user_change, selected_expenses):
+        if len(selected_expenses) != 1:
+            self._display_error_message(
+                f"Choose a single expense to edit its {editable.lower()}")
+            return
+
+        values = self._expense_table.item(selected_expenses[0]).get("values")
+        old_expense = Expense(values[0], values[1], values[2], values[3])
+
+        if editable == "Name":
+            self.expense_service.edit_expense_name(user_change, old_expense)
+
+        elif editable == "Amount":
+            try:
+                self.expense_service.edit_expense_amount(
+                    user_change, old_expense)
+            except InvalidInputError:
+                self._display_error_message(
+                    "Invalid input. Make sure you have entered a nonnegative numeric amount")
+
+        self._expense_user_change_input.delete(0, constants.END)
+        self._get_expense_table()
+
+    def _undo(self):
+        if self.expense_service.undo() is None:
+            self._display_error_message("There is nothing to undo")
+            return
+        self._reload_after_undo_or_redo()
+
+    def _redo(self):
+        if self.expense_service.redo() is None:
+            self._display_error_message("There is nothing to redo")
+            return
+        self._reload_after_undo_or_redo()
+
+    def _reload_after_undo_or_redo(self):
+        # Undoing may change any expenses and categories, so everything is shown anew
+        if not self.expense_service.list_expenses_page(0, 1):
+            self._expense_overview()
+            return
+
+        self._get_category_dropdown()
+        self._initialize_edit_categories()
+        self._get_expense_table()
 
     def _initialize_edit_categories(self):
         edit_categories_header = ttk.Label(
@@ -381,3 +544,79 @@ class ExpenseOverview:
 
     def _display_error_message(self, message):
         messagebox.showerror("Error", message)
+
+    def _initialize_budgets(self):
+        if not self.budget_service:
+            return
+
+        budgets_header = ttk.Label(
+            master=self._frame, text="Monthly Budgets", background="pink")
+        budgets_label = ttk.Label(
+            master=self._frame, text="Choose a category and fill in how much you want to spend in it each month. Budgets that are nearly or fully spent this month are highlighted.", background="#AFE4DE")
+
+        column_names = ["Category", "Budget", "Spent this month", "Status"]
+        self._budget_table = ttk.Treeview(
+            master=self._frame, columns=column_names, show="headings", selectmode="browse", height=5)
+        for column in column_names:
+            self._budget_table.heading(column, text=column)
+        self._budget_table.tag_configure(NEAR_BUDGET, background="#FFE8A3")
+        self._budget_table.tag_configure(OVER_BUDGET, background="#F4A6A6")
+
+        self._selected_budget_category = StringVar()
+        categories = self.expense_service.list_all_categories()
+        budget_category_dropdown = OptionMenu(
+            self._frame, self._selected_budget_category, *categories)
+        self._budget_amount_input = ttk.Entry(master=self._frame)
+
+        set_budget_button = ttk.Button(
+            master=self._frame, text="Set Budget", command=self._edit_budget)
+        remove_budget_button = ttk.Button(
+            master=self._frame, text="Remove Budget", command=self._delete_budget)
+
+        budgets_header.grid(row=26, padx=10, pady=10, sticky=(
+            constants.E, constants.W))
+        budgets_label.grid(row=27, padx=5, pady=5, sticky=(
+            constants.E, constants.W))
+        self._budget_table.grid(row=28, columnspan=2, sticky=(
+            constants.NSEW), padx=5, pady=5)
+        budget_category_dropdown.grid(row=29, padx=5, pady=5, sticky=(
+            constants.E, constants.W))
+        self._budget_amount_input.grid(row=30, padx=5, pady=5, sticky=(
+            constants.E, constants.W))
+        set_budget_button.grid(row=31, padx=5, pady=5, sticky=(
+            constants.E, constants.W))
+        remove_budget_button.grid(row=32, padx=5, pady=5, sticky=(
+            constants.E, constants.W))
+
+        self._display_budgets()
+
+    def _display_budgets(self):
+        if not self._budget_table:
+            return
+
+        for element in self._budget_table.get_children():
+            self._budget_table.delete(element)
+        for category, amount, spent, status in self.budget_service.list_budgets():
+            self._budget_table.insert(
+                "", END, values=[category, amount, spent, status], tags=(status,))
+
+    def _edit_budget(self):
+        category = self._selected_budget_category.get()
+        amount = self._budget_amount_input.get()
+
+        if category and amount:
+            try:
+                self.budget_service.set_budget(Category(category), amount)
+            except InvalidInputError:
+                self._display_error_message(
+                    "Invalid input. Make sure you have entered a nonnegative numeric amount")
+
+            self._budget_amount_input.delete(0, constants.END)
+            self._display_budgets()
+
+    def _delete_budget(self):
+        category = self._selected_budget_category.get()
+
+        if category:
+            self.budget_service.remove_budget(Category(category))
+            self._display_budgets()
@@ -1,7 +1,4 @@
 from tkinter import ttk, constants
-from services.login_service import login_service
-from repositories.expense_repository import ExpenseRepository
-from services.expense_service import ExpenseService
 
 
 class ExpenseTrackerView:
@@ -9,26 +6,23 @@ class ExpenseTrackerView:
     after a user logs in, and from which a user can navigatev to other parts of the Expense Tracker
     """
 
-    def __init__(self, root, handle_login, expense_overview, expense_creation):
+    def __init__(self, root, handle_logout, expense_overview, expense_creation):
         """Class constructor, creates the 'expense tracker' view
 
         Args:
             root (Tkinter frame): The Tkinter frame within which the login view resides
-            handle_login: Callable value, called when the user logs out and returns to login view
+            handle_logout: Callable value, called when the user logs out and returns to login view
             expense_overview: Callable value, called when the user clicks the "View and Edit Expenses" button
             expense_creation: Callable value, called when the user clicks the "Create Expenses" button
         """
         self._root = root
-        self._handle_return_to_login = handle_login
+        self._handle_logout = handle_logout
         self._handle_expense_overview = expense_overview
         self._handle_create_expense = expense_creation
 
         self._frame = None
         self._style = None
 
-        self.user = login_service.find_logged_in_user()
-        self.expense_service = ExpenseService(ExpenseRepository(), self.user)
-
         self._expense_name = None
         self._expense_amount = None
         self._expense_date = None
@@ -73,10 +67,6 @@ class ExpenseTrackerView:
         self._root.geometry(
             f"{int(window_width)}x{int(window_height)}+{int(screen_width)}+{int(screen_height)}")
 
-    def _handle_logout(self):
-        login_service.logout_user()
-        self._handle_return_to_login()
-
     def _initialize_start_view(self):
         header_label = ttk.Label(
             master=self._frame, text="Welcome to your Expense Tracker", background="#AFE4DE")
@@ -1,5 +1,6 @@
+import math
 from tkinter import ttk, constants, messagebox
-from services.login_service import login_service, InvalidCredentialsError
+from services.login_service import login_service, InvalidCredentialsError, TooManyAttemptsError
 
 
 class LoginView:
@@ -12,16 +13,19 @@ class LoginView:
         Args:
             root (Tkinter frame): The Tkinter frame within which the login view resides
             handle_create_account: Callable value, called when the user clicks the "Create new account" button
-            handle_start_expense_tracker: Callable value, called when the user logs in with valid credentials
+            handle_start_expense_tracker: Callable value, called with the new session
+                                            when the user logs in with valid credentials
         """
         self._root = root
         self._handle_create_account = handle_create_account
         self._handle_start_expense_tracker = handle_start_expense_tracker
         self._frame = None
         self._style = None
+        self._pending_wait = None
 
         self._username_entry = None
         self._password_entry = None
+        self._login_button = None
 
         self._initialize()
 
@@ -43,7 +47,7 @@ class LoginView:
             master=self._frame, text="Password", background="#AFE4DE")
         self._password_entry = ttk.Entry(master=self._frame)
 
-        login_button = ttk.Button(
+        self._login_button = ttk.Button(
             master=self._frame, text="Login", command=self._handle_login_button_click)
         create_account_button = ttk.Button(
             master=self._frame, text="Create new account", command=self._handle_create_account)
@@ -58,7 +62,7 @@ class LoginView:
         self._password_entry.grid(row=2, column=1, sticky=(
             constants.E, constants.W), padx=5, pady=5)
 
-        login_button.grid(columnspan=2, sticky=(
+        self._login_button.grid(columnspan=2, sticky=(
             constants.E, constants.W), padx=5, pady=5)
 
         create_account_button.grid(columnspan=2, sticky=(
@@ -86,6 +90,8 @@ class LoginView:
     def destroy(self):
         """Destroys the login view
         """
+        if self._pending_wait:
+            self._root.after_cancel(self._pending_wait)
         self._frame.destroy()
 
     def _handle_login_button_click(self):
@@ -93,13 +99,30 @@ class LoginView:
         password_value = self._password_entry.get()
 
         if username_value and password_value:
-            try:
-                login_service.login_user(username_value, password_value)
-                self._handle_start_expense_tracker()
-
-            except InvalidCredentialsError:
-                self._display_error_message(
-                    "Invalid credentials. Please try again")
+            self._login_button.state(["disabled"])
+            login = login_service.start_session_async(
+                username_value, password_value)
+            self._wait_for_login(login)
+
+    def _wait_for_login(self, login):
+        # Checking the password hash runs in a worker thread, so the window stays responsive.
+        # The result is requested here, so the database is only used from the UI thread.
+        # The view may be left meanwhile, in which case destroy cancels the next check
+        self._pending_wait = None
+        if not login.done():
+            self._pending_wait = self._root.after(20, self._wait_for_login, login)
+            return
+
+        self._login_button.state(["!disabled"])
+        try:
+            self._handle_start_expense_tracker(login.result())
+
+        except InvalidCredentialsError:
+            self._display_error_message(
+                "Invalid credentials. Please try again")
+        except TooManyAttemptsError as error:
+            self._display_error_message(
+                f"Too many failed login attempts. Please try again in {math.ceil(error.retry_after)} seconds")
 
     def _display_error_message(self, message):
         messagebox.showerror("Error", message)
@@ -1,6 +1,18 @@
 from tkinter import Tk
 
 from matplotlib import pyplot
+from repositories.expense_repository import ExpenseRepository
+from repositories.expense_rollup_repository import ExpenseRollupRepository
+from repositories.budget_repository import BudgetRepository
+from repositories.recurring_expense_repository import RecurringExpenseRepository
+from services.expense_service import ExpenseService
+from services.expense_report_service import ExpenseReportService
+from services.budget_service import BudgetService
+from services.forecast_service import ForecastService
+from services.anomaly_service import AnomalyService
+from services.recurring_expense_service import (RecurringExpenseService,
+                                                recurring_expense_scheduler)
+from services.login_service import login_service
 from ui.login_view import LoginView
 from ui.create_account_view import CreateAccountView
 from ui.expense_tracker_view import ExpenseTrackerView
@@ -11,6 +23,8 @@ from ui.expense_overview import ExpenseOverview
 
 class UI:
     """This class manages switching between different UI views and windows.
+    It holds the session of the logged-in user, and the ExpenseService shared by all views
+    during that session.
     """
 
     def __init__(self, root):
@@ -22,6 +36,17 @@ class UI:
         self._root = root
         self._current_view = None
 
+        self._expense_repository = ExpenseRepository()
+        self._budget_repository = BudgetRepository()
+        self._recurring_expense_repository = RecurringExpenseRepository()
+        self._session = None
+        self._expense_service = None
+        self._report_service = None
+        self._budget_service = None
+        self._recurring_expense_service = None
+        self._forecast_service = None
+        self._anomaly_service = None
+
         self._root.protocol('WM_DELETE_WINDOW', self._exit)
 
     def start(self):
@@ -42,6 +67,43 @@ class UI:
     def _handle_login(self):
         self._show_login_view()
 
+    def _handle_session_start(self, session):
+        self._session = session
+        self._expense_service = ExpenseService(
+            self._expense_repository, session.user)
+        self._report_service = ExpenseReportService(self._expense_repository, session.user)
+        self._budget_service = BudgetService(self._budget_repository, session.user)
+        self._recurring_expense_service = RecurringExpenseService(
+            self._recurring_expense_repository, session.user)
+        self._forecast_service = ForecastService(ExpenseRollupRepository(), session.user)
+        self._anomaly_service = AnomalyService(self._expense_repository, session.user)
+        self._show_expense_tracker_view()
+
+    def _handle_logout(self):
+        login_service.end_session(self._session)
+        self._end_session()
+
+    def _has_valid_session(self):
+        """Checks that the session has not expired, and returns to the login view if it has
+        """
+        if self._session and login_service.find_session(self._session.session_id):
+            return True
+
+        self._end_session()
+        return False
+
+    def _end_session(self):
+        """Forgets the session and the services of its user, and returns to the login view
+        """
+        self._session = None
+        self._expense_service = None
+        self._report_service = None
+        self._budget_service = None
+        self._recurring_expense_service = None
+        self._forecast_service = None
+        self._anomaly_service = None
+        self._show_login_view()
+
     def _handle_create_account(self):
         self._show_create_account_view()
 
@@ -61,14 +123,17 @@ class UI:
         self._hide_current_view()
 
         self._current_view = LoginView(
-            self._root, self._handle_create_account, self._handle_expense_tracker)
+            self._root, self._handle_create_account, self._handle_session_start)
         self._current_view.configure()
 
     def _show_expense_overview(self):
+        if not self._has_valid_session():
+            return
         self._hide_current_view()
 
         self._current_view = ExpenseOverview(
-            self._root, self._handle_expense_tracker, self._handle_expense_graph, self._handle_expense_creation, self._handle_expense_overview)
+            self._root, self._expense_service, self._handle_expense_tracker, self._handle_expense_graph, self._handle_expense_creation, self._handle_expense_overview,
+            self._budget_service, self._anomaly_service, self._report_service)
         self._current_view.configure()
 
     def _show_create_account_view(self):
@@ -79,22 +144,30 @@ class UI:
         self._current_view.configure()
 
     def _show_expense_tracker_view(self):
+        if not self._has_valid_session():
+            return
         self._hide_current_view()
 
         self._current_view = ExpenseTrackerView(
-            self._root, self._handle_login, self._handle_expense_overview, self._handle_expense_creation)
+            self._root, self._handle_logout, self._handle_expense_overview, self._handle_expense_creation)
         self._current_view.configure()
 
     def _show_expense_creation_view(self):
+        if not self._has_valid_session():
+            return
         self._hide_current_view()
 
         self._current_view = ExpenseCreationView(
-            self._root, self._handle_expense_tracker, self._handle_expense_overview)
+            self._root, self._expense_service, self._handle_expense_tracker, self._handle_expense_overview,
+            self._budget_service, self._recurring_expense_service, recurring_expense_scheduler)
         self._current_view.configure()
 
     def _show_expense_graph_view(self):
+        if not self._has_valid_session():
+            return
         self._hide_current_view()
 
         self._current_view = ExpenseGraph(
-            self._root, self._handle_expense_tracker, self._handle_expense_overview)
+            self._root, self._expense_service, self._handle_expense_tracker, self._handle_expense_overview,
+            self._forecast_service, self._report_service)
         self._current_view.configure()
@@ -4,10 +4,18 @@ from invoke import task
 def start(ctx):
     ctx.run("python3 src/main.py", pty = True)
 
+@task
+def profile(ctx):
+    ctx.run("python3 src/main.py", env={"PROFILE": "1"}, pty = True)
+
 @task
 def initialize(ctx):
     ctx.run("python3 src/initialize.py", pty = True)
 
+@task
+def reset_database(ctx):
+    ctx.run("python3 src/initialize.py --reset", pty = True)
+
 @task
 def test(ctx):
     ctx.run("pytest src", pty = True)
@@ -26,4 +34,34 @@ def lint(ctx):
 
 @task
 def format(ctx):
-    ctx.run("autopep8 --in-place --recursive src", pty = True)
\ No newline at end of file
+    ctx.run("autopep8 --in-place --recursive src", pty = True)
+
+@task
+def benchmark(ctx, sizes="1000,100000,1000000", password_hash_cost="15"):
+    ctx.run("pytest src/benchmarks -o python_files=*_benchmark.py "
+            "--benchmark-autosave --benchmark-storage=file://./data/benchmarks",
+            env={"BENCHMARK_SIZES": sizes, "DATABASE_FILE": "benchmark-database.sqlite",
+                 "PASSWORD_HASH_COST": password_hash_cost},
+            pty = True)
+
+@task
+def benchmark_compare(ctx):
+    ctx.run("pytest-benchmark --storage file://./data/benchmarks compare --group-by=name",
+            pty = True)
+
+@task
+def cli(ctx, command=""):
+    ctx.run(f"python3 -m cli {command}", env={"PYTHONPATH": "src"})
+
+@task
+def serve(ctx):
+    ctx.run("python3 -m api", env={"PYTHONPATH": "src"}, pty = True)
+
+@task
+def load_test(ctx, clients=20, requests=200):
+    ctx.run(f"python3 src/benchmarks/load_test_api.py --clients {clients} --requests {requests}",
+            env={"PYTHONPATH": "src"}, pty = True)
+
+@task
+def calibrate_password_hashing(ctx):
+    ctx.run("python3 src/services/password_hasher.py", env={"PYTHONPATH": "src"}, pty = True)